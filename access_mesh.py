@@ -3,21 +3,226 @@ access_mesh.py — Part of MetaFabric Production v1.1.0
 Auto-generated under Domino Mode
 """
 
+import json
+import os
+import threading
 import yaml
+from contextlib import contextmanager
 from pathlib import Path
 
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+COMPACT_AFTER = 256  # Log records replayed on load before the snapshot is rewritten
+
+_Loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+_Dumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
 class AccessMesh:
-    def __init__(self, registry_path: Path):
-        self.registry_path = registry_path
-        if self.registry_path.exists():
-            self.mesh = yaml.safe_load(self.registry_path.read_text()) or {}
+    """
+    Project -> {tools, secrets} bindings. `registry_path` holds a YAML
+    snapshot; each bind appends one record to `<registry>.log` under an
+    exclusive file lock, and the log is folded into a freshly written
+    snapshot (atomic replace) every `compact_after` records. Every instance
+    replays only the log records it has not seen yet, and keeps reverse
+    indexes from secrets and tools to the projects bound to them.
+    """
+
+    def __init__(self, registry_path: Path, compact_after: int = COMPACT_AFTER):
+        self.registry_path = Path(registry_path)
+        self.log_path = self.registry_path.with_name(self.registry_path.name + ".log")
+        self.lock_path = self.registry_path.with_name(self.registry_path.name + ".lock")
+        self.compact_after = compact_after
+        self.mesh = {}
+        self.by_secret = {}
+        self.by_tool = {}
+        self._snapshot_id = None
+        self._stale = True
+        self._log_id = None
+        self._log_offset = 0
+        self._log_records = 0
+        self._pending = None
+        self._lock_depth = 0
+        self._lock_file = None
+        self._thread_lock = threading.RLock()
+        with self._locked():
+            self._refresh()
+
+    # === LOCKING ===
+
+    @contextmanager
+    def _locked(self):
+        """Exclusive lock on the mesh across threads and processes (re-entrant per instance)"""
+        with self._thread_lock:
+            if self._lock_depth == 0:
+                self.registry_path.parent.mkdir(parents=True, exist_ok=True)
+                self._lock_file = open(self.lock_path, "a+b")
+                if fcntl is not None:
+                    fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_EX)
+                else:
+                    self._lock_file.seek(0)
+                    msvcrt.locking(self._lock_file.fileno(), msvcrt.LK_LOCK, 1)
+            self._lock_depth += 1
+            try:
+                yield
+            finally:
+                self._lock_depth -= 1
+                if self._lock_depth == 0:
+                    if fcntl is None:
+                        self._lock_file.seek(0)
+                        msvcrt.locking(self._lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+                    self._lock_file.close()  # Closing releases the flock
+                    self._lock_file = None
+
+    # === LOADING ===
+
+    @staticmethod
+    def _file_id(path: Path):
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            return None
+        return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+    def _apply(self, project: str, binding):
+        previous = self.mesh.get(project)
+        if previous is not None:
+            for index, names in ((self.by_secret, previous["secrets"]), (self.by_tool, previous["tools"])):
+                for name in names:
+                    projects = index.get(name)
+                    if projects is not None:
+                        projects.discard(project)
+                        if not projects:
+                            del index[name]
+        if binding is None:
+            self.mesh.pop(project, None)
         else:
-            self.mesh = {}
+            self.mesh[project] = binding
+            for name in binding["secrets"]:
+                self.by_secret.setdefault(name, set()).add(project)
+            for name in binding["tools"]:
+                self.by_tool.setdefault(name, set()).add(project)
+
+    def _refresh(self):
+        """Catch up with the snapshot and log as written by any process (lock held)"""
+        snapshot_id = self._file_id(self.registry_path)
+        log_id = self._file_id(self.log_path)
+        if self._stale or snapshot_id != self._snapshot_id or (log_id and self._log_id and log_id[0] != self._log_id[0]):
+            # Compacted (or first load): start over from the snapshot
+            self.mesh, self.by_secret, self.by_tool = {}, {}, {}
+            if snapshot_id is not None:
+                with open(self.registry_path, "r") as f:
+                    snapshot = yaml.load(f, Loader=_Loader) or {}
+                for project, binding in snapshot.items():
+                    self._apply(project, {"tools": list(binding.get("tools", [])),
+                                          "secrets": list(binding.get("secrets", []))})
+            self._snapshot_id = snapshot_id
+            self._stale = False
+            self._log_offset = self._log_records = 0
+        if log_id is not None and log_id[2] > self._log_offset:
+            with open(self.log_path, "rb") as f:
+                f.seek(self._log_offset)
+                data = f.read()
+            end = data.rfind(b"\n") + 1  # A torn final record (crash mid-append) is ignored
+            for line in data[:end].splitlines():
+                self._apply_record(json.loads(line))
+                self._log_records += 1
+            self._log_offset += end
+        self._log_id = log_id
+
+    # === WRITING ===
+
+    def _apply_record(self, record):
+        self._apply(record["project"], None if record.get("removed") else
+                    {"tools": record["tools"], "secrets": record["secrets"]})
+
+    def _append(self, records):
+        payload = b"".join(json.dumps(record, separators=(",", ":")).encode() + b"\n" for record in records)
+        with open(self.log_path, "ab") as f:
+            if f.tell() > self._log_offset:
+                f.truncate(self._log_offset)  # Drop a torn record left by a crashed writer
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        self._log_offset += len(payload)
+        self._log_records += len(records)
+        self._log_id = self._file_id(self.log_path)
+        if self._log_records >= self.compact_after:
+            self.compact()
+
+    def _write(self, record):
+        with self._locked():
+            if self._pending is not None:
+                self._apply_record(record)
+                self._pending.append(record)
+                return
+            self._refresh()
+            self._apply_record(record)
+            self._append([record])
+
+    @contextmanager
+    def transaction(self):
+        """Hold the mesh lock across several binds and write them as one log append"""
+        with self._locked():
+            if self._pending is not None:
+                yield self
+                return
+            self._refresh()
+            self._pending = []
+            try:
+                yield self
+                records, self._pending = self._pending, None
+                if records:
+                    self._append(records)
+            except BaseException:
+                self._stale = True  # Discard the unwritten binds on the next refresh
+                raise
+            finally:
+                self._pending = None
+
+    def compact(self):
+        """Write the current mesh as the snapshot and start an empty log"""
+        with self._locked():
+            self._refresh()
+            temp_path = self.registry_path.with_name(self.registry_path.name + ".tmp")
+            with open(temp_path, "w") as f:
+                yaml.dump(self.mesh, f, Dumper=_Dumper, sort_keys=False)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.registry_path)
+            # The snapshot now contains every log record, so replaying them again is harmless
+            open(temp_path, "wb").close()
+            os.replace(temp_path, self.log_path)
+            self._snapshot_id = self._file_id(self.registry_path)
+            self._log_id = self._file_id(self.log_path)
+            self._log_offset = self._log_records = 0
 
     def bind(self, project: str, tools: list, secrets: list):
-        self.mesh[project] = {
-            "tools": sorted(tools),
-            "secrets": sorted(secrets)
-        }
-        self.registry_path.write_text(yaml.dump(self.mesh, sort_keys=False))
-        print(f"[✓] AccessMesh binding updated: {self.registry_path}")
\ No newline at end of file
+        self._write({"project": project, "tools": sorted(tools), "secrets": sorted(secrets)})
+        print(f"[✓] AccessMesh binding updated: {self.registry_path}")
+
+    def unbind(self, project: str):
+        self._write({"project": project, "removed": True})
+
+    # === QUERIES ===
+
+    def _current(self):
+        with self._locked():
+            if self._pending is None:
+                self._refresh()
+
+    def get(self, project: str):
+        self._current()
+        return self.mesh.get(project)
+
+    def projects_using_secret(self, secret: str) -> list:
+        """Projects bound to a secret, e.g. to fan out a rotation"""
+        self._current()
+        return sorted(self.by_secret.get(secret, ()))
+
+    def projects_using_tool(self, tool: str) -> list:
+        self._current()
+        return sorted(self.by_tool.get(tool, ()))
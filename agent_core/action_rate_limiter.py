@@ -0,0 +1,313 @@
+"""
+⏱️ ACTION RATE LIMITER - Abuse Prevention
+========================================
+
+Constant-memory rate limiting for agent actions:
+- Token bucket (burst-friendly) and sliding window counter (smooth) algorithms
+- Per-agent limits plus per action type / severity limits
+- Idle key eviction so memory tracks active agents, not every agent ever seen
+- Optional shared SQLite store so several worker processes enforce one limit
+
+Each key keeps a fixed three-number state, so a check is O(1) regardless of
+how many actions fall inside the window.
+"""
+
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+State = Tuple[float, float, float]
+
+class RateLimitAlgorithm(Enum):
+    """Supported rate limiting algorithms"""
+    TOKEN_BUCKET = "token_bucket"
+    SLIDING_WINDOW = "sliding_window"
+
+@dataclass(frozen=True)
+class RateLimit:
+    """A limit of `limit` actions per `period_seconds`; `burst` sizes the token bucket"""
+    limit: int
+    period_seconds: float = 60.0
+    algorithm: RateLimitAlgorithm = RateLimitAlgorithm.SLIDING_WINDOW
+    burst: Optional[int] = None
+
+    @classmethod
+    def from_config(cls, config: Any, default_algorithm: RateLimitAlgorithm) -> 'RateLimit':
+        """Build from an int (actions per minute) or a dict with limit/period_seconds/algorithm/burst"""
+        if isinstance(config, RateLimit):
+            return config
+        if isinstance(config, (int, float)):
+            return cls(limit=int(config), algorithm=default_algorithm)
+        return cls(
+            limit=int(config["limit"]),
+            period_seconds=float(config.get("period_seconds", 60.0)),
+            algorithm=RateLimitAlgorithm(config.get("algorithm", default_algorithm.value)),
+            burst=config.get("burst")
+        )
+
+    @property
+    def capacity(self) -> float:
+        return float(self.burst if self.burst is not None else self.limit)
+
+@dataclass
+class RateLimitDecision:
+    """Outcome of a rate limit check for one key"""
+    allowed: bool
+    key: str
+    limit: int
+    current: float          # Tokens used / estimated actions in the window
+    remaining: float
+    retry_after: float      # Seconds until the next action would be allowed
+    reset_after: float      # Seconds until the key is back to full capacity
+
+def _token_bucket_step(state: Optional[State], rule: RateLimit, cost: float, now: float) -> Tuple[State, RateLimitDecision]:
+    """State is (tokens, last_refill, unused)"""
+    capacity = rule.capacity
+    refill_rate = rule.limit / rule.period_seconds
+    tokens, last = (capacity, now) if state is None else state[:2]
+    tokens = min(capacity, tokens + max(0.0, now - last) * refill_rate)
+
+    allowed = cost <= tokens or cost <= 0
+    if allowed:
+        tokens = min(capacity, tokens - cost)
+    retry_after = 0.0 if allowed else (cost - tokens) / refill_rate
+    decision = RateLimitDecision(
+        allowed=allowed, key="", limit=rule.limit,
+        current=capacity - tokens, remaining=max(0.0, tokens),
+        retry_after=retry_after, reset_after=(capacity - tokens) / refill_rate
+    )
+    return (tokens, now, 0.0), decision
+
+def _sliding_window_step(state: Optional[State], rule: RateLimit, cost: float, now: float) -> Tuple[State, RateLimitDecision]:
+    """State is (window_start, current_count, previous_count) for fixed windows of period_seconds"""
+    period = rule.period_seconds
+    window_start = now - now % period
+    if state is None:
+        current, previous = 0.0, 0.0
+    else:
+        start, current, previous = state
+        if window_start - start >= 2 * period:
+            current, previous = 0.0, 0.0
+        elif window_start != start:
+            current, previous = 0.0, current
+
+    # Weight the previous window by how much of it still overlaps the sliding window
+    overlap = 1.0 - (now - window_start) / period
+    estimate = previous * overlap + current
+
+    allowed = cost <= 0 or estimate + cost <= rule.limit
+    if allowed:
+        current += cost
+        estimate += cost
+        if current < 0.0:
+            current = 0.0
+    retry_after = 0.0
+    if not allowed:
+        # Wait until enough of the previous window slides out, or else until
+        # enough of the current one does after the window rolls over
+        window_left = window_start + period - now
+        excess = estimate + cost - rule.limit
+        if previous > 0 and excess / previous * period <= window_left:
+            retry_after = excess / previous * period
+        else:
+            rolled_over = period * (1.0 - (rule.limit - cost) / current) if current > 0 else 0.0
+            retry_after = window_left + max(0.0, rolled_over)
+    if estimate < 0.0:
+        estimate = 0.0
+    remaining = rule.limit - estimate
+    decision = RateLimitDecision(
+        allowed=allowed, key="", limit=rule.limit,
+        current=estimate, remaining=remaining if remaining > 0.0 else 0.0,
+        retry_after=retry_after, reset_after=window_start + 2 * period - now
+    )
+    return (window_start, current, previous), decision
+
+def _step(state: Optional[State], rule: RateLimit, cost: float, now: float) -> Tuple[State, RateLimitDecision]:
+    if rule.algorithm is RateLimitAlgorithm.TOKEN_BUCKET:
+        return _token_bucket_step(state, rule, cost, now)
+    return _sliding_window_step(state, rule, cost, now)
+
+class InMemoryRateLimitStore:
+    """
+    Per-process key state in access order. Keys idle longer than `idle_ttl`
+    are evicted on access, and the oldest keys are dropped past `max_keys`.
+    """
+
+    EVICTION_INTERVAL = 64  # Checks between idle-key sweeps when no new keys arrive
+
+    def __init__(self, idle_ttl: float = 600.0, max_keys: int = 1_000_000):
+        self.idle_ttl = idle_ttl
+        self.max_keys = max_keys
+        self._states: "OrderedDict[str, Tuple[State, float]]" = OrderedDict()
+        self._applies = 0
+        self._lock = threading.Lock()
+
+    def apply(self, key: str, rule: RateLimit, cost: float, now: float) -> RateLimitDecision:
+        states = self._states
+        with self._lock:
+            entry = states.get(key)
+            if entry is not None:
+                states.move_to_end(key)
+                state = entry[0] if now - entry[1] <= self.idle_ttl else None
+            else:
+                state = None
+            new_state, decision = _step(state, rule, cost, now)
+            states[key] = (new_state, now)
+            self._applies += 1
+            if entry is None or self._applies >= self.EVICTION_INTERVAL:
+                self._evict(now)
+        decision.key = key
+        return decision
+
+    def _evict(self, now: float):
+        self._applies = 0
+        states = self._states
+        while len(states) > self.max_keys:
+            states.popitem(last=False)
+        cutoff = now - self.idle_ttl
+        # Least recently used first: pop until one is still fresh
+        while states:
+            oldest_key = next(iter(states))
+            if states[oldest_key][1] >= cutoff:
+                break
+            states.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+class SQLiteRateLimitStore:
+    """
+    Key state in a shared SQLite database. Each check runs in its own
+    BEGIN IMMEDIATE transaction, so concurrent processes see a consistent count.
+    """
+
+    def __init__(self, db_path: str, idle_ttl: float = 600.0, busy_timeout: float = 5.0):
+        self.db_path = db_path
+        self.idle_ttl = idle_ttl
+        self.busy_timeout = busy_timeout
+        self._local = threading.local()
+        self._checks_since_eviction = 0
+        conn = self._connection()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS rate_limit_state (
+                key TEXT PRIMARY KEY,
+                a REAL NOT NULL,
+                b REAL NOT NULL,
+                c REAL NOT NULL,
+                last_seen REAL NOT NULL
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_rate_limit_last_seen ON rate_limit_state(last_seen)")
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=self.busy_timeout, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def apply(self, key: str, rule: RateLimit, cost: float, now: float) -> RateLimitDecision:
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT a, b, c, last_seen FROM rate_limit_state WHERE key = ?", (key,)
+            ).fetchone()
+            state = row[:3] if row is not None and now - row[3] <= self.idle_ttl else None
+            new_state, decision = _step(state, rule, cost, now)
+            conn.execute(
+                "INSERT OR REPLACE INTO rate_limit_state (key, a, b, c, last_seen) VALUES (?, ?, ?, ?, ?)",
+                (key, *new_state, now)
+            )
+            self._checks_since_eviction += 1
+            if self._checks_since_eviction >= 1000:
+                conn.execute("DELETE FROM rate_limit_state WHERE last_seen < ?", (now - self.idle_ttl,))
+                self._checks_since_eviction = 0
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        decision.key = key
+        return decision
+
+    def __len__(self) -> int:
+        return self._connection().execute("SELECT COUNT(*) FROM rate_limit_state").fetchone()[0]
+
+class ActionRateLimiter:
+    """
+    Applies an agent-wide limit plus an optional limit for the action type
+    (falling back to the action severity). An action is allowed only if every
+    applicable limit allows it; if a later limit rejects, earlier ones are refunded.
+
+    Config keys:
+        max_action_rate:   default per-agent actions per minute (default 30)
+        algorithm:         "sliding_window" (default) or "token_bucket"
+        agents:            {agent_id: limit} overrides of the per-agent limit
+        action_types:      {action_type: limit} limits per agent and action type
+        severities:        {severity: limit} used when the action type has no limit
+        idle_ttl_seconds:  evict keys idle this long (default 600)
+        max_keys:          in-memory key cap (default 1,000,000)
+        sqlite_path:       share state across processes through this database
+    A limit is an int (per minute) or {"limit", "period_seconds", "algorithm", "burst"}.
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None, clock=time.time):
+        config = config or {}
+        self.clock = clock
+        self.algorithm = RateLimitAlgorithm(config.get("algorithm", RateLimitAlgorithm.SLIDING_WINDOW.value))
+        self.default_agent_limit = RateLimit.from_config(config.get("max_action_rate", 30), self.algorithm)
+        self.agent_limits = self._parse_limits(config.get("agents", {}))
+        self.action_type_limits = self._parse_limits(config.get("action_types", {}))
+        self.severity_limits = self._parse_limits(config.get("severities", {}))
+        self._has_scoped_limits = bool(self.action_type_limits or self.severity_limits)
+
+        idle_ttl = float(config.get("idle_ttl_seconds", 600.0))
+        if config.get("sqlite_path"):
+            self.store = SQLiteRateLimitStore(config["sqlite_path"], idle_ttl=idle_ttl)
+        else:
+            self.store = InMemoryRateLimitStore(idle_ttl=idle_ttl, max_keys=int(config.get("max_keys", 1_000_000)))
+
+    def _parse_limits(self, limits: Dict[str, Any]) -> Dict[str, RateLimit]:
+        return {name: RateLimit.from_config(limit, self.algorithm) for name, limit in limits.items()}
+
+    def limits_for(self, agent_id: str, action_type: str, severity: str) -> List[Tuple[str, RateLimit]]:
+        """Keys and limits that apply to one action"""
+        applicable = [(f"agent:{agent_id}", self.agent_limits.get(agent_id, self.default_agent_limit))]
+        action_limit = self.action_type_limits.get(action_type)
+        if action_limit is not None:
+            applicable.append((f"action:{agent_id}:{action_type}", action_limit))
+        else:
+            severity_limit = self.severity_limits.get(severity)
+            if severity_limit is not None:
+                applicable.append((f"severity:{agent_id}:{severity}", severity_limit))
+        return applicable
+
+    def check(self, agent_id: str, action_type: str = "", severity: str = "", cost: float = 1.0) -> RateLimitDecision:
+        """Consume `cost` from every applicable limit; returns the most restrictive decision"""
+        now = self.clock()
+        if not self._has_scoped_limits:
+            return self.store.apply("agent:" + agent_id, self.agent_limits.get(agent_id, self.default_agent_limit), cost, now)
+        consumed = []
+        decisions = []
+        for key, rule in self.limits_for(agent_id, action_type, severity):
+            decision = self.store.apply(key, rule, cost, now)
+            decisions.append(decision)
+            if not decision.allowed:
+                for refund_key, refund_rule in consumed:
+                    self.store.apply(refund_key, refund_rule, -cost, now)
+                return decision
+            consumed.append((key, rule))
+        return min(decisions, key=lambda d: d.remaining)
+
+def create_action_rate_limiter(config: Optional[Dict[str, Any]] = None) -> ActionRateLimiter:
+    """Factory function to create an action rate limiter"""
+    return ActionRateLimiter(config)
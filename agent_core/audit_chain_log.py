@@ -0,0 +1,404 @@
+"""
+📜 AUDIT CHAIN LOG - Persistent Action Audit Trail
+=================================================
+
+Append-only, hash-linked audit log for EnhancedActionSecurity:
+- One JSON line per audit record, linked by previous_audit_hash and HMAC-signed
+- Signed checkpoints with a Merkle root every `block_size` records
+- Verification starts at the last trusted checkpoint instead of the first record
+- Inclusion proofs show that one record belongs to a checkpointed block
+- Group commit: records enqueued while a write is in flight share the next write
+
+Without a directory the log is kept in memory with the same format and checks.
+"""
+
+import asyncio
+import hashlib
+import hmac
+import io
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+LOG_FILENAME = "audit_chain.log"
+CHECKPOINT_FILENAME = "audit_checkpoints.log"
+
+# Record fields persisted to the log; payloads and secrets are deliberately left out
+RECORD_FIELDS = (
+    "audit_id", "action_id", "agent_id", "action_type", "execution_status",
+    "timestamp", "duration_ms", "audit_hash", "previous_audit_hash", "digital_signature",
+)
+
+def compute_audit_hash(audit_id: str, action_id: str, agent_id: str, execution_status: str,
+                       duration_ms: float, previous_hash: Optional[str]) -> str:
+    """Hash that links an audit record to its predecessor"""
+    content = f"{audit_id}{action_id}{agent_id}{execution_status}{duration_ms}{previous_hash or ''}"
+    return hashlib.sha256(content.encode()).hexdigest()
+
+def sign(signing_key: str, message: str) -> str:
+    return hmac.new(signing_key.encode(), message.encode(), hashlib.sha256).hexdigest()
+
+def _leaf_hash(audit_hash: str) -> bytes:
+    return hashlib.sha256(b"\x00" + bytes.fromhex(audit_hash)).digest()
+
+def _node_hash(left: bytes, right: bytes) -> bytes:
+    return hashlib.sha256(b"\x01" + left + right).digest()
+
+def merkle_root(leaves: List[bytes]) -> bytes:
+    """Merkle root over leaf hashes; an odd node is promoted to the next level unchanged"""
+    level = list(leaves)
+    while len(level) > 1:
+        level = [_node_hash(level[i], level[i + 1]) if i + 1 < len(level) else level[i]
+                 for i in range(0, len(level), 2)]
+    return level[0]
+
+def merkle_path(leaves: List[bytes], index: int) -> List[Tuple[str, str]]:
+    """Sibling hashes from leaf to root, as (side, hex) pairs where side is the sibling's position"""
+    path = []
+    level = list(leaves)
+    while len(level) > 1:
+        sibling = index ^ 1
+        if sibling < len(level):
+            path.append(("left" if sibling < index else "right", level[sibling].hex()))
+        level = [_node_hash(level[i], level[i + 1]) if i + 1 < len(level) else level[i]
+                 for i in range(0, len(level), 2)]
+        index //= 2
+    return path
+
+def _checkpoint_message(checkpoint: Dict[str, Any]) -> str:
+    fields = {k: v for k, v in checkpoint.items() if k != "signature"}
+    return json.dumps(fields, sort_keys=True, separators=(",", ":"))
+
+class AuditChainLog:
+    """
+    Persistent audit chain with Merkle checkpoints.
+
+    `enqueue()` assigns the sequence number and advances `head_hash` at once,
+    so callers can link the next record immediately; `append()` additionally
+    waits until the record's batch is written (and fsynced, if enabled).
+    """
+
+    def __init__(self, signing_key: str, directory: Optional[str] = None,
+                 block_size: int = 256, fsync: bool = True):
+        self.signing_key = signing_key
+        self.directory = Path(directory) if directory else None
+        self.block_size = block_size
+        self.fsync = fsync and self.directory is not None
+
+        self.record_count = 0               # Records enqueued (next sequence number)
+        self.head_hash: Optional[str] = None
+        self.checkpoints: List[Dict[str, Any]] = []
+
+        self._committed_count = 0           # Records written to the log
+        self._offset = 0                    # Bytes written to the log
+        self._block_leaves: List[bytes] = []
+        self._last_block_hash: Optional[str] = None
+        self._index: Dict[str, int] = {}
+        self._index_complete = True
+        self._pending: List[Tuple[bytes, Optional[asyncio.Future]]] = []
+        self._flush_task: Optional[asyncio.Task] = None
+        self._write_lock = threading.Lock()
+
+        if self.directory is None:
+            self._log = io.BytesIO()
+            self._checkpoint_log = io.BytesIO()
+        else:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self._log = open(self.directory / LOG_FILENAME, "a+b")
+            self._checkpoint_log = open(self.directory / CHECKPOINT_FILENAME, "a+b")
+            self._load()
+
+    # === APPEND ===
+
+    def enqueue(self, record: Any) -> Optional[asyncio.Future]:
+        """
+        Queue a record (ActionAuditRecord or dict) for the next group commit.
+        Returns a future resolved with the sequence number once written, or
+        None if there is no running event loop and the record was written directly.
+        """
+        entry = self._record_entry(record)
+        entry["seq"] = self.record_count
+        self.record_count += 1
+        self.head_hash = entry["audit_hash"]
+        self._index[entry["audit_id"]] = entry["seq"]
+        line = (json.dumps(entry, separators=(",", ":"), default=str) + "\n").encode()
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._write_batch([line])
+            return None
+
+        future = loop.create_future()
+        self._pending.append((line, future))
+        if self._flush_task is None:
+            self._flush_task = loop.create_task(self._flush_pending())
+        return future
+
+    async def append(self, record: Any) -> int:
+        """Append a record and wait for it to be committed; returns its sequence number"""
+        future = self.enqueue(record)
+        if future is None:
+            return self.record_count - 1
+        return await future
+
+    async def flush(self):
+        """Wait for every queued record to be written"""
+        while self._flush_task is not None:
+            await asyncio.shield(self._flush_task)
+
+    async def _flush_pending(self):
+        loop = asyncio.get_running_loop()
+        try:
+            while self._pending:
+                batch, self._pending = self._pending, []
+                try:
+                    await loop.run_in_executor(None, self._write_batch, [line for line, _ in batch])
+                except Exception as e:
+                    logger.error(f"❌ Audit log write failed: {e}")
+                    for _, future in batch:
+                        if not future.done():
+                            future.set_exception(e)
+                    continue
+                for line, future in batch:
+                    if not future.done():
+                        future.set_result(json.loads(line)["seq"])
+        finally:
+            self._flush_task = None
+
+    def _write_batch(self, lines: List[bytes]):
+        with self._write_lock:
+            self._log.seek(0, os.SEEK_END)
+            self._log.write(b"".join(lines))
+            self._log.flush()
+            if self.fsync:
+                os.fsync(self._log.fileno())
+
+            new_checkpoints = []
+            for line in lines:
+                new_checkpoints.extend(self._commit_line(line, json.loads(line)))
+            self._write_checkpoints(new_checkpoints)
+
+    def _commit_line(self, line: bytes, entry: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Account for one written record; returns the checkpoints of the blocks it completes"""
+        self._offset += len(line)
+        self._committed_count += 1
+        self._block_leaves.append(_leaf_hash(entry["audit_hash"]))
+        self._last_block_hash = entry["audit_hash"]
+        checkpoints = []
+        while len(self._block_leaves) >= self.block_size:
+            checkpoints.append(self._make_checkpoint())
+        return checkpoints
+
+    def _write_checkpoints(self, checkpoints: List[Dict[str, Any]]):
+        if not checkpoints:
+            return
+        self._checkpoint_log.seek(0, os.SEEK_END)
+        self._checkpoint_log.write(b"".join(
+            (json.dumps(cp, sort_keys=True) + "\n").encode() for cp in checkpoints
+        ))
+        self._checkpoint_log.flush()
+        if self.fsync:
+            os.fsync(self._checkpoint_log.fileno())
+
+    def _make_checkpoint(self) -> Dict[str, Any]:
+        block = len(self.checkpoints)
+        checkpoint = {
+            "block": block,
+            "first_seq": block * self.block_size,
+            "last_seq": (block + 1) * self.block_size - 1,
+            "merkle_root": merkle_root(self._block_leaves[:self.block_size]).hex(),
+            "last_audit_hash": self._last_block_hash,
+            "log_offset": self._offset,
+            "previous_signature": self.checkpoints[-1]["signature"] if self.checkpoints else None,
+        }
+        checkpoint["signature"] = sign(self.signing_key, _checkpoint_message(checkpoint))
+        self.checkpoints.append(checkpoint)
+        del self._block_leaves[:self.block_size]
+        return checkpoint
+
+    def _record_entry(self, record: Any) -> Dict[str, Any]:
+        if isinstance(record, dict):
+            entry = {field: record.get(field) for field in RECORD_FIELDS}
+        else:
+            entry = {field: getattr(record, field, None) for field in RECORD_FIELDS}
+            validation = getattr(record, "validation_result", None)
+            if validation is not None:
+                entry["validation_status"] = validation.validation_status.value
+                entry["security_score"] = validation.security_score
+        if hasattr(entry["timestamp"], "isoformat"):
+            entry["timestamp"] = entry["timestamp"].isoformat()
+        return entry
+
+    # === LOADING ===
+
+    def _load(self):
+        """Trust the signed checkpoint chain, then replay only the records after the last checkpoint"""
+        self._checkpoint_log.seek(0)
+        for raw in self._checkpoint_log.read().splitlines():
+            checkpoint = json.loads(raw)
+            if not self._checkpoint_valid(checkpoint, self.checkpoints[-1] if self.checkpoints else None):
+                raise ValueError(f"Audit checkpoint {checkpoint.get('block')} failed signature verification")
+            self.checkpoints.append(checkpoint)
+
+        last = self.checkpoints[-1] if self.checkpoints else None
+        self._offset = last["log_offset"] if last else 0
+        self._committed_count = last["last_seq"] + 1 if last else 0
+        self.head_hash = last["last_audit_hash"] if last else None
+        self._index_complete = last is None
+
+        self._log.seek(0, os.SEEK_END)
+        size = self._log.tell()
+        self._log.seek(self._offset)
+        tail = self._log.read()
+        if tail and not tail.endswith(b"\n"):
+            # Torn write from a crash: drop the partial record
+            keep = tail.rfind(b"\n") + 1
+            logger.warning(f"⚠️ Truncating {len(tail) - keep} bytes of partial audit record")
+            self._log.truncate(self._offset + keep)
+            tail = tail[:keep]
+        missing_checkpoints = []
+        for line in tail.splitlines(keepends=True):
+            entry = json.loads(line)
+            # Blocks completed by a run that stopped before checkpointing them are checkpointed now
+            missing_checkpoints.extend(self._commit_line(line, entry))
+            self.head_hash = entry["audit_hash"]
+            self._index[entry["audit_id"]] = entry["seq"]
+        self.record_count = self._committed_count
+        if missing_checkpoints:
+            logger.warning(f"⚠️ Writing {len(missing_checkpoints)} missing audit checkpoints")
+            self._write_checkpoints(missing_checkpoints)
+        logger.info(f"📜 Audit chain loaded: {self.record_count} records, {len(self.checkpoints)} checkpoints ({size} bytes)")
+
+    def _checkpoint_valid(self, checkpoint: Dict[str, Any], previous: Optional[Dict[str, Any]]) -> bool:
+        expected = sign(self.signing_key, _checkpoint_message(checkpoint))
+        if not hmac.compare_digest(expected, checkpoint.get("signature", "")):
+            return False
+        return checkpoint.get("previous_signature") == (previous["signature"] if previous else None)
+
+    # === VERIFICATION ===
+
+    def _read_lines(self, start: int, end: Optional[int] = None) -> List[bytes]:
+        with self._write_lock:
+            self._log.seek(start)
+            data = self._log.read() if end is None else self._log.read(end - start)
+        return data.splitlines()
+
+    def _verify_records(self, lines: List[bytes], previous_hash: Optional[str], first_seq: int) -> Optional[str]:
+        """Check hash, signature, linkage and sequence; returns the last hash or raises ValueError"""
+        for offset, raw in enumerate(lines):
+            entry = json.loads(raw)
+            if entry.get("seq") != first_seq + offset:
+                raise ValueError(f"sequence gap at record {first_seq + offset}")
+            if entry["previous_audit_hash"] != previous_hash:
+                raise ValueError(f"broken link at record {entry['seq']}")
+            expected = compute_audit_hash(entry["audit_id"], entry["action_id"], entry["agent_id"],
+                                          entry["execution_status"], entry["duration_ms"], previous_hash)
+            if entry["audit_hash"] != expected:
+                raise ValueError(f"hash mismatch at record {entry['seq']}")
+            if not hmac.compare_digest(sign(self.signing_key, expected), entry.get("digital_signature") or ""):
+                raise ValueError(f"signature mismatch at record {entry['seq']}")
+            previous_hash = expected
+        return previous_hash
+
+    def verify(self, full: bool = False) -> Dict[str, Any]:
+        """
+        Verify the chain. By default only the checkpoint signatures and the records
+        after the last checkpoint are checked; `full=True` also recomputes every
+        block's Merkle root and record hashes from the log.
+        """
+        try:
+            previous = None
+            for checkpoint in self.checkpoints:
+                if not self._checkpoint_valid(checkpoint, previous):
+                    raise ValueError(f"checkpoint {checkpoint['block']} signature invalid")
+                previous = checkpoint
+
+            blocks_verified = 0
+            if full:
+                start, previous_hash = 0, None
+                for checkpoint in self.checkpoints:
+                    lines = self._read_lines(start, checkpoint["log_offset"])
+                    previous_hash = self._verify_records(lines, previous_hash, checkpoint["first_seq"])
+                    leaves = [_leaf_hash(json.loads(raw)["audit_hash"]) for raw in lines]
+                    if len(leaves) != self.block_size or merkle_root(leaves).hex() != checkpoint["merkle_root"]:
+                        raise ValueError(f"Merkle root mismatch in block {checkpoint['block']}")
+                    start = checkpoint["log_offset"]
+                    blocks_verified += 1
+
+            last = self.checkpoints[-1] if self.checkpoints else None
+            tail = self._read_lines(last["log_offset"] if last else 0)
+            self._verify_records(tail, last["last_audit_hash"] if last else None,
+                                 last["last_seq"] + 1 if last else 0)
+            return {
+                "valid": True,
+                "checkpoints": len(self.checkpoints),
+                "blocks_verified": blocks_verified,
+                "tail_records_verified": len(tail),
+            }
+        except (ValueError, KeyError, json.JSONDecodeError) as e:
+            logger.error(f"❌ Audit chain verification failed: {e}")
+            return {"valid": False, "error": str(e)}
+
+    # === INCLUSION PROOFS ===
+
+    def _lookup_seq(self, audit_id: str) -> Optional[int]:
+        if audit_id not in self._index and not self._index_complete:
+            # Records from earlier runs are indexed on first lookup
+            for raw in self._read_lines(0):
+                entry = json.loads(raw)
+                self._index.setdefault(entry["audit_id"], entry["seq"])
+            self._index_complete = True
+        return self._index.get(audit_id)
+
+    def get_inclusion_proof(self, audit_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Proof that a record is part of a checkpointed block: the record, its
+        Merkle path and the signed checkpoint. Returns None if the record is
+        unknown or its block has not been checkpointed yet.
+        """
+        seq = self._lookup_seq(audit_id)
+        if seq is None:
+            return None
+        block = seq // self.block_size
+        if block >= len(self.checkpoints):
+            return None
+        checkpoint = self.checkpoints[block]
+        start = self.checkpoints[block - 1]["log_offset"] if block else 0
+        lines = self._read_lines(start, checkpoint["log_offset"])
+        position = seq - checkpoint["first_seq"]
+        leaves = [_leaf_hash(json.loads(raw)["audit_hash"]) for raw in lines]
+        return {
+            "record": json.loads(lines[position]),
+            "leaf_index": position,
+            "path": merkle_path(leaves, position),
+            "checkpoint": checkpoint,
+        }
+
+    def verify_inclusion_proof(self, proof: Dict[str, Any]) -> bool:
+        """Check a proof against the record contents and the checkpoint signature"""
+        try:
+            record, checkpoint = proof["record"], proof["checkpoint"]
+            expected_hash = compute_audit_hash(record["audit_id"], record["action_id"], record["agent_id"],
+                                               record["execution_status"], record["duration_ms"],
+                                               record["previous_audit_hash"])
+            if expected_hash != record["audit_hash"]:
+                return False
+            node = _leaf_hash(expected_hash)
+            for side, sibling in proof["path"]:
+                node = _node_hash(bytes.fromhex(sibling), node) if side == "left" else _node_hash(node, bytes.fromhex(sibling))
+            if node.hex() != checkpoint["merkle_root"]:
+                return False
+            expected_signature = sign(self.signing_key, _checkpoint_message(checkpoint))
+            return hmac.compare_digest(expected_signature, checkpoint["signature"])
+        except (KeyError, ValueError, TypeError):
+            return False
+
+    def close(self):
+        self._log.close()
+        self._checkpoint_log.close()
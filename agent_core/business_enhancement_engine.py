@@ -18,7 +18,7 @@ import os
 import re
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Tuple
+from typing import AsyncIterator, Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass, asdict
 from enum import Enum
 import logging
@@ -28,17 +28,15 @@ from .intelligent_vault_agent import IntelligentVaultAgent
 from .production_vault_integration import ProductionVaultIntegration
 from .secret_lifecycle_engine import SecretRiskLevel, SecretLifecycleState
 from .simple_memory_system import MemoryType
+from .scan_cache import DEFAULT_CACHE_PATH, ScanCache
+from .secret_discovery import (
+    BusinessImpactLevel, SecretDiscoveryResult, SecretDiscoveryScanner,
+    calculate_secret_confidence, assess_secret_business_impact,
+    generate_secret_recommendation, identify_risk_factors, flatten_patterns, scan_content
+)
 
 logger = logging.getLogger(__name__)
 
-class BusinessImpactLevel(Enum):
-    """Business impact classification"""
-    CRITICAL = "critical"
-    HIGH = "high"
-    MEDIUM = "medium"
-    LOW = "low"
-    MINIMAL = "minimal"
-
 class ComplianceFramework(Enum):
     """Supported compliance frameworks"""
     SOC2 = "soc2"
@@ -58,16 +56,6 @@ class BusinessMetrics:
     efficiency_gain_percentage: float
     security_incidents_prevented: int
 
-@dataclass
-class SecretDiscoveryResult:
-    """Result of automated secret discovery"""
-    location: str
-    secret_type: str
-    confidence_score: float
-    business_impact: BusinessImpactLevel
-    recommended_action: str
-    risk_factors: List[str]
-
 class BusinessEnhancementEngine:
     """
     💼 BUSINESS ENHANCEMENT ENGINE
@@ -83,7 +71,9 @@ class BusinessEnhancementEngine:
     """
     
     def __init__(self, vault_agent: IntelligentVaultAgent, 
-                 production_integration: ProductionVaultIntegration = None):
+                 production_integration: ProductionVaultIntegration = None,
+                 scan_workers: Optional[int] = None,
+                 scan_cache_path: Optional[str] = str(DEFAULT_CACHE_PATH)):
         """Initialize business enhancement engine"""
         self.vault_agent = vault_agent
         self.production_integration = production_integration
@@ -122,6 +112,11 @@ class BusinessEnhancementEngine:
             ]
         }
         
+        # Parallel scanner over the discovery patterns; unchanged files come from the scan cache
+        self.scan_cache = ScanCache(scan_cache_path, namespace="secret_discovery") if scan_cache_path else None
+        self.secret_scanner = SecretDiscoveryScanner(self.secret_patterns, max_workers=scan_workers,
+                                                     cache=self.scan_cache)
+        
         # Business cost models (example values)
         self.cost_models = {
             "security_incident_cost": 50000,  # Average cost per incident
@@ -133,6 +128,11 @@ class BusinessEnhancementEngine:
         
         logger.info("💼 Business Enhancement Engine initialized")
     
+    async def stream_hardcoded_secrets(self, scan_paths: List[str]) -> AsyncIterator[SecretDiscoveryResult]:
+        """Stream secrets from a parallel scan as batches complete; stats in self.secret_scanner.stats"""
+        async for secret in self.secret_scanner.scan_async(scan_paths):
+            yield secret
+    
     async def discover_hardcoded_secrets(self, scan_paths: List[str] = None) -> Dict[str, Any]:
         """Discover hardcoded secrets in codebase and configuration files"""
         logger.info("🔍 Starting automated secret discovery scan...")
@@ -145,37 +145,25 @@ class BusinessEnhancementEngine:
             "paths_scanned": [],
             "secrets_found": [],
             "total_files_scanned": 0,
+            "total_bytes_scanned": 0,
+            "files_from_cache": 0,
             "high_risk_secrets": 0,
             "business_impact_summary": {},
             "recommended_actions": []
         }
         
         try:
-            for scan_path in scan_paths:
-                path_obj = Path(scan_path)
-                if not path_obj.exists():
-                    continue
-                
-                discovery_results["paths_scanned"].append(str(path_obj))
-                
-                # Scan files in path
-                for file_path in self._get_scannable_files(path_obj):
-                    discovery_results["total_files_scanned"] += 1
-                    
-                    try:
-                        content = file_path.read_text(encoding='utf-8', errors='ignore')
-                        
-                        # Scan for secret patterns
-                        file_secrets = self._scan_file_for_secrets(file_path, content)
-                        discovery_results["secrets_found"].extend(file_secrets)
-                        
-                        # Count high-risk secrets
-                        high_risk_count = sum(1 for secret in file_secrets 
-                                            if secret.business_impact in [BusinessImpactLevel.CRITICAL, BusinessImpactLevel.HIGH])
-                        discovery_results["high_risk_secrets"] += high_risk_count
-                        
-                    except Exception as e:
-                        logger.warning(f"Failed to scan file {file_path}: {e}")
+            discovery_results["paths_scanned"] = [str(Path(p)) for p in scan_paths if Path(p).exists()]
+            
+            async for secret in self.stream_hardcoded_secrets(discovery_results["paths_scanned"]):
+                discovery_results["secrets_found"].append(secret)
+                if secret.business_impact in [BusinessImpactLevel.CRITICAL, BusinessImpactLevel.HIGH]:
+                    discovery_results["high_risk_secrets"] += 1
+            
+            scan_stats = self.secret_scanner.stats
+            discovery_results["total_files_scanned"] = scan_stats["files_scanned"]
+            discovery_results["total_bytes_scanned"] = scan_stats["bytes_scanned"]
+            discovery_results["files_from_cache"] = scan_stats["files_cached"]
             
             # Analyze business impact
             discovery_results["business_impact_summary"] = self._analyze_discovery_business_impact(
@@ -430,139 +418,27 @@ class BusinessEnhancementEngine:
     # Internal helper methods
     def _get_scannable_files(self, path: Path) -> List[Path]:
         """Get list of files that should be scanned for secrets"""
-        scannable_extensions = {
-            '.py', '.js', '.ts', '.java', '.cs', '.cpp', '.c', '.h',
-            '.yaml', '.yml', '.json', '.xml', '.ini', '.cfg', '.conf',
-            '.sh', '.bat', '.ps1', '.sql', '.env', '.properties'
-        }
-        
-        scannable_files = []
-        
-        if path.is_file():
-            if path.suffix.lower() in scannable_extensions:
-                scannable_files.append(path)
-        else:
-            for file_path in path.rglob('*'):
-                if (file_path.is_file() and 
-                    file_path.suffix.lower() in scannable_extensions and
-                    not any(part.startswith('.') for part in file_path.parts) and
-                    'node_modules' not in file_path.parts):
-                    scannable_files.append(file_path)
-        
-        return scannable_files[:1000]  # Limit to prevent excessive scanning
+        return [Path(file_path) for file_path, _ in self.secret_scanner.iter_files([str(path)])]
     
     def _scan_file_for_secrets(self, file_path: Path, content: str) -> List[SecretDiscoveryResult]:
         """Scan a single file for potential secrets"""
-        secrets_found = []
-        
-        for secret_type, patterns in self.secret_patterns.items():
-            for pattern in patterns:
-                matches = re.finditer(pattern, content, re.MULTILINE)
-                
-                for match in matches:
-                    # Calculate confidence based on context
-                    confidence = self._calculate_secret_confidence(match, content, secret_type)
-                    
-                    if confidence > 0.3:  # Only report if confidence > 30%
-                        # Assess business impact
-                        business_impact = self._assess_secret_business_impact(file_path, secret_type)
-                        
-                        # Generate recommendations
-                        recommendation = self._generate_secret_recommendation(secret_type, business_impact)
-                        
-                        # Identify risk factors
-                        risk_factors = self._identify_risk_factors(file_path, secret_type, match)
-                        
-                        secret = SecretDiscoveryResult(
-                            location=f"{file_path}:{match.start()}",
-                            secret_type=secret_type,
-                            confidence_score=confidence,
-                            business_impact=business_impact,
-                            recommended_action=recommendation,
-                            risk_factors=risk_factors
-                        )
-                        
-                        secrets_found.append(secret)
-        
-        return secrets_found
+        return scan_content(file_path, content, flatten_patterns(self.secret_patterns))
     
     def _calculate_secret_confidence(self, match: re.Match, content: str, secret_type: str) -> float:
         """Calculate confidence score for detected secret"""
-        confidence = 0.5  # Base confidence
-        
-        matched_text = match.group(0).lower()
-        
-        # Adjust based on secret type patterns
-        if secret_type == "api_key" and ("api" in matched_text or "key" in matched_text):
-            confidence += 0.2
-        elif secret_type == "password" and ("password" in matched_text or "passwd" in matched_text):
-            confidence += 0.2
-        elif secret_type == "crypto" and ("begin" in matched_text and "end" in matched_text):
-            confidence += 0.3
-        
-        # Check for common false positives
-        if any(word in matched_text for word in ["example", "sample", "test", "dummy", "placeholder"]):
-            confidence -= 0.3
-        
-        # Check if it looks like a real secret (entropy, length)
-        secret_value = match.group(1) if match.groups() else match.group(0)
-        if len(secret_value) > 20 and len(set(secret_value)) > 10:
-            confidence += 0.2
-        
-        return max(0.0, min(1.0, confidence))
+        return calculate_secret_confidence(match, content, secret_type)
     
     def _assess_secret_business_impact(self, file_path: Path, secret_type: str) -> BusinessImpactLevel:
         """Assess business impact of discovered secret"""
-        path_str = str(file_path).lower()
-        
-        # High impact patterns
-        if any(pattern in path_str for pattern in ["prod", "production", "live", "master"]):
-            if secret_type in ["database", "api_key", "crypto"]:
-                return BusinessImpactLevel.CRITICAL
-            else:
-                return BusinessImpactLevel.HIGH
-        
-        # Medium impact patterns
-        elif any(pattern in path_str for pattern in ["staging", "stage", "config"]):
-            return BusinessImpactLevel.MEDIUM
-        
-        # Development/test impact
-        elif any(pattern in path_str for pattern in ["dev", "test", "demo"]):
-            return BusinessImpactLevel.LOW
-        
-        # Default assessment based on secret type
-        if secret_type in ["database", "crypto"]:
-            return BusinessImpactLevel.HIGH
-        elif secret_type in ["api_key", "secret"]:
-            return BusinessImpactLevel.MEDIUM
-        else:
-            return BusinessImpactLevel.LOW
+        return assess_secret_business_impact(file_path, secret_type)
     
     def _generate_secret_recommendation(self, secret_type: str, business_impact: BusinessImpactLevel) -> str:
         """Generate recommendation for discovered secret"""
-        if business_impact in [BusinessImpactLevel.CRITICAL, BusinessImpactLevel.HIGH]:
-            return f"URGENT: Move {secret_type} to secure vault immediately"
-        elif business_impact == BusinessImpactLevel.MEDIUM:
-            return f"Move {secret_type} to vault and update references"
-        else:
-            return f"Consider moving {secret_type} to vault for best practices"
+        return generate_secret_recommendation(secret_type, business_impact)
     
     def _identify_risk_factors(self, file_path: Path, secret_type: str, match: re.Match) -> List[str]:
         """Identify risk factors for discovered secret"""
-        risk_factors = []
-        
-        path_str = str(file_path).lower()
-        
-        if "prod" in path_str:
-            risk_factors.append("Production environment")
-        if file_path.suffix in ['.js', '.py', '.java']:
-            risk_factors.append("Source code exposure")
-        if any(word in path_str for word in ["config", "env"]):
-            risk_factors.append("Configuration file")
-        if secret_type in ["database", "crypto"]:
-            risk_factors.append("High-value secret type")
-        
-        return risk_factors
+        return identify_risk_factors(file_path, secret_type, match)
     
     def _analyze_discovery_business_impact(self, secrets: List[SecretDiscoveryResult]) -> Dict[str, Any]:
         """Analyze business impact of discovered secrets"""
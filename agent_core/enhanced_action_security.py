@@ -17,8 +17,6 @@ import asyncio
 import json
 import logging
 import time
-import hashlib
-import hmac
 import secrets
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
@@ -32,6 +30,10 @@ from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 import base64
 
+from .action_rate_limiter import ActionRateLimiter
+from .audit_chain_log import AuditChainLog, compute_audit_hash, sign
+from .security_event_buffer import SecurityEventBuffer, SecurityEventCategory
+
 logger = logging.getLogger(__name__)
 
 class ActionSeverity(Enum):
@@ -133,14 +135,28 @@ class EnhancedActionSecurity:
         self.fernet = Fernet(self.encryption_key)
         
         # Security state
-        self.action_rate_limiter: Dict[str, List[datetime]] = {}
+        self.action_rate_limiter = ActionRateLimiter({
+            "max_action_rate": self.max_action_rate_per_minute,
+            **self.security_config.get("rate_limits", {})
+        })
         self.active_validations: Dict[str, SecurityValidationResult] = {}
-        self.audit_chain: List[ActionAuditRecord] = []
+        self.audit_chain: List[ActionAuditRecord] = []  # Records from this session
+        if self.security_config.get("audit_log_dir") and "signing_key" not in self.security_config:
+            # A generated key would not verify the persisted checkpoints after a restart
+            raise ValueError("audit_log_dir requires a stable signing_key in the security config")
+        self.audit_log = AuditChainLog(
+            self.signing_key,
+            directory=self.security_config.get("audit_log_dir"),
+            block_size=self.security_config.get("audit_checkpoint_interval", 256),
+            fsync=self.security_config.get("audit_fsync", True)
+        )
         self.threat_indicators: Dict[str, Any] = {}
         self.blocked_agents: Set[str] = set()
         
         # Real-time monitoring
-        self.security_events: List[Dict[str, Any]] = []
+        self.security_events = SecurityEventBuffer(
+            capacity=self.security_config.get("security_event_capacity", 1000)
+        )
         self.anomaly_detector = ActionAnomalyDetector()
         
         logger.info("🛡️ Enhanced Action Security initialized with zero-trust mode")
@@ -297,8 +313,9 @@ class EnhancedActionSecurity:
                 context, validation_result, execution_result, execution_status, execution_start
             )
             
-            # Add to audit chain
+            # Add to audit chain (group-committed to the persistent log)
             self.audit_chain.append(audit_record)
+            await self.audit_log.append(audit_record)
             
             # Log security event
             await self._log_security_event("action_executed", {
@@ -334,10 +351,7 @@ class EnhancedActionSecurity:
         successful_actions = len([a for a in recent_actions if a.execution_status == "success"])
         total_recent_actions = len(recent_actions)
         
-        security_events_last_hour = len([
-            event for event in self.security_events
-            if (current_time - datetime.fromisoformat(event["timestamp"])).total_seconds() < 3600
-        ])
+        security_events_last_hour = self.security_events.count_recent(seconds=3600)
         
         # Threat level assessment
         current_threat_level = await self._assess_current_threat_level()
@@ -352,7 +366,7 @@ class EnhancedActionSecurity:
             },
             
             "action_metrics": {
-                "total_actions_audited": len(self.audit_chain),
+                "total_actions_audited": self.audit_log.record_count,
                 "recent_actions_1h": total_recent_actions,
                 "successful_actions_1h": successful_actions,
                 "success_rate_1h": successful_actions / max(1, total_recent_actions),
@@ -362,12 +376,17 @@ class EnhancedActionSecurity:
             "security_events": {
                 "total_events": len(self.security_events),
                 "events_last_hour": security_events_last_hour,
-                "threat_detections": len([e for e in self.security_events if e.get("type") == "threat_detected"]),
-                "validation_failures": len([e for e in self.security_events if e.get("type") == "validation_failed"])
+                "threat_detections": self.security_events.retained_count("threat_detected"),
+                "validation_failures": self.security_events.retained_count("validation_failed"),
+                "per_minute_last_15m": {
+                    category.value: self.security_events.per_minute(category, 15)
+                    for category in (SecurityEventCategory.THREAT, SecurityEventCategory.VALIDATION)
+                }
             },
             
             "compliance_status": {
                 "audit_trail_integrity": await self._verify_audit_chain_integrity(),
+                "audit_checkpoints": len(self.audit_log.checkpoints),
                 "encryption_status": "active",
                 "mfa_compliance": self.mfa_required_for_critical,
                 "coe_compliance": self.coe_required_for_emergency
@@ -412,35 +431,20 @@ class EnhancedActionSecurity:
             return {"verified": False, "error": str(e)}
     
     async def _check_rate_limits(self, context: ActionSecurityContext) -> Dict[str, Any]:
-        """Check action rate limits for agent"""
+        """Check action rate limits for agent, action type and severity"""
         try:
+            decision = self.action_rate_limiter.check(
+                context.agent_id, context.action_type, context.severity.value
+            )
             current_time = datetime.now(timezone.utc)
-            agent_id = context.agent_id
-            
-            # Get recent actions for this agent
-            if agent_id not in self.action_rate_limiter:
-                self.action_rate_limiter[agent_id] = []
-            
-            recent_actions = self.action_rate_limiter[agent_id]
-            
-            # Remove actions older than 1 minute
-            cutoff_time = current_time - timedelta(minutes=1)
-            recent_actions = [t for t in recent_actions if t > cutoff_time]
-            self.action_rate_limiter[agent_id] = recent_actions
-            
-            # Check if under rate limit
-            action_count = len(recent_actions)
-            allowed = action_count < self.max_action_rate_per_minute
-            
-            if allowed:
-                # Add current action to rate limiter
-                self.action_rate_limiter[agent_id].append(current_time)
             
             return {
-                "allowed": allowed,
-                "current_rate": action_count,
-                "max_rate": self.max_action_rate_per_minute,
-                "reset_time": (current_time + timedelta(minutes=1)).isoformat()
+                "allowed": decision.allowed,
+                "current_rate": int(decision.current),
+                "max_rate": decision.limit,
+                "limit_key": decision.key,
+                "retry_after_seconds": round(decision.retry_after, 3),
+                "reset_time": (current_time + timedelta(seconds=decision.reset_after)).isoformat()
             }
         except Exception as e:
             return {"allowed": False, "error": str(e)}
@@ -725,8 +729,8 @@ class EnhancedActionSecurity:
         audit_id = f"audit_{int(time.time() * 1000)}_{secrets.token_hex(8)}"
         execution_duration = (time.time() - execution_start) * 1000
         
-        # Get hash of previous audit record
-        previous_hash = self.audit_chain[-1].audit_hash if self.audit_chain else None
+        # Get hash of previous audit record (survives restarts via the audit log)
+        previous_hash = self.audit_log.head_hash
         
         # Create audit record
         audit_record = ActionAuditRecord(
@@ -745,46 +749,26 @@ class EnhancedActionSecurity:
         )
         
         # Calculate audit hash
-        audit_content = f"{audit_id}{context.action_id}{context.agent_id}{execution_status}{execution_duration}{previous_hash or ''}"
-        audit_hash = hashlib.sha256(audit_content.encode()).hexdigest()
+        audit_hash = compute_audit_hash(
+            audit_id, context.action_id, context.agent_id, execution_status, execution_duration, previous_hash
+        )
         audit_record.audit_hash = audit_hash
         
         # Digital signature
-        signature = hmac.new(
-            self.signing_key.encode(),
-            audit_hash.encode(),
-            hashlib.sha256
-        ).hexdigest()
-        audit_record.digital_signature = signature
+        audit_record.digital_signature = sign(self.signing_key, audit_hash)
         
         return audit_record
     
     async def _log_security_event(self, event_type: str, event_data: Dict[str, Any]):
-        """Log security event"""
-        security_event = {
-            "event_id": f"event_{int(time.time() * 1000)}",
-            "type": event_type,
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-            "data": event_data
-        }
-        
-        self.security_events.append(security_event)
-        
-        # Keep only last 1000 events
-        if len(self.security_events) > 1000:
-            self.security_events = self.security_events[-1000:]
+        """Log security event (the ring buffer keeps the last `security_event_capacity`)"""
+        self.security_events.record(event_type, event_data)
     
     async def _assess_current_threat_level(self) -> ThreatLevel:
         """Assess current overall threat level"""
         try:
-            # Count recent security events
-            recent_events = [
-                event for event in self.security_events
-                if (datetime.now(timezone.utc) - datetime.fromisoformat(event["timestamp"])).total_seconds() < 3600
-            ]
-            
-            threat_events = len([e for e in recent_events if "threat" in e.get("type", "")])
-            validation_failures = len([e for e in recent_events if "validation" in e.get("type", "")])
+            # Count recent security events from the per-minute counters
+            threat_events = self.security_events.count_recent(SecurityEventCategory.THREAT, 3600)
+            validation_failures = self.security_events.count_recent(SecurityEventCategory.VALIDATION, 3600)
             
             if threat_events > 10 or validation_failures > 20:
                 return ThreatLevel.CRITICAL
@@ -809,39 +793,20 @@ class EnhancedActionSecurity:
         return round(sum(scores) / len(scores), 3)
     
     async def _verify_audit_chain_integrity(self) -> bool:
-        """Verify integrity of audit chain"""
+        """Verify integrity of audit chain from the last signed checkpoint"""
         try:
-            if not self.audit_chain:
-                return True
-            
-            for i, audit_record in enumerate(self.audit_chain):
-                # Verify hash
-                expected_content = f"{audit_record.audit_id}{audit_record.action_id}{audit_record.agent_id}{audit_record.execution_status}{audit_record.duration_ms}{audit_record.previous_audit_hash or ''}"
-                expected_hash = hashlib.sha256(expected_content.encode()).hexdigest()
-                
-                if audit_record.audit_hash != expected_hash:
-                    return False
-                
-                # Verify signature
-                expected_signature = hmac.new(
-                    self.signing_key.encode(),
-                    audit_record.audit_hash.encode(),
-                    hashlib.sha256
-                ).hexdigest()
-                
-                if audit_record.digital_signature != expected_signature:
-                    return False
-                
-                # Verify chain linkage
-                if i > 0:
-                    previous_record = self.audit_chain[i-1]
-                    if audit_record.previous_audit_hash != previous_record.audit_hash:
-                        return False
-            
-            return True
+            return self.audit_log.verify()["valid"]
         except Exception as e:
             logger.error(f"❌ Audit chain verification failed: {e}")
             return False
+    
+    def get_audit_inclusion_proof(self, audit_id: str) -> Optional[Dict[str, Any]]:
+        """Merkle proof that an audit record belongs to the chain (None until its block is checkpointed)"""
+        return self.audit_log.get_inclusion_proof(audit_id)
+    
+    def verify_audit_inclusion_proof(self, proof: Dict[str, Any]) -> bool:
+        """Verify a proof returned by get_audit_inclusion_proof"""
+        return self.audit_log.verify_inclusion_proof(proof)
 
 class ActionAnomalyDetector:
     """Detects anomalies in action execution"""
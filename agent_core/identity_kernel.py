@@ -12,17 +12,72 @@ Based on: theplanmermaid/agent_system_architecture.mmd
 Component: IDENTITY["🧬 IDENTITY KERNEL"]
 """
 
+import bisect
+import copy
 import json
 import hashlib
+import os
 from datetime import datetime, timezone
 from typing import Dict, List, Any, Optional, Union
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, fields
 from pathlib import Path
 import logging
 
 # Setup logging
 logger = logging.getLogger(__name__)
 
+# Identity hash format; snapshots written before it carried a hash of the full canonical JSON
+HASH_SCHEME = "merkle-v1"
+MERKLE_BUCKETS = 64
+
+# Sections restored by rollback (anchor traits are immutable)
+ROLLBACK_SECTIONS = ("symbolic_self", "mcp_context")
+
+def _canonical(value: Any) -> bytes:
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), default=str).encode()
+
+class IdentityMerkleMap:
+    """
+    Identity hash over (key, value) leaves such as "mcp_context/<key>".
+
+    Leaves are spread over a fixed number of buckets by key hash; changing one
+    key rehashes only its bucket and the bucket hashes, so the root costs
+    O(bucket + MERKLE_BUCKETS) per update instead of the whole identity.
+    """
+    
+    def __init__(self):
+        self._buckets: List[Dict[str, bytes]] = [{} for _ in range(MERKLE_BUCKETS)]
+        self._bucket_hashes: List[bytes] = [hashlib.sha256(b"\x01").digest()] * MERKLE_BUCKETS
+        self._dirty: set = set()
+        self._root: Optional[str] = None
+    
+    @staticmethod
+    def _bucket(key: str) -> int:
+        return hashlib.sha256(key.encode()).digest()[0] % MERKLE_BUCKETS
+    
+    def set(self, key: str, value: Any):
+        bucket = self._bucket(key)
+        self._buckets[bucket][key] = hashlib.sha256(b"\x00" + key.encode() + b"\x00" + _canonical(value)).digest()
+        self._dirty.add(bucket)
+        self._root = None
+    
+    def delete(self, key: str):
+        bucket = self._bucket(key)
+        if self._buckets[bucket].pop(key, None) is not None:
+            self._dirty.add(bucket)
+            self._root = None
+    
+    def root(self) -> str:
+        if self._root is None:
+            for bucket in self._dirty:
+                leaves = self._buckets[bucket]
+                self._bucket_hashes[bucket] = hashlib.sha256(
+                    b"\x01" + b"".join(leaves[key] for key in sorted(leaves))
+                ).digest()
+            self._dirty.clear()
+            self._root = hashlib.sha256(b"\x02" + b"".join(self._bucket_hashes)).hexdigest()
+        return self._root
+
 @dataclass
 class MutationRecord:
     """Records a single mutation in agent evolution"""
@@ -33,6 +88,8 @@ class MutationRecord:
     impact_assessment: Dict[str, Any]
     rollback_data: Optional[Dict[str, Any]] = None
     success: bool = True
+    # Changed keys per section: {"keys": [...], "before": {...}, "after": {...}}; absent keys are omitted
+    delta: Optional[Dict[str, Any]] = None
 
 @dataclass
 class AnchorTrait:
@@ -65,12 +122,25 @@ class IdentityKernel:
     - Complete mutation lineage for evolution tracking  
     - MCP protocol context integration
     - Identity validation and integrity checks
+    
+    Persistence: every mutation appends one hash-chained line with its delta to
+    `<identity_store_path>.journal`. Once the journal holds at least
+    `snapshot_interval` entries and has grown as large as the snapshot, the
+    whole identity is compacted into the snapshot at `identity_store_path`
+    and the journal is emptied, so snapshot cost stays proportional to the
+    journal bytes written. With a shared `store` (SharedIdentityStore) the
+    same entries and snapshots are buffered there and written in batches.
     """
     
-    def __init__(self, agent_id: str, identity_store_path: Optional[str] = None):
+    def __init__(self, agent_id: str, identity_store_path: Optional[str] = None,
+                 snapshot_interval: int = 64, max_checkpoints: int = 8, store: Optional[Any] = None):
         """Initialize identity kernel for an agent"""
         self.agent_id = agent_id
+        self.store = store
         self.identity_store_path = identity_store_path or f"vault/identity_{agent_id}.json"
+        self.journal_path = f"{self.identity_store_path}.journal"
+        self.snapshot_interval = snapshot_interval
+        self.max_checkpoints = max_checkpoints
         
         # Core identity components (from mermaid architecture)
         self.anchor_traits: Dict[str, AnchorTrait] = {}
@@ -83,44 +153,77 @@ class IdentityKernel:
         self.created_at: str = datetime.now(timezone.utc).isoformat()
         self.last_validated: Optional[str] = None
         
+        # Journal state
+        self._merkle = IdentityMerkleMap()
+        self._mutation_index: Dict[str, int] = {}
+        self._journal_head: Optional[str] = None     # Hash of the last journal entry
+        self._snapshot_seq = 0                       # Mutations compacted into the snapshot
+        self._snapshot_bytes = 0
+        self._journal_bytes = 0
+        self._checkpoints: Dict[int, Dict[str, Any]] = {}  # seq -> rollback sections after seq mutations
+        self._checkpoint_seqs: List[int] = []
+        self._loading = False
+        
         # Load existing identity or initialize new
         self._load_or_initialize_identity()
+        if self.store is not None:
+            self.store.register(self)
         
         logger.info(f"🧬 Identity Kernel initialized for agent {agent_id}")
     
     def _load_or_initialize_identity(self):
         """Load existing identity or create new one"""
         try:
-            if Path(self.identity_store_path).exists():
-                with open(self.identity_store_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    self._deserialize_identity(data)
-                    logger.info(f"✅ Loaded existing identity for {self.agent_id}")
+            snapshot, journal_lines = self._read_storage()
+            if snapshot is not None:
+                self._snapshot_bytes = len(snapshot)
+                self._deserialize_identity(json.loads(snapshot))
+                self._replay_journal(journal_lines)
+                logger.info(f"✅ Loaded existing identity for {self.agent_id}")
             else:
                 self._initialize_new_identity()
                 logger.info(f"🆕 Initialized new identity for {self.agent_id}")
         except Exception as e:
             logger.error(f"❌ Failed to load identity for {self.agent_id}: {e}")
+            self._reset_state()
             self._initialize_new_identity()
     
+    def _reset_state(self):
+        self.anchor_traits = {}
+        self.mutation_lineage = []
+        self.symbolic_self = None
+        self.mcp_context = {}
+        self._merkle = IdentityMerkleMap()
+        self._mutation_index = {}
+        self._journal_head = None
+        self._snapshot_seq = 0
+        self._snapshot_bytes = 0
+        self._journal_bytes = 0
+        self._checkpoints = {}
+        self._checkpoint_seqs = []
+    
     def _initialize_new_identity(self):
         """Create new identity with basic anchors"""
-        # Establish core anchor traits
-        self.add_anchor_trait(
-            trait_id="agent_id",
-            name="Agent Identifier", 
-            value=self.agent_id,
-            description="Unique identifier for this agent",
-            immutable_reason="Core identity reference - cannot change without losing identity"
-        )
-        
-        self.add_anchor_trait(
-            trait_id="creation_timestamp",
-            name="Creation Timestamp",
-            value=self.created_at,
-            description="When this agent identity was first established",
-            immutable_reason="Historical record - defines identity origin point"
-        )
+        self._loading = True
+        try:
+            # Establish core anchor traits
+            self.add_anchor_trait(
+                trait_id="agent_id",
+                name="Agent Identifier", 
+                value=self.agent_id,
+                description="Unique identifier for this agent",
+                immutable_reason="Core identity reference - cannot change without losing identity"
+            )
+            
+            self.add_anchor_trait(
+                trait_id="creation_timestamp",
+                name="Creation Timestamp",
+                value=self.created_at,
+                description="When this agent identity was first established",
+                immutable_reason="Historical record - defines identity origin point"
+            )
+        finally:
+            self._loading = False
         
         # Initialize symbolic self
         self.symbolic_self = SymbolicSelf(
@@ -141,6 +244,7 @@ class IdentityKernel:
             "communication_endpoints": []
         }
         
+        self._rebuild_merkle()
         self._update_identity_hash()
         self._save_identity()
     
@@ -160,10 +264,10 @@ class IdentityKernel:
             established_at=datetime.now(timezone.utc).isoformat()
         )
         
-        self.anchor_traits[trait_id] = trait
-        self._record_mutation("anchor_trait_add", f"Added anchor trait: {name}")
-        self._update_identity_hash()
-        self._save_identity()
+        delta = {"anchor_traits": {"keys": [trait_id], "before": {}, "after": {trait_id: asdict(trait)}}}
+        self._apply_delta(delta, "after")
+        mutation = self._record_mutation("anchor_trait_add", f"Added anchor trait: {name}", delta=delta)
+        self._commit_mutation(mutation)
         
         logger.info(f"🔒 Added anchor trait: {name}")
         return True
@@ -180,34 +284,44 @@ class IdentityKernel:
             logger.error("❌ Evolution violates anchor traits")
             return False
         
-        # Create rollback data
-        rollback_data = asdict(self.symbolic_self)
+        # Rollback data: previous values of the updated fields only
+        changed = [key for key in updates if hasattr(self.symbolic_self, key)]
+        rollback_data = {key: copy.deepcopy(getattr(self.symbolic_self, key)) for key in changed}
+        delta = {"symbolic_self": {
+            "keys": changed,
+            "before": rollback_data,
+            "after": {key: copy.deepcopy(updates[key]) for key in changed}
+        }}
         
         # Apply updates
-        for key, value in updates.items():
-            if hasattr(self.symbolic_self, key):
-                setattr(self.symbolic_self, key, value)
-                logger.info(f"🔄 Updated symbolic self: {key}")
+        self._apply_delta(delta, "after")
+        for key in changed:
+            logger.info(f"🔄 Updated symbolic self: {key}")
         
         # Record mutation
-        self._record_mutation(
+        mutation = self._record_mutation(
             "symbolic_self_evolution", 
             mutation_description,
-            rollback_data=rollback_data
+            rollback_data=rollback_data,
+            delta=delta
         )
         
-        self._update_identity_hash()
-        self._save_identity()
+        self._commit_mutation(mutation)
         return True
     
     def update_mcp_context(self, context_updates: Dict[str, Any]) -> bool:
         """Update MCP protocol context"""
-        self.mcp_context.update(context_updates)
-        self._record_mutation("mcp_context_update", f"Updated MCP context: {list(context_updates.keys())}")
-        self._update_identity_hash()
-        self._save_identity()
+        keys = list(context_updates)
+        delta = {"mcp_context": {
+            "keys": keys,
+            "before": {key: copy.deepcopy(self.mcp_context[key]) for key in keys if key in self.mcp_context},
+            "after": copy.deepcopy(context_updates)
+        }}
+        self._apply_delta(delta, "after")
+        mutation = self._record_mutation("mcp_context_update", f"Updated MCP context: {keys}", delta=delta)
+        self._commit_mutation(mutation)
         
-        logger.info(f"🔧 Updated MCP context: {list(context_updates.keys())}")
+        logger.info(f"🔧 Updated MCP context: {keys}")
         return True
     
     def _validate_evolution_safety(self, updates: Dict[str, Any]) -> bool:
@@ -228,7 +342,8 @@ class IdentityKernel:
         return True
     
     def _record_mutation(self, mutation_type: str, description: str, 
-                        rollback_data: Optional[Dict[str, Any]] = None):
+                        rollback_data: Optional[Dict[str, Any]] = None,
+                        delta: Optional[Dict[str, Any]] = None) -> MutationRecord:
         """Record a mutation in the lineage"""
         mutation = MutationRecord(
             mutation_id=f"{self.agent_id}_{len(self.mutation_lineage)}_{int(datetime.now(timezone.utc).timestamp())}",
@@ -237,29 +352,69 @@ class IdentityKernel:
             description=description,
             impact_assessment={"identity_hash_changed": True},
             rollback_data=rollback_data,
-            success=True
+            success=True,
+            delta=delta
         )
         
+        self._mutation_index[mutation.mutation_id] = len(self.mutation_lineage)
         self.mutation_lineage.append(mutation)
         logger.info(f"📝 Recorded mutation: {description}")
+        return mutation
+    
+    # === STATE AND HASHING ===
+    
+    def _apply_delta(self, delta: Dict[str, Any], side: str, sections=None):
+        """Apply the "after" (replay) or "before" (rewind) side of a delta"""
+        for section, change in delta.items():
+            if sections is not None and section not in sections:
+                continue
+            values = change[side]
+            for key in change["keys"]:
+                leaf = f"{section}/{key}"
+                if section == "symbolic_self":
+                    setattr(self.symbolic_self, key, copy.deepcopy(values[key]))
+                    self._merkle.set(leaf, values[key])
+                    continue
+                target = self.mcp_context if section == "mcp_context" else self.anchor_traits
+                if key in values:
+                    value = copy.deepcopy(values[key])
+                    target[key] = AnchorTrait(**value) if section == "anchor_traits" else value
+                    self._merkle.set(leaf, values[key])
+                else:
+                    target.pop(key, None)
+                    self._merkle.delete(leaf)
+    
+    def _leaves(self):
+        yield "agent_id", self.agent_id
+        for trait_id, trait in self.anchor_traits.items():
+            yield f"anchor_traits/{trait_id}", asdict(trait)
+        if self.symbolic_self:
+            for key, value in asdict(self.symbolic_self).items():
+                yield f"symbolic_self/{key}", value
+        for key, value in self.mcp_context.items():
+            yield f"mcp_context/{key}", value
+    
+    def _rebuild_merkle(self) -> IdentityMerkleMap:
+        merkle = IdentityMerkleMap()
+        for key, value in self._leaves():
+            merkle.set(key, value)
+        self._merkle = merkle
+        return merkle
     
     def _update_identity_hash(self):
-        """Update identity integrity hash"""
-        # Create canonical representation for hashing
-        canonical_data = {
-            "agent_id": self.agent_id,
-            "anchor_traits": {k: asdict(v) for k, v in self.anchor_traits.items()},
-            "symbolic_self": asdict(self.symbolic_self) if self.symbolic_self else None,
-            "mcp_context": self.mcp_context
-        }
-        
-        canonical_json = json.dumps(canonical_data, sort_keys=True)
-        self.identity_hash = hashlib.sha256(canonical_json.encode()).hexdigest()
+        """Update identity integrity hash from the incrementally maintained Merkle map"""
+        self.identity_hash = self._merkle.root()
         self.last_validated = datetime.now(timezone.utc).isoformat()
     
-    def validate_identity_integrity(self) -> bool:
-        """Validate identity integrity using hash"""
+    def validate_identity_integrity(self, full: bool = True) -> bool:
+        """
+        Validate identity integrity using hash. `full` rebuilds the Merkle map from
+        the current state, catching changes made outside the mutation methods;
+        otherwise the maintained hash is checked against the stored hash.
+        """
         current_hash = self.identity_hash
+        if full:
+            self._rebuild_merkle()
         self._update_identity_hash()
         
         if current_hash != self.identity_hash:
@@ -280,49 +435,116 @@ class IdentityKernel:
             "mutation_count": len(self.mutation_lineage),
             "symbolic_self": asdict(self.symbolic_self) if self.symbolic_self else None,
             "mcp_context": self.mcp_context,
-            "integrity_status": "valid" if self.validate_identity_integrity() else "compromised"
+            "integrity_status": "valid" if self.validate_identity_integrity(full=False) else "compromised"
         }
     
+    # === ROLLBACK ===
+    
     def rollback_to_mutation(self, mutation_id: str) -> bool:
-        """Rollback to a specific mutation point"""
-        # Find the mutation
-        target_mutation = None
-        for mutation in self.mutation_lineage:
-            if mutation.mutation_id == mutation_id:
-                target_mutation = mutation
-                break
+        """
+        Rollback to a specific mutation point: the symbolic self and MCP context
+        are restored to their state just before that mutation. The state is
+        rebuilt from the nearest snapshot checkpoint or by rewinding from the
+        present, whichever passes fewer mutations.
+        """
+        index = self._mutation_index.get(mutation_id)
+        target_mutation = self.mutation_lineage[index] if index is not None else None
         
-        if not target_mutation or not target_mutation.rollback_data:
+        if not target_mutation or not (target_mutation.delta or target_mutation.rollback_data):
             logger.error(f"❌ Cannot rollback to mutation {mutation_id}")
             return False
         
-        # Apply rollback
-        if target_mutation.mutation_type == "symbolic_self_evolution":
-            self.symbolic_self = SymbolicSelf(**target_mutation.rollback_data)
-            
-        # Record rollback as new mutation
-        self._record_mutation(
+        if target_mutation.delta is None:
+            # Record from before the journal: only the full symbolic self was kept
+            target_state = {"symbolic_self": dict(target_mutation.rollback_data),
+                            "mcp_context": copy.deepcopy(self.mcp_context)}
+        else:
+            target_state = self._state_before(index)
+        
+        # Apply rollback and record it as new mutation
+        delta = self._diff_state(self._current_state(), target_state)
+        self._apply_delta(delta, "after")
+        mutation = self._record_mutation(
             "rollback",
-            f"Rolled back to mutation: {mutation_id}"
+            f"Rolled back to mutation: {mutation_id}",
+            delta=delta
         )
-        
-        self._update_identity_hash()
-        self._save_identity()
+        self._commit_mutation(mutation)
         
         logger.info(f"🔄 Rolled back to mutation: {mutation_id}")
         return True
     
+    def _current_state(self) -> Dict[str, Any]:
+        return {
+            "symbolic_self": asdict(self.symbolic_self) if self.symbolic_self else {},
+            "mcp_context": copy.deepcopy(self.mcp_context)
+        }
+    
+    def _state_before(self, index: int) -> Dict[str, Any]:
+        """Rollback sections as they were before mutation_lineage[index]"""
+        position = bisect.bisect_right(self._checkpoint_seqs, index) - 1
+        checkpoint_seq = self._checkpoint_seqs[position] if position >= 0 else None
+        replay = self.mutation_lineage[checkpoint_seq:index] if checkpoint_seq is not None else None
+        
+        if replay is not None and len(replay) < len(self.mutation_lineage) - index \
+                and all(m.delta is not None for m in replay):
+            state = copy.deepcopy(self._checkpoints[checkpoint_seq])
+            for mutation in replay:
+                self._apply_delta_to_state(state, mutation.delta, "after")
+            return state
+        
+        state = self._current_state()
+        for mutation in reversed(self.mutation_lineage[index:]):
+            if mutation.delta is not None:
+                self._apply_delta_to_state(state, mutation.delta, "before")
+            elif mutation.mutation_type == "symbolic_self_evolution" and mutation.rollback_data:
+                state["symbolic_self"] = dict(mutation.rollback_data)
+        return state
+    
+    @staticmethod
+    def _apply_delta_to_state(state: Dict[str, Any], delta: Dict[str, Any], side: str):
+        for section in ROLLBACK_SECTIONS:
+            change = delta.get(section)
+            if not change:
+                continue
+            for key in change["keys"]:
+                if key in change[side]:
+                    state[section][key] = copy.deepcopy(change[side][key])
+                else:
+                    state[section].pop(key, None)
+    
+    @staticmethod
+    def _diff_state(current: Dict[str, Any], target: Dict[str, Any]) -> Dict[str, Any]:
+        delta = {}
+        for section in ROLLBACK_SECTIONS:
+            before, after = current[section], target[section]
+            keys = [key for key in sorted(set(before) | set(after))
+                    if key not in before or key not in after or before[key] != after[key]]
+            if keys:
+                delta[section] = {
+                    "keys": keys,
+                    "before": {key: before[key] for key in keys if key in before},
+                    "after": {key: copy.deepcopy(after[key]) for key in keys if key in after}
+                }
+        return delta
+    
+    # === PERSISTENCE ===
+    
     def _serialize_identity(self) -> Dict[str, Any]:
         """Serialize identity for storage"""
         return {
             "agent_id": self.agent_id,
             "identity_hash": self.identity_hash,
+            "hash_scheme": HASH_SCHEME,
             "created_at": self.created_at,
             "last_validated": self.last_validated,
             "anchor_traits": {k: asdict(v) for k, v in self.anchor_traits.items()},
             "mutation_lineage": [asdict(m) for m in self.mutation_lineage],
             "symbolic_self": asdict(self.symbolic_self) if self.symbolic_self else None,
-            "mcp_context": self.mcp_context
+            "mcp_context": self.mcp_context,
+            "journal_seq": len(self.mutation_lineage),
+            "journal_head": self._journal_head,
+            "checkpoints": {str(seq): state for seq, state in self._checkpoints.items()}
         }
     
     def _deserialize_identity(self, data: Dict[str, Any]):
@@ -337,6 +559,7 @@ class IdentityKernel:
         
         # Deserialize mutation lineage
         for mutation_data in data.get("mutation_lineage", []):
+            self._mutation_index[mutation_data["mutation_id"]] = len(self.mutation_lineage)
             self.mutation_lineage.append(MutationRecord(**mutation_data))
         
         # Deserialize symbolic self
@@ -346,20 +569,172 @@ class IdentityKernel:
         
         # Deserialize MCP context
         self.mcp_context = data.get("mcp_context", {})
+        
+        # Journal position and rollback checkpoints
+        self._snapshot_seq = data.get("journal_seq", len(self.mutation_lineage))
+        self._journal_head = data.get("journal_head")
+        self._checkpoints = {int(seq): state for seq, state in data.get("checkpoints", {}).items()}
+        self._checkpoint_seqs = sorted(self._checkpoints)
+        
+        self._rebuild_merkle()
+        if data.get("hash_scheme") != HASH_SCHEME:
+            # Snapshot from before the journal: adopt the new hash format
+            logger.info(f"🔄 Migrating identity hash for {self.agent_id} to {HASH_SCHEME}")
+            self._update_identity_hash()
+            self._save_identity()
+        elif self._merkle.root() != self.identity_hash:
+            # Keep the stored hash so integrity validation reports the mismatch
+            logger.error(f"❌ Identity snapshot hash mismatch for {self.agent_id}")
+    
+    def _journal_entry_hash(self, entry: Dict[str, Any]) -> str:
+        body = {k: v for k, v in entry.items() if k != "hash"}
+        return hashlib.sha256((entry.get("prev") or "").encode() + _canonical(body)).hexdigest()
+    
+    def _replay_journal(self, lines: List[bytes]):
+        """Apply journal entries written after the snapshot, stopping at the first broken entry"""
+        valid_bytes = 0
+        for raw in lines:
+            applied = None
+            try:
+                if not raw.endswith(b"\n"):
+                    raise ValueError("partial entry")
+                entry = json.loads(raw)
+                if entry["seq"] < self._snapshot_seq:
+                    # Already compacted into the snapshot (crash between snapshot and truncation)
+                    valid_bytes += len(raw)
+                    continue
+                if entry["seq"] != len(self.mutation_lineage) or entry["prev"] != self._journal_head \
+                        or entry["hash"] != self._journal_entry_hash(entry):
+                    raise ValueError(f"broken chain at entry {entry['seq']}")
+                mutation = MutationRecord(**entry["mutation"])
+                applied = mutation.delta or {}
+                self._apply_delta(applied, "after")
+                if self._merkle.root() != entry["identity_hash"]:
+                    raise ValueError(f"identity hash mismatch at entry {entry['seq']}")
+            except (ValueError, KeyError, TypeError, AttributeError) as e:
+                logger.warning(f"⚠️ Discarding identity journal tail for {self.agent_id}: {e}")
+                if applied is not None:
+                    self._apply_delta(applied, "before")
+                self._rebuild_merkle()
+                break
+            self._mutation_index[mutation.mutation_id] = len(self.mutation_lineage)
+            self.mutation_lineage.append(mutation)
+            self._journal_head = entry["hash"]
+            self.identity_hash = entry["identity_hash"]
+            valid_bytes += len(raw)
+        
+        if valid_bytes < sum(len(raw) for raw in lines):
+            self._discard_journal_tail(valid_bytes)
+        self._journal_bytes = valid_bytes
+        if self._compaction_due():
+            self._save_identity()
+    
+    def _compaction_due(self) -> bool:
+        return len(self.mutation_lineage) - self._snapshot_seq >= self.snapshot_interval \
+            and self._journal_bytes >= self._snapshot_bytes
+    
+    def _commit_mutation(self, mutation: MutationRecord):
+        """Update the identity hash and append the mutation to the journal"""
+        self._update_identity_hash()
+        if self._loading:
+            return
+        
+        entry = {
+            "seq": len(self.mutation_lineage) - 1,
+            "prev": self._journal_head,
+            # Serialized right away, so the record's fields need no deep copy
+            "mutation": {field.name: getattr(mutation, field.name) for field in fields(MutationRecord)},
+            "identity_hash": self.identity_hash
+        }
+        entry["hash"] = self._journal_entry_hash(entry)
+        try:
+            line = (json.dumps(entry, separators=(",", ":"), ensure_ascii=False, default=str) + "\n").encode()
+            self._write_journal_line(entry["seq"], line)
+            self._journal_head = entry["hash"]
+            self._journal_bytes += len(line)
+        except Exception as e:
+            logger.error(f"❌ Failed to journal mutation for {self.agent_id}: {e}")
+            return
+        
+        if self._compaction_due():
+            self._save_identity()
+    
+    def _add_checkpoint(self, seq: int):
+        """Keep rollback sections at `seq`; older checkpoints are thinned to every other one"""
+        self._checkpoints[seq] = self._current_state()
+        bisect.insort(self._checkpoint_seqs, seq)
+        if len(self._checkpoint_seqs) > self.max_checkpoints:
+            older, recent = self._checkpoint_seqs[:-self.max_checkpoints // 2], \
+                self._checkpoint_seqs[-self.max_checkpoints // 2:]
+            for dropped in older[1::2]:
+                del self._checkpoints[dropped]
+            self._checkpoint_seqs = older[::2] + recent
     
     def _save_identity(self):
-        """Save identity to persistent storage"""
+        """Compact the identity into a snapshot and empty the journal"""
         try:
-            # Ensure directory exists
-            Path(self.identity_store_path).parent.mkdir(parents=True, exist_ok=True)
+            seq = len(self.mutation_lineage)
+            if seq not in self._checkpoints:
+                self._add_checkpoint(seq)
             
-            with open(self.identity_store_path, 'w', encoding='utf-8') as f:
-                json.dump(self._serialize_identity(), f, indent=2, ensure_ascii=False)
+            snapshot = json.dumps(self._serialize_identity(), separators=(",", ":"),
+                                  ensure_ascii=False, default=str).encode()
+            self._write_snapshot(seq, snapshot)
+            self._snapshot_bytes = len(snapshot)
+            self._snapshot_seq = seq
+            self._journal_bytes = 0
             
             logger.debug(f"💾 Saved identity for {self.agent_id}")
         except Exception as e:
             logger.error(f"❌ Failed to save identity for {self.agent_id}: {e}")
 
+    # === STORAGE ===
+    
+    def _read_storage(self):
+        """(snapshot bytes or None, journal lines) from the shared store or the identity files"""
+        if self.store is not None:
+            return self.store.load(self.agent_id)
+        if not Path(self.identity_store_path).exists():
+            return None, []
+        with open(self.identity_store_path, 'rb') as f:
+            snapshot = f.read()
+        journal_lines = []
+        if Path(self.journal_path).exists():
+            with open(self.journal_path, 'rb') as f:
+                journal_lines = f.read().splitlines(keepends=True)
+        return snapshot, journal_lines
+    
+    def _write_journal_line(self, seq: int, line: bytes):
+        if self.store is not None:
+            self.store.append(self.agent_id, seq, line)
+            return
+        Path(self.journal_path).parent.mkdir(parents=True, exist_ok=True)
+        with open(self.journal_path, 'ab') as f:
+            f.write(line)
+    
+    def _write_snapshot(self, seq: int, snapshot: bytes):
+        """Replace the snapshot atomically (temp file + rename) and empty the journal"""
+        if self.store is not None:
+            self.store.put_snapshot(self.agent_id, seq, snapshot)
+            return
+        Path(self.identity_store_path).parent.mkdir(parents=True, exist_ok=True)
+        temp_path = f"{self.identity_store_path}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(snapshot)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.identity_store_path)
+        if os.path.exists(self.journal_path):
+            with open(self.journal_path, 'wb'):
+                pass
+    
+    def _discard_journal_tail(self, valid_bytes: int):
+        if self.store is not None:
+            self.store.discard_journal(self.agent_id, len(self.mutation_lineage))
+            return
+        with open(self.journal_path, 'r+b') as f:
+            f.truncate(valid_bytes)
+
 # Factory function for easy creation
 def create_identity_kernel(agent_id: str, **kwargs) -> IdentityKernel:
     """Factory function to create an identity kernel"""
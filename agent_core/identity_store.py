@@ -0,0 +1,241 @@
+"""
+🧬 SHARED IDENTITY STORE - Batched Identity Persistence
+======================================================
+
+One SQLite database holding the snapshots and mutation journals of many
+IdentityKernels:
+- Kernels register with the store and hand it journal entries and snapshots
+  instead of writing their own files
+- Writes are buffered per agent and flushed together in one transaction
+  (when `max_pending` entries are buffered, every `flush_interval` seconds
+  from a background thread, or on `flush()`/`close()`)
+- A snapshot supersedes the agent's buffered and stored journal entries
+  before it, so they are never written or are deleted in the same transaction
+- Identities are loaded lazily by `get_kernel()` on first access
+
+A crash loses at most the mutations buffered since the last flush; every
+agent's stored snapshot and journal always form a consistent prefix.
+"""
+
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .identity_kernel import IdentityKernel
+
+logger = logging.getLogger(__name__)
+
+class SharedIdentityStore:
+    """SQLite-backed identity store shared by many IdentityKernels"""
+
+    def __init__(self, db_path: str, flush_interval: Optional[float] = 0.5, max_pending: int = 4096,
+                 synchronous: str = "NORMAL", kernel_options: Optional[Dict[str, Any]] = None):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.kernel_options = kernel_options or {}
+
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(f"PRAGMA synchronous={synchronous}")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS identity_snapshots (
+                agent_id TEXT PRIMARY KEY,
+                seq INTEGER NOT NULL,
+                snapshot BLOB NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS identity_journal (
+                agent_id TEXT NOT NULL,
+                seq INTEGER NOT NULL,
+                entry BLOB NOT NULL,
+                PRIMARY KEY (agent_id, seq)
+            ) WITHOUT ROWID;
+        """)
+        self._conn.commit()
+
+        self._kernels: Dict[str, IdentityKernel] = {}
+        self._pending_entries: Dict[str, List[Tuple[int, bytes]]] = {}
+        self._pending_snapshots: Dict[str, Tuple[int, bytes]] = {}
+        self._pending_discards: Dict[str, int] = {}
+        self._pending_count = 0
+        self._lock = threading.Lock()           # Guards the pending buffers and kernel registry
+        self._load_lock = threading.Lock()      # One kernel construction per agent
+        self._write_lock = threading.Lock()     # Serializes flushes and reads of the database
+
+        self.stats = {"flushes": 0, "entries_written": 0, "snapshots_written": 0, "entries_coalesced": 0}
+
+        self._closed = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+        if flush_interval:
+            self._flusher = threading.Thread(target=self._flush_loop, name="identity-store-flush", daemon=True)
+            self._flusher.start()
+
+        logger.info(f"🧬 Shared identity store opened at {self.db_path}")
+
+    # === KERNELS ===
+
+    def get_kernel(self, agent_id: str, **kwargs) -> IdentityKernel:
+        """Kernel for an agent, loaded from the store (or created) on first access"""
+        with self._lock:
+            kernel = self._kernels.get(agent_id)
+        if kernel is not None:
+            return kernel
+        with self._load_lock:
+            with self._lock:
+                kernel = self._kernels.get(agent_id)
+            if kernel is None:
+                kernel = IdentityKernel(agent_id, store=self, **dict(self.kernel_options, **kwargs))
+        return kernel
+
+    def register(self, kernel: IdentityKernel):
+        with self._lock:
+            self._kernels[kernel.agent_id] = kernel
+
+    def loaded_agent_ids(self) -> List[str]:
+        with self._lock:
+            return list(self._kernels)
+
+    def agent_ids(self) -> List[str]:
+        """Every agent with a stored or buffered identity, without loading it"""
+        with self._write_lock:
+            stored = [row[0] for row in self._conn.execute("SELECT agent_id FROM identity_snapshots")]
+        with self._lock:
+            buffered = set(self._pending_snapshots) - set(stored)
+        return stored + sorted(buffered)
+
+    # === KERNEL STORAGE INTERFACE ===
+
+    def load(self, agent_id: str) -> Tuple[Optional[bytes], List[bytes]]:
+        """(snapshot, journal lines after it) for an agent, including anything still buffered"""
+        with self._lock:
+            buffered = agent_id in self._pending_snapshots or agent_id in self._pending_entries \
+                or agent_id in self._pending_discards
+        if buffered:
+            self.flush()
+        with self._write_lock:
+            row = self._conn.execute(
+                "SELECT seq, snapshot FROM identity_snapshots WHERE agent_id = ?", (agent_id,)
+            ).fetchone()
+            if row is None:
+                return None, []
+            entries = self._conn.execute(
+                "SELECT entry FROM identity_journal WHERE agent_id = ? AND seq >= ? ORDER BY seq",
+                (agent_id, row[0])
+            ).fetchall()
+        return bytes(row[1]), [bytes(entry) for entry, in entries]
+
+    def append(self, agent_id: str, seq: int, line: bytes):
+        with self._lock:
+            self._pending_entries.setdefault(agent_id, []).append((seq, line))
+            self._pending_count += 1
+            flush_now = self._pending_count >= self.max_pending
+        if flush_now:
+            self.flush()
+
+    def put_snapshot(self, agent_id: str, seq: int, snapshot: bytes):
+        with self._lock:
+            self._pending_snapshots[agent_id] = (seq, snapshot)
+            entries = self._pending_entries.get(agent_id)
+            if entries:
+                kept = [(entry_seq, line) for entry_seq, line in entries if entry_seq >= seq]
+                self.stats["entries_coalesced"] += len(entries) - len(kept)
+                self._pending_count -= len(entries) - len(kept)
+                self._pending_entries[agent_id] = kept
+            self._pending_count += 1
+            flush_now = self._pending_count >= self.max_pending
+        if flush_now:
+            self.flush()
+
+    def discard_journal(self, agent_id: str, from_seq: int):
+        """Drop journal entries from `from_seq` on (a rejected tail found while loading)"""
+        with self._lock:
+            entries = self._pending_entries.get(agent_id)
+            if entries:
+                kept = [(seq, line) for seq, line in entries if seq < from_seq]
+                self._pending_count -= len(entries) - len(kept)
+                self._pending_entries[agent_id] = kept
+            self._pending_discards[agent_id] = min(from_seq, self._pending_discards.get(agent_id, from_seq))
+
+    # === FLUSHING ===
+
+    def flush(self) -> int:
+        """Write all buffered entries and snapshots in one transaction; returns the rows written"""
+        with self._write_lock:
+            with self._lock:
+                entries, self._pending_entries = self._pending_entries, {}
+                snapshots, self._pending_snapshots = self._pending_snapshots, {}
+                discards, self._pending_discards = self._pending_discards, {}
+                self._pending_count = 0
+            if not (entries or snapshots or discards):
+                return 0
+
+            entry_rows = [(agent_id, seq, line) for agent_id, lines in entries.items() for seq, line in lines]
+            try:
+                with self._conn:
+                    self._conn.executemany(
+                        "DELETE FROM identity_journal WHERE agent_id = ? AND seq >= ?", list(discards.items())
+                    )
+                    self._conn.executemany("INSERT OR REPLACE INTO identity_journal VALUES (?, ?, ?)", entry_rows)
+                    self._conn.executemany(
+                        "INSERT OR REPLACE INTO identity_snapshots VALUES (?, ?, ?)",
+                        [(agent_id, seq, snapshot) for agent_id, (seq, snapshot) in snapshots.items()]
+                    )
+                    self._conn.executemany(
+                        "DELETE FROM identity_journal WHERE agent_id = ? AND seq < ?",
+                        [(agent_id, seq) for agent_id, (seq, _) in snapshots.items()]
+                    )
+            except sqlite3.Error as e:
+                logger.error(f"❌ Identity store flush failed: {e}")
+                self._requeue(entries, snapshots, discards)
+                raise
+
+            self.stats["flushes"] += 1
+            self.stats["entries_written"] += len(entry_rows)
+            self.stats["snapshots_written"] += len(snapshots)
+            logger.debug(f"💾 Flushed {len(entry_rows)} journal entries and {len(snapshots)} snapshots")
+            return len(entry_rows) + len(snapshots)
+
+    def _requeue(self, entries, snapshots, discards):
+        """Put a failed batch back in front of anything buffered since"""
+        with self._lock:
+            for agent_id, lines in entries.items():
+                self._pending_entries[agent_id] = lines + self._pending_entries.get(agent_id, [])
+            for agent_id, snapshot in snapshots.items():
+                self._pending_snapshots.setdefault(agent_id, snapshot)
+            for agent_id, seq in discards.items():
+                self._pending_discards[agent_id] = min(seq, self._pending_discards.get(agent_id, seq))
+            self._pending_count = sum(len(lines) for lines in self._pending_entries.values()) \
+                + len(self._pending_snapshots)
+
+    def _flush_loop(self):
+        while not self._closed.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"❌ Background identity flush failed: {e}")
+
+    def close(self):
+        """Flush everything buffered and close the database"""
+        if self._closed.is_set():
+            return
+        self._closed.set()
+        if self._flusher is not None:
+            self._flusher.join()
+        self.flush()
+        with self._write_lock:
+            self._conn.close()
+        logger.info(f"🧬 Shared identity store closed ({self.stats['flushes']} flushes)")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+# Factory function for easy creation
+def create_shared_identity_store(db_path: str, **kwargs) -> SharedIdentityStore:
+    """Factory function to create a shared identity store"""
+    return SharedIdentityStore(db_path, **kwargs)
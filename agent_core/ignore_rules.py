@@ -0,0 +1,192 @@
+"""
+🙈 IGNORE RULES - .gitignore-Style Pruning for Project Walks
+============================================================
+
+Decides which paths of a project the scanners skip:
+- Directories in `always_ignored` (dependency trees, VCS and tool state) are
+  never entered, whatever the ignore files say
+- `.gitignore` files apply to their own directory and below, with git's
+  semantics: blank lines and `#` comments are skipped, `!` re-includes, a
+  trailing `/` matches directories only, a pattern containing a `/` is
+  anchored to the ignore file's directory, `*`/`?`/`[...]` do not cross `/`,
+  and `**` spans directories; the last matching rule wins
+- `walk()` prunes ignored directories instead of filtering their contents,
+  so a vendored node_modules costs one directory entry
+"""
+
+import os
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, FrozenSet, Iterable, Iterator, Optional, Pattern, Tuple
+
+DEFAULT_IGNORED_DIRECTORIES = frozenset({
+    '.git', '.hg', '.svn', 'node_modules', 'bower_components', '__pycache__',
+    'venv', '.venv', '.tox', '.nox', '.mypy_cache', '.pytest_cache', '.vanta',
+})
+
+IGNORE_FILE = ".gitignore"
+
+@dataclass(frozen=True)
+class IgnoreRule:
+    """One ignore-file line; `base` is the posix path of its file's directory ('' at the root)"""
+    pattern: str
+    regex: Pattern
+    base: str
+    negated: bool = False
+    dir_only: bool = False
+
+    def matches(self, rel_path: str, is_dir: bool) -> bool:
+        if self.dir_only and not is_dir:
+            return False
+        if self.base:
+            if not rel_path.startswith(self.base + "/"):
+                return False
+            rel_path = rel_path[len(self.base) + 1:]
+        return self.regex.match(rel_path) is not None
+
+def _translate(pattern: str) -> str:
+    parts = []
+    i, n = 0, len(pattern)
+    while i < n:
+        if pattern.startswith("**/", i):
+            parts.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("/**", i) and i + 3 == n:
+            parts.append("/.*")
+            i += 3
+        elif pattern.startswith("**", i):
+            parts.append(".*")
+            i += 2
+        elif pattern[i] == "*":
+            parts.append("[^/]*")
+            i += 1
+        elif pattern[i] == "?":
+            parts.append("[^/]")
+            i += 1
+        elif pattern[i] == "[":
+            end = pattern.find("]", i + 2)
+            if end == -1:
+                parts.append(re.escape("["))
+                i += 1
+                continue
+            body = pattern[i + 1:end]
+            if body[0] in "!^":
+                body = "^" + body[1:]
+            parts.append("(?!/)[" + body.replace("\\", "\\\\") + "]")
+            i = end + 1
+        elif pattern[i] == "\\" and i + 1 < n:
+            parts.append(re.escape(pattern[i + 1]))
+            i += 2
+        else:
+            parts.append(re.escape(pattern[i]))
+            i += 1
+    return "".join(parts)
+
+def parse_ignore_lines(lines: Iterable[str], base: str = "") -> Tuple[IgnoreRule, ...]:
+    """Rules from the lines of an ignore file located in directory `base`"""
+    rules = []
+    for line in lines:
+        line = line.rstrip("\n")
+        stripped = line.rstrip(" ")
+        if stripped.endswith("\\") and len(line) > len(stripped):
+            stripped += " "  # An escaped trailing space is kept
+        line = stripped
+        if not line or line.startswith("#"):
+            continue
+        negated = line.startswith("!")
+        if negated:
+            line = line[1:]
+        dir_only = line.endswith("/")
+        line = line.rstrip("/")
+        if not line:
+            continue
+        anchored = "/" in line
+        body = _translate(line.lstrip("/"))
+        regex = re.compile((body if anchored else "(?:.*/)?" + body) + r"\Z", re.DOTALL)
+        rules.append(IgnoreRule(line, regex, base, negated, dir_only))
+    return tuple(rules)
+
+class IgnoreRules:
+    """The ignore rules of one project tree, with each directory's ignore file read once"""
+
+    def __init__(self, root: Path, always_ignored: Iterable[str] = DEFAULT_IGNORED_DIRECTORIES,
+                 ignore_file: Optional[str] = IGNORE_FILE):
+        self.root = os.path.abspath(root)
+        self.always_ignored: FrozenSet[str] = frozenset(always_ignored)
+        self.ignore_file = ignore_file
+        self._rules: Dict[str, Tuple[IgnoreRule, ...]] = {}
+
+    def rules_for(self, rel_dir: str) -> Tuple[IgnoreRule, ...]:
+        """Rules in effect inside `rel_dir`: its ancestors' rules followed by its own"""
+        rules = self._rules.get(rel_dir)
+        if rules is None:
+            parent = self.rules_for(rel_dir.rpartition("/")[0]) if rel_dir else ()
+            own = ()
+            if self.ignore_file:
+                try:
+                    with open(os.path.join(self.root, rel_dir, self.ignore_file), encoding="utf-8",
+                              errors="replace") as f:
+                        own = parse_ignore_lines(f, rel_dir)
+                except OSError:
+                    pass
+            rules = self._rules[rel_dir] = parent + own
+        return rules
+
+    def _ignored(self, rules: Tuple[IgnoreRule, ...], rel_path: str, is_dir: bool) -> bool:
+        if is_dir and rel_path.rpartition("/")[2] in self.always_ignored:
+            return True
+        ignored = False
+        for rule in rules:
+            if rule.negated == ignored and rule.matches(rel_path, is_dir):
+                ignored = not rule.negated
+        return ignored
+
+    def is_ignored(self, path: str, is_dir: bool = False) -> bool:
+        """Whether a path (absolute, or relative to the root) or any directory above it is ignored"""
+        rel_path = os.path.relpath(os.path.join(self.root, path), self.root).replace(os.sep, "/")
+        if rel_path == "." or rel_path.startswith("../"):
+            return False
+        parts = rel_path.split("/")
+        for depth in range(1, len(parts) + 1):
+            rel_dir = "/".join(parts[:depth - 1])
+            last = depth == len(parts)
+            if self._ignored(self.rules_for(rel_dir), "/".join(parts[:depth]), is_dir or not last):
+                return True
+        return False
+
+    def invalidate(self):
+        """Forget every ignore file read so far"""
+        self._rules.clear()
+
+    def walk(self, suffixes: Optional[Iterable[str]] = None) -> Iterator[Tuple[str, os.stat_result]]:
+        """(path, stat) of every file that is not ignored, optionally only with the given suffixes"""
+        suffixes = frozenset(suffixes) if suffixes is not None else None
+        stack = [""]
+        while stack:
+            rel_dir = stack.pop()
+            directory = os.path.join(self.root, rel_dir) if rel_dir else self.root
+            rules = self.rules_for(rel_dir)
+            prefix = rel_dir + "/" if rel_dir else ""
+            try:
+                with os.scandir(directory) as entries:
+                    entries = list(entries)
+            except OSError:
+                continue
+            for entry in entries:
+                try:
+                    is_dir = entry.is_dir(follow_symlinks=False)
+                    if not is_dir and suffixes is not None and os.path.splitext(entry.name)[1] not in suffixes:
+                        continue
+                    if self._ignored(rules, prefix + entry.name, is_dir):
+                        continue
+                    if is_dir:
+                        stack.append(prefix + entry.name)
+                    elif entry.is_file():
+                        yield entry.path, entry.stat()
+                except OSError:
+                    continue
+
+def create_ignore_rules(root: Path, **kwargs) -> IgnoreRules:
+    """Create the ignore rules for a project tree"""
+    return IgnoreRules(root, **kwargs)
@@ -12,12 +12,16 @@ Level 3 Runtime Governance: Autonomous self-management and behavioral evolution
 Core Purpose: Enable autonomous runtime governance with intelligent self-evolution
 """
 
+import ast
 import asyncio
 import json
 import logging
+import operator
 import time
 import traceback
+from collections.abc import Mapping
 from datetime import datetime, timezone, timedelta
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, List, Any, Optional, Tuple, Callable, Union
 from dataclasses import dataclass, field
@@ -50,6 +54,142 @@ class DecisionContext(Enum):
     EMERGENCY = "emergency"
     EVOLUTION = "evolution"
 
+class GovernanceConditionError(ValueError):
+    """Raised when a rule condition uses syntax outside the allowed subset"""
+
+# === CONDITION COMPILER ===
+# Rule conditions are parsed once into a restricted AST and turned into nested
+# closures. Only literals, situation fields, attribute/subscript access,
+# arithmetic, comparisons and boolean logic are allowed - no calls, lambdas or
+# dunder access - so a condition can never execute arbitrary code.
+
+ConditionFn = Callable[[Dict[str, Any]], Any]
+
+_COMPARE_OPS = {
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+    ast.Is: operator.is_,
+    ast.IsNot: operator.is_not,
+    ast.In: lambda a, b: a in b,
+    ast.NotIn: lambda a, b: a not in b,
+}
+
+_BINARY_OPS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+}
+
+_UNARY_OPS = {
+    ast.Not: operator.not_,
+    ast.USub: operator.neg,
+    ast.UAdd: operator.pos,
+}
+
+def _compile_node(node: ast.AST) -> ConditionFn:
+    if isinstance(node, ast.Constant):
+        value = node.value
+        return lambda situation: value
+    
+    if isinstance(node, ast.Name):
+        name = node.id
+        return lambda situation: situation[name]
+    
+    if isinstance(node, ast.Attribute):
+        if node.attr.startswith("_"):
+            raise GovernanceConditionError(f"Access to private attribute '{node.attr}' is not allowed")
+        target, attr = _compile_node(node.value), node.attr
+        def get_attribute(situation):
+            value = target(situation)
+            return value[attr] if isinstance(value, Mapping) else getattr(value, attr)
+        return get_attribute
+    
+    if isinstance(node, ast.Subscript):
+        target, key = _compile_node(node.value), _compile_node(node.slice)
+        return lambda situation: target(situation)[key(situation)]
+    
+    if isinstance(node, (ast.Tuple, ast.List, ast.Set)):
+        items = [_compile_node(element) for element in node.elts]
+        container = {ast.Tuple: tuple, ast.List: list, ast.Set: frozenset}[type(node)]
+        return lambda situation: container(item(situation) for item in items)
+    
+    if isinstance(node, ast.BoolOp):
+        operands = [_compile_node(value) for value in node.values]
+        if isinstance(node.op, ast.And):
+            def all_of(situation):
+                result = True
+                for operand in operands:
+                    result = operand(situation)
+                    if not result:
+                        return result
+                return result
+            return all_of
+        def any_of(situation):
+            result = False
+            for operand in operands:
+                result = operand(situation)
+                if result:
+                    return result
+            return result
+        return any_of
+    
+    if isinstance(node, ast.UnaryOp) and type(node.op) in _UNARY_OPS:
+        op, operand = _UNARY_OPS[type(node.op)], _compile_node(node.operand)
+        return lambda situation: op(operand(situation))
+    
+    if isinstance(node, ast.BinOp) and type(node.op) in _BINARY_OPS:
+        op, left, right = _BINARY_OPS[type(node.op)], _compile_node(node.left), _compile_node(node.right)
+        return lambda situation: op(left(situation), right(situation))
+    
+    if isinstance(node, ast.Compare):
+        left = _compile_node(node.left)
+        steps = []
+        for op, comparator in zip(node.ops, node.comparators):
+            if type(op) not in _COMPARE_OPS:
+                raise GovernanceConditionError(f"Unsupported comparison: {type(op).__name__}")
+            steps.append((_COMPARE_OPS[type(op)], _compile_node(comparator)))
+        if len(steps) == 1:
+            (op, right), = steps
+            return lambda situation: op(left(situation), right(situation))
+        def compare_chain(situation):
+            current = left(situation)
+            for op, right in steps:
+                value = right(situation)
+                if not op(current, value):
+                    return False
+                current = value
+            return True
+        return compare_chain
+    
+    raise GovernanceConditionError(f"Unsupported expression: {type(node).__name__}")
+
+def compile_condition(condition: str) -> ConditionFn:
+    """
+    Compile a rule condition into a closure taking the situation dict.
+    
+    The closure raises (KeyError, TypeError, ...) when the situation lacks a
+    field or holds an incompatible value; callers treat that as "not met".
+    """
+    try:
+        tree = ast.parse(condition.strip(), mode="eval")
+    except SyntaxError as e:
+        raise GovernanceConditionError(f"Invalid condition syntax: {e.msg}") from e
+    return _compile_node(tree.body)
+
+@lru_cache(maxsize=1024)
+def _cached_condition(condition: str) -> ConditionFn:
+    return compile_condition(condition)
+
+def _never_met(situation: Dict[str, Any]) -> bool:
+    return False
+
 @dataclass
 class GovernanceRule:
     """Individual governance rule with metadata"""
@@ -69,6 +209,87 @@ class GovernanceRule:
     safety_constraints: List[str] = field(default_factory=list)
     dependencies: List[str] = field(default_factory=list)
     metadata: Dict[str, Any] = field(default_factory=dict)
+    _compiled: Optional[Tuple[str, ConditionFn]] = field(default=None, init=False, repr=False, compare=False)
+    _reported_condition: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    
+    def compiled_condition(self) -> ConditionFn:
+        """Return the compiled condition, recompiling only if `condition` changed"""
+        if self._compiled is None or self._compiled[0] != self.condition:
+            try:
+                compiled = _cached_condition(self.condition)
+            except GovernanceConditionError as e:
+                logger.warning(f"⚠️ Rule {self.rule_id} has an invalid condition and will never match: {e}")
+                compiled = _never_met
+            self._compiled = (self.condition, compiled)
+        return self._compiled[1]
+    
+    def matches(self, situation: Dict[str, Any]) -> bool:
+        """Evaluate the condition against a situation; evaluation errors count as not met"""
+        try:
+            return bool(self.compiled_condition()(situation))
+        except Exception as e:
+            # Warn once per condition; situations routinely omit fields, so repeats go to debug
+            if self._reported_condition != self.condition:
+                self._reported_condition = self.condition
+                logger.warning(f"⚠️ Failed to evaluate rule {self.rule_id}: {e}")
+            else:
+                logger.debug(f"Failed to evaluate rule {self.rule_id}: {e}")
+            return False
+
+class GovernanceRuleSet(dict):
+    """
+    Rule registry keyed by rule_id that also indexes rules by DecisionContext.
+    
+    The index is maintained on insert/remove, so a rule whose `context` is
+    changed in place must be re-assigned to refresh it.
+    """
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__()
+        self._by_context: Dict[DecisionContext, Dict[str, GovernanceRule]] = {}
+        self.update(*args, **kwargs)
+    
+    def __setitem__(self, rule_id: str, rule: GovernanceRule):
+        if rule_id in self:
+            self._unindex(rule_id)
+        super().__setitem__(rule_id, rule)
+        self._by_context.setdefault(rule.context, {})[rule_id] = rule
+    
+    def __delitem__(self, rule_id: str):
+        self._unindex(rule_id)
+        super().__delitem__(rule_id)
+    
+    def _unindex(self, rule_id: str):
+        rule = dict.get(self, rule_id)
+        if rule is not None:
+            self._by_context.get(rule.context, {}).pop(rule_id, None)
+    
+    def update(self, *args, **kwargs):
+        for rule_id, rule in dict(*args, **kwargs).items():
+            self[rule_id] = rule
+    
+    def setdefault(self, rule_id: str, rule: GovernanceRule = None):
+        if rule_id not in self:
+            self[rule_id] = rule
+        return self[rule_id]
+    
+    def pop(self, rule_id: str, *default):
+        if rule_id in self:
+            self._unindex(rule_id)
+        return super().pop(rule_id, *default)
+    
+    def popitem(self):
+        rule_id, rule = super().popitem()
+        self._by_context.get(rule.context, {}).pop(rule_id, None)
+        return rule_id, rule
+    
+    def clear(self):
+        super().clear()
+        self._by_context.clear()
+    
+    def for_context(self, context: DecisionContext) -> List[GovernanceRule]:
+        """Rules registered for a context (active or not)"""
+        return list(self._by_context.get(context, {}).values())
 
 @dataclass
 class GovernanceDecision:
@@ -118,7 +339,7 @@ class RuntimeGovernanceEngine:
         self.governance_config = governance_config or {}
         
         # Core governance state
-        self.rules: Dict[str, GovernanceRule] = {}
+        self.rules = GovernanceRuleSet()
         self.decision_history: List[GovernanceDecision] = []
         self.metrics = RuntimeMetrics()
         self.start_time = datetime.now(timezone.utc)
@@ -146,6 +367,14 @@ class RuntimeGovernanceEngine:
         
         logger.info(f"🏛️ Runtime Governance Engine initialized for {agent_id}")
     
+    @property
+    def rules(self) -> GovernanceRuleSet:
+        return self._rules
+    
+    @rules.setter
+    def rules(self, rules: Dict[str, GovernanceRule]):
+        self._rules = rules if isinstance(rules, GovernanceRuleSet) else GovernanceRuleSet(rules)
+    
     async def initialize_governance(self) -> Dict[str, Any]:
         """Initialize the governance engine with baseline rules"""
         logger.info("🚀 Initializing Level 3 Runtime Governance...")
@@ -513,37 +742,21 @@ class RuntimeGovernanceEngine:
     
     async def _evaluate_rules(self, context: DecisionContext, situation: Dict[str, Any]) -> List[GovernanceRule]:
         """Evaluate which rules apply to the current situation"""
-        applicable_rules = []
-        
-        for rule in self.rules.values():
-            if not rule.is_active or rule.context != context:
-                continue
-            
-            try:
-                # Evaluate rule condition
-                condition_met = await self._evaluate_condition(rule.condition, situation)
-                if condition_met:
-                    applicable_rules.append(rule)
-            except Exception as e:
-                logger.warning(f"⚠️ Failed to evaluate rule {rule.rule_id}: {e}")
+        # Only rules indexed under this context are considered; conditions are precompiled
+        applicable_rules = [
+            rule for rule in self.rules.for_context(context)
+            if rule.is_active and rule.matches(situation)
+        ]
         
         # Sort by priority
         applicable_rules.sort(key=lambda r: r.priority, reverse=True)
         return applicable_rules
     
     async def _evaluate_condition(self, condition: str, situation: Dict[str, Any]) -> bool:
-        """Safely evaluate a rule condition"""
+        """Safely evaluate an ad-hoc condition string (compiled forms are cached)"""
         try:
-            # Create safe evaluation context
-            eval_context = {
-                **situation,
-                "datetime": datetime,
-                "time": time
-            }
-            
-            # Simple condition evaluation (in production, use a safer approach)
-            return eval(condition, {"__builtins__": {}}, eval_context)
-        except:
+            return bool(_cached_condition(condition)(situation))
+        except Exception:
             return False
     
     def _select_optimal_rule(self, rules: List[GovernanceRule]) -> GovernanceRule:
@@ -0,0 +1,194 @@
+"""
+🗂️ SCAN CACHE - Incremental File Scan Results
+=============================================
+
+Persistent per-file findings for the secret and environment scanners, in a
+SQLite database under the project state dir (.vanta/scan_cache.db):
+- Entries are keyed by scanner namespace and path, and fingerprinted by
+  size, mtime_ns, inode and the scanner's ruleset version
+- A matching fingerprint returns the cached findings without reading the file
+- When only mtime/inode differ (touched, copied, checked out again) the
+  content hash decides; an unchanged hash keeps the findings
+- Entries written in the same instant the file was last modified are
+  "racily clean" and always verified by hash, since a later write in the
+  same timestamp tick would not change the fingerprint
+- A ruleset change invalidates every entry of that namespace and nothing else
+
+Findings are stored as JSON; callers convert their result types.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from enum import Enum
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = Path(".vanta") / "scan_cache.db"
+
+# Files modified this close to the scan time are verified by hash on the next lookup
+RACY_WINDOW_NS = 2_000_000_000
+
+class CacheStatus(Enum):
+    """Result of checking a file against its cache entry"""
+    HIT = "hit"
+    VERIFY = "verify"   # Same size, different stat: compare content hashes
+    MISS = "miss"
+
+def content_hash(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+class ScanCache:
+    """SQLite-backed cache of per-file scan findings for one scanner namespace"""
+
+    def __init__(self, db_path: Optional[str] = None, namespace: str = "default",
+                 ruleset_version: str = "", synchronous: str = "NORMAL"):
+        self.db_path = Path(db_path) if db_path else DEFAULT_CACHE_PATH
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.namespace = namespace
+        self.ruleset_version = ruleset_version
+
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(f"PRAGMA synchronous={synchronous}")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS scan_cache (
+                namespace TEXT NOT NULL,
+                path TEXT NOT NULL,
+                ruleset TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                inode INTEGER NOT NULL,
+                content_hash TEXT NOT NULL,
+                scanned_ns INTEGER NOT NULL,
+                findings TEXT NOT NULL,
+                PRIMARY KEY (namespace, path)
+            ) WITHOUT ROWID
+        """)
+        self._conn.commit()
+
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()  # One transaction at a time on the shared connection
+        # path -> (ruleset, size, mtime_ns, inode, content_hash, scanned_ns, findings JSON)
+        self._entries: Dict[str, Tuple] = {
+            row[0]: row[1:] for row in self._conn.execute(
+                "SELECT path, ruleset, size, mtime_ns, inode, content_hash, scanned_ns, findings "
+                "FROM scan_cache WHERE namespace = ?", (namespace,)
+            )
+        }
+        self._pending: Dict[str, Tuple] = {}
+        self.stats = {"hits": 0, "hash_hits": 0, "misses": 0}
+
+    # === LOOKUP ===
+
+    def lookup(self, path: str, st: os.stat_result) -> Tuple[CacheStatus, Optional[str]]:
+        """
+        (status, value) for a file: HIT with the findings JSON, VERIFY with
+        the cached content hash to compare against, or MISS
+        """
+        with self._lock:
+            entry = self._entries.get(path)
+        if entry is None or entry[0] != self.ruleset_version or entry[1] != st.st_size:
+            return CacheStatus.MISS, None
+        _, _, mtime_ns, inode, cached_hash, scanned_ns, findings = entry
+        if mtime_ns == st.st_mtime_ns and inode == st.st_ino and mtime_ns < scanned_ns - RACY_WINDOW_NS:
+            return CacheStatus.HIT, findings
+        return CacheStatus.VERIFY, cached_hash
+
+    def get(self, path: str, st: os.stat_result) -> Optional[Any]:
+        """Cached findings if the fingerprint matches, without reading the file"""
+        status, findings = self.lookup(path, st)
+        if status is CacheStatus.HIT:
+            self.stats["hits"] += 1
+            return json.loads(findings)
+        return None
+
+    def cached_findings(self, path: str) -> Any:
+        with self._lock:
+            return json.loads(self._entries[path][6])
+
+    # === UPDATES ===
+
+    def put(self, path: str, st: os.stat_result, digest: str, findings: Any, scanned_ns: Optional[int] = None):
+        """Record findings for a file; `st` must be taken before the content was read"""
+        entry = (self.ruleset_version, st.st_size, st.st_mtime_ns, st.st_ino, digest,
+                 scanned_ns or time.time_ns(), json.dumps(findings, separators=(',', ':')))
+        with self._lock:
+            self._entries[path] = entry
+            self._pending[path] = entry
+
+    def refresh(self, path: str, st: os.stat_result, scanned_ns: Optional[int] = None) -> Any:
+        """Content hash matched: keep the findings under the new fingerprint"""
+        self.stats["hash_hits"] += 1
+        with self._lock:
+            entry = self._entries[path]
+        findings = json.loads(entry[6])
+        self.put(path, st, entry[4], findings, scanned_ns)
+        return findings
+
+    def scan_file(self, path: str, scan: Callable[[bytes], Any], st: Optional[os.stat_result] = None) -> Any:
+        """Cached findings for a file, or scan(content bytes) recorded in the cache"""
+        scanned_ns = time.time_ns()
+        st = st or os.stat(path)
+        status, value = self.lookup(path, st)
+        if status is CacheStatus.HIT:
+            self.stats["hits"] += 1
+            return json.loads(value)
+
+        with open(path, 'rb') as f:
+            data = f.read()
+        digest = content_hash(data)
+        if status is CacheStatus.VERIFY and digest == value:
+            return self.refresh(path, st, scanned_ns)
+
+        self.stats["misses"] += 1
+        findings = scan(data)
+        self.put(path, st, digest, findings, scanned_ns)
+        return findings
+
+    # === PERSISTENCE ===
+
+    def flush(self) -> int:
+        """Write recorded entries in one transaction"""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return 0
+        try:
+            with self._write_lock, self._conn:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO scan_cache VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    [(self.namespace, path) + entry for path, entry in pending.items()]
+                )
+        except sqlite3.Error as e:
+            logger.error(f"❌ Scan cache flush failed: {e}")
+            return 0
+        return len(pending)
+
+    def clear(self):
+        """Drop every entry of this namespace"""
+        with self._lock:
+            self._entries.clear()
+            self._pending.clear()
+        with self._write_lock, self._conn:
+            self._conn.execute("DELETE FROM scan_cache WHERE namespace = ?", (self.namespace,))
+
+    def close(self):
+        self.flush()
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+def create_scan_cache(db_path: Optional[str] = None, **kwargs) -> ScanCache:
+    """Create a scan cache"""
+    return ScanCache(db_path, **kwargs)
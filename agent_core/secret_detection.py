@@ -0,0 +1,323 @@
+"""
+🔎 SECRET DETECTION ENGINE - Single-Pass Rule Matching
+=====================================================
+
+Shared matcher behind the secret and environment scanners:
+- All rules compile into one alternation of named groups, so content is
+  traversed once instead of once per pattern
+- A keyword prefilter finds the literals each rule requires (derived from
+  the regex, or given explicitly) with C-level substring search; rules whose
+  keywords are absent never reach the regex engine, and files without any
+  keyword are not regex-scanned at all
+- Detections carry the Shannon entropy of the matched value, used by
+  confidence scoring
+
+Matching keeps the semantics of running each rule's finditer separately:
+each rule resumes after its own previous match, so a rule's matches do not
+overlap each other, but different rules may match overlapping text (e.g.
+`db_password=...` is both a database and a password finding) and several
+rules may match at the same offset, reported in rule order. Rules that can
+match the empty string run their own finditer, whose empty-match handling
+the shared alternation cannot reproduce.
+"""
+
+import hashlib
+import json
+import logging
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, Optional, Sequence, Tuple
+
+try:
+    import re._parser as sre_parse
+    import re._constants as sre_constants
+except ImportError:  # Python < 3.11
+    import sre_parse
+    import sre_constants
+
+logger = logging.getLogger(__name__)
+
+# Shortest literal worth prefiltering on
+MIN_KEYWORD_LENGTH = 3
+
+_SCOPED_FLAGS = {re.IGNORECASE: "i", re.MULTILINE: "m", re.DOTALL: "s", re.VERBOSE: "x"}
+_INLINE_FLAGS = {"i": re.IGNORECASE, "m": re.MULTILINE, "s": re.DOTALL, "x": re.VERBOSE}
+_LEADING_FLAGS = re.compile(r"^\(\?([imsx]+)\)")
+_UNBOUNDED = 1 << 16
+
+# Bump when matching semantics change, so cached findings are invalidated
+DETECTOR_VERSION = "single-pass-3"
+
+@dataclass(frozen=True)
+class DetectionRule:
+    """A named pattern; `keywords` are literals, one of which every match contains"""
+    name: str
+    category: str
+    pattern: str
+    flags: int = 0
+    keywords: Optional[Tuple[str, ...]] = None  # None: derive from the pattern
+
+@dataclass
+class Detection:
+    """A rule match; `value` is the rule's first capture group, or the whole match"""
+    rule: str
+    category: str
+    start: int
+    end: int
+    text: str
+    value: str
+    entropy: float = field(init=False)
+
+    def __post_init__(self):
+        self.entropy = shannon_entropy(self.value)
+
+    @property
+    def confidence(self) -> float:
+        return confidence_score(self.category, self.text, self.value)
+
+# === SCORING ===
+
+def shannon_entropy(value: str) -> float:
+    """Shannon entropy of a string in bits per character"""
+    if not value:
+        return 0.0
+    length = len(value)
+    return -sum(count / length * math.log2(count / length) for count in Counter(value).values())
+
+def confidence_score(category: str, text: str, value: str) -> float:
+    """Confidence that a match is a real secret"""
+    confidence = 0.5  # Base confidence
+
+    matched_text = text.lower()
+
+    # Adjust based on secret type patterns
+    if category == "api_key" and ("api" in matched_text or "key" in matched_text):
+        confidence += 0.2
+    elif category == "password" and ("password" in matched_text or "passwd" in matched_text):
+        confidence += 0.2
+    elif category == "crypto" and ("begin" in matched_text and "end" in matched_text):
+        confidence += 0.3
+
+    # Check for common false positives
+    if any(word in matched_text for word in ["example", "sample", "test", "dummy", "placeholder"]):
+        confidence -= 0.3
+
+    # Long random-looking values are likely real; repetitive ones are placeholders
+    entropy = shannon_entropy(value)
+    if len(value) > 20 and entropy >= 3.5:
+        confidence += 0.2
+    elif len(value) >= 8 and entropy < 2.0:
+        confidence -= 0.1
+
+    return max(0.0, min(1.0, confidence))
+
+# === KEYWORD EXTRACTION ===
+
+def _best(current, candidate):
+    """Prefer the keyword set whose shortest literal is longest (most selective)"""
+    if candidate is None or min(map(len, candidate[0])) < MIN_KEYWORD_LENGTH:
+        return current
+    if current is None or min(map(len, candidate[0])) > min(map(len, current[0])):
+        return candidate
+    return current
+
+def _required_literals(items) -> Optional[Tuple[FrozenSet[str], int]]:
+    """
+    (literals, index) for a parsed sequence: every match contains one of the
+    literals, found in items[:index + 1]; None if no useful literal is required
+    """
+    best = None
+    run: List[str] = []
+    for index, (op, av) in enumerate(items):
+        if op is sre_constants.LITERAL:
+            run.append(chr(av))
+            continue
+        if run:
+            best = _best(best, (frozenset({"".join(run).lower()}), index - 1))
+            run = []
+        candidate = None
+        if op is sre_constants.SUBPATTERN:
+            candidate = _required_literals(av[-1])
+        elif op is sre_constants.BRANCH:
+            branches = [_required_literals(branch) for branch in av[1]]
+            if all(branches):
+                candidate = (frozenset().union(*(literals for literals, _ in branches)), index)
+        elif op in (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT) and av[0] >= 1:
+            candidate = _required_literals(av[2])
+        if candidate is not None:
+            best = _best(best, (candidate[0], index))
+    if run:
+        best = _best(best, (frozenset({"".join(run).lower()}), len(items) - 1))
+    return best
+
+def derive_keywords(pattern: str, flags: int = 0) -> Tuple[Optional[Tuple[str, ...]], int]:
+    """
+    (keywords, max_prefix) for a pattern: keywords one of which every match
+    contains, and the furthest a keyword can end from the match start
+    (_UNBOUNDED if unknown). keywords is None when no prefilter is possible.
+    """
+    parsed = sre_parse.parse(pattern, flags)
+    found = _required_literals(parsed.data)
+    if found is None:
+        return None, _UNBOUNDED
+    literals, index = found
+    try:
+        prefix = sre_parse.SubPattern(parsed.state, parsed.data[:index + 1]).getwidth()[1]
+    except Exception:
+        prefix = _UNBOUNDED
+    return tuple(sorted(literals)), min(prefix, _UNBOUNDED)
+
+# === DETECTOR ===
+
+class SecretDetector:
+    """Compiles a rule set into one prefiltered alternation and scans content with it"""
+
+    def __init__(self, rules: Sequence[DetectionRule], max_cached_alternations: int = 256):
+        self.rules = list(rules)
+        self.max_cached_alternations = max_cached_alternations
+        self._fragments: List[str] = []
+        self._value_groups: List[int] = []
+        self._max_prefix: List[int] = []
+        self._keyword_rules: Dict[str, List[int]] = {}   # keyword -> rule indexes
+        self._always_active = 0                          # bitmask of rules without keywords
+        self._alternations: Dict[int, re.Pattern] = {}
+        self._separate = 0                               # bitmask of rules that can match ''
+        self._separate_patterns: Dict[int, re.Pattern] = {}
+        self.ruleset_version = hashlib.sha256(json.dumps(
+            [DETECTOR_VERSION] + [[r.name, r.category, r.pattern, int(r.flags), r.keywords] for r in self.rules]
+        ).encode()).hexdigest()[:16]
+
+        for index, rule in enumerate(self.rules):
+            pattern, flags = rule.pattern, rule.flags
+            leading = _LEADING_FLAGS.match(pattern)
+            if leading:
+                pattern = pattern[leading.end():]
+                for letter in leading.group(1):
+                    flags |= _INLINE_FLAGS[letter]
+            unsupported = flags & ~sum(_SCOPED_FLAGS)
+            if unsupported:
+                raise ValueError(f"Rule {rule.name}: unsupported flags {unsupported}")
+
+            compiled = re.compile(pattern, flags)
+            if sre_parse.parse(pattern, flags).getwidth()[0] == 0:
+                self._separate |= 1 << index
+                self._separate_patterns[index] = compiled
+            letters = "".join(letter for flag, letter in _SCOPED_FLAGS.items() if flags & flag)
+            body = f"(?{letters}:{pattern})" if letters else f"(?:{pattern})"
+            self._fragments.append(f"(?P<r{index}>{body})")
+            self._value_groups.append(1 if compiled.groups else 0)
+
+            keywords = rule.keywords
+            max_prefix = _UNBOUNDED
+            if keywords is None:
+                keywords, max_prefix = derive_keywords(pattern, flags)
+            if keywords:
+                for keyword in keywords:
+                    self._keyword_rules.setdefault(keyword.lower(), []).append(index)
+            else:
+                self._always_active |= 1 << index
+            self._max_prefix.append(max_prefix)
+
+    @classmethod
+    def from_patterns(cls, secret_patterns: Dict[str, List[str]], flags: int = 0) -> "SecretDetector":
+        """Detector for a {category: [pattern, ...]} mapping"""
+        return cls([DetectionRule(f"{category}_{i}", category, pattern, flags)
+                    for category, patterns in secret_patterns.items()
+                    for i, pattern in enumerate(patterns)])
+
+    def _alternation(self, active: int) -> re.Pattern:
+        pattern = self._alternations.get(active)
+        if pattern is None:
+            if len(self._alternations) >= self.max_cached_alternations:
+                self._alternations.clear()
+            pattern = re.compile("|".join(fragment for index, fragment in enumerate(self._fragments)
+                                          if active >> index & 1))
+            self._alternations[active] = pattern
+        return pattern
+
+    def prefilter(self, content: str) -> Tuple[int, int]:
+        """(bitmask of rules that can match, offset before which no match can start)"""
+        active = self._always_active
+        start = 0 if active else len(content)
+        if self._keyword_rules:
+            lowered = content.lower()
+            exact_offsets = len(lowered) == len(content)  # Some characters lowercase to two
+            for keyword, indexes in self._keyword_rules.items():
+                hit = lowered.find(keyword)
+                if hit < 0:
+                    continue
+                for index in indexes:
+                    active |= 1 << index
+                    start = min(start, max(0, hit + len(keyword) - self._max_prefix[index]) if exact_offsets else 0)
+        return active, start
+
+    def scan(self, content: str) -> List[Detection]:
+        """All detections in content, in order of position"""
+        active, start = self.prefilter(content)
+        if not active:
+            return []
+
+        detections = []
+        rule_indexes = []
+        separate = active & self._separate
+        active &= ~separate
+        next_start: Dict[int, int] = {}  # rule -> offset its next match may start at
+        position = start
+        while active and position <= len(content):
+            # Rules still inside their previous match sit out until they may match again
+            blocked, resume = 0, None
+            for index, offset in list(next_start.items()):
+                if offset <= position:
+                    del next_start[index]
+                else:
+                    blocked |= 1 << index
+                    resume = offset if resume is None else min(resume, offset)
+            eligible = active & ~blocked
+            match = self._alternation(eligible).search(content, position) if eligible else None
+            if match is None or (resume is not None and match.start() >= resume):
+                if resume is None:
+                    break
+                position = resume  # A blocked rule may match from here on
+                continue
+            index = int(match.lastgroup[1:])
+            match_start, match_end = match.span()
+            # Other rules may still match at this offset: search it again without this one
+            next_start[index] = match_end if match_end > match_start else match_end + 1
+            position = match_start
+            text = match.group()
+            group = match.re.groupindex[match.lastgroup]
+            value = match.group(group + 1) if self._value_groups[index] else None
+            rule = self.rules[index]
+            detections.append(Detection(rule.name, rule.category, match_start, match_end, text,
+                                        text if value is None else value))
+            rule_indexes.append(index)
+
+        if separate:
+            keyed = [(detection.start, index, detection) for detection, index in zip(detections, rule_indexes)]
+            for index, compiled in self._separate_patterns.items():
+                if not separate >> index & 1:
+                    continue
+                rule = self.rules[index]
+                for match in compiled.finditer(content, start):
+                    text = match.group()
+                    value = match.group(1) if compiled.groups else None
+                    keyed.append((match.start(), index, Detection(rule.name, rule.category, match.start(),
+                                                                  match.end(), text, text if value is None else value)))
+            keyed.sort(key=lambda item: item[:2])
+            detections = [detection for _, _, detection in keyed]
+        return detections
+
+@lru_cache(maxsize=32)
+def detector_for_patterns(patterns: Tuple[Tuple[str, str], ...], flags: int = 0) -> SecretDetector:
+    """Cached detector for (category, pattern) pairs, e.g. one per worker process"""
+    secret_patterns: Dict[str, List[str]] = {}
+    for category, pattern in patterns:
+        secret_patterns.setdefault(category, []).append(pattern)
+    return SecretDetector.from_patterns(secret_patterns, flags)
+
+def create_secret_detector(rules: Sequence[DetectionRule], **kwargs) -> SecretDetector:
+    """Create a secret detector"""
+    return SecretDetector(rules, **kwargs)
@@ -0,0 +1,443 @@
+"""
+🔍 SECRET DISCOVERY SCANNER - Parallel Hardcoded Secret Scanning
+===============================================================
+
+Scanning subsystem behind BusinessEnhancementEngine.discover_hardcoded_secrets:
+- Walks scan paths with os.scandir, pruning hidden and ignored directories
+  before descending into them; no cap on the number of files
+- Groups files into size-balanced batches (by bytes and file count)
+- Scans batches in a process pool, a bounded number in flight at a time
+- Streams SecretDiscoveryResults back batch by batch as they are found
+- Matches each file with the shared single-pass SecretDetector
+
+Scanning logic lives in module-level functions so worker processes can run
+it without the engine (and its vault agent) being pickled.
+"""
+
+import asyncio
+import concurrent.futures
+import json
+import logging
+import os
+import re
+import threading
+import time
+from dataclasses import asdict, dataclass
+from enum import Enum
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+from .scan_cache import CacheStatus, ScanCache, content_hash
+from .secret_detection import Detection, confidence_score, detector_for_patterns
+
+logger = logging.getLogger(__name__)
+
+class BusinessImpactLevel(Enum):
+    """Business impact classification"""
+    CRITICAL = "critical"
+    HIGH = "high"
+    MEDIUM = "medium"
+    LOW = "low"
+    MINIMAL = "minimal"
+
+@dataclass
+class SecretDiscoveryResult:
+    """Result of automated secret discovery"""
+    location: str
+    secret_type: str
+    confidence_score: float
+    business_impact: BusinessImpactLevel
+    recommended_action: str
+    risk_factors: List[str]
+
+SCANNABLE_EXTENSIONS = frozenset({
+    '.py', '.js', '.ts', '.java', '.cs', '.cpp', '.c', '.h',
+    '.yaml', '.yml', '.json', '.xml', '.ini', '.cfg', '.conf',
+    '.sh', '.bat', '.ps1', '.sql', '.env', '.properties'
+})
+
+IGNORED_DIRECTORIES = frozenset({'node_modules', '__pycache__'})
+
+# Bump when confidence, impact or recommendation logic changes, so cached findings are invalidated
+SCORING_VERSION = "1"
+
+def flatten_patterns(secret_patterns: Dict[str, List[str]]) -> Tuple[Tuple[str, str], ...]:
+    return tuple((secret_type, pattern) for secret_type, patterns in secret_patterns.items() for pattern in patterns)
+
+# === PER-MATCH ASSESSMENT ===
+
+def calculate_secret_confidence(match: re.Match, content: str, secret_type: str) -> float:
+    """Calculate confidence score for detected secret"""
+    secret_value = match.group(1) if match.groups() and match.group(1) is not None else match.group(0)
+    return confidence_score(secret_type, match.group(0), secret_value)
+
+def assess_secret_business_impact(file_path: Path, secret_type: str) -> BusinessImpactLevel:
+    """Assess business impact of discovered secret"""
+    path_str = str(file_path).lower()
+
+    # High impact patterns
+    if any(pattern in path_str for pattern in ["prod", "production", "live", "master"]):
+        if secret_type in ["database", "api_key", "crypto"]:
+            return BusinessImpactLevel.CRITICAL
+        else:
+            return BusinessImpactLevel.HIGH
+
+    # Medium impact patterns
+    elif any(pattern in path_str for pattern in ["staging", "stage", "config"]):
+        return BusinessImpactLevel.MEDIUM
+
+    # Development/test impact
+    elif any(pattern in path_str for pattern in ["dev", "test", "demo"]):
+        return BusinessImpactLevel.LOW
+
+    # Default assessment based on secret type
+    if secret_type in ["database", "crypto"]:
+        return BusinessImpactLevel.HIGH
+    elif secret_type in ["api_key", "secret"]:
+        return BusinessImpactLevel.MEDIUM
+    else:
+        return BusinessImpactLevel.LOW
+
+def generate_secret_recommendation(secret_type: str, business_impact: BusinessImpactLevel) -> str:
+    """Generate recommendation for discovered secret"""
+    if business_impact in [BusinessImpactLevel.CRITICAL, BusinessImpactLevel.HIGH]:
+        return f"URGENT: Move {secret_type} to secure vault immediately"
+    elif business_impact == BusinessImpactLevel.MEDIUM:
+        return f"Move {secret_type} to vault and update references"
+    else:
+        return f"Consider moving {secret_type} to vault for best practices"
+
+def identify_risk_factors(file_path: Path, secret_type: str, match: Union[re.Match, Detection]) -> List[str]:
+    """Identify risk factors for discovered secret"""
+    risk_factors = []
+
+    path_str = str(file_path).lower()
+
+    if "prod" in path_str:
+        risk_factors.append("Production environment")
+    if file_path.suffix in ['.js', '.py', '.java']:
+        risk_factors.append("Source code exposure")
+    if any(word in path_str for word in ["config", "env"]):
+        risk_factors.append("Configuration file")
+    if secret_type in ["database", "crypto"]:
+        risk_factors.append("High-value secret type")
+
+    return risk_factors
+
+def secret_result_to_dict(result: SecretDiscoveryResult) -> Dict[str, Any]:
+    data = asdict(result)
+    data["business_impact"] = result.business_impact.value
+    return data
+
+def secret_result_from_dict(data: Dict[str, Any]) -> SecretDiscoveryResult:
+    return SecretDiscoveryResult(**dict(data, business_impact=BusinessImpactLevel(data["business_impact"])))
+
+def discovery_ruleset_version(patterns: Tuple[Tuple[str, str], ...]) -> str:
+    """Cache key for findings: the detector's rules plus the scoring below"""
+    return f"{detector_for_patterns(patterns, re.MULTILINE).ruleset_version}:{SCORING_VERSION}"
+
+# === SCANNING ===
+
+def scan_content(file_path: Path, content: str, patterns: Tuple[Tuple[str, str], ...]) -> List[SecretDiscoveryResult]:
+    """Scan one file's content for potential secrets in a single prefiltered pass"""
+    secrets_found = []
+
+    for detection in detector_for_patterns(patterns, re.MULTILINE).scan(content):
+        confidence = detection.confidence
+
+        if confidence > 0.3:  # Only report if confidence > 30%
+            business_impact = assess_secret_business_impact(file_path, detection.category)
+            secrets_found.append(SecretDiscoveryResult(
+                location=f"{file_path}:{detection.start}",
+                secret_type=detection.category,
+                confidence_score=confidence,
+                business_impact=business_impact,
+                recommended_action=generate_secret_recommendation(detection.category, business_impact),
+                risk_factors=identify_risk_factors(file_path, detection.category, detection)
+            ))
+
+    return secrets_found
+
+def scan_batch(items: List[Tuple[str, Optional[str]]], patterns: Tuple[Tuple[str, str], ...]) -> Dict[str, Any]:
+    """
+    Read and scan a batch of (path, cached content hash or None) items (runs
+    in a worker process). A file whose content hash equals its cached hash is
+    not scanned; its entry in "files" carries None instead of results.
+    """
+    files: List[Tuple[str, str, Optional[List[SecretDiscoveryResult]]]] = []
+    bytes_scanned = 0
+    errors = []
+    for path, cached_hash in items:
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            digest = content_hash(data)
+            if digest == cached_hash:
+                files.append((path, digest, None))
+                continue
+            content = data.decode('utf-8', errors='ignore')
+            bytes_scanned += len(content)
+            files.append((path, digest, scan_content(Path(path), content, patterns)))
+        except OSError as e:
+            errors.append(f"{path}: {e}")
+    return {"files": files, "bytes": bytes_scanned, "errors": errors}
+
+class SecretDiscoveryScanner:
+    """
+    Walks scan paths and scans files for secret patterns in a process pool.
+
+    `secret_patterns` is read at each scan, so later changes to the dict
+    (e.g. BusinessEnhancementEngine.secret_patterns) are picked up. With a
+    ScanCache, unchanged files return their cached findings without being
+    read; files whose stat changed but size did not are hashed in the
+    workers and only scanned if their content changed.
+    """
+
+    def __init__(self, secret_patterns: Dict[str, List[str]],
+                 extensions: Iterable[str] = SCANNABLE_EXTENSIONS,
+                 ignored_directories: Iterable[str] = IGNORED_DIRECTORIES,
+                 max_workers: Optional[int] = None,
+                 batch_bytes: int = 4 * 1024 * 1024,
+                 batch_files: int = 256,
+                 max_in_flight: Optional[int] = None,
+                 cache: Optional[ScanCache] = None):
+        self.secret_patterns = secret_patterns
+        self.extensions = frozenset(ext.lower() for ext in extensions)
+        self.ignored_directories = frozenset(ignored_directories)
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.batch_bytes = batch_bytes
+        self.batch_files = batch_files
+        self.max_in_flight = max_in_flight or self.max_workers * 2
+        self.cache = cache
+        self.stats = self._empty_stats()
+
+    @staticmethod
+    def _empty_stats() -> Dict[str, Any]:
+        return {"files_scanned": 0, "files_cached": 0, "bytes_scanned": 0, "batches": 0,
+                "errors": [], "elapsed_seconds": 0.0}
+
+    # === WALKING ===
+
+    def _scannable(self, name: str) -> bool:
+        return not name.startswith('.') and os.path.splitext(name)[1].lower() in self.extensions
+
+    def iter_entries(self, scan_paths: Iterable[str]) -> Iterator[Tuple[str, os.stat_result]]:
+        """(path, stat) of every scannable file; each file is yielded once even if paths overlap"""
+        seen: Set[Tuple[int, int]] = set()
+        for scan_path in scan_paths:
+            if os.path.isfile(scan_path):
+                if os.path.splitext(scan_path)[1].lower() in self.extensions:
+                    st = os.stat(scan_path)
+                    if (st.st_dev, st.st_ino) not in seen:
+                        seen.add((st.st_dev, st.st_ino))
+                        yield scan_path, st
+                continue
+
+            root = os.path.normpath(scan_path)
+            stack = [root]
+            while stack:
+                directory = stack.pop()
+                prefix = "" if directory == "." else directory + os.sep
+                try:
+                    with os.scandir(directory) as entries:
+                        for entry in entries:
+                            name = entry.name
+                            try:
+                                if entry.is_dir(follow_symlinks=False):
+                                    if not name.startswith('.') and name not in self.ignored_directories:
+                                        stack.append(prefix + name)
+                                elif self._scannable(name) and entry.is_file():
+                                    st = entry.stat()
+                                    key = (st.st_dev, st.st_ino)
+                                    if key not in seen:
+                                        seen.add(key)
+                                        yield prefix + name, st
+                            except OSError:
+                                continue
+                except OSError as e:
+                    logger.warning(f"Failed to list {directory}: {e}")
+
+    def iter_files(self, scan_paths: Iterable[str]) -> Iterator[Tuple[str, int]]:
+        """(path, size) of every scannable file"""
+        for path, st in self.iter_entries(scan_paths):
+            yield path, st.st_size
+
+    def iter_batches(self, scan_paths: Iterable[str]) -> Iterator[List[str]]:
+        """Size-balanced batches: a batch closes at batch_bytes or batch_files, whichever comes first"""
+        for batch in self._iter_work(self.iter_entries(scan_paths)):
+            yield [path for path, _ in batch]
+
+    def _iter_work(self, entries: Iterable[Tuple[str, os.stat_result]],
+                   fingerprints: Optional[Dict[str, os.stat_result]] = None,
+                   cached: Optional[List[Dict[str, Any]]] = None) -> Iterator[List[Tuple[str, Optional[str]]]]:
+        """
+        Work batches of (path, cached hash) for files the cache cannot answer;
+        cache hits are appended to `cached` as ready batch results
+        """
+        batch: List[Tuple[str, Optional[str]]] = []
+        batch_size = 0
+        hits: List[SecretDiscoveryResult] = []
+        hit_files = 0
+        for path, st in entries:
+            cached_hash = None
+            if self.cache is not None and fingerprints is not None:
+                status, value = self.cache.lookup(path, st)
+                if status is CacheStatus.HIT:
+                    self.cache.stats["hits"] += 1
+                    hits.extend(secret_result_from_dict(data) for data in json.loads(value))
+                    hit_files += 1
+                    if hit_files >= self.batch_files:
+                        cached.append({"results": hits, "files": hit_files, "cached": hit_files,
+                                       "bytes": 0, "errors": []})
+                        hits, hit_files = [], 0
+                    continue
+                cached_hash = value
+                fingerprints[path] = st
+            batch.append((path, cached_hash))
+            batch_size += st.st_size
+            if batch_size >= self.batch_bytes or len(batch) >= self.batch_files:
+                yield batch
+                batch, batch_size = [], 0
+        if hit_files:
+            cached.append({"results": hits, "files": hit_files, "cached": hit_files, "bytes": 0, "errors": []})
+        if batch:
+            yield batch
+
+    # === SCANNING ===
+
+    def iter_batch_results(self, scan_paths: Iterable[str],
+                           cancelled: Optional[threading.Event] = None) -> Iterator[Dict[str, Any]]:
+        """Scan results per batch, in completion order; cache hits come as batches too"""
+        patterns = flatten_patterns(self.secret_patterns)
+        self.stats = self._empty_stats()
+        start = time.perf_counter()
+        scanned_ns = time.time_ns()
+        fingerprints: Dict[str, os.stat_result] = {}
+        cached: List[Dict[str, Any]] = []
+        if self.cache is not None:
+            self.cache.ruleset_version = discovery_ruleset_version(patterns)
+        batches = self._iter_work(self.iter_entries(scan_paths), fingerprints, cached)
+
+        def complete(batch_result):
+            return self._record(self._apply_cache(batch_result, fingerprints, scanned_ns))
+
+        def ready():
+            while cached:
+                yield self._record(cached.pop(0))
+
+        # A single batch is scanned in process; pool startup would dominate
+        first = next(batches, None)
+        second = next(batches, None)
+        try:
+            yield from ready()
+            if first is None:
+                return
+            if second is None or self.max_workers == 1:
+                for batch in filter(None, [first, second]):
+                    yield complete(scan_batch(batch, patterns))
+                for batch in batches:
+                    yield from ready()
+                    if cancelled is not None and cancelled.is_set():
+                        return
+                    yield complete(scan_batch(batch, patterns))
+                yield from ready()
+                return
+
+            with concurrent.futures.ProcessPoolExecutor(max_workers=self.max_workers) as pool:
+                pending = {pool.submit(scan_batch, first, patterns), pool.submit(scan_batch, second, patterns)}
+                for batch in batches:
+                    yield from ready()
+                    while len(pending) >= self.max_in_flight:
+                        done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                        for future in done:
+                            yield complete(future.result())
+                    if cancelled is not None and cancelled.is_set():
+                        for future in pending:
+                            future.cancel()
+                        return
+                    pending.add(pool.submit(scan_batch, batch, patterns))
+                yield from ready()
+                for future in concurrent.futures.as_completed(pending):
+                    yield complete(future.result())
+        finally:
+            if self.cache is not None:
+                self.cache.flush()
+            self.stats["elapsed_seconds"] = time.perf_counter() - start
+
+    def _apply_cache(self, batch_result: Dict[str, Any], fingerprints: Dict[str, os.stat_result],
+                     scanned_ns: int) -> Dict[str, Any]:
+        """Flatten a worker's per-file results, recording them in (or taking them from) the cache"""
+        results: List[SecretDiscoveryResult] = []
+        unchanged = 0
+        for path, digest, file_results in batch_result["files"]:
+            st = fingerprints.pop(path, None)
+            if file_results is None:
+                unchanged += 1
+                file_results = [secret_result_from_dict(data)
+                                for data in self.cache.refresh(path, st, scanned_ns)]
+            elif self.cache is not None:
+                self.cache.stats["misses"] += 1
+                self.cache.put(path, st, digest, [secret_result_to_dict(r) for r in file_results], scanned_ns)
+            results.extend(file_results)
+        return {"results": results, "files": len(batch_result["files"]) + len(batch_result["errors"]),
+                "cached": unchanged, "bytes": batch_result["bytes"], "errors": batch_result["errors"]}
+
+    def _record(self, batch_result: Dict[str, Any]) -> Dict[str, Any]:
+        self.stats["files_scanned"] += batch_result["files"]
+        self.stats["files_cached"] += batch_result["cached"]
+        self.stats["bytes_scanned"] += batch_result["bytes"]
+        self.stats["batches"] += 1
+        for error in batch_result["errors"]:
+            logger.warning(f"Failed to scan file {error}")
+        self.stats["errors"].extend(batch_result["errors"])
+        return batch_result
+
+    def scan(self, scan_paths: Iterable[str]) -> Iterator[SecretDiscoveryResult]:
+        """Stream secrets found under scan_paths"""
+        for batch_result in self.iter_batch_results(scan_paths):
+            yield from batch_result["results"]
+
+    async def scan_async(self, scan_paths: Iterable[str], max_buffered_batches: int = 4) -> AsyncIterator[SecretDiscoveryResult]:
+        """
+        Stream secrets without blocking the event loop; walking and pool dispatch
+        run in a thread that pauses once max_buffered_batches results are unread
+        """
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=max_buffered_batches)
+        cancelled = threading.Event()
+        done = object()
+        scan_paths = list(scan_paths)
+
+        def put(item):
+            asyncio.run_coroutine_threadsafe(queue.put(item), loop).result()
+
+        def produce():
+            try:
+                for batch_result in self.iter_batch_results(scan_paths, cancelled):
+                    put(batch_result["results"])
+            except Exception as e:
+                put(e)
+            finally:
+                put(done)
+
+        producer = loop.run_in_executor(None, produce)
+        try:
+            while True:
+                item = await queue.get()
+                if item is done:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                for result in item:
+                    yield result
+        finally:
+            # Stopped early: keep draining so the producer can see the cancellation and exit
+            cancelled.set()
+            while not producer.done():
+                while not queue.empty():
+                    queue.get_nowait()
+                await asyncio.sleep(0.005)
+
+def create_secret_discovery_scanner(secret_patterns: Dict[str, List[str]], **kwargs) -> SecretDiscoveryScanner:
+    """Create a secret discovery scanner"""
+    return SecretDiscoveryScanner(secret_patterns, **kwargs)
@@ -0,0 +1,173 @@
+"""
+📡 SECURITY EVENT BUFFER - Bounded Security Telemetry
+====================================================
+
+Fixed-size ring buffer of typed security events plus rolling per-minute
+counters by event category:
+- Appends overwrite the oldest slot in place; nothing is copied or re-sliced
+- Event categories are resolved once, when an event is recorded
+- "How many threat events in the last hour" sums at most one counter per
+  minute bucket, with no timestamp parsing on the read path
+- Live buffers register themselves so their counters can be exported to the
+  vault API metrics endpoint
+"""
+
+import threading
+import time
+import weakref
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from enum import Enum
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+class SecurityEventCategory(Enum):
+    """Coarse event categories used for threat assessment"""
+    THREAT = "threat"
+    VALIDATION = "validation"
+    EXECUTION = "execution"
+    ANOMALY = "anomaly"
+    OTHER = "other"
+
+@lru_cache(maxsize=256)
+def categorize_event_type(event_type: str) -> SecurityEventCategory:
+    """Map an event type such as 'threat_detected' or 'action_validation' to its category"""
+    for category in (SecurityEventCategory.THREAT, SecurityEventCategory.VALIDATION,
+                     SecurityEventCategory.ANOMALY):
+        if category.value in event_type:
+            return category
+    if "execut" in event_type:
+        return SecurityEventCategory.EXECUTION
+    return SecurityEventCategory.OTHER
+
+@dataclass
+class SecurityEvent:
+    """A recorded security event; `timestamp` is epoch seconds"""
+    event_id: str
+    type: str
+    category: SecurityEventCategory
+    timestamp: float
+    data: Dict[str, Any] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Legacy dict form (ISO timestamp) used by existing consumers"""
+        return {
+            "event_id": self.event_id,
+            "type": self.type,
+            "category": self.category.value,
+            "timestamp": datetime.fromtimestamp(self.timestamp, timezone.utc).isoformat(),
+            "data": self.data,
+        }
+
+_LIVE_BUFFERS: "weakref.WeakSet[SecurityEventBuffer]" = weakref.WeakSet()
+
+class SecurityEventBuffer:
+    """
+    Ring buffer holding the last `capacity` events, with per-category counters
+    for `window_minutes` rolling one-minute buckets.
+    """
+
+    def __init__(self, capacity: int = 1000, window_minutes: int = 60, clock=time.time):
+        self.capacity = capacity
+        self.window_minutes = window_minutes
+        self.clock = clock
+        self.total_recorded = 0
+
+        self._events: List[Optional[SecurityEvent]] = [None] * capacity
+        self._next = 0
+        self._retained_types: Counter = Counter()
+        self._bucket_minutes = [-1] * window_minutes
+        self._bucket_counts = {category: [0] * window_minutes for category in SecurityEventCategory}
+        self._lock = threading.Lock()
+        _LIVE_BUFFERS.add(self)
+
+    # === WRITE PATH ===
+
+    def record(self, event_type: str, data: Optional[Dict[str, Any]] = None) -> SecurityEvent:
+        """Record an event, overwriting the oldest one when full"""
+        now = self.clock()
+        event = SecurityEvent(
+            event_id=f"event_{int(now * 1000)}",
+            type=event_type,
+            category=categorize_event_type(event_type),
+            timestamp=now,
+            data=data or {},
+        )
+        minute = int(now // 60)
+        slot = minute % self.window_minutes
+        with self._lock:
+            evicted = self._events[self._next]
+            if evicted is not None:
+                self._retained_types[evicted.type] -= 1
+            self._events[self._next] = event
+            self._next = (self._next + 1) % self.capacity
+            self._retained_types[event_type] += 1
+            self.total_recorded += 1
+
+            if self._bucket_minutes[slot] != minute:
+                self._bucket_minutes[slot] = minute
+                for counts in self._bucket_counts.values():
+                    counts[slot] = 0
+            self._bucket_counts[event.category][slot] += 1
+        return event
+
+    # === READ PATH ===
+
+    def _live_slots(self, seconds: float) -> List[int]:
+        current = int(self.clock() // 60)
+        oldest = current - min(self.window_minutes, max(1, int(-(-seconds // 60)))) + 1
+        return [slot for slot, minute in enumerate(self._bucket_minutes) if oldest <= minute <= current]
+
+    def count_recent(self, category: Optional[SecurityEventCategory] = None, seconds: float = 3600) -> int:
+        """Events in the last `seconds` (minute granularity), optionally for one category"""
+        with self._lock:
+            slots = self._live_slots(seconds)
+            categories = [category] if category is not None else list(SecurityEventCategory)
+            return sum(self._bucket_counts[c][slot] for c in categories for slot in slots)
+
+    def per_minute(self, category: SecurityEventCategory, minutes: Optional[int] = None) -> List[int]:
+        """Counts for the last `minutes` minutes, oldest first"""
+        minutes = min(minutes or self.window_minutes, self.window_minutes)
+        current = int(self.clock() // 60)
+        with self._lock:
+            series = []
+            for minute in range(current - minutes + 1, current + 1):
+                slot = minute % self.window_minutes
+                series.append(self._bucket_counts[category][slot] if self._bucket_minutes[slot] == minute else 0)
+            return series
+
+    def retained_count(self, event_type: str) -> int:
+        """Events of an exact type still held in the buffer"""
+        return self._retained_types.get(event_type, 0)
+
+    def events(self) -> List[SecurityEvent]:
+        """Retained events, oldest first"""
+        with self._lock:
+            ordered = self._events[self._next:] + self._events[:self._next]
+        return [event for event in ordered if event is not None]
+
+    def __len__(self) -> int:
+        return min(self.total_recorded, self.capacity)
+
+    def export_metrics(self) -> Dict[str, Any]:
+        """Counter snapshot for metrics endpoints"""
+        return {
+            "events_total": self.total_recorded,
+            "events_retained": len(self),
+            "last_hour": {category.value: self.count_recent(category) for category in SecurityEventCategory},
+            "per_minute_last_15m": {category.value: self.per_minute(category, 15) for category in SecurityEventCategory},
+        }
+
+def export_security_event_metrics() -> Dict[str, Any]:
+    """Aggregate counters across every live SecurityEventBuffer in this process"""
+    buffers = list(_LIVE_BUFFERS)
+    totals = {"buffers": len(buffers), "events_total": 0, "events_retained": 0,
+              "last_hour": {category.value: 0 for category in SecurityEventCategory}}
+    for buffer in buffers:
+        metrics = buffer.export_metrics()
+        totals["events_total"] += metrics["events_total"]
+        totals["events_retained"] += metrics["events_retained"]
+        for category, count in metrics["last_hour"].items():
+            totals["last_hour"][category] += count
+    return totals
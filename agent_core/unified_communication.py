@@ -8,7 +8,7 @@ import asyncio
 import json
 import logging
 import uuid
-from typing import Dict, Any, Optional, List, Callable, Union
+from typing import Dict, Any, Optional, List, Callable, Tuple, Union
 from datetime import datetime
 from enum import Enum
 
@@ -248,48 +248,74 @@ class UnifiedCommunicationLayer:
     async def send_message(self, message: UnifiedMessage) -> bool:
         """Send a message to an agent (Python or TypeScript)"""
         try:
-            # Update source agent's last seen and message count
-            if message.source_agent in self.registered_agents:
-                agent_info = self.registered_agents[message.source_agent]
-                agent_info.last_seen = datetime.utcnow()
-                agent_info.message_count += 1
-            
-            # Determine routing based on target agent
-            if message.target_agent:
-                # Direct message to specific agent
-                if message.target_agent in self.registered_agents:
-                    target_agent = self.registered_agents[message.target_agent]
-                    
-                    if target_agent.language == "typescript":
-                        # Route to TypeScript bridge
-                        return await self._route_to_typescript(message)
-                    else:
-                        # Route to Python agent via KEBClient
-                        return await self._route_to_python(message)
-                else:
-                    logger.warning(f"Target agent {message.target_agent} not found")
-                    return False
-            else:
-                # Broadcast message
-                return await self._broadcast_message(message)
-                
+            self._record_sent(message)
+            route = self._route(message)
+            if route is None:
+                return False
+            stream, payload = route
+            sent = self.keb_client.publish(stream, payload) is not None
+            if sent:
+                self._log_routed(message, stream)
+            return sent
         except Exception as e:
             logger.error(f"Failed to send message: {e}")
             return False
     
-    async def _route_to_python(self, message: UnifiedMessage) -> bool:
-        """Route message to Python agent via KEBClient"""
-        try:
-            self.keb_client.publish("agent_messages", message.to_dict())
-            logger.debug(f"Routed message {message.message_id} to Python agent {message.target_agent}")
-            return True
-        except Exception as e:
-            logger.error(f"Failed to route message to Python agent: {e}")
-            return False
+    async def send_messages(self, messages: List[UnifiedMessage]) -> List[bool]:
+        """
+        Send a batch of messages, pipelining publishes per destination stream.
+
+        Messages are grouped by the stream they route to and each group is
+        published with a single KEB round trip. Returns one flag per message.
+        """
+        results = [False] * len(messages)
+        streams: Dict[str, List[int]] = {}
+        payloads: Dict[str, List[Dict[str, Any]]] = {}
+
+        for index, message in enumerate(messages):
+            self._record_sent(message)
+            route = self._route(message)
+            if route is None:
+                continue
+            stream, payload = route
+            streams.setdefault(stream, []).append(index)
+            payloads.setdefault(stream, []).append(payload)
+
+        for stream, indexes in streams.items():
+            try:
+                event_ids = self.keb_client.publish_many(stream, payloads[stream])
+            except Exception as e:
+                logger.error(f"Failed to publish batch to {stream}: {e}")
+                continue
+            for index, event_id in zip(indexes, event_ids):
+                results[index] = event_id is not None
+                if results[index]:
+                    self._log_routed(messages[index], stream)
+
+        return results
     
-    async def _route_to_typescript(self, message: UnifiedMessage) -> bool:
-        """Route message to TypeScript agent via bridge"""
-        try:
+    def _record_sent(self, message: UnifiedMessage):
+        """Update the source agent's last seen time and message count"""
+        if message.source_agent in self.registered_agents:
+            agent_info = self.registered_agents[message.source_agent]
+            agent_info.last_seen = datetime.utcnow()
+            agent_info.message_count += 1
+    
+    def _route(self, message: UnifiedMessage) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """
+        The (stream, payload) a message is published as: the TypeScript bridge
+        for TypeScript targets, agent_messages for Python targets and
+        agent_broadcasts without a target. None if the target is unknown.
+        """
+        if not message.target_agent:
+            return "agent_broadcasts", message.to_dict()
+        
+        target_agent = self.registered_agents.get(message.target_agent)
+        if target_agent is None:
+            logger.warning(f"Target agent {message.target_agent} not found")
+            return None
+        
+        if target_agent.language == "typescript":
             # Add routing metadata for TypeScript bridge
             bridge_message = message.to_dict()
             bridge_message["routing"] = {
@@ -297,23 +323,16 @@ class UnifiedCommunicationLayer:
                 "target_agent": message.target_agent,
                 "bridge_timestamp": datetime.utcnow().isoformat() + "Z"
             }
-            
-            self.keb_client.publish("typescript_bridge", bridge_message)
-            logger.debug(f"Routed message {message.message_id} to TypeScript agent {message.target_agent}")
-            return True
-        except Exception as e:
-            logger.error(f"Failed to route message to TypeScript agent: {e}")
-            return False
+            return "typescript_bridge", bridge_message
+        return "agent_messages", message.to_dict()
     
-    async def _broadcast_message(self, message: UnifiedMessage) -> bool:
-        """Broadcast message to all agents"""
-        try:
-            self.keb_client.publish("agent_broadcasts", message.to_dict())
+    def _log_routed(self, message: UnifiedMessage, stream: str):
+        if stream == "agent_broadcasts":
             logger.debug(f"Broadcasted message {message.message_id} from {message.source_agent}")
-            return True
-        except Exception as e:
-            logger.error(f"Failed to broadcast message: {e}")
-            return False
+        elif stream == "typescript_bridge":
+            logger.debug(f"Routed message {message.message_id} to TypeScript agent {message.target_agent}")
+        else:
+            logger.debug(f"Routed message {message.message_id} to Python agent {message.target_agent}")
     
     async def _process_agent_messages(self):
         """Process direct agent-to-agent messages"""
@@ -3,20 +3,41 @@ cli.py — Part of MetaFabric Production v1.1.0
 Auto-generated under Domino Mode
 """
 
+import os
+import sys
+
+if __name__ == "__main__" and not os.environ.get("VANTA_NO_DAEMON"):
+    # A running daemon serves the command from its warm state; this runs
+    # before the imports below so a forwarded command does not pay for them
+    from cli_daemon import forward_to_daemon
+    _exit_code = forward_to_daemon(sys.argv[1:])
+    if _exit_code is not None:
+        sys.exit(_exit_code)
+
 import argparse
 from pathlib import Path
 from env_scanner import scan_env_and_tools
 from secret_broker import SecretBroker
-from symlink_manager import link_env, link_tool
+from symlink_manager import ProjectLinks, reconcile_project, reconcile_projects
 from access_mesh import AccessMesh
 import yaml
 import json
 import time
 import shutil # Import shutil for copy operations
 import glob
-import os
 import fnmatch
 
+# Kept across commands by a long-running process (daemon, watcher); each
+# AccessMesh catches up with other writers whenever it is used
+_meshes = {}
+
+def get_access_mesh(registry_path: Path) -> AccessMesh:
+    registry_path = registry_path.resolve()
+    mesh = _meshes.get(registry_path)
+    if mesh is None:
+        mesh = _meshes[registry_path] = AccessMesh(registry_path)
+    return mesh
+
 def cmd_scan(project_path: Path):
     result = scan_env_and_tools(project_path)
     print("[SCAN RESULT]")
@@ -34,21 +55,24 @@ def cmd_link(project_path: Path, secure=False, password=None):
 
     env_path = Path.home() / ".vanta" / "envs" / f"{project_path.name}.env"
     env_path.parent.mkdir(parents=True, exist_ok=True)
-    with env_path.open("w") as f:
-        for k, v in secrets.items():
-            f.write(f"{k}={v}\n")
-    link_env(project_path, env_path)
+    env_content = "".join(f"{k}={v}\n" for k, v in secrets.items())
+    if not env_path.exists() or env_path.read_text() != env_content:
+        env_path.write_text(env_content)
 
+    tools_root = Path.home() / ".vanta" / "mcp" / "tools"
     tool_paths = []
+    tool_sources = []
     for tool in scan_result["tools"]:
-        tool_path = Path.home() / ".vanta" / "mcp" / "tools" / f"{tool}.mcp"
+        tool_path = tools_root / f"{tool}.mcp"
         tool_path.parent.mkdir(parents=True, exist_ok=True)
         if not tool_path.exists():
             tool_path.write_text(f"# MCP tool: {tool}")
-        link_tool(project_path, tool_path)
+        tool_sources.append(tool_path)
         tool_paths.append(tool)
+    # Only links that differ from the desired set are touched
+    reconcile_project(ProjectLinks(project_path, env_path, tool_sources, managed_tools_root=tools_root))
 
-    mesh = AccessMesh(Path("access_mesh.yaml"))
+    mesh = get_access_mesh(Path("access_mesh.yaml"))
     mesh.bind(project_path.name, tool_paths, list(secrets.keys()))
 
 def cmd_sync_shared_resources(project_path: Path, master_shared_resources_yaml_path: Path):
@@ -182,8 +206,28 @@ def cmd_sync_shared_resources(project_path: Path, master_shared_resources_yaml_p
     except Exception as e:
         print(f"[X] Error writing sync info to {sync_info_file}: {e}")
 
+def cmd_reconcile(root_path: Path, dry_run=False):
+    """Reconcile the .env and tools/ links of every project under a root from the access mesh"""
+    from project_scanner import find_projects
+    mesh = get_access_mesh(Path("access_mesh.yaml"))
+    envs_root = Path.home() / ".vanta" / "envs"
+    tools_root = Path.home() / ".vanta" / "mcp" / "tools"
+    specs = []
+    for project_path in find_projects(root_path):
+        binding = mesh.get(project_path.name)
+        if binding is None:
+            continue
+        env_path = envs_root / f"{project_path.name}.env"
+        specs.append(ProjectLinks(project_path, env_path if env_path.exists() else None,
+                                  [tools_root / f"{tool}.mcp" for tool in binding["tools"]],
+                                  managed_tools_root=tools_root))
+    report = reconcile_projects(specs, dry_run=dry_run)
+    for change in report.changes:
+        print(change.describe())
+    print(f"[{'PLAN' if dry_run else '✓'}] {report.summary()}")
+
 def cmd_list():
-    print("Available commands: scan, link, bootstrap, list")
+    print("Available commands: scan, link, bootstrap, reconcile, list")
 
 def cmd_list_tools():
     from yaml import safe_load
@@ -319,7 +363,7 @@ def cmd_mcp_search_files(directory: str, pattern: str, recursive: bool = True) -
     except Exception as e:
         return {"success": False, "error": str(e)}
 
-if __name__ == "__main__":
+def build_parser():
     parser = argparse.ArgumentParser(description="MetaFabric CLI")
     subparsers = parser.add_subparsers(dest="command")
 
@@ -348,6 +392,10 @@ if __name__ == "__main__":
     upgrade_parser.add_argument("tool_name")
     upgrade_parser.add_argument("version")
 
+    reconcile_parser = subparsers.add_parser("reconcile", help="Reconcile project links from the access mesh.")
+    reconcile_parser.add_argument("--root", type=Path, required=True, help="Root projects folder")
+    reconcile_parser.add_argument("--dry-run", action="store_true", help="Print the plan without changing links")
+
     scanroot_parser = subparsers.add_parser("scan-root")
     scanroot_parser.add_argument("--dir", required=True)
 
@@ -370,14 +418,13 @@ if __name__ == "__main__":
     mcp_search_files_parser.add_argument("--recursive", action="store_true", help="Recursive search for mcp-search-files")
     mcp_search_files_parser.add_argument("--format", choices=["text", "json"], default="text", help="Output format")
 
-    args = parser.parse_args()
-    
-    # Handle password for secure storage operations
-    password = None
-    if hasattr(args, 'secure') and args.secure:
-        import getpass
-        password = getpass.getpass("Enter master password: ")
-        
+    daemon_parser = subparsers.add_parser("daemon", help="Serve CLI commands from a warm background process.")
+    daemon_parser.add_argument("action", choices=["start", "stop", "status"])
+    daemon_parser.add_argument("--socket", type=Path, default=None, help="Unix socket path")
+    return parser
+
+def run_command(args, password=None):
+    """Run one parsed command in this process"""
     if args.command == "scan":
         cmd_scan(args.project_path)
     elif args.command == "link":
@@ -391,6 +438,8 @@ if __name__ == "__main__":
     elif args.command == "scan-root":
         from project_scanner import scan_projects_with_rules
         scan_projects_with_rules(args.dir, "rules")
+    elif args.command == "reconcile":
+        cmd_reconcile(args.root, dry_run=args.dry_run)
     elif args.command == "list":
         cmd_list()
     elif args.command == "watch":
@@ -431,4 +480,24 @@ if __name__ == "__main__":
             else:
                 print(f"Error: {result['error']}")
     else:
-        parser.print_help()
\ No newline at end of file
+        build_parser().print_help()
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    args = build_parser().parse_args(argv)
+
+    if args.command == "daemon":
+        import cli_daemon
+        return cli_daemon.run_daemon_command(args.action, args.socket)
+
+    # Handle password for secure storage operations
+    password = None
+    if hasattr(args, 'secure') and args.secure:
+        import getpass
+        password = getpass.getpass("Enter master password: ")
+
+    run_command(args, password)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,237 @@
+"""
+cli_daemon.py — Part of MetaFabric Production v1.1.0
+
+A long-running process that serves cli.py commands over a Unix domain
+socket. It keeps imports and warm state between commands: parsed rules,
+AccessMesh instances, derived secret keys and loaded scan caches. cli.py
+forwards a command here when a daemon is listening and runs it in-process
+otherwise.
+
+Protocol: the client sends one JSON line ({"argv", "cwd", "password"} or
+{"control": "ping"|"stop"}); the daemon answers with JSON lines
+{"stream": "out"|"err", "data"} while the command runs and a final
+{"exit": code}.
+
+Both ends only talk to a peer running as the same user: the client checks
+the daemon's uid before sending anything (the master password included),
+and the daemon drops connections from other users.
+"""
+
+import io
+import json
+import os
+import socket
+import stat
+import struct
+import sys
+import threading
+import time
+import traceback
+from contextlib import redirect_stderr, redirect_stdout
+
+# Commands that always run in the calling process (long-running or daemon control)
+LOCAL_COMMANDS = {"watch", "daemon"}
+
+def socket_path(path=None) -> str:
+    if path:
+        return str(path)
+    return os.environ.get("VANTA_DAEMON_SOCKET") or os.path.join(os.path.expanduser("~"), ".vanta", "cli.sock")
+
+def _peer_uid(sock, path):
+    """uid of the process at the other end of a connected socket"""
+    if hasattr(socket, "SO_PEERCRED"):
+        pid, uid, gid = struct.unpack("3i", sock.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED,
+                                                            struct.calcsize("3i")))
+        return uid
+    # No peer credentials (e.g. macOS): the socket file's owner is the one who bound it
+    return os.lstat(path).st_uid
+
+# === CLIENT ===
+
+def _connect(path):
+    if not hasattr(socket, "AF_UNIX") or not hasattr(os, "getuid"):
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(path)
+        uid = _peer_uid(sock, path)
+    except OSError:
+        sock.close()
+        return None
+    if uid != os.getuid():
+        sock.close()
+        print(f"[!] Ignoring {path}: served by uid {uid}, not by you", file=sys.stderr)
+        return None
+    return sock
+
+def _request(sock, message: dict):
+    """Send a request and yield the daemon's reply messages"""
+    sock.sendall(json.dumps(message).encode() + b"\n")
+    with sock.makefile("rb") as replies:
+        for line in replies:
+            yield json.loads(line)
+
+def forward_to_daemon(argv, path=None):
+    """Run a command in the daemon; None when it must run locally (no daemon, or a local command)"""
+    if not argv or argv[0] in LOCAL_COMMANDS or argv[0].startswith("-"):
+        return None
+    sock = _connect(socket_path(path))
+    if sock is None:
+        return None
+    password = None
+    if "--secure" in argv:
+        import getpass
+        password = getpass.getpass("Enter master password: ")
+    with sock:
+        for reply in _request(sock, {"argv": list(argv), "cwd": os.getcwd(), "password": password}):
+            if "exit" in reply:
+                return reply["exit"]
+            stream = sys.stderr if reply.get("stream") == "err" else sys.stdout
+            stream.write(reply.get("data", ""))
+            stream.flush()
+    print("[X] Daemon closed the connection before the command finished", file=sys.stderr)
+    return 1
+
+def control(action: str, path=None):
+    """Send a control request; the daemon's reply, or None if no daemon is listening"""
+    sock = _connect(socket_path(path))
+    if sock is None:
+        return None
+    with sock:
+        for reply in _request(sock, {"control": action}):
+            return reply
+    return None
+
+# === SERVER ===
+
+class _ReplyStream(io.TextIOBase):
+    """stdout/stderr of a served command, sent to the client as it is written"""
+
+    def __init__(self, conn, name):
+        self.conn = conn
+        self.name = name
+        self.connected = True
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        if data and self.connected:
+            try:
+                self.conn.sendall(json.dumps({"stream": self.name, "data": data}).encode() + b"\n")
+            except OSError:
+                self.connected = False  # Client went away; let the command finish
+        return len(data)
+
+class CommandDaemon:
+    def __init__(self, path=None):
+        self.socket_path = socket_path(path)
+        self.started_at = time.time()
+        self.commands = 0
+        self._command_lock = threading.Lock()  # Commands chdir and redirect stdout: one at a time
+        self._stopping = threading.Event()
+        self._server = None
+
+    def run(self, argv, cwd, password, out, err) -> int:
+        import cli
+        with self._command_lock:
+            home = os.getcwd()
+            self.commands += 1
+            try:
+                os.chdir(cwd)
+                with redirect_stdout(out), redirect_stderr(err):
+                    try:
+                        args = cli.build_parser().parse_args(argv)
+                        cli.run_command(args, password)
+                        return 0
+                    except SystemExit as e:
+                        return e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+                    except Exception:
+                        traceback.print_exc()
+                        return 1
+            finally:
+                os.chdir(home)
+
+    def handle(self, conn):
+        try:
+            uid = _peer_uid(conn, self.socket_path)
+        except OSError:
+            uid = None
+        if uid != os.getuid():
+            conn.close()  # Only the daemon's own user may run commands in it
+            return
+        with conn, conn.makefile("rb") as requests:
+            line = requests.readline()
+            if not line:
+                return
+            request = json.loads(line)
+            if request.get("control") == "ping":
+                reply = {"pid": os.getpid(), "uptime": time.time() - self.started_at, "commands": self.commands}
+            elif request.get("control") == "stop":
+                reply = {"stopping": True}
+                self._stopping.set()
+            elif "argv" in request:
+                out, err = _ReplyStream(conn, "out"), _ReplyStream(conn, "err")
+                reply = {"exit": self.run(request["argv"], request.get("cwd") or os.getcwd(),
+                                          request.get("password"), out, err)}
+            else:
+                reply = {"error": "unknown request"}
+            try:
+                conn.sendall(json.dumps(reply).encode() + b"\n")
+            except OSError:
+                pass
+
+    def serve_forever(self):
+        import cli  # Warm the whole command stack once
+        directory = os.path.dirname(self.socket_path)
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        info = os.stat(directory)
+        if info.st_uid == os.getuid() and not info.st_mode & stat.S_ISVTX:
+            # Our own directory (e.g. ~/.vanta, created earlier with default permissions);
+            # shared sticky directories such as /tmp are left alone, the socket itself is 0600
+            os.chmod(directory, 0o700)
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)  # Stale: the caller checked nothing is listening
+        self._server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        old_umask = os.umask(0o177)
+        try:
+            self._server.bind(self.socket_path)
+        finally:
+            os.umask(old_umask)
+        self._server.listen(16)
+        self._server.settimeout(0.5)  # Wake up regularly to notice a stop request
+        print(f"[🛰️] CLI daemon {os.getpid()} listening on {self.socket_path}", flush=True)
+        try:
+            while not self._stopping.is_set():
+                try:
+                    conn, _ = self._server.accept()
+                except socket.timeout:
+                    continue
+                conn.settimeout(None)
+                threading.Thread(target=self.handle, args=(conn,), daemon=True).start()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self._server.close()
+            try:
+                os.unlink(self.socket_path)
+            except FileNotFoundError:
+                pass
+            print(f"[✓] CLI daemon stopped after {self.commands} commands", flush=True)
+
+def run_daemon_command(action, path=None) -> int:
+    if action == "start":
+        if control("ping", path) is not None:
+            print(f"[X] A daemon is already listening on {socket_path(path)}")
+            return 1
+        CommandDaemon(path).serve_forever()
+        return 0
+    reply = control("stop" if action == "stop" else "ping", path)
+    if reply is None:
+        print("[X] No daemon running")
+        return 1
+    if action == "stop":
+        print("[✓] Daemon stopping")
+    else:
+        print(f"[✓] Daemon {reply['pid']} up {reply['uptime']:.0f}s, {reply['commands']} commands served")
+    return 0
@@ -16,10 +16,12 @@ Features:
 """
 
 import asyncio
-import yaml
+import hashlib
 import json
+import sqlite3
 import time
 import statistics
+from collections import defaultdict, deque
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
 from typing import Dict, List, Any, Optional, Tuple
@@ -82,11 +84,182 @@ class AgentScore:
     score_history: List[Dict[str, Any]] = field(default_factory=list)
     intervention_history: List[Dict[str, Any]] = field(default_factory=list)
 
+def compute_input_digest(agent_data: Dict[str, Any]) -> str:
+    """Stable digest of an agent's scoring inputs"""
+    canonical = json.dumps(agent_data, sort_keys=True, default=str)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+def agent_score_to_dict(agent_score: AgentScore) -> Dict[str, Any]:
+    """Serializable form of an agent score"""
+    return {
+        "agent_id": agent_score.agent_id,
+        "coherence_score": agent_score.coherence_score,
+        "collapse_score": agent_score.collapse_score,
+        "last_updated": agent_score.last_updated.isoformat(),
+        "coherence_metrics": [
+            {
+                "category": metric.category.value,
+                "value": metric.value,
+                "confidence": metric.confidence,
+                "measurement_time": metric.measurement_time.isoformat(),
+                "contributing_factors": metric.contributing_factors,
+                "trend_direction": metric.trend_direction
+            }
+            for metric in agent_score.coherence_metrics
+        ],
+        "collapse_metrics": [
+            {
+                "factor": metric.factor.value,
+                "risk_level": metric.risk_level,
+                "urgency": metric.urgency,
+                "measurement_time": metric.measurement_time.isoformat(),
+                "indicators": metric.indicators,
+                "intervention_suggestions": metric.intervention_suggestions
+            }
+            for metric in agent_score.collapse_metrics
+        ]
+    }
+
+def agent_score_from_dict(data: Dict[str, Any]) -> AgentScore:
+    """Rebuild an AgentScore from agent_score_to_dict output"""
+    return AgentScore(
+        agent_id=data["agent_id"],
+        coherence_score=data["coherence_score"],
+        collapse_score=data["collapse_score"],
+        coherence_metrics=[
+            CoherenceMetric(
+                category=CoherenceCategory(m["category"]),
+                value=m["value"],
+                confidence=m["confidence"],
+                measurement_time=datetime.fromisoformat(m["measurement_time"]),
+                contributing_factors=m["contributing_factors"],
+                trend_direction=m["trend_direction"]
+            )
+            for m in data["coherence_metrics"]
+        ],
+        collapse_metrics=[
+            CollapseRiskMetric(
+                factor=CollapseRiskFactor(m["factor"]),
+                risk_level=m["risk_level"],
+                urgency=m["urgency"],
+                measurement_time=datetime.fromisoformat(m["measurement_time"]),
+                indicators=m["indicators"],
+                intervention_suggestions=m["intervention_suggestions"]
+            )
+            for m in data["collapse_metrics"]
+        ],
+        last_updated=datetime.fromisoformat(data["last_updated"])
+    )
+
+class CoherenceScoreHistory:
+    """
+    SQLite score history shared by the whole fleet.
+
+    agent_scores holds one row per scoring run and metric_scores one row per
+    metric per run (long/columnar layout indexed by agent and metric), so trend
+    queries read a single index range. The last `trend_window` values of each
+    agent metric are also kept in memory for _calculate_trend.
+    """
+    
+    def __init__(self, db_path: Path, trend_window: int = 3):
+        self.db_path = Path(db_path)
+        self.trend_window = trend_window
+        self.conn = sqlite3.connect(str(self.db_path))
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS agent_scores (
+                agent_id TEXT NOT NULL,
+                scored_at REAL NOT NULL,
+                coherence_score REAL,
+                collapse_score REAL,
+                input_digest TEXT
+            );
+            CREATE INDEX IF NOT EXISTS idx_agent_scores_agent ON agent_scores (agent_id, scored_at);
+            CREATE TABLE IF NOT EXISTS metric_scores (
+                agent_id TEXT NOT NULL,
+                metric TEXT NOT NULL,
+                scored_at REAL NOT NULL,
+                value REAL,
+                weight REAL
+            );
+            CREATE INDEX IF NOT EXISTS idx_metric_scores_series ON metric_scores (agent_id, metric, scored_at);
+            CREATE TABLE IF NOT EXISTS agent_latest (
+                agent_id TEXT PRIMARY KEY,
+                input_digest TEXT,
+                scored_at REAL,
+                score_json TEXT
+            );
+        """)
+        self.conn.commit()
+        
+        self._digests = dict(self.conn.execute("SELECT agent_id, input_digest FROM agent_latest"))
+        self._recent: Dict[Tuple[str, str], deque] = defaultdict(lambda: deque(maxlen=self.trend_window))
+        for agent_id, metric, value in self.conn.execute("""
+            SELECT agent_id, metric, value FROM (
+                SELECT agent_id, metric, value, scored_at,
+                       ROW_NUMBER() OVER (PARTITION BY agent_id, metric ORDER BY scored_at DESC) AS rn
+                FROM metric_scores
+            ) WHERE rn <= ? ORDER BY scored_at
+        """, (self.trend_window,)):
+            self._recent[(agent_id, metric)].append(value)
+    
+    def latest_digest(self, agent_id: str) -> Optional[str]:
+        return self._digests.get(agent_id)
+    
+    def recent_values(self, agent_id: str, metric: str) -> List[float]:
+        """Last trend_window recorded values of a metric, oldest first"""
+        window = self._recent.get((agent_id, metric))
+        return list(window) if window else []
+    
+    def metric_series(self, agent_id: str, metric: str, since: Optional[datetime] = None,
+                      limit: Optional[int] = None) -> List[Tuple[datetime, float]]:
+        """(time, value) for one agent metric, oldest first"""
+        query = "SELECT scored_at, value FROM metric_scores WHERE agent_id = ? AND metric = ?"
+        params: List[Any] = [agent_id, metric]
+        if since is not None:
+            query += " AND scored_at >= ?"
+            params.append(since.timestamp())
+        query += " ORDER BY scored_at DESC"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+        rows = self.conn.execute(query, params).fetchall()
+        return [(datetime.fromtimestamp(ts, timezone.utc), value) for ts, value in reversed(rows)]
+    
+    def load_latest(self, agent_id: str) -> Optional[Dict[str, Any]]:
+        row = self.conn.execute("SELECT score_json FROM agent_latest WHERE agent_id = ?", (agent_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+    
+    def record_many(self, entries: List[Tuple[Dict[str, Any], str]]):
+        """Record (score dict, input digest) pairs in one transaction"""
+        score_rows, metric_rows, latest_rows = [], [], []
+        for score, digest in entries:
+            agent_id = score["agent_id"]
+            scored_at = datetime.fromisoformat(score["last_updated"]).timestamp()
+            score_rows.append((agent_id, scored_at, score["coherence_score"], score["collapse_score"], digest))
+            for metric in score["coherence_metrics"]:
+                metric_rows.append((agent_id, metric["category"], scored_at, metric["value"], metric["confidence"]))
+                self._recent[(agent_id, metric["category"])].append(metric["value"])
+            for metric in score["collapse_metrics"]:
+                metric_rows.append((agent_id, metric["factor"], scored_at, metric["risk_level"], metric["urgency"]))
+                self._recent[(agent_id, metric["factor"])].append(metric["risk_level"])
+            latest_rows.append((agent_id, digest, scored_at, json.dumps(score)))
+            self._digests[agent_id] = digest
+        with self.conn:
+            self.conn.executemany("INSERT INTO agent_scores VALUES (?, ?, ?, ?, ?)", score_rows)
+            self.conn.executemany("INSERT INTO metric_scores VALUES (?, ?, ?, ?, ?)", metric_rows)
+            self.conn.executemany("INSERT OR REPLACE INTO agent_latest VALUES (?, ?, ?, ?)", latest_rows)
+    
+    def close(self):
+        self.conn.close()
+
 class CoherenceAnalyzer:
     """Analyzes various aspects of agent coherence"""
     
-    def __init__(self, vanta_path: Path):
+    def __init__(self, vanta_path: Path, score_history: Optional[CoherenceScoreHistory] = None):
         self.vanta_path = vanta_path
+        self.score_history = score_history
         self.scoring_weights = {
             CoherenceCategory.ARCHITECTURAL_FIT: 0.25,
             CoherenceCategory.SYMBOLIC_ALIGNMENT: 0.20,
@@ -97,30 +270,15 @@ class CoherenceAnalyzer:
         }
     
     async def analyze_agent_coherence(self, agent_id: str, agent_data: Dict[str, Any]) -> List[CoherenceMetric]:
-        """Analyze all coherence aspects of an agent"""
-        metrics = []
-        
-        # Architectural fit analysis
-        arch_metric = await self._analyze_architectural_fit(agent_id, agent_data)
-        metrics.append(arch_metric)
-        
-        # Symbolic alignment analysis
-        symbolic_metric = await self._analyze_symbolic_alignment(agent_id, agent_data)
-        metrics.append(symbolic_metric)
-        
-        # Performance efficiency analysis
-        perf_metric = await self._analyze_performance_efficiency(agent_id, agent_data)
-        metrics.append(perf_metric)
-        
-        # Trinity role harmony analysis
-        trinity_metric = await self._analyze_trinity_harmony(agent_id, agent_data)
-        metrics.append(trinity_metric)
-        
-        # Narrative consistency analysis
-        narrative_metric = await self._analyze_narrative_consistency(agent_id, agent_data)
-        metrics.append(narrative_metric)
-        
-        return metrics
+        """Analyze all coherence aspects of an agent (categories run concurrently)"""
+        metrics = await asyncio.gather(
+            self._analyze_architectural_fit(agent_id, agent_data),
+            self._analyze_symbolic_alignment(agent_id, agent_data),
+            self._analyze_performance_efficiency(agent_id, agent_data),
+            self._analyze_trinity_harmony(agent_id, agent_data),
+            self._analyze_narrative_consistency(agent_id, agent_data)
+        )
+        return list(metrics)
     
     async def _analyze_architectural_fit(self, agent_id: str, agent_data: Dict[str, Any]) -> CoherenceMetric:
         """Analyze how well agent fits into system architecture"""
@@ -291,10 +449,8 @@ class CoherenceAnalyzer:
     
     def _calculate_trend(self, agent_id: str, category: CoherenceCategory, current_score: float) -> str:
         """Calculate trend direction for a coherence category"""
-        # This would look at historical scores to determine trend
-        # For demo purposes, we'll simulate trend detection
-        
-        historical_scores = [0.75, 0.77, 0.79, current_score]  # Simulated history
+        previous = self.score_history.recent_values(agent_id, category.value) if self.score_history else []
+        historical_scores = previous + [current_score]
         
         if len(historical_scores) < 2:
             return "stable"
@@ -326,30 +482,16 @@ class CollapseRiskAnalyzer:
         }
     
     async def analyze_collapse_risk(self, agent_id: str, agent_data: Dict[str, Any], coherence_metrics: List[CoherenceMetric]) -> List[CollapseRiskMetric]:
-        """Analyze all collapse risk factors for an agent"""
-        metrics = []
-        
-        # Utility decline analysis
-        utility_metric = await self._analyze_utility_decline(agent_id, agent_data)
-        metrics.append(utility_metric)
-        
-        # Resource waste analysis
-        resource_metric = await self._analyze_resource_waste(agent_id, agent_data)
-        metrics.append(resource_metric)
-        
-        # Conflict generation analysis
-        conflict_metric = await self._analyze_conflict_generation(agent_id, agent_data)
-        metrics.append(conflict_metric)
-        
-        # Obsolescence analysis
-        obsolescence_metric = await self._analyze_obsolescence(agent_id, agent_data)
-        metrics.append(obsolescence_metric)
-        
-        # Coherence loss analysis (based on coherence metrics)
-        coherence_loss_metric = await self._analyze_coherence_loss(agent_id, coherence_metrics)
-        metrics.append(coherence_loss_metric)
-        
-        return metrics
+        """Analyze all collapse risk factors for an agent (factors run concurrently)"""
+        metrics = await asyncio.gather(
+            self._analyze_utility_decline(agent_id, agent_data),
+            self._analyze_resource_waste(agent_id, agent_data),
+            self._analyze_conflict_generation(agent_id, agent_data),
+            self._analyze_obsolescence(agent_id, agent_data),
+            # Coherence loss analysis (based on coherence metrics)
+            self._analyze_coherence_loss(agent_id, coherence_metrics)
+        )
+        return list(metrics)
     
     async def _analyze_utility_decline(self, agent_id: str, agent_data: Dict[str, Any]) -> CollapseRiskMetric:
         """Analyze utility decline risk"""
@@ -544,15 +686,20 @@ class CollapseRiskAnalyzer:
 class CoherenceScoringEngine:
     """Main engine for coherence and collapse scoring"""
     
-    def __init__(self, vanta_path: Path):
+    def __init__(self, vanta_path: Path, auto_scoring: bool = True, max_concurrency: int = 64):
         self.vanta_path = vanta_path
-        self.coherence_analyzer = CoherenceAnalyzer(vanta_path)
-        self.collapse_analyzer = CollapseRiskAnalyzer(vanta_path)
         self.scores_path = vanta_path / "runtime" / "coherence_scores"
         self.scores_path.mkdir(parents=True, exist_ok=True)
+        self.score_history = CoherenceScoreHistory(self.scores_path / "score_history.db")
+        self.coherence_analyzer = CoherenceAnalyzer(vanta_path, self.score_history)
+        self.collapse_analyzer = CollapseRiskAnalyzer(vanta_path)
+        self.latest_scores: Dict[str, AgentScore] = {}
+        
+        # Fleet scoring: at most this many agents are scored at once
+        self.max_concurrency = max_concurrency
         
         # Auto-scoring configuration
-        self.auto_scoring_enabled = True
+        self.auto_scoring_enabled = auto_scoring
         self.scoring_interval = 30 * 60  # 30 minutes
         
         # Start background scoring if enabled
@@ -563,6 +710,71 @@ class CoherenceScoringEngine:
         """Generate complete score for an agent"""
         logger.info(f"📊 Scoring agent: {agent_id}")
         
+        agent_score = await self._compute_agent_score(agent_id, agent_data)
+        
+        # Save score
+        await self._save_agent_score(agent_score, compute_input_digest(agent_data))
+        
+        # Check for intervention triggers
+        await self._check_intervention_triggers(agent_score)
+        
+        logger.info(f"✅ Agent {agent_id} scored: coherence={agent_score.coherence_score:.2f}, collapse_risk={agent_score.collapse_score:.2f}")
+        return agent_score
+    
+    async def score_fleet(self, agents: Dict[str, Dict[str, Any]], force: bool = False) -> Dict[str, AgentScore]:
+        """
+        Score many agents concurrently (at most max_concurrency at once). Agents
+        whose input data digest matches their last recorded score are not
+        rescored unless `force`; all new scores are written in one transaction.
+        """
+        digests = {agent_id: compute_input_digest(agent_data) for agent_id, agent_data in agents.items()}
+        results: Dict[str, AgentScore] = {}
+        to_score = []
+        for agent_id, digest in digests.items():
+            if not force and self.score_history.latest_digest(agent_id) == digest:
+                cached = self.get_latest_score(agent_id)
+                if cached is not None:
+                    results[agent_id] = cached
+                    continue
+            to_score.append(agent_id)
+        
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        
+        async def bounded(agent_id: str) -> AgentScore:
+            async with semaphore:
+                return await self._compute_agent_score(agent_id, agents[agent_id])
+        
+        scored = await asyncio.gather(*(bounded(agent_id) for agent_id in to_score))
+        
+        if scored:
+            self.score_history.record_many(
+                [(agent_score_to_dict(agent_score), digests[agent_score.agent_id]) for agent_score in scored]
+            )
+        triggered = []
+        for agent_score in scored:
+            self.latest_scores[agent_score.agent_id] = agent_score
+            results[agent_score.agent_id] = agent_score
+            triggers = self._collect_intervention_triggers(agent_score)
+            if triggers:
+                triggered.append((agent_score.agent_id, triggers))
+        if triggered:
+            await self._log_intervention_batch(triggered)
+        
+        logger.info(f"📊 Fleet scoring: {len(scored)} agents scored, {len(agents) - len(scored)} unchanged")
+        return {agent_id: results[agent_id] for agent_id in agents}
+    
+    def get_latest_score(self, agent_id: str) -> Optional[AgentScore]:
+        """Most recent score for an agent, from memory or the score history"""
+        agent_score = self.latest_scores.get(agent_id)
+        if agent_score is None:
+            data = self.score_history.load_latest(agent_id)
+            if data is not None:
+                agent_score = agent_score_from_dict(data)
+                self.latest_scores[agent_id] = agent_score
+        return agent_score
+    
+    async def _compute_agent_score(self, agent_id: str, agent_data: Dict[str, Any]) -> AgentScore:
+        """Analyze coherence and collapse risk for one agent without saving"""
         # Analyze coherence
         coherence_metrics = await self.coherence_analyzer.analyze_agent_coherence(agent_id, agent_data)
         
@@ -582,14 +794,6 @@ class CoherenceScoringEngine:
             collapse_metrics=collapse_metrics,
             last_updated=datetime.now(timezone.utc)
         )
-        
-        # Save score
-        await self._save_agent_score(agent_score)
-        
-        # Check for intervention triggers
-        await self._check_intervention_triggers(agent_score)
-        
-        logger.info(f"✅ Agent {agent_id} scored: coherence={coherence_score:.2f}, collapse_risk={collapse_score:.2f}")
         return agent_score
     
     def _calculate_overall_coherence(self, coherence_metrics: List[CoherenceMetric]) -> float:
@@ -624,45 +828,21 @@ class CoherenceScoringEngine:
         
         return weighted_sum / total_weight if total_weight > 0 else 0.0
     
-    async def _save_agent_score(self, agent_score: AgentScore):
-        """Save agent score to file"""
-        score_file = self.scores_path / f"{agent_score.agent_id}_score.yaml"
-        
-        # Convert to serializable format
-        score_dict = {
-            "agent_id": agent_score.agent_id,
-            "coherence_score": agent_score.coherence_score,
-            "collapse_score": agent_score.collapse_score,
-            "last_updated": agent_score.last_updated.isoformat(),
-            "coherence_metrics": [
-                {
-                    "category": metric.category.value,
-                    "value": metric.value,
-                    "confidence": metric.confidence,
-                    "measurement_time": metric.measurement_time.isoformat(),
-                    "contributing_factors": metric.contributing_factors,
-                    "trend_direction": metric.trend_direction
-                }
-                for metric in agent_score.coherence_metrics
-            ],
-            "collapse_metrics": [
-                {
-                    "factor": metric.factor.value,
-                    "risk_level": metric.risk_level,
-                    "urgency": metric.urgency,
-                    "measurement_time": metric.measurement_time.isoformat(),
-                    "indicators": metric.indicators,
-                    "intervention_suggestions": metric.intervention_suggestions
-                }
-                for metric in agent_score.collapse_metrics
-            ]
-        }
-        
-        with open(score_file, 'w') as f:
-            yaml.dump(score_dict, f, default_flow_style=False)
+    async def _save_agent_score(self, agent_score: AgentScore, input_digest: Optional[str] = None):
+        """Record agent score in the score history"""
+        self.latest_scores[agent_score.agent_id] = agent_score
+        self.score_history.record_many([(agent_score_to_dict(agent_score), input_digest)])
     
     async def _check_intervention_triggers(self, agent_score: AgentScore):
         """Check if intervention is needed based on scores"""
+        intervention_triggers = self._collect_intervention_triggers(agent_score)
+        
+        # Log and potentially trigger interventions
+        if intervention_triggers:
+            await self._log_intervention_triggers(agent_score.agent_id, intervention_triggers)
+    
+    def _collect_intervention_triggers(self, agent_score: AgentScore) -> List[Dict[str, Any]]:
+        """Intervention triggers raised by a score"""
         intervention_triggers = []
         
         # Critical coherence loss
@@ -700,23 +880,26 @@ class CoherenceScoringEngine:
                 "factors": [f.factor.value for f in urgent_collapse_factors]
             })
         
-        # Log and potentially trigger interventions
-        if intervention_triggers:
-            await self._log_intervention_triggers(agent_score.agent_id, intervention_triggers)
+        return intervention_triggers
     
     async def _log_intervention_triggers(self, agent_id: str, triggers: List[Dict[str, Any]]):
         """Log intervention triggers"""
-        log_entry = {
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-            "agent_id": agent_id,
-            "intervention_triggers": triggers
-        }
+        await self._log_intervention_batch([(agent_id, triggers)])
+    
+    async def _log_intervention_batch(self, batch: List[Tuple[str, List[Dict[str, Any]]]]):
+        """Append intervention triggers for several agents with one file write"""
+        timestamp = datetime.now(timezone.utc).isoformat()
+        lines = [
+            json.dumps({"timestamp": timestamp, "agent_id": agent_id, "intervention_triggers": triggers}) + '\n'
+            for agent_id, triggers in batch
+        ]
         
         log_file = self.vanta_path / "runtime" / "intervention_log.jsonl"
         with open(log_file, 'a') as f:
-            f.write(json.dumps(log_entry) + '\n')
+            f.writelines(lines)
         
-        logger.warning(f"⚠️ Intervention triggers for {agent_id}: {len(triggers)} issues detected")
+        for agent_id, triggers in batch:
+            logger.warning(f"⚠️ Intervention triggers for {agent_id}: {len(triggers)} issues detected")
     
     async def _background_scoring_loop(self):
         """Background loop for automatic scoring"""
@@ -754,13 +937,12 @@ class CoherenceScoringEngine:
             }
         }
         
-        for agent_id, agent_data in demo_agents.items():
-            await self.score_agent(agent_id, agent_data)
+        await self.score_fleet(demo_agents)
 
 # Factory function
-def create_coherence_scoring_engine(vanta_path: Path) -> CoherenceScoringEngine:
+def create_coherence_scoring_engine(vanta_path: Path, **kwargs) -> CoherenceScoringEngine:
     """Create coherence scoring engine"""
-    return CoherenceScoringEngine(vanta_path)
+    return CoherenceScoringEngine(vanta_path, **kwargs)
 
 if __name__ == "__main__":
     async def demo_coherence_scoring():
@@ -805,6 +987,6 @@ if __name__ == "__main__":
         for metric in agent_score.collapse_metrics:
             print(f"   - {metric.factor.value}: {metric.risk_level:.3f} (urgency: {metric.urgency:.3f})")
         
-        print(f"\n💾 Score saved to: {scoring_engine.scores_path}")
+        print(f"\n💾 Score saved to: {scoring_engine.score_history.db_path}")
     
     asyncio.run(demo_coherence_scoring())
\ No newline at end of file
@@ -5,34 +5,137 @@ Auto-generated under Domino Mode
 
 import os
 import re
+import sqlite3
+import threading
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Iterator, Optional, Tuple
 
-def scan_env_and_tools(path: Path) -> dict:
+from agent_core.ignore_rules import IgnoreRules
+from agent_core.scan_cache import ScanCache
+from agent_core.secret_detection import DetectionRule, SecretDetector
+
+SCANNED_SUFFIXES = {'.py', '.yaml', '.yml', '.md'}
+
+ENV_DETECTOR = SecretDetector([
+    DetectionRule("getenv", "env_key", r"os\.getenv\(['\"]([A-Z0-9_]+)['\"]\)"),
+    DetectionRule("OPENAI_API_KEY", "env_key", r"OpenAI", re.IGNORECASE),
+    DetectionRule("SummarizeTranscript", "tool", r"summarization|summarize", re.IGNORECASE),
+    DetectionRule("ChronoMeshSync", "tool", r"ChronoMesh", re.IGNORECASE),
+])
+
+def scan_content(content: str) -> dict:
     env_keys = set()
     tools = set()
-    env_patterns = [re.compile(r"os\.getenv\(['\"]([A-Z0-9_]+)['\"]\)")]
-    doc_patterns = {
-        "OPENAI_API_KEY": re.compile(r"OpenAI", re.IGNORECASE),
-        "SummarizeTranscript": re.compile(r"summarization|summarize", re.IGNORECASE),
-        "ChronoMeshSync": re.compile(r"ChronoMesh", re.IGNORECASE)
-    }
-
-    for file in path.rglob("*"):
-        if file.suffix in {'.py', '.yaml', '.yml', '.md'}:
+    for detection in ENV_DETECTOR.scan(content):
+        if detection.rule == "getenv":
+            env_keys.add(detection.value)
+        elif detection.category == "env_key":
+            env_keys.add(detection.rule)
+        else:
+            tools.add(detection.rule)
+    return {"env_keys": sorted(env_keys), "tools": sorted(tools)}
+
+# Open scan caches by database path in least-recently-used order, kept loaded
+# between scans; idle caches beyond MAX_OPEN_SCAN_CACHES are closed
+MAX_OPEN_SCAN_CACHES = 8
+_scan_caches = OrderedDict()
+_scan_cache_users = {}
+_scan_caches_lock = threading.Lock()
+
+def _close_idle_scan_caches():
+    """Close least recently used caches no scan is using until at most MAX_OPEN_SCAN_CACHES are open"""
+    for key in [key for key in _scan_caches if not _scan_cache_users.get(key)]:
+        if len(_scan_caches) <= MAX_OPEN_SCAN_CACHES:
+            break
+        try:
+            _scan_caches.pop(key).close()
+        except sqlite3.Error:
+            pass
+
+@contextmanager
+def open_scan_cache(db_path: Path) -> Iterator[Optional[ScanCache]]:
+    """The process-wide scan cache for a database, or None if it cannot be opened; flushed on exit"""
+    key = os.path.abspath(db_path)
+    with _scan_caches_lock:
+        cache = _scan_caches.get(key)
+        if cache is None:
+            try:
+                cache = _scan_caches[key] = ScanCache(key, namespace="env_scanner",
+                                                      ruleset_version=ENV_DETECTOR.ruleset_version)
+            except (OSError, sqlite3.Error):
+                cache = None
+        if cache is not None:
+            _scan_caches.move_to_end(key)
+            _scan_cache_users[key] = _scan_cache_users.get(key, 0) + 1
+            _close_idle_scan_caches()
+    if cache is None:
+        yield None
+        return
+    try:
+        yield cache
+    finally:
+        try:
+            cache.flush()
+        finally:
+            with _scan_caches_lock:
+                _scan_cache_users[key] -= 1
+                if not _scan_cache_users[key]:
+                    del _scan_cache_users[key]
+                _close_idle_scan_caches()
+
+def iter_project_files(path: Path, cache_path: Optional[Path] = None, max_workers: Optional[int] = None,
+                       ignore_rules: Optional[IgnoreRules] = None) -> Iterator[Tuple[str, dict]]:
+    """
+    (file, {"env_keys", "tools"}) for every scanned file in a project, streamed
+    as files are read. Ignored directories are pruned from the walk, files are
+    read and scanned on a thread pool, and unchanged files come from the scan
+    cache in the project's .vanta dir.
+    """
+    path = Path(path)
+    ignore_rules = ignore_rules or IgnoreRules(path)
+    max_workers = max_workers or min(8, (os.cpu_count() or 1) + 4)
+    with open_scan_cache(cache_path or path / ".vanta" / "scan_cache.db") as cache:
+
+        def scan_file(entry):
+            file, st = entry
             try:
-                content = file.read_text()
-                for pattern in env_patterns:
-                    env_keys.update(pattern.findall(content))
-                for key, pattern in doc_patterns.items():
-                    if pattern.search(content):
-                        if 'KEY' in key:
-                            env_keys.add(key)
-                        else:
-                            tools.add(key)
+                if cache is not None:
+                    return file, cache.scan_file(file, lambda data: scan_content(data.decode()), st)
+                return file, scan_content(Path(file).read_text())
             except Exception:
-                continue
+                return file, None
+
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            in_flight = deque()
+            for entry in ignore_rules.walk(SCANNED_SUFFIXES):
+                in_flight.append(pool.submit(scan_file, entry))
+                while len(in_flight) > max_workers * 4 or (in_flight and in_flight[0].done()):
+                    file, result = in_flight.popleft().result()
+                    if result is not None:
+                        yield file, result
+            while in_flight:
+                file, result = in_flight.popleft().result()
+                if result is not None:
+                    yield file, result
+
+def scan_project_files(path: Path, cache_path: Optional[Path] = None, max_workers: Optional[int] = None) -> dict:
+    """Per-file scan results ({file: {"env_keys", "tools"}}) for every scanned file in a project"""
+    return dict(iter_project_files(path, cache_path, max_workers))
+
+def merge_results(file_results) -> dict:
+    env_keys = set()
+    tools = set()
+    for result in file_results:
+        env_keys.update(result["env_keys"])
+        tools.update(result["tools"])
     return {"env_keys": sorted(env_keys), "tools": sorted(tools)}
 
+def scan_env_and_tools(path: Path, cache_path: Optional[Path] = None) -> dict:
+    return merge_results(result for _, result in iter_project_files(path, cache_path))
+
 if __name__ == "__main__":
     result = scan_env_and_tools(Path("test_project"))
     print("[SCAN RESULT]")
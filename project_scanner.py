@@ -1,42 +1,200 @@
 # project_scanner.py
 import os
+import re
 import glob
+import fnmatch
+import threading
 import yaml
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 
+GLOBSTAR = "**"
+_MAGIC = re.compile(r"[*?[]")
+_EXTENSION_SEGMENT = re.compile(r"^\*(\.[^*?\[.]+)$")
+
+# rule_dir -> {rule file: (mtime_ns, size, parsed rule)}
+_rule_cache = {}
+_rule_cache_lock = threading.Lock()
+
 def find_projects(root_path):
     return [f for f in Path(root_path).iterdir() if f.is_dir()]
 
 def load_rules(rule_dir):
+    """Parsed rules; files are only re-parsed when their mtime or size changes"""
     rules = []
+    with _rule_cache_lock:
+        cached = _rule_cache.get(str(rule_dir), {})
+    current = {}
     for rule_file in Path(rule_dir).glob("*.yaml"):
-        data = yaml.safe_load(Path(rule_file).read_text())
-        rules.append(data)
+        st = rule_file.stat()
+        entry = cached.get(rule_file)
+        if entry is None or entry[:2] != (st.st_mtime_ns, st.st_size):
+            entry = (st.st_mtime_ns, st.st_size, yaml.safe_load(Path(rule_file).read_text()))
+        current[rule_file] = entry
+        rules.append(entry[2])
+    with _rule_cache_lock:
+        _rule_cache[str(rule_dir)] = current
     return rules
 
+class _Node:
+    """Trie node over pattern segments; `mask` holds the rules reachable from it"""
+    __slots__ = ("literals", "extensions", "wildcards", "globstar", "is_globstar", "terminal", "dir_terminal", "mask")
+
+    def __init__(self, is_globstar=False):
+        self.literals = {}
+        self.extensions = {}     # '.py' -> node, for '*.py' segments
+        self.wildcards = {}      # segment -> (match, matches hidden names, node)
+        self.globstar = None
+        self.is_globstar = is_globstar
+        self.terminal = 0        # rules whose pattern ends here
+        self.dir_terminal = 0    # rules whose pattern ends here with a trailing slash
+        self.mask = 0
+
+class RuleIndex:
+    """
+    Rule `match` patterns compiled into one trie over path segments (fnmatch
+    translation per wildcard segment, `**` as a recursive node), matched
+    against a project in a single os.scandir walk with glob's semantics:
+    wildcards skip hidden names unless the segment starts with '.', and a
+    trailing slash matches directories only. Patterns the trie cannot express
+    (absolute, or containing '..') fall back to glob.
+    """
+
+    def __init__(self, patterns):
+        self.patterns = list(patterns)
+        self.root = _Node()
+        self.fallback = []       # (rule index, pattern) matched with glob
+        self.all_rules = 0
+        for index, pattern in enumerate(self.patterns):
+            if not pattern:
+                continue
+            self.all_rules |= 1 << index
+            segments = [segment for segment in pattern.split("/") if segment != "."]
+            if os.path.isabs(pattern) or ".." in segments:
+                self.fallback.append((index, pattern))
+                continue
+            dir_only = pattern.endswith("/")
+            segments = [segment for segment in segments if segment]
+            node = self.root
+            node.mask |= 1 << index
+            for segment in segments:
+                if segment == GLOBSTAR:
+                    if node.is_globstar:
+                        continue     # '**/**' is the same as '**'
+                    if node.globstar is None:
+                        node.globstar = _Node(is_globstar=True)
+                    node = node.globstar
+                elif not _MAGIC.search(segment):
+                    node = node.literals.setdefault(segment, _Node())
+                elif _EXTENSION_SEGMENT.match(segment):
+                    node = node.extensions.setdefault(segment[1:], _Node())
+                else:
+                    if segment not in node.wildcards:
+                        node.wildcards[segment] = (re.compile(fnmatch.translate(segment)).match,
+                                                   segment.startswith("."), _Node())
+                    node = node.wildcards[segment][2]
+                node.mask |= 1 << index
+            if dir_only:
+                node.dir_terminal |= 1 << index
+            else:
+                node.terminal |= 1 << index
+
+    @staticmethod
+    def _expand(nodes):
+        """Nodes reachable by letting a following '**' match zero segments"""
+        return [node.globstar for node in nodes if node.globstar is not None and node.globstar not in nodes]
+
+    def match(self, project_path):
+        """Bitmask of rules matching at least one path in the project"""
+        matched = 0
+        for index, pattern in self.fallback:
+            if glob.glob(str(Path(project_path) / pattern), recursive=True):
+                matched |= 1 << index
+
+        states = [self.root] + self._expand([self.root])
+        for node in states:
+            # '**' alone (or a pattern ending in it) matches the project directory itself
+            if node.is_globstar:
+                matched |= node.terminal | node.dir_terminal
+
+        stack = [(str(project_path), states)]
+        while stack and matched != self.all_rules:
+            directory, states = stack.pop()
+            try:
+                with os.scandir(directory) as entries:
+                    entries = list(entries)
+            except OSError:
+                continue
+            for entry in entries:
+                name = entry.name
+                hidden = name.startswith(".")
+                extension = name[name.rfind("."):] if not hidden and "." in name else None
+                following = []
+                for node in states:
+                    child = node.literals.get(name)
+                    if child is not None:
+                        following.append(child)
+                    if extension is not None and node.extensions:
+                        child = node.extensions.get(extension)
+                        if child is not None:
+                            following.append(child)
+                    for match, allow_hidden, child in node.wildcards.values():
+                        if (allow_hidden or not hidden) and match(name):
+                            following.append(child)
+                    if node.is_globstar and not hidden:
+                        following.append(node)
+                if not following:
+                    continue
+
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                for node in following:
+                    matched |= node.terminal
+                    if is_dir:
+                        matched |= node.dir_terminal
+                if not is_dir:
+                    continue
+                # A trailing '**' matches the directory itself as well as what is below it
+                expanded = self._expand(following)
+                for node in expanded:
+                    matched |= node.terminal | node.dir_terminal
+                # '**' does not descend through symlinks, so link cycles cannot loop
+                live = [node for node in following + expanded
+                        if node.mask & ~matched and (node.literals or node.extensions or node.wildcards
+                                                     or node.globstar or node.is_globstar)]
+                if live and entry.is_symlink():
+                    live = [node for node in live if not (node.is_globstar and node in states)]
+                if live:
+                    stack.append((entry.path, live))
+        return matched
+
+@lru_cache(maxsize=32)
+def compile_rules(patterns):
+    """Cached RuleIndex for a tuple of `match` patterns"""
+    return RuleIndex(patterns)
+
 def match_rules(project_path, rules):
-    matched_headers = []
-    for rule in rules:
-        pattern = rule.get("match")
-        if pattern:
-            full_pattern = str(project_path / pattern)
-            matched = glob.glob(full_pattern, recursive=True)
-            if matched:
-                matched_headers.append(rule.get("header", {}))
-    return matched_headers
-
-def scan_projects_with_rules(root_path, rule_dir):
+    index = compile_rules(tuple(rule.get("match") or None for rule in rules))
+    matched = index.match(project_path)
+    return [rule.get("header", {}) for i, rule in enumerate(rules) if matched >> i & 1]
+
+def scan_projects_with_rules(root_path, rule_dir, max_workers=None):
     print(f"[📁] Scanning root: {root_path}")
     projects = find_projects(root_path)
     rules = load_rules(rule_dir)
     results = {}
 
-    for proj in projects:
-        print(f"[🔍] Project: {proj.name}")
-        matched = match_rules(proj, rules)
-        results[proj.name] = matched
-        for m in matched:
-            print(f"  [✓] Rule matched: {m}")
+    # Each project is walked once for all rules; projects are walked in parallel
+    with ThreadPoolExecutor(max_workers=max_workers or min(32, (os.cpu_count() or 1) + 4)) as pool:
+        matches = pool.map(lambda proj: match_rules(proj, rules), projects)
+        for proj, matched in zip(projects, matches):
+            print(f"[🔍] Project: {proj.name}")
+            results[proj.name] = matched
+            for m in matched:
+                print(f"  [✓] Rule matched: {m}")
     return results
 
 if __name__ == "__main__":
@@ -46,4 +204,4 @@ if __name__ == "__main__":
     parser.add_argument("--rules", default="rules", help="Directory with YAML rule files")
     args = parser.parse_args()
 
-    scan_projects_with_rules(args.root, args.rules)
\ No newline at end of file
+    scan_projects_with_rules(args.root, args.rules)
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Benchmark: AccessMesh bind cost, secret fan-out queries and concurrent binds.
+
+Seeds a mesh of --projects bound projects, then times --binds binds with the
+previous store (whole mesh re-dumped to YAML per bind) and the current one
+(one appended log record per bind, periodic compaction), a "which projects
+use this secret" query (full scan of the loaded YAML vs the reverse index),
+and counts the bindings that survive --workers processes binding at once.
+
+Usage: python scripts/benchmarks/bench_access_mesh.py [--projects 2000] [--binds 100] [--workers 4]
+"""
+
+import argparse
+import logging
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import yaml
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from access_mesh import AccessMesh
+
+SECRETS = [f"SERVICE_{i}_TOKEN" for i in range(200)]
+TOOLS = ["openai", "anthropic", "github", "docker", "postgres", "redis"]
+
+
+class PreviousAccessMesh:
+    """The previous AccessMesh: load on open, re-dump everything per bind, no locking"""
+
+    def __init__(self, registry_path):
+        self.registry_path = registry_path
+        self.mesh = yaml.safe_load(registry_path.read_text()) or {} if registry_path.exists() else {}
+
+    def bind(self, project, tools, secrets):
+        self.mesh[project] = {"tools": sorted(tools), "secrets": sorted(secrets)}
+        self.registry_path.write_text(yaml.dump(self.mesh, sort_keys=False))
+
+
+def binding(rng):
+    return rng.sample(TOOLS, rng.randint(0, 3)), rng.sample(SECRETS, rng.randint(1, 6))
+
+
+def bind_worker(store, registry_path, worker, count):
+    for i in range(count):
+        try:
+            mesh = store(Path(registry_path))  # A separate bootstrap per bind, as the CLI does
+        except yaml.YAMLError:
+            continue  # The previous store can read a half-written file from another process
+        mesh.bind(f"worker_{worker}_{i}", ["github"], ["SHARED_TOKEN"])
+
+
+def timed(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--projects', type=int, default=2000)
+    parser.add_argument('--binds', type=int, default=100)
+    parser.add_argument('--workers', type=int, default=4)
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    rng = random.Random(11)
+    seed = {}
+    for i in range(args.projects):
+        tools, secrets = binding(rng)
+        seed[f"project_{i}"] = {"tools": sorted(tools), "secrets": sorted(secrets)}
+    updates = [(f"project_{rng.randrange(args.projects)}",) + binding(rng) for _ in range(args.binds)]
+
+    with tempfile.TemporaryDirectory() as workspace, open(os.devnull, 'w') as devnull:
+        sys.stdout, stdout = devnull, sys.stdout
+        try:
+            results = {}
+            for label, store in (("previous", PreviousAccessMesh), ("current", AccessMesh)):
+                registry = Path(workspace) / f"{label}.yaml"
+                registry.write_text(yaml.dump(seed, sort_keys=False))
+                mesh = store(registry)
+                results[label] = timed(lambda: [mesh.bind(*update) for update in updates])
+
+            lookups = rng.sample(SECRETS, 50)
+            previous_registry = Path(workspace) / "previous.yaml"
+            scan = timed(lambda: [[p for p, b in (yaml.safe_load(previous_registry.read_text()) or {}).items()
+                                   if s in b["secrets"]] for s in lookups[:5]]) / 5
+            mesh = AccessMesh(Path(workspace) / "current.yaml")
+            indexed = timed(lambda: [mesh.projects_using_secret(s) for s in lookups]) / len(lookups)
+
+            survived = {}
+            for label, store in (("previous", PreviousAccessMesh), ("current", AccessMesh)):
+                registry = Path(workspace) / f"race_{label}.yaml"
+                workers = [multiprocessing.Process(target=bind_worker, args=(store, str(registry), w, 50))
+                           for w in range(args.workers)]
+                for worker in workers:
+                    worker.start()
+                for worker in workers:
+                    worker.join()
+                survived[label] = len(store(registry).mesh)
+        finally:
+            sys.stdout = stdout
+
+    for label in ("previous", "current"):
+        print(f"{label:<9} {args.binds} binds into {args.projects} projects  {results[label]:7.2f}s  "
+              f"({results[label] / args.binds * 1e3:.2f} ms/bind)")
+    print(f"speedup   {results['previous'] / results['current']:.0f}x")
+    print(f"secret fan-out query: scan {scan * 1e3:.1f} ms, reverse index {indexed * 1e6:.1f} us")
+    for label in ("previous", "current"):
+        print(f"{label:<9} {args.workers} processes x 50 binds: {survived[label]} of {args.workers * 50} kept")
+
+
+if __name__ == '__main__':
+    main()
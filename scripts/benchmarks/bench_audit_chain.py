@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Benchmark: audit chain append throughput and verification latency.
+
+Appends --records audit records from --concurrency concurrent writers with
+group commit (fsync per batch), compares that to one fsync per record, and
+times chain verification: the previous full in-memory rescan versus the
+checkpointed log's default (since last checkpoint) and full verification.
+
+Usage: python scripts/benchmarks/bench_audit_chain.py [--records 20000] [--concurrency 64]
+"""
+
+import argparse
+import asyncio
+import hashlib
+import hmac
+import logging
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from agent_core.audit_chain_log import AuditChainLog, compute_audit_hash, sign
+
+KEY = "bench-signing-key"
+
+
+def make_record(log, n):
+    previous = log.head_hash
+    fields = dict(audit_id=f"audit_{n}", action_id=f"action_{n}", agent_id=f"agent_{n % 50}",
+                  execution_status="success", duration_ms=float(n % 1000))
+    audit_hash = compute_audit_hash(**fields, previous_hash=previous)
+    return dict(fields, action_type="bench", timestamp=datetime.now(timezone.utc), audit_hash=audit_hash,
+                previous_audit_hash=previous, digital_signature=sign(KEY, audit_hash))
+
+
+def legacy_verify(records):
+    for i, r in enumerate(records):
+        content = f"{r['audit_id']}{r['action_id']}{r['agent_id']}{r['execution_status']}{r['duration_ms']}{r['previous_audit_hash'] or ''}"
+        if r["audit_hash"] != hashlib.sha256(content.encode()).hexdigest():
+            return False
+        if r["digital_signature"] != hmac.new(KEY.encode(), r["audit_hash"].encode(), hashlib.sha256).hexdigest():
+            return False
+        if i and r["previous_audit_hash"] != records[i - 1]["audit_hash"]:
+            return False
+    return True
+
+
+def timed(label, fn, count=None):
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    rate = f"{count / elapsed:12,.0f} records/s" if count else ""
+    print(f"{label:40s} {elapsed * 1000:9.2f} ms {rate}")
+    return result
+
+
+async def writer(log, records, per_writer):
+    for _ in range(per_writer):
+        record = make_record(log, log.record_count)
+        records.append(record)
+        await log.append(record)
+
+
+async def run(args):
+    with tempfile.TemporaryDirectory() as tmp:
+        log = AuditChainLog(KEY, os.path.join(tmp, "grouped"), block_size=args.block_size, fsync=True)
+        records = []
+        per_writer = args.records // args.concurrency
+        start = time.perf_counter()
+        await asyncio.gather(*[writer(log, records, per_writer) for _ in range(args.concurrency)])
+        elapsed = time.perf_counter() - start
+        print(f"{'group commit append (fsync per batch)':40s} {elapsed * 1000:9.2f} ms {len(records) / elapsed:12,.0f} records/s")
+
+        single = AuditChainLog(KEY, os.path.join(tmp, "single"), block_size=args.block_size, fsync=True)
+        sample = min(2000, len(records))
+        start = time.perf_counter()
+        for _ in range(sample):
+            single.enqueue(make_record(single, single.record_count))
+            await single.flush()
+        elapsed = time.perf_counter() - start
+        print(f"{'one fsync per record':40s} {elapsed * 1000:9.2f} ms {sample / elapsed:12,.0f} records/s")
+
+        timed(f"previous full rescan ({len(records)} records)", lambda: legacy_verify(records))
+        timed("verify from last checkpoint", log.verify)
+        timed("verify full (Merkle roots)", lambda: log.verify(full=True))
+        proof = timed("inclusion proof", lambda: log.get_inclusion_proof("audit_17"))
+        timed("verify inclusion proof", lambda: log.verify_inclusion_proof(proof))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--records", type=int, default=20000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--block-size", type=int, default=256)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Benchmark: 20-step fan-out cascade, sequential vs. DAG execution.
+
+The cascade is one root step, 18 independent leaves and one join step. Each
+agent call sleeps for --step-ms to stand in for agent I/O. The same steps are
+run once as a linear profile (the pre-DAG behaviour) and once with declared
+dependencies.
+
+Usage: python scripts/benchmarks/bench_cascade_fanout.py [--step-ms 50] [--concurrency 8]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from vanta_seed.core.cascade_executor import CascadeExecutor
+from vanta_seed.core.cascade_profile_registry import CascadeProfileRegistry
+
+
+class SleepingVMC:
+    def __init__(self, step_seconds: float):
+        self.step_seconds = step_seconds
+
+    def execute_agent_task_sync(self, agent_id, task_type, task_data):
+        time.sleep(self.step_seconds)
+        return {"status": "success", "agent": agent_id}
+
+
+def build_profiles():
+    leaves = [f"leaf_{i}" for i in range(18)]
+    dag_steps = [{"name": "root", "agent": "root_agent"}]
+    dag_steps += [{"name": leaf, "agent": f"{leaf}_agent", "depends_on": "root"} for leaf in leaves]
+    dag_steps.append({"name": "join", "agent": "join_agent", "depends_on": leaves})
+    linear_steps = [{k: v for k, v in step.items() if k != "depends_on"} for step in dag_steps]
+    return [
+        {"profile_id": "fanout_linear", "agent_sequence": linear_steps},
+        {"profile_id": "fanout_dag", "agent_sequence": dag_steps},
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--step-ms", type=float, default=50.0)
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    registry = CascadeProfileRegistry()
+    executor = CascadeExecutor(SleepingVMC(args.step_ms / 1000.0), max_concurrency=args.concurrency, registry=registry)
+    registry.load_profiles(build_profiles())
+
+    for profile_id in ("fanout_linear", "fanout_dag"):
+        start = time.perf_counter()
+        result = executor.trigger_cascade(profile_id)
+        elapsed = time.perf_counter() - start
+        steps = len(result["step_results"]) - 1
+        print(f"{profile_id:15s} steps={steps:2d} wall={elapsed * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Benchmark: cascade profile loading with hundreds of profiles.
+
+Writes a synthetic agent_cascade_definitions.mdc with --profiles profiles and
+measures (1) the cold parse+compile, (2) constructing further CascadeExecutors
+against the shared registry, (3) a poll that finds the file unchanged, and (4)
+a reload after editing a single profile.
+
+Usage: python scripts/benchmarks/bench_cascade_registry.py [--profiles 500] [--steps 6]
+"""
+
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from vanta_seed.core.cascade_executor import CascadeExecutor
+from vanta_seed.core.cascade_profile_registry import get_cascade_profile_registry
+
+
+def render_mdc(profile_count: int, steps: int, marker: str = "v1") -> str:
+    lines = ["---", "description: synthetic cascades", "---", "profiles:"]
+    for p in range(profile_count):
+        lines.append(f'  - profile_id: "profile_{p}"')
+        lines.append(f'    description: "Synthetic profile {p} {marker if p == 0 else "v1"}"')
+        lines.append("    agent_sequence:")
+        for s in range(steps):
+            lines.append(f'      - agent: "agent_{s}"')
+            lines.append("        task_data:")
+            lines.append(f'          value: "{{{{ step_results.initial_data.key_{s} }}}}"')
+    return "\n".join(lines) + "\n"
+
+
+def timed(label, fn):
+    start = time.perf_counter()
+    result = fn()
+    print(f"{label:34s} {(time.perf_counter() - start) * 1000:9.2f} ms")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--profiles", type=int, default=500)
+    parser.add_argument("--steps", type=int, default=6)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "agent_cascade_definitions.mdc")
+        with open(path, "w") as f:
+            f.write(render_mdc(args.profiles, args.steps))
+
+        registry = timed("cold load + compile", lambda: get_cascade_profile_registry(path))
+        timed("100 more CascadeExecutors", lambda: [CascadeExecutor(None, registry=get_cascade_profile_registry(path)) for _ in range(100)])
+        timed("poll, file unchanged", registry.refresh)
+
+        with open(path, "w") as f:
+            f.write(render_mdc(args.profiles, args.steps, marker="v2"))
+        os.utime(path, ns=(time.time_ns(), time.time_ns() + 1_000_000))
+        timed("reload, one profile changed", lambda: registry.refresh(force=True))
+        print(f"profiles={len(registry.compiled)} reloads={registry.reload_count}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Benchmark: cli.py command latency, run in-process versus served by the daemon.
+
+Creates --projects small projects in a temporary HOME and times `python cli.py
+<command>` as a user runs it: each invocation with VANTA_NO_DAEMON=1 imports
+the whole stack and rebuilds its state, while with a daemon listening the
+client only forwards argv to the warm process (imports, AccessMesh, scan
+caches and derived keys kept between commands).
+
+Usage: python scripts/benchmarks/bench_cli_daemon.py [--projects 20] [--repeat 10]
+"""
+
+import argparse
+import logging
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from cli_daemon import control
+
+CLI = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'cli.py'))
+
+
+def build_projects(root, count):
+    projects = []
+    for i in range(count):
+        project = os.path.join(root, f"project_{i}")
+        os.makedirs(os.path.join(project, "src"))
+        for j in range(10):
+            with open(os.path.join(project, "src", f"module_{j}.py"), "w") as f:
+                f.write(f'import os\nTOKEN = os.getenv("API_TOKEN_{j}")\n# mcp://tool_{j}\n' * 20)
+        projects.append(project)
+    with open("secrets.yaml", "w") as f:
+        f.writelines(f"API_TOKEN_{j}: token-{j}\n" for j in range(10))
+    return projects
+
+
+def time_commands(commands, env, repeat):
+    latencies = []
+    for _ in range(repeat):
+        for argv in commands:
+            start = time.perf_counter()
+            result = subprocess.run([sys.executable, CLI, *argv], env=env, capture_output=True, text=True)
+            latencies.append(time.perf_counter() - start)
+            assert result.returncode == 0, result.stderr
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--projects', type=int, default=20)
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    with tempfile.TemporaryDirectory() as workspace:
+        os.chdir(workspace)
+        socket = os.path.join(workspace, "cli.sock")
+        env = dict(os.environ, HOME=workspace, VANTA_DAEMON_SOCKET=socket)
+        projects = build_projects(workspace, args.projects)
+        workloads = {
+            "scan": [["scan", project] for project in projects],
+            "link": [["link", project] for project in projects],
+        }
+        local_env = dict(env, VANTA_NO_DAEMON="1")
+        time_commands(workloads["link"], local_env, 1)  # First links are created outside the timings
+
+        daemon = subprocess.Popen([sys.executable, CLI, "daemon", "start"], env=env,
+                                  stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            while control("ping", socket) is None:
+                time.sleep(0.05)
+            for name, commands in workloads.items():
+                local = time_commands(commands, local_env, args.repeat)
+                time_commands(commands, env, 1)  # Warm the daemon's per-project state
+                served = time_commands(commands, env, args.repeat)
+                local_ms, served_ms = statistics.median(local) * 1e3, statistics.median(served) * 1e3
+                print(f"{name:5s} in-process {local_ms:8.1f} ms   daemon {served_ms:8.1f} ms   "
+                      f"({local_ms / served_ms:.1f}x, median of {len(local)})")
+        finally:
+            control("stop", socket)
+            daemon.wait(timeout=10)
+
+
+if __name__ == '__main__':
+    main()
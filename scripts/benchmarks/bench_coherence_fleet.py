@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Benchmark: scoring a fleet of agents with CoherenceScoringEngine.
+
+Scores --agents agents the previous way (score_agent one after another, one
+YAML file written per agent) and with score_fleet into the SQLite score
+history, then rescoring the fleet with --changed percent of agents whose
+input data changed.
+
+Usage: python scripts/benchmarks/bench_coherence_fleet.py [--agents 5000] [--changed 5]
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import yaml
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from coherence_scoring_engine import CoherenceScoringEngine, agent_score_to_dict
+
+
+def make_fleet(count, rng):
+    return {
+        f"agent_{i}": {
+            "task_completion_rate": rng.random(),
+            "resource_efficiency": rng.random(),
+            "avg_response_time_ms": rng.randint(50, 3000),
+            "archetypal_alignment": rng.choice(["athena", "prometheus", "unknown"]),
+            "trinity_role": rng.choice(["cube", "dodecahedron", "none"]),
+            "usage_frequency": rng.random(),
+            "conflicts_generated_last_week": rng.randint(0, 6),
+        }
+        for i in range(count)
+    }
+
+
+async def previous_scoring(engine, fleet):
+    """The previous path: sequential score_agent, one YAML file per agent"""
+    for agent_id, agent_data in fleet.items():
+        agent_score = await engine._compute_agent_score(agent_id, agent_data)
+        with open(engine.scores_path / f"{agent_id}_score.yaml", 'w') as f:
+            yaml.dump(agent_score_to_dict(agent_score), f, default_flow_style=False)
+        await engine._check_intervention_triggers(agent_score)
+
+
+async def main_async(args):
+    rng = random.Random(args.seed)
+    fleet = make_fleet(args.agents, rng)
+
+    with tempfile.TemporaryDirectory() as old_dir, tempfile.TemporaryDirectory() as new_dir:
+        engine = CoherenceScoringEngine(Path(old_dir), auto_scoring=False)
+        start = time.perf_counter()
+        await previous_scoring(engine, fleet)
+        previous_seconds = time.perf_counter() - start
+        print(f"per-file YAML, sequential:  {previous_seconds:6.2f}s")
+
+        engine = CoherenceScoringEngine(Path(new_dir), auto_scoring=False, max_concurrency=args.concurrency)
+        start = time.perf_counter()
+        await engine.score_fleet(fleet)
+        cold_seconds = time.perf_counter() - start
+        print(f"score_fleet, cold:          {cold_seconds:6.2f}s  ({previous_seconds / cold_seconds:.1f}x)")
+
+        for agent_id in rng.sample(sorted(fleet), args.agents * args.changed // 100):
+            fleet[agent_id] = dict(fleet[agent_id], task_completion_rate=rng.random())
+        start = time.perf_counter()
+        await engine.score_fleet(fleet)
+        warm_seconds = time.perf_counter() - start
+        print(f"score_fleet, {args.changed}% changed:    {warm_seconds:6.2f}s  ({previous_seconds / warm_seconds:.1f}x)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--agents', type=int, default=5000)
+    parser.add_argument('--changed', type=int, default=5)
+    parser.add_argument('--concurrency', type=int, default=64)
+    parser.add_argument('--seed', type=int, default=5)
+    logging.disable(logging.CRITICAL)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Benchmark: HistoricalAccuracyTracker ingestion and similar-decision lookups.
+
+Ingests --decisions completed decisions with the previous full recomputation
+per insert (np.corrcoef over the whole history) and with the streaming
+statistics, then times --queries nearest-context lookups with a linear scan
+versus the k-d tree index over --index-size decisions.
+
+Usage: python scripts/benchmarks/bench_decision_tracker.py [--decisions 5000] [--index-size 100000]
+"""
+
+import argparse
+import math
+import os
+import random
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'vanta_2_0', 'src', 'core')))
+
+from decision_confidence_scoring import HistoricalAccuracyTracker, HistoricalDecision, decision_context_features
+
+AREAS = ["security", "performance", "integration", "compliance", "ai_systems", "architecture"]
+
+
+def random_context(rng):
+    return {
+        "complexity_score": rng.random(),
+        "strategic_importance": rng.choice(["low", "medium", "high", "critical"]),
+        "timeline_weeks": rng.randint(1, 52),
+        "required_expertise": rng.sample(AREAS, rng.randint(1, 3)),
+    }
+
+
+def make_decisions(count, rng):
+    return [
+        HistoricalDecision(
+            decision_id=f"decision_{i}", decision_date=datetime(2025, 1, 1), confidence_score=rng.random(),
+            predicted_success=rng.random(), actual_outcome=rng.random(), outcome_date=None,
+            lessons_learned=[], decision_context=random_context(rng)
+        )
+        for i in range(count)
+    ]
+
+
+def previous_ingest(decisions):
+    """The previous tracker: re-filter and np.corrcoef over all decisions on every insert"""
+    history = []
+    for decision in decisions:
+        history.append(decision)
+        completed = [d for d in history if d.actual_outcome is not None]
+        predicted = [d.predicted_success for d in completed]
+        actual = [d.actual_outcome for d in completed]
+        if len(predicted) > 1:
+            np.corrcoef(predicted, actual)
+        sum(1 for p, a in zip(predicted, actual) if (p >= 0.7 and a >= 0.7) or (p < 0.7 and a < 0.7))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--decisions', type=int, default=5000)
+    parser.add_argument('--index-size', type=int, default=100000)
+    parser.add_argument('--queries', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=11)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    decisions = make_decisions(args.decisions, rng)
+    start = time.perf_counter()
+    previous_ingest(decisions)
+    previous_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    tracker = HistoricalAccuracyTracker()
+    for decision in decisions:
+        tracker.add_historical_decision(decision)
+    streaming_seconds = time.perf_counter() - start
+    print(f"ingest {args.decisions} decisions: previous {previous_seconds:6.2f}s  "
+          f"streaming {streaming_seconds:6.3f}s  ({previous_seconds / streaming_seconds:.0f}x)")
+
+    tracker = HistoricalAccuracyTracker()
+    indexed = make_decisions(args.index_size, rng)
+    start = time.perf_counter()
+    for decision in indexed:
+        tracker.add_historical_decision(decision)
+    print(f"ingest {args.index_size} decisions into the index: {time.perf_counter() - start:6.2f}s")
+
+    features = [(decision_context_features(d.decision_context), d) for d in indexed]
+    queries = [random_context(rng) for _ in range(args.queries)]
+
+    start = time.perf_counter()
+    for context in queries:
+        query = decision_context_features(context)
+        sorted(features, key=lambda item: math.dist(query, item[0]))[:10]
+    scan_ms = (time.perf_counter() - start) * 1000 / len(queries)
+
+    start = time.perf_counter()
+    for context in queries:
+        tracker.get_similar_decision_outcomes(context)
+    index_ms = (time.perf_counter() - start) * 1000 / len(queries)
+    print(f"nearest-10 lookup over {args.index_size}: linear scan {scan_ms:7.2f} ms  "
+          f"k-d tree {index_ms:7.3f} ms  ({scan_ms / index_ms:.0f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Benchmark: env/tool discovery and bootstrap on a project with vendored dependencies.
+
+Builds a project of --sources source files next to a vendored node_modules
+(--vendored files, many of them .md/.yaml/.py) and a .git directory, then
+times the previous scan (rglob over everything, one thread, no cache), the
+current discovery (pruned walk, thread pool, cold and warm scan cache) and
+a full `cli.py bootstrap` run in-process with each.
+
+Usage: python scripts/benchmarks/bench_env_scanner.py [--sources 500] [--vendored 30000] [--workers N]
+"""
+
+import argparse
+import contextlib
+import io
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+import cli
+import env_scanner
+from env_scanner import scan_content, scan_env_and_tools
+
+
+def previous_scan(path, cache_path=None):
+    """The previous scan_env_and_tools: every file under the project, read and scanned in turn"""
+    env_keys, tools = set(), set()
+    for file in Path(path).rglob("*"):
+        if file.suffix in {'.py', '.yaml', '.yml', '.md'}:
+            try:
+                result = scan_content(file.read_text())
+            except Exception:
+                continue
+            env_keys.update(result["env_keys"])
+            tools.update(result["tools"])
+    return {"env_keys": sorted(env_keys), "tools": sorted(tools)}
+
+
+def build_project(root, sources, vendored):
+    rng = random.Random(12)
+    filler = "def handler(event):\n    return event\n" * 20
+    for i in range(sources):
+        path = root / f"src/module_{i % 40}/file_{i}.py"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(filler + (f"TOKEN = os.getenv('SERVICE_{i % 7}_TOKEN')\n" if i % 25 == 0 else ""))
+    (root / "README.md").write_text("Summarize transcripts with the OpenAI API\n")
+    for i in range(vendored):
+        path = root / f"node_modules/pkg_{i % 300}/lib/file_{i}{rng.choice(['.js', '.md', '.yaml', '.py', '.json'])}"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(filler)
+    for i in range(2000):
+        path = root / f".git/objects/{i % 256:02x}/object_{i}.py"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(filler)
+    (root / ".gitignore").write_text("node_modules/\n")
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--sources', type=int, default=500)
+    parser.add_argument('--vendored', type=int, default=30000)
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    with tempfile.TemporaryDirectory() as workspace:
+        workspace = Path(workspace)
+        os.environ["HOME"] = str(workspace)
+        os.chdir(workspace)
+        (workspace / "secrets.yaml").write_text("SERVICE_1_TOKEN: t1\n")
+        project = workspace / "project"
+        build_project(project, args.sources, args.vendored)
+        time.sleep(2.1)  # Let the files age out of the scan cache's racily-clean window
+
+        previous_s, expected = timed(lambda: previous_scan(project))
+        print(f"scan: previous (rglob, 1 thread)   {previous_s:7.2f}s  {expected['env_keys']}")
+        cold_s, result = timed(lambda: env_scanner.merge_results(
+            r for _, r in env_scanner.iter_project_files(project, max_workers=args.workers)))
+        print(f"scan: pruned + parallel, cold      {cold_s:7.2f}s  ({previous_s / cold_s:.0f}x)")
+        warm_s, result = timed(lambda: scan_env_and_tools(project))
+        print(f"scan: pruned + parallel, cached    {warm_s:7.2f}s  ({previous_s / warm_s:.0f}x)")
+        # node_modules is vendored; the keys its files mention are not the project's
+        assert set(result["env_keys"]) <= set(expected["env_keys"])
+
+        for label, scan in (("previous", previous_scan), ("current", scan_env_and_tools)):
+            cli.scan_env_and_tools = scan
+            with contextlib.redirect_stdout(io.StringIO()):
+                elapsed, _ = timed(lambda: cli.cmd_bootstrap(project))
+            print(f"bootstrap: {label:<24} {elapsed:7.2f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Benchmark: governance decisions per second with a large rule set.
+
+Registers --rules synthetic rules spread across every DecisionContext and
+measures rule evaluation throughput for (1) the previous approach - scan all
+rules and eval() each condition string - and (2) the context index with
+precompiled conditions, plus full make_governance_decision throughput.
+
+Usage: python scripts/benchmarks/bench_governance_rules.py [--rules 1000] [--decisions 2000]
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import random
+import sys
+import time
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from agent_core.runtime_governance_engine import (
+    AutonomyLevel, DecisionContext, GovernanceLevel, GovernanceRule, create_runtime_governance_engine
+)
+
+CONDITIONS = [
+    "response_time > baseline * {k}",
+    "compliance_score < 0.{k} and region in ('eu', 'us')",
+    "system_health < 0.{k} or error_rate > {k}",
+    "threat_level >= 'HIGH' and load >= 0.{k}",
+]
+
+
+def build_rules(count):
+    now = datetime.now(timezone.utc)
+    contexts = list(DecisionContext)
+    return [
+        GovernanceRule(
+            rule_id=f"rule_{i}", level=GovernanceLevel.TACTICAL, context=contexts[i % len(contexts)],
+            condition=CONDITIONS[i % len(CONDITIONS)].format(k=(i % 9) + 1), action=f"action_{i}",
+            priority=i % 200, autonomy_level=AutonomyLevel.GUIDED, created_at=now, last_modified=now
+        )
+        for i in range(count)
+    ]
+
+
+def legacy_evaluate(rules, context, situation):
+    applicable = []
+    for rule in rules.values():
+        if not rule.is_active or rule.context != context:
+            continue
+        try:
+            if eval(rule.condition, {"__builtins__": {}}, {**situation, "datetime": datetime, "time": time}):
+                applicable.append(rule)
+        except Exception:
+            pass
+    applicable.sort(key=lambda r: r.priority, reverse=True)
+    return applicable
+
+
+def situations(count):
+    rng = random.Random(7)
+    contexts = list(DecisionContext)
+    return [
+        (contexts[i % len(contexts)], {
+            "response_time": rng.uniform(0, 10), "baseline": 2.0, "compliance_score": rng.random(),
+            "region": rng.choice(["eu", "us", "ap"]), "system_health": rng.random(),
+            "error_rate": rng.uniform(0, 10), "threat_level": rng.choice(["LOW", "HIGH", "MEDIUM"]),
+            "load": rng.random(),
+        })
+        for i in range(count)
+    ]
+
+
+def report(label, count, elapsed):
+    print(f"{label:34s} {count / elapsed:12,.0f} decisions/s  ({elapsed * 1000:8.1f} ms)")
+
+
+async def run(args):
+    engine = create_runtime_governance_engine("bench")
+    for rule in build_rules(args.rules):
+        engine.rules[rule.rule_id] = rule
+    cases = situations(args.decisions)
+
+    start = time.perf_counter()
+    legacy = [legacy_evaluate(engine.rules, context, situation) for context, situation in cases]
+    report("eval() scan (previous)", len(cases), time.perf_counter() - start)
+
+    start = time.perf_counter()
+    compiled = [await engine._evaluate_rules(context, situation) for context, situation in cases]
+    report("indexed + compiled rules", len(cases), time.perf_counter() - start)
+    assert [[r.rule_id for r in rules] for rules in legacy] == [[r.rule_id for r in rules] for rules in compiled]
+
+    engine.learning_enabled = False
+    start = time.perf_counter()
+    for context, situation in cases:
+        await engine.make_governance_decision(context, situation)
+    report("make_governance_decision", len(cases), time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rules", type=int, default=1000)
+    parser.add_argument("--decisions", type=int, default=2000)
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
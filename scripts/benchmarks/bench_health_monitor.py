@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Benchmark: time-to-rollback-decision with slow and hanging health checks.
+
+Registers --checks probes taking 10-100 ms, --hanging of which never return
+and one of which reports an error. Compares the previous sequential sweep
+(capped at --old-cap seconds, since it never finishes on its own) with the
+concurrent runner using --timeout second deadlines, and measures how soon
+the background monitor reaches a rollback decision.
+
+Usage: python scripts/benchmarks/bench_health_monitor.py [--checks 100] [--hanging 5] [--timeout 1.0]
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'vanta_2_0', 'src', 'core')))
+
+from rollback_recovery_manager import HealthMonitor
+
+
+def make_checks(count: int, hanging: int, rng: random.Random):
+    async def hang():
+        await asyncio.Event().wait()
+
+    def probe(delay, metrics):
+        async def check():
+            await asyncio.sleep(delay)
+            return metrics
+        return check
+
+    checks = {}
+    hanging_ids = set(rng.sample(range(1, count), hanging))
+    for i in range(count):
+        if i in hanging_ids:
+            checks[f"check_{i}"] = hang
+        elif i == 0:
+            checks[f"check_{i}"] = probe(0.05, {"error": "connection refused"})
+        else:
+            checks[f"check_{i}"] = probe(rng.uniform(0.01, 0.1), {"cpu_usage": 20})
+    return checks
+
+
+async def sequential_sweep(monitor: HealthMonitor):
+    """The previous run_all_health_checks: one awaited check after another, no deadline"""
+    for check_id, check_info in monitor.health_checks.items():
+        await check_info['function']()
+
+
+async def main_async(args):
+    rng = random.Random(args.seed)
+    config = {"check_timeout_seconds": args.timeout, "max_concurrent_checks": args.concurrency,
+              "consecutive_failures_threshold": 1, "check_interval_seconds": 5,
+              "evaluation_interval_seconds": 0.05}
+
+    monitor = HealthMonitor(config)
+    for check_id, check in make_checks(args.checks, args.hanging, rng).items():
+        await monitor.register_health_check(check_id, check, "service")
+
+    start = time.perf_counter()
+    try:
+        await asyncio.wait_for(sequential_sweep(monitor), timeout=args.old_cap)
+        print(f"sequential sweep:      {time.perf_counter() - start:6.2f}s")
+    except asyncio.TimeoutError:
+        print(f"sequential sweep:      no decision after {args.old_cap:.0f}s (blocked on a hung check)")
+
+    start = time.perf_counter()
+    results = await monitor.run_all_health_checks()
+    triggered, reason = monitor.should_trigger_rollback()
+    print(f"concurrent sweep:      {time.perf_counter() - start:6.2f}s  "
+          f"{len(results)} results, rollback={triggered}")
+
+    monitor = HealthMonitor(config)
+    for check_id, check in make_checks(args.checks, args.hanging, rng).items():
+        await monitor.register_health_check(check_id, check, "service")
+    decided = asyncio.get_running_loop().create_future()
+
+    async def on_rollback(reason):
+        if not decided.done():
+            decided.set_result(reason)
+
+    start = time.perf_counter()
+    await monitor.start_monitoring(on_rollback)
+    reason = await decided
+    print(f"monitor decision:      {time.perf_counter() - start:6.2f}s  ({reason})")
+    await monitor.stop_monitoring()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--checks', type=int, default=100)
+    parser.add_argument('--hanging', type=int, default=5)
+    parser.add_argument('--timeout', type=float, default=1.0)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--old-cap', type=float, default=10.0)
+    parser.add_argument('--seed', type=int, default=3)
+    logging.disable(logging.CRITICAL)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Benchmark: IdentityKernel mutation cost with a large identity.
+
+Builds an identity with --context-keys MCP context entries and --history
+prior mutations, then times --mutations single-key updates the previous way
+(full canonical-JSON hash plus full JSON rewrite per mutation) and with the
+journal, followed by identity summaries and rollbacks to early mutations.
+
+Usage: python scripts/benchmarks/bench_identity_journal.py [--context-keys 2000] [--mutations 200]
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+from dataclasses import asdict
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from agent_core.identity_kernel import IdentityKernel
+
+
+def previous_mutation(kernel, key, value):
+    """The previous update_mcp_context: full hash and full rewrite on every call"""
+    kernel.mcp_context[key] = value
+    kernel._record_mutation("mcp_context_update", f"Updated MCP context: {[key]}")
+    canonical = {
+        "agent_id": kernel.agent_id,
+        "anchor_traits": {k: asdict(v) for k, v in kernel.anchor_traits.items()},
+        "symbolic_self": asdict(kernel.symbolic_self),
+        "mcp_context": kernel.mcp_context
+    }
+    kernel.identity_hash = hashlib.sha256(json.dumps(canonical, sort_keys=True).encode()).hexdigest()
+    with open(kernel.identity_store_path, 'w', encoding='utf-8') as f:
+        json.dump(kernel._serialize_identity(), f, indent=2, ensure_ascii=False, default=str)
+
+
+def build_kernel(directory, args):
+    kernel = IdentityKernel("bench", identity_store_path=os.path.join(directory, "identity_bench.json"))
+    kernel.update_mcp_context({f"endpoint_{i}": {"url": f"https://svc{i}.local", "weight": i}
+                               for i in range(args.context_keys)})
+    for i in range(args.history):
+        kernel.evolve_symbolic_self({"capabilities": [f"cap_{i}"]}, "history")
+    return kernel
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--context-keys', type=int, default=2000)
+    parser.add_argument('--history', type=int, default=1000)
+    parser.add_argument('--mutations', type=int, default=200)
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    with tempfile.TemporaryDirectory() as old_dir, tempfile.TemporaryDirectory() as new_dir:
+        kernel = build_kernel(old_dir, args)
+        start = time.perf_counter()
+        for i in range(args.mutations):
+            previous_mutation(kernel, f"endpoint_{i}", {"weight": -i})
+        previous_ms = (time.perf_counter() - start) * 1000 / args.mutations
+
+        kernel = build_kernel(new_dir, args)
+        start = time.perf_counter()
+        for i in range(args.mutations):
+            kernel.update_mcp_context({f"endpoint_{i}": {"weight": -i}})
+        journal_ms = (time.perf_counter() - start) * 1000 / args.mutations
+        print(f"mutation: full rewrite {previous_ms:7.2f} ms  journal {journal_ms:6.3f} ms  "
+              f"({previous_ms / journal_ms:.0f}x)")
+
+        start = time.perf_counter()
+        for _ in range(100):
+            kernel.validate_identity_integrity()
+        full_ms = (time.perf_counter() - start) * 10
+        start = time.perf_counter()
+        for _ in range(100):
+            kernel.get_identity_summary()
+        summary_ms = (time.perf_counter() - start) * 10
+        print(f"summary:  full validation {full_ms:7.2f} ms  incremental {summary_ms:6.3f} ms")
+
+        start = time.perf_counter()
+        for i in range(20):
+            kernel.rollback_to_mutation(kernel.mutation_lineage[10 + i * (args.history // 20)].mutation_id)
+        rollback_ms = (time.perf_counter() - start) * 1000 / 20
+        print(f"rollback into {len(kernel.mutation_lineage)} mutations: {rollback_ms:6.2f} ms")
+
+        start = time.perf_counter()
+        IdentityKernel("bench", identity_store_path=kernel.identity_store_path)
+        print(f"reload (snapshot + journal replay): {(time.perf_counter() - start) * 1000:6.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Benchmark: identity mutation throughput for a fleet of agents.
+
+Creates --agents identities and applies --mutations MCP context updates to
+each, round-robin: the previous full JSON rewrite per mutation, one journal
+file per kernel (without and with an fsync per mutation), and a
+SharedIdentityStore flushing batched transactions (synchronous=NORMAL and
+FULL). Then times loading one identity from each layout.
+
+Usage: python scripts/benchmarks/bench_identity_store.py [--agents 1000] [--mutations 10]
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from agent_core.identity_kernel import IdentityKernel
+from agent_core.identity_store import SharedIdentityStore
+
+
+class FsyncJournalKernel(IdentityKernel):
+    """Per-kernel journal made durable the only way a single file can be: fsync every append"""
+
+    def _write_journal_line(self, seq, line):
+        with open(self.journal_path, 'ab') as f:
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+
+
+def previous_update(kernel, updates):
+    """The previous update_mcp_context persistence: rewrite the whole identity file"""
+    kernel.mcp_context.update(updates)
+    kernel._record_mutation("mcp_context_update", f"Updated MCP context: {list(updates)}")
+    kernel.validate_identity_integrity()
+    with open(kernel.identity_store_path, 'w', encoding='utf-8') as f:
+        json.dump(kernel._serialize_identity(), f, indent=2, ensure_ascii=False, default=str)
+
+
+def run(label, kernels, mutate, args, finish=None):
+    start = time.perf_counter()
+    for step in range(args.mutations):
+        for kernel in kernels:
+            mutate(kernel, {"step": step, f"tool_{step}": ["scan", "report"]})
+    if finish:
+        finish()
+    elapsed = time.perf_counter() - start
+    total = args.mutations * len(kernels)
+    print(f"{label:<34} {elapsed:6.2f}s  {total / elapsed:9.0f} mutations/s")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--agents', type=int, default=1000)
+    parser.add_argument('--mutations', type=int, default=10)
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    with tempfile.TemporaryDirectory() as directory:
+        def file_kernels(name, kernel_class=IdentityKernel):
+            return [kernel_class(f"agent_{i}", identity_store_path=os.path.join(directory, name, f"agent_{i}.json"))
+                    for i in range(args.agents)]
+
+        run("full rewrite per mutation", file_kernels("previous"), previous_update, args)
+        journal_kernels = file_kernels("journal")
+        run("journal file per kernel", journal_kernels, lambda k, u: k.update_mcp_context(u), args)
+        run("journal file per kernel + fsync", file_kernels("fsync", FsyncJournalKernel),
+            lambda k, u: k.update_mcp_context(u), args)
+
+        for synchronous in ("NORMAL", "FULL"):
+            store = SharedIdentityStore(os.path.join(directory, f"identities_{synchronous}.db"),
+                                        synchronous=synchronous)
+            store_kernels = [store.get_kernel(f"agent_{i}") for i in range(args.agents)]
+            store.flush()
+            flushes = store.stats["flushes"]
+            run(f"shared store, synchronous={synchronous}", store_kernels,
+                lambda k, u: k.update_mcp_context(u), args, store.flush)
+            print(f"  {store.stats['flushes'] - flushes} batched transactions")
+            store.close()
+
+        start = time.perf_counter()
+        IdentityKernel("agent_7", identity_store_path=journal_kernels[7].identity_store_path)
+        file_ms = (time.perf_counter() - start) * 1000
+        store = SharedIdentityStore(os.path.join(directory, "identities_NORMAL.db"), flush_interval=None)
+        start = time.perf_counter()
+        store.get_kernel("agent_7")
+        print(f"load one identity: journal file {file_ms:.2f} ms  shared store (lazy) "
+              f"{(time.perf_counter() - start) * 1000:.2f} ms")
+        store.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Benchmark: project_scanner rule matching across many projects.
+
+Generates --projects synthetic projects and --rules YAML rules (a mix of
+literal paths, '*.ext', '**' and character-class patterns), then times the
+previous matcher (one recursive glob per rule per project, YAML re-parsed
+per scan) against scan_projects_with_rules (one compiled rule index, one
+os.scandir walk per project, projects walked in parallel, rules cached).
+
+Usage: python scripts/benchmarks/bench_project_scanner.py [--projects 500] [--rules 200] [--workers N]
+"""
+
+import argparse
+import contextlib
+import glob
+import io
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import yaml
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from project_scanner import find_projects, load_rules, scan_projects_with_rules
+
+EXTENSIONS = ['py', 'js', 'ts', 'go', 'rs', 'java', 'yaml', 'json', 'md', 'toml', 'cfg', 'sql']
+LAYOUT = ['src', 'src/app', 'src/app/models', 'src/lib', 'tests', 'tests/unit', 'docs', 'config', 'scripts']
+
+
+def build_projects(root, count):
+    rng = random.Random(3)
+    for p in range(count):
+        project = os.path.join(root, "projects", f"project_{p}")
+        for directory in LAYOUT:
+            os.makedirs(os.path.join(project, directory), exist_ok=True)
+        os.makedirs(os.path.join(project, ".git", "objects"), exist_ok=True)
+        for i in range(rng.randint(40, 120)):
+            directory = rng.choice(LAYOUT)
+            with open(os.path.join(project, directory, f"file_{i}.{rng.choice(EXTENSIONS)}"), 'w') as f:
+                f.write("")
+
+
+def build_rules(root, count):
+    rng = random.Random(8)
+    rule_dir = os.path.join(root, "rules")
+    os.makedirs(rule_dir)
+    for r in range(count):
+        kind = r % 5
+        if kind == 0:
+            pattern = f"**/*.{rng.choice(EXTENSIONS)}"
+        elif kind == 1:
+            pattern = f"{rng.choice(LAYOUT)}/file_{rng.randint(0, 150)}.{rng.choice(EXTENSIONS)}"
+        elif kind == 2:
+            pattern = f"src/**/file_{rng.randint(0, 150)}.*"
+        elif kind == 3:
+            pattern = f"{rng.choice(['config', 'docs', 'scripts'])}/*.{rng.choice(EXTENSIONS)}"
+        else:
+            pattern = f"**/missing_{r}/[abc]*.lock"
+        with open(os.path.join(rule_dir, f"rule_{r}.yaml"), 'w') as f:
+            yaml.safe_dump({"match": pattern, "header": {"rule": r}}, f)
+    return rule_dir
+
+
+def previous_scan(root_path, rule_dir):
+    """The previous scan: YAML parsed per call, one recursive glob per rule per project"""
+    rules = [yaml.safe_load(Path(rule_file).read_text()) for rule_file in Path(rule_dir).glob("*.yaml")]
+    results = {}
+    for proj in find_projects(root_path):
+        matched_headers = []
+        for rule in rules:
+            pattern = rule.get("match")
+            if pattern and glob.glob(str(proj / pattern), recursive=True):
+                matched_headers.append(rule.get("header", {}))
+        results[proj.name] = matched_headers
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--projects', type=int, default=500)
+    parser.add_argument('--rules', type=int, default=200)
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    with tempfile.TemporaryDirectory() as root:
+        build_projects(root, args.projects)
+        rule_dir = build_rules(root, args.rules)
+        projects_root = os.path.join(root, "projects")
+
+        start = time.perf_counter()
+        previous = previous_scan(projects_root, rule_dir)
+        previous_s = time.perf_counter() - start
+        print(f"glob per rule per project   {previous_s:7.2f}s")
+
+        load_rules(rule_dir)    # Warm the rule cache as a long-running caller would
+        for label in ("compiled index, cold rules", "compiled index, cached rules"):
+            if label.endswith("cold rules"):
+                for rule_file in Path(rule_dir).glob("*.yaml"):
+                    os.utime(rule_file, None)
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                results = scan_projects_with_rules(projects_root, rule_dir, max_workers=args.workers)
+            elapsed = time.perf_counter() - start
+            assert {k: sorted(h["rule"] for h in v) for k, v in results.items()} == \
+                {k: sorted(h["rule"] for h in v) for k, v in previous.items()}
+            print(f"{label:<27} {elapsed:7.2f}s  ({previous_s / elapsed:.0f}x)")
+
+        matched = sum(len(v) for v in previous.values())
+        print(f"{args.rules} rules x {args.projects} projects, {matched} matches")
+
+
+if __name__ == '__main__':
+    main()
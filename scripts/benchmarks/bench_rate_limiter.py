@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Benchmark: action rate limit checks per second across many distinct agents.
+
+Runs --checks checks spread over --agents agent ids (each agent is hit
+repeatedly) against (1) the previous per-agent list of datetimes that is
+filtered on every check, (2) ActionRateLimiter with the in-memory store for
+both algorithms, and (3) the shared SQLite store on a smaller sample.
+
+Usage: python scripts/benchmarks/bench_rate_limiter.py [--agents 100000] [--checks 500000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from agent_core.action_rate_limiter import ActionRateLimiter
+
+
+def legacy_check(rate_limiter, agent_id, max_rate):
+    current_time = datetime.now(timezone.utc)
+    recent_actions = rate_limiter.setdefault(agent_id, [])
+    cutoff_time = current_time - timedelta(minutes=1)
+    recent_actions = [t for t in recent_actions if t > cutoff_time]
+    rate_limiter[agent_id] = recent_actions
+    allowed = len(recent_actions) < max_rate
+    if allowed:
+        recent_actions.append(current_time)
+    return allowed
+
+
+def report(label, count, elapsed, extra=""):
+    print(f"{label:34s} {count / elapsed:12,.0f} checks/s  ({elapsed * 1000:9.1f} ms) {extra}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--agents", type=int, default=100_000)
+    parser.add_argument("--checks", type=int, default=500_000)
+    parser.add_argument("--rate", type=int, default=30)
+    parser.add_argument("--sqlite-checks", type=int, default=20_000)
+    args = parser.parse_args()
+
+    rng = random.Random(11)
+    # Skewed traffic: a few hot agents and a long tail of distinct ones
+    agents = [f"agent_{min(int(rng.paretovariate(1.2)) - 1, args.agents - 1) if i % 2 else (i // 2) % args.agents}"
+              for i in range(args.checks)]
+
+    legacy_state = {}
+    start = time.perf_counter()
+    for agent_id in agents:
+        legacy_check(legacy_state, agent_id, args.rate)
+    report("datetime list (previous)", len(agents), time.perf_counter() - start, f"keys={len(legacy_state)}")
+
+    for algorithm in ("sliding_window", "token_bucket"):
+        limiter = ActionRateLimiter({"max_action_rate": args.rate, "algorithm": algorithm})
+        start = time.perf_counter()
+        for agent_id in agents:
+            limiter.check(agent_id, "secret_rotation", "high")
+        report(f"in-memory {algorithm}", len(agents), time.perf_counter() - start, f"keys={len(limiter.store)}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        limiter = ActionRateLimiter({"max_action_rate": args.rate, "sqlite_path": os.path.join(tmp, "rl.db")})
+        sample = agents[:args.sqlite_checks]
+        start = time.perf_counter()
+        for agent_id in sample:
+            limiter.check(agent_id, "secret_rotation", "high")
+        report("shared SQLite sliding_window", len(sample), time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    main()
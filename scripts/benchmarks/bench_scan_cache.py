@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Benchmark: repeated secret discovery scans with the incremental scan cache.
+
+Generates a synthetic tree of --files source files and runs
+SecretDiscoveryScanner over it without a cache, then with a ScanCache: a
+cold scan that fills it, a no-change rescan, and a rescan after touching
+--touched files (new mtime, same content) and editing --edited files.
+
+Usage: python scripts/benchmarks/bench_scan_cache.py [--files 100000] [--touched 1000] [--edited 100]
+"""
+
+import argparse
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from agent_core.scan_cache import RACY_WINDOW_NS, ScanCache
+from agent_core.secret_discovery import SecretDiscoveryScanner
+
+SECRET_PATTERNS = {
+    "api_key": [r"(?i)api[_-]?key['\"\s]*[:=]['\"\s]*([a-zA-Z0-9_\-]{20,})"],
+    "password": [r"(?i)password['\"\s]*[:=]['\"\s]*([a-zA-Z0-9_\-]{8,})"],
+    "secret": [r"(?i)secret['\"\s]*[:=]['\"\s]*([a-zA-Z0-9_\-]{16,})",
+               r"(?i)token['\"\s]*[:=]['\"\s]*([a-zA-Z0-9_\-]{20,})"],
+    "crypto": [r"-----BEGIN [A-Z ]+-----[\s\S]*?-----END [A-Z ]+-----"],
+}
+
+
+def build_tree(root, files):
+    rng = random.Random(5)
+    filler = "def handler(event, context):\n    return {'status': 200, 'body': event.get('body')}\n"
+    paths = []
+    for i in range(files):
+        directory = os.path.join(root, f"service_{i % 50}", f"module_{i % 997}")
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"file_{i}.py")
+        body = filler * rng.randint(1, 60)
+        if i % 40 == 0:
+            body += f'API_KEY = "{rng.getrandbits(128):032x}"\n'
+        with open(path, 'w') as f:
+            f.write(body)
+        paths.append(path)
+    return paths
+
+
+def run(label, root, cache=None):
+    scanner = SecretDiscoveryScanner(SECRET_PATTERNS, cache=cache)
+    start = time.perf_counter()
+    found = sum(1 for _ in scanner.scan([root]))
+    elapsed = time.perf_counter() - start
+    stats = scanner.stats
+    print(f"{label:<30} {elapsed:7.2f}s  {stats['files_scanned'] / elapsed:9.0f} files/s  "
+          f"{stats['files_cached']:6d} cached  {stats['bytes_scanned'] / 1e6:7.1f} MB read  ({found} secrets)")
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--files', type=int, default=100000)
+    parser.add_argument('--touched', type=int, default=1000)
+    parser.add_argument('--edited', type=int, default=100)
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    with tempfile.TemporaryDirectory() as root, tempfile.TemporaryDirectory() as state:
+        paths = build_tree(root, args.files)
+        # Let the newest files age out of the racily-clean window
+        time.sleep(RACY_WINDOW_NS / 1e9 + 0.1)
+
+        run("no cache", root)
+        db_path = os.path.join(state, "scan_cache.db")
+        with ScanCache(db_path, namespace="secret_discovery") as cache:
+            run("cache: cold", root, cache)
+        with ScanCache(db_path, namespace="secret_discovery") as cache:
+            run("cache: no-change rescan", root, cache)
+
+        rng = random.Random(9)
+        for path in rng.sample(paths, args.touched):
+            os.utime(path, None)
+        for path in rng.sample(paths, args.edited):
+            with open(path, 'a') as f:
+                f.write("password = 'hunter2hunter2'\n")
+        with ScanCache(db_path, namespace="secret_discovery") as cache:
+            run(f"cache: {args.touched} touched, {args.edited} edited", root, cache)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Benchmark: SecretBroker start-up, resolve and writes on a large encrypted store.
+
+Builds a secrets_secure/ store of --secrets encrypted values and compares
+the previous broker (PBKDF2 twice, every value decrypted and the YAML parsed
+with the pure-Python loader on start-up; the whole file re-read and
+rewritten per added key) with the current one (one derivation cached in the
+keyring, lazy per-key decryption, batched atomic writes).
+
+Usage: python scripts/benchmarks/bench_secret_broker.py [--secrets 10000] [--resolve 20] [--writes 10]
+"""
+
+import argparse
+import base64
+import hashlib
+import logging
+import os
+import secrets
+import statistics
+import sys
+import tempfile
+import time
+
+import yaml
+from cryptography.fernet import Fernet
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from secret_broker import KeyRing, SecretBroker, derive_key
+
+PASSWORD = "benchmark-master-password"
+
+
+def build_store(count):
+    salt = secrets.token_hex(16)
+    key = derive_key(PASSWORD, salt)
+    os.makedirs("secrets_secure")
+    with open("secrets_secure/config.yaml", "w") as f:
+        yaml.dump({"salt": salt, "key_hash": key.hex()}, f)
+    cipher = Fernet(base64.b64encode(key))
+    with open("secrets_secure/encrypted_secrets.yaml", "w") as f:
+        yaml.dump({f"SECRET_{i}": cipher.encrypt(os.urandom(24).hex().encode()).decode() for i in range(count)}, f)
+
+
+def previous_open():
+    """The previous SecretBroker.__init__ in secure mode"""
+    with open("secrets_secure/config.yaml") as f:
+        config = yaml.safe_load(f)
+    salt = bytes.fromhex(config["salt"])
+    if hashlib.pbkdf2_hmac('sha256', PASSWORD.encode(), salt, 100000).hex() != config["key_hash"]:
+        raise ValueError("Invalid master password")
+    cipher = Fernet(base64.b64encode(hashlib.pbkdf2_hmac('sha256', PASSWORD.encode(), salt, 100000, dklen=32)))
+    with open("secrets_secure/encrypted_secrets.yaml") as f:
+        encrypted = yaml.safe_load(f)
+    return cipher, {key: cipher.decrypt(value.encode()).decode() for key, value in encrypted.items()}
+
+
+def previous_add(cipher, key, value):
+    with open("secrets_secure/encrypted_secrets.yaml") as f:
+        encrypted = yaml.safe_load(f) or {}
+    encrypted[key] = cipher.encrypt(value.encode()).decode()
+    with open("secrets_secure/encrypted_secrets.yaml", "w") as f:
+        yaml.dump(encrypted, f)
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--secrets', type=int, default=10000)
+    parser.add_argument('--resolve', type=int, default=20)
+    parser.add_argument('--writes', type=int, default=10)
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    with tempfile.TemporaryDirectory() as workspace:
+        os.chdir(workspace)
+        build_store(args.secrets)
+        keys = [f"SECRET_{i}" for i in range(0, args.secrets, max(1, args.secrets // args.resolve))][:args.resolve]
+
+        previous_s, (cipher, previous_values) = timed(previous_open)
+        print(f"previous: open                {previous_s * 1e3:9.1f} ms")
+
+        keyring = KeyRing()
+        cold_s, broker = timed(lambda: SecretBroker(None, secure=True, password=PASSWORD, keyring=keyring))
+        print(f"current: open, cold keyring   {cold_s * 1e3:9.1f} ms  ({previous_s / cold_s:.1f}x)")
+        warm_s, broker = timed(lambda: SecretBroker(None, secure=True, password=PASSWORD, keyring=keyring))
+        print(f"current: open, cached key     {warm_s * 1e3:9.1f} ms  ({previous_s / warm_s:.0f}x)")
+
+        latencies = []
+        for key in keys:
+            elapsed, resolved = timed(lambda: broker.resolve([key]))
+            assert resolved[key] == previous_values[key]
+            latencies.append(elapsed)
+        print(f"current: resolve, first use   {statistics.median(latencies) * 1e6:9.1f} us/key (median)")
+        elapsed, _ = timed(lambda: broker.resolve(keys))
+        print(f"current: resolve, decrypted   {elapsed / len(keys) * 1e6:9.1f} us/key")
+
+        previous_s, _ = timed(lambda: [previous_add(cipher, f"NEW_{i}", "value") for i in range(args.writes)])
+        print(f"previous: {args.writes} add_secret      {previous_s * 1e3:9.1f} ms")
+
+        def batched():
+            with broker.batch():
+                for i in range(args.writes):
+                    broker.add_secret(f"BATCH_{i}", "value")
+        batch_s, _ = timed(batched)
+        print(f"current: {args.writes} in one batch     {batch_s * 1e3:9.1f} ms  ({previous_s / batch_s:.0f}x)")
+
+
+if __name__ == '__main__':
+    main()
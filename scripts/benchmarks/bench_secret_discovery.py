@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Benchmark: hardcoded secret discovery throughput over a large source tree.
+
+Generates a synthetic tree of --files source/config files (plus ignored
+node_modules and .git directories), then scans it the previous way (rglob
+filtered after the walk, read_text per file, sequentially, without the
+1000-file cap) and with SecretDiscoveryScanner. Reports files/s, MB/s and
+the latency until the first batch of results is streamed back.
+
+Usage: python scripts/benchmarks/bench_secret_discovery.py [--files 100000] [--workers N]
+"""
+
+import argparse
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from agent_core.secret_discovery import SCANNABLE_EXTENSIONS, SecretDiscoveryScanner, scan_content
+
+SECRET_PATTERNS = {
+    "api_key": [r"(?i)api[_-]?key['\"\s]*[:=]['\"\s]*([a-zA-Z0-9_\-]{20,})",
+                r"(?i)apikey['\"\s]*[:=]['\"\s]*([a-zA-Z0-9_\-]{20,})"],
+    "password": [r"(?i)password['\"\s]*[:=]['\"\s]*([a-zA-Z0-9_\-]{8,})",
+                 r"(?i)passwd['\"\s]*[:=]['\"\s]*([a-zA-Z0-9_\-]{8,})"],
+    "secret": [r"(?i)secret['\"\s]*[:=]['\"\s]*([a-zA-Z0-9_\-]{16,})",
+               r"(?i)token['\"\s]*[:=]['\"\s]*([a-zA-Z0-9_\-]{20,})"],
+    "database": [r"(?i)db[_-]?password['\"\s]*[:=]['\"\s]*(['\"][^'\"]{6,}['\"])",
+                 r"(?i)database[_-]?url['\"\s]*[:=]['\"\s]*(['\"][^'\"]{10,}['\"])"],
+    "crypto": [r"-----BEGIN [A-Z ]+-----[\s\S]*?-----END [A-Z ]+-----",
+               r"(?i)private[_-]?key['\"\s]*[:=]['\"\s]*([a-zA-Z0-9+/=]{100,})"],
+}
+
+EXTENSIONS = ['.py', '.js', '.yaml', '.json', '.sh', '.env', '.md', '.png']
+
+
+def build_tree(root, files):
+    rng = random.Random(7)
+    filler = "def handler(event, context):\n    return {'status': 200, 'body': event.get('body')}\n"
+    for i in range(files):
+        directory = os.path.join(root, f"service_{i % 50}", f"module_{i % 997}")
+        os.makedirs(directory, exist_ok=True)
+        lines = filler * rng.randint(1, 60)
+        if i % 40 == 0:
+            lines += f'API_KEY = "{rng.getrandbits(128):032x}"\n'
+        with open(os.path.join(directory, f"file_{i}{EXTENSIONS[i % len(EXTENSIONS)]}"), 'w') as f:
+            f.write(lines)
+    for ignored in ("node_modules", ".git"):
+        directory = os.path.join(root, ignored, "deep", "tree")
+        os.makedirs(directory, exist_ok=True)
+        for i in range(files // 10):
+            with open(os.path.join(directory, f"vendored_{i}.js"), 'w') as f:
+                f.write(filler * 20)
+
+
+def previous_scan(root):
+    """The previous discover_hardcoded_secrets loop, uncapped"""
+    patterns = tuple((t, p) for t, ps in SECRET_PATTERNS.items() for p in ps)
+    files = [p for p in Path(root).rglob('*')
+             if p.is_file() and p.suffix.lower() in SCANNABLE_EXTENSIONS
+             and not any(part.startswith('.') for part in p.relative_to(root).parts)
+             and 'node_modules' not in p.parts]
+    found = total_bytes = 0
+    for path in files:
+        content = path.read_text(encoding='utf-8', errors='ignore')
+        total_bytes += len(content)
+        found += len(scan_content(path, content, patterns))
+    return len(files), total_bytes, found
+
+
+def report(label, files, total_bytes, found, elapsed):
+    print(f"{label:<28} {elapsed:7.2f}s  {files / elapsed:9.0f} files/s  "
+          f"{total_bytes / elapsed / 1e6:7.1f} MB/s  ({files} files, {found} secrets)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--files', type=int, default=100000)
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    with tempfile.TemporaryDirectory() as root:
+        start = time.perf_counter()
+        build_tree(root, args.files)
+        print(f"built {args.files} files in {time.perf_counter() - start:.1f}s")
+
+        start = time.perf_counter()
+        files, total_bytes, found = previous_scan(root)
+        report("sequential rglob", files, total_bytes, found, time.perf_counter() - start)
+
+        scanner = SecretDiscoveryScanner(SECRET_PATTERNS, max_workers=args.workers)
+        start = time.perf_counter()
+        found = sum(1 for _ in scanner.scan([root]))
+        elapsed = time.perf_counter() - start
+        report(f"scanner ({scanner.max_workers} workers)", scanner.stats["files_scanned"],
+               scanner.stats["bytes_scanned"], found, elapsed)
+
+        start = time.perf_counter()
+        batches = scanner.iter_batch_results([root])
+        next(batches)
+        print(f"first batch streamed after {(time.perf_counter() - start) * 1000:.0f} ms")
+        batches.close()
+
+
+if __name__ == '__main__':
+    main()
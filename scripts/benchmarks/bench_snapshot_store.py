@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Benchmark: incremental content-addressed snapshots vs full zip snapshots.
+
+Builds a --files file tree, takes a baseline snapshot, modifies --change-pct
+percent of the files, then times a second snapshot with the previous
+single-threaded ZIP_DEFLATED path and with ContentAddressedSnapshotStore,
+reporting bytes written by each. Restore of the changed files is timed too.
+
+Usage: python scripts/benchmarks/bench_snapshot_store.py [--files 50000] [--change-pct 1]
+"""
+
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'vanta_2_0', 'src', 'core')))
+
+from rollback_recovery_manager import ContentAddressedSnapshotStore
+
+WORDS = ["vanta", "agent", "rollback", "snapshot", "cascade", "governance", "audit", "vault"]
+
+
+def build_tree(root: Path, files: int, rng: random.Random) -> list:
+    paths = []
+    for i in range(files):
+        directory = root / f"pkg_{i // 500}"
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"module_{i}.py"
+        path.write_text(" ".join(rng.choice(WORDS) for _ in range(rng.randint(50, 800))) + "\n")
+        paths.append(path)
+    return paths
+
+
+def zip_snapshot(source: Path, backup_path: Path) -> int:
+    """The previous FileSystemBackupManager path: full DEFLATE archive of every file"""
+    with zipfile.ZipFile(backup_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
+        for file_path in source.rglob('*'):
+            if file_path.is_file():
+                zipf.write(file_path, file_path.relative_to(source.parent))
+    return backup_path.stat().st_size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--files', type=int, default=50000)
+    parser.add_argument('--change-pct', type=float, default=1.0)
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    workdir = Path(tempfile.mkdtemp(prefix='bench_snapshot_'))
+    try:
+        source = workdir / 'src'
+        print(f"Building {args.files} files...")
+        paths = build_tree(source, args.files, rng)
+        store = ContentAddressedSnapshotStore(workdir / 'cas')
+
+        _, baseline = store.create_snapshot('baseline', [str(source)])
+        print(f"baseline content-addressed snapshot: {baseline.duration_seconds:.2f}s, "
+              f"{baseline.bytes_written / 1e6:.1f} MB written")
+
+        changed = rng.sample(paths, max(1, int(len(paths) * args.change_pct / 100)))
+        for path in changed:
+            path.write_text(path.read_text() + f"# changed {rng.random()}\n")
+        print(f"Modified {len(changed)} files ({args.change_pct}%)")
+
+        start = time.perf_counter()
+        zip_bytes = zip_snapshot(source, workdir / 'incremental.zip')
+        zip_seconds = time.perf_counter() - start
+
+        _, incremental = store.create_snapshot('incremental', [str(source)])
+
+        print(f"zip (previous):        {zip_seconds:7.2f}s  {zip_bytes / 1e6:9.2f} MB written")
+        print(f"content-addressed:     {incremental.duration_seconds:7.2f}s  "
+              f"{incremental.bytes_written / 1e6:9.2f} MB written "
+              f"({incremental.files_reused} reused, {incremental.files_stored} stored)")
+
+        start = time.perf_counter()
+        result = store.restore_snapshot('baseline', [str(source)])
+        print(f"restore to baseline:   {time.perf_counter() - start:7.2f}s  "
+              f"{result['files_written']} files rewritten, {result['files_unchanged']} unchanged")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
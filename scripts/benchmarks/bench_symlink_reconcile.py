@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Benchmark: re-linking many projects with the previous per-link calls vs reconciliation.
+
+Creates --projects projects that each link a .env and --tools tools, then
+re-links all of them: the previous link_env/link_tool (unlink and recreate
+every link, one print per call) against reconcile_projects (readlink diff,
+only changed links swapped in by atomic rename), unchanged and after
+retargeting --changed tools. Counts the link mutations a file watcher would see.
+
+Usage: python scripts/benchmarks/bench_symlink_reconcile.py [--projects 2000] [--tools 20] [--changed 2]
+"""
+
+import argparse
+import contextlib
+import io
+import logging
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from symlink_manager import LinkAction, ProjectLinks, reconcile_projects
+
+
+def previous_link(project_path, source, name):
+    """The previous link_env/link_tool body"""
+    link = project_path / name
+    if link.exists() or link.is_symlink():
+        link.unlink()
+    link.symlink_to(source.resolve())
+    print(f"[✓] Linked {source.name} -> {name}")
+
+
+def previous_relink(specs):
+    for spec in specs:
+        previous_link(spec.project_path, spec.env_source, ".env")
+        (spec.project_path / "tools").mkdir(exist_ok=True)
+        for source in spec.tool_sources:
+            previous_link(spec.project_path, source, f"tools/{source.name}")
+    return sum(1 + len(spec.tool_sources) for spec in specs)
+
+
+def timed(fn):
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = fn()
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--projects', type=int, default=2000)
+    parser.add_argument('--tools', type=int, default=20)
+    parser.add_argument('--changed', type=int, default=2)
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    with tempfile.TemporaryDirectory() as workspace:
+        workspace = Path(workspace)
+        tools_root = workspace / "vanta" / "tools"
+        retargeted_root = workspace / "vanta" / "tools_v2"
+        for root in (tools_root, retargeted_root):
+            root.mkdir(parents=True)
+            for t in range(args.tools):
+                (root / f"tool_{t}.mcp").write_text(f"# MCP tool: tool_{t}")
+        envs = workspace / "vanta" / "envs"
+        envs.mkdir()
+
+        specs = []
+        for p in range(args.projects):
+            project = workspace / "projects" / f"project_{p}"
+            project.mkdir(parents=True)
+            env = envs / f"project_{p}.env"
+            env.write_text("KEY=value\n")
+            specs.append(ProjectLinks(project, env, [tools_root / f"tool_{t}.mcp" for t in range(args.tools)],
+                                      managed_tools_root=workspace / "vanta"))
+        reconcile_projects(specs)
+
+        previous_s, mutations = timed(lambda: previous_relink(specs))
+        print(f"previous, unchanged          {previous_s:7.2f}s  {mutations * 2} link mutations")
+        plan_s, plan = timed(lambda: reconcile_projects(specs, dry_run=True))
+        print(f"reconcile plan (dry run)     {plan_s:7.2f}s  {len(plan.changes)} changes planned")
+        current_s, report = timed(lambda: reconcile_projects(specs))
+        print(f"reconcile, unchanged         {current_s:7.2f}s  {len(report.changes)} link mutations  "
+              f"({previous_s / current_s:.0f}x)")
+
+        for spec in specs:
+            for t in range(args.changed):
+                spec.tool_sources[t] = retargeted_root / f"tool_{t}.mcp"
+        previous_s, mutations = timed(lambda: previous_relink(specs))
+        print(f"previous, {args.changed} tools retargeted  {previous_s:7.2f}s  {mutations * 2} link mutations")
+        for spec in specs:
+            for t in range(args.changed):
+                spec.tool_sources[t] = tools_root / f"tool_{t}.mcp"
+        current_s, report = timed(lambda: reconcile_projects(specs))
+        replaced = report.counts()["replace"]
+        assert replaced == args.projects * args.changed and report.counts()[LinkAction.CREATE.name.lower()] == 0
+        print(f"reconcile, {args.changed} tools retargeted {current_s:7.2f}s  {replaced} link mutations  "
+              f"({previous_s / current_s:.0f}x)")
+
+
+if __name__ == '__main__':
+    main()
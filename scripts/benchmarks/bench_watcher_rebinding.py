@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Benchmark: rebinding a watched project after a checkout-style burst of edits.
+
+Creates a project of --files source files in a scratch workspace (its own
+secrets.yaml, access mesh and HOME), then rewrites every file at once, as a
+`git checkout` would. The previous watcher ran `python3 cli.py bootstrap` in
+a subprocess for every modify event; the RebindingEngine behind a real
+watchdog observer coalesces the burst and rebinds in-process.
+
+Usage: python scripts/benchmarks/bench_watcher_rebinding.py [--files 200] [--debounce 0.5]
+"""
+
+import argparse
+import contextlib
+import io
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from watchdog.observers import Observer
+
+from watcher_daemon import ProjectChangeHandler, RebindingEngine
+
+CLI = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'cli.py'))
+
+
+def write_files(project, files, revision):
+    paths = []
+    for i in range(files):
+        path = project / f"pkg_{i % 10}" / f"module_{i}.py"
+        path.parent.mkdir(exist_ok=True)
+        # The burst changes one binding (file 0's key) among many irrelevant edits
+        key = f"SERVICE_{i % 5}_TOKEN" if i else f"SERVICE_{5 + revision}_TOKEN"
+        path.write_text(f"import os\n# revision {revision}\nTOKEN = os.getenv('{key}')\n")
+        paths.append(path)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--files', type=int, default=200)
+    parser.add_argument('--debounce', type=float, default=0.5)
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    with tempfile.TemporaryDirectory() as workspace:
+        workspace = Path(workspace)
+        os.environ["HOME"] = str(workspace)
+        os.chdir(workspace)
+        (workspace / "secrets.yaml").write_text("SERVICE_1_TOKEN: t1\nSERVICE_6_TOKEN: t6\n")
+        project = workspace / "project"
+        project.mkdir()
+        paths = write_files(project, args.files, 0)
+
+        # Previous watcher: one bootstrap subprocess per modify event, run serially
+        start = time.perf_counter()
+        for _ in paths:
+            subprocess.run([sys.executable, CLI, "bootstrap", str(project)], capture_output=True, check=False)
+        previous_s = time.perf_counter() - start
+        print(f"subprocess per event     {previous_s:7.2f}s  {len(paths)} bootstraps")
+
+        engine = RebindingEngine(workspace / "secrets.yaml", workspace / "shared_resources.yaml",
+                                 debounce=args.debounce)
+        engine.add_project(project)
+        observer = Observer()
+        observer.schedule(ProjectChangeHandler(engine), str(project), recursive=True)
+        engine.start()
+        observer.start()
+        try:
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                write_files(project, args.files, 1)
+                while engine.stats["events"] < len(paths):
+                    time.sleep(0.01)
+                engine.wait_idle(timeout=60)
+            elapsed = time.perf_counter() - start
+        finally:
+            observer.stop()
+            observer.join()
+            engine.stop()
+        stats = engine.stats
+        print(f"debounced, in-process    {elapsed:7.2f}s  {stats['runs']} runs, {stats['links']} rebinds "
+              f"for {stats['events']} events (includes {args.debounce}s debounce)  ({previous_s / elapsed:.0f}x)")
+
+
+if __name__ == '__main__':
+    main()
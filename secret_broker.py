@@ -5,108 +5,258 @@ Auto-generated under Domino Mode
 
 import yaml
 import os
+import stat
 import getpass
 import hashlib
+import hmac
+import threading
+import time
+from contextlib import contextmanager
+from collections.abc import Mapping
 from pathlib import Path
-from cryptography.fernet import Fernet
+from cryptography.fernet import Fernet, InvalidToken
 import base64
 
+PBKDF2_ITERATIONS = 100000
+KEY_CACHE_TTL = 900  # Seconds a derived key stays unlocked in the process keyring
+
+_Loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+_Dumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+class KeyRing:
+    """
+    Derived encryption keys held in memory for `ttl` seconds, so PBKDF2 runs
+    once per process (per store and password) instead of once per broker.
+    Entries are looked up by a salted digest of the password, never the
+    password itself.
+    """
+
+    def __init__(self, ttl=KEY_CACHE_TTL):
+        self.ttl = ttl
+        self._keys = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _slot(salt, key_hash, password):
+        return (salt, key_hash, hashlib.blake2b(password.encode(), key=bytes.fromhex(salt)[:64]).digest())
+
+    def get(self, salt, key_hash, password):
+        slot = self._slot(salt, key_hash, password)
+        with self._lock:
+            entry = self._keys.get(slot)
+            if entry is None:
+                return None
+            if entry[1] <= time.monotonic():
+                del self._keys[slot]
+                return None
+            return entry[0]
+
+    def put(self, salt, key_hash, password, key):
+        with self._lock:
+            now = time.monotonic()
+            for slot in [slot for slot, entry in self._keys.items() if entry[1] <= now]:
+                del self._keys[slot]
+            self._keys[self._slot(salt, key_hash, password)] = (key, now + self.ttl)
+
+    def clear(self):
+        with self._lock:
+            self._keys.clear()
+
+KEYRING = KeyRing()
+
+def derive_key(password, salt):
+    """The store key; its hex form is also the stored password hash (PBKDF2-SHA256 yields 32 bytes)"""
+    return hashlib.pbkdf2_hmac('sha256', password.encode(), bytes.fromhex(salt), PBKDF2_ITERATIONS, dklen=32)
+
+def unlock(config, password, keyring=KEYRING):
+    """Verify the master password and return the derived key, from the keyring when possible"""
+    salt, key_hash = config['salt'], config['key_hash']
+    key = keyring.get(salt, key_hash, password) if keyring is not None else None
+    if key is None:
+        key = derive_key(password, salt)
+        if not hmac.compare_digest(key.hex(), key_hash):
+            raise ValueError("Invalid master password")
+        if keyring is not None:
+            keyring.put(salt, key_hash, password, key)
+    return key
+
+def _write_atomic(path: Path, data: dict):
+    """Replace `path` with `data` as YAML, keeping the file's permissions (new files are 0600)"""
+    try:
+        mode = stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        mode = 0o600
+    temp_path = path.with_name(path.name + ".tmp")
+    try:
+        os.unlink(temp_path)  # Left over by an interrupted write
+    except FileNotFoundError:
+        pass
+    # Created private, so the secrets are never readable under a looser mode, then given the file's mode
+    fd = os.open(temp_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o600)
+    with os.fdopen(fd, "w") as f:
+        yaml.dump(data, f, Dumper=_Dumper)
+        f.flush()
+        os.fsync(f.fileno())
+    os.chmod(temp_path, mode)
+    os.replace(temp_path, path)
+
+class EncryptedSecretStore:
+    """
+    The encrypted secrets file as {key: Fernet token}. The parsed file is
+    reused while its mtime and size are unchanged; updates merge into the
+    current file and replace it atomically, so a batch is one write.
+    """
+
+    # Shared by every store on the same file: resolved path -> lock, (fingerprint, tokens)
+    _locks = {}
+    _parsed = {}
+    _guard = threading.Lock()
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._key = str(self.path.resolve())
+        with self._guard:
+            self._lock = self._locks.setdefault(self._key, threading.Lock())
+
+    def load(self) -> dict:
+        st = self.path.stat()
+        fingerprint = (st.st_mtime_ns, st.st_size)
+        with self._guard:
+            cached = self._parsed.get(self._key)
+        if cached is not None and cached[0] == fingerprint:
+            return cached[1]
+        with open(self.path, "r") as f:
+            tokens = yaml.load(f, Loader=_Loader) or {}
+        with self._guard:
+            self._parsed[self._key] = (fingerprint, tokens)
+        return tokens
+
+    def update(self, tokens: dict):
+        with self._lock:
+            current = dict(self.load()) if self.path.exists() else {}
+            current.update(tokens)
+            _write_atomic(self.path, current)
+            st = self.path.stat()
+            with self._guard:
+                self._parsed[self._key] = ((st.st_mtime_ns, st.st_size), current)
+
+class LazySecrets(Mapping):
+    """Read-only view of the encrypted store that decrypts a value on first access"""
+
+    def __init__(self, broker):
+        self._broker = broker
+
+    def __getitem__(self, key):
+        value = self._broker.get_secret(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __iter__(self):
+        return iter(self._broker._tokens)
+
+    def __len__(self):
+        return len(self._broker._tokens)
+
+    def __contains__(self, key):
+        return key in self._broker._tokens
+
 class SecretBroker:
-    def __init__(self, secrets_path: Path, secure=False, password=None):
+    def __init__(self, secrets_path: Path, secure=False, password=None, keyring=KEYRING):
         self.secure = secure
-        
+        self.secrets_path = secrets_path
+        self._pending = None
+
         if secure:
             # Use encrypted secrets
             self.secure_dir = Path("secrets_secure")
             if not self.secure_dir.exists() or not (self.secure_dir / "config.yaml").exists():
                 raise FileNotFoundError(f"Secure storage not set up. Run setup_secure_secrets.py first")
-            
+
             # Load config
             with open(self.secure_dir / "config.yaml", "r") as f:
                 self.config = yaml.safe_load(f)
-            
+
             # Get password from input if not provided
             if not password:
                 if os.environ.get('MASTER_PASSWORD'):
                     password = os.environ.get('MASTER_PASSWORD')
                 else:
                     password = getpass.getpass("Enter master password: ")
-            
-            # Verify the password
-            salt = self.config['salt']
-            key_hash = hashlib.pbkdf2_hmac(
-                'sha256',
-                password.encode(),
-                bytes.fromhex(salt),
-                100000
-            ).hex()
-            
-            if key_hash != self.config['key_hash']:
-                raise ValueError("Invalid master password")
-            
-            # Generate the encryption key from the password
-            encryption_key = hashlib.pbkdf2_hmac(
-                'sha256',
-                password.encode(),
-                bytes.fromhex(salt),
-                100000,
-                dklen=32
-            )
-            
+
+            # One PBKDF2 derivation both verifies the password and yields the key
+            encryption_key = unlock(self.config, password, keyring)
             self.cipher_suite = Fernet(base64.b64encode(encryption_key))
-            
-            # Load encrypted secrets
+
+            # Load encrypted secrets; values are decrypted when first resolved
             encrypted_path = self.secure_dir / "encrypted_secrets.yaml"
             if not encrypted_path.exists():
                 raise FileNotFoundError(f"Encrypted secrets file not found: {encrypted_path}")
-            
-            with open(encrypted_path, "r") as f:
-                encrypted_data = yaml.safe_load(f)
-            
-            # Decrypt secrets
-            self.secrets = {}
-            for key, value in encrypted_data.items():
-                try:
-                    decrypted_value = self.cipher_suite.decrypt(value.encode()).decode()
-                    self.secrets[key] = decrypted_value
-                except Exception as e:
-                    print(f"Error decrypting {key}: {e}")
+            self.store = EncryptedSecretStore(encrypted_path)
+            self._tokens = self.store.load()
+            self._decrypted = {}
+            self.secrets = LazySecrets(self)
         else:
             # Use plaintext secrets
             if not secrets_path.exists():
                 raise FileNotFoundError(f"Secrets file not found: {secrets_path}")
-            
+
             with open(secrets_path, "r") as f:
-                self.secrets = yaml.safe_load(f)
-    
+                self.secrets = yaml.safe_load(f) or {}
+
+    def get_secret(self, key):
+        """A secret's value, or None if it is missing (or cannot be decrypted)"""
+        if not self.secure:
+            return self.secrets.get(key)
+        if key in self._decrypted:
+            return self._decrypted[key]
+        token = self._tokens.get(key)
+        if token is None:
+            return None
+        try:
+            value = self.cipher_suite.decrypt(token.encode()).decode()
+        except (InvalidToken, AttributeError, UnicodeDecodeError) as e:
+            print(f"Error decrypting {key}: {e!r}")
+            value = None
+        self._decrypted[key] = value
+        return value
+
     def resolve(self, keys):
         result = {}
         for key in keys:
-            result[key] = self.secrets.get(key, "")
+            value = self.get_secret(key)
+            result[key] = value if value is not None else ""
         return result
-    
-    def add_secret(self, key, value):
-        self.secrets[key] = value
-        
+
+    @contextmanager
+    def batch(self):
+        """Collect add_secret calls and write them to the store once, on exit"""
+        if self._pending is not None:
+            yield self
+            return
+        self._pending = {}
+        try:
+            yield self
+            pending, self._pending = self._pending, None
+            if pending:
+                self.add_secrets(pending)
+        finally:
+            self._pending = None
+
+    def add_secrets(self, secrets: dict):
+        if self._pending is not None:
+            self._pending.update(secrets)
+            return True
+
         if self.secure:
-            # Load existing encrypted secrets
-            encrypted_path = self.secure_dir / "encrypted_secrets.yaml"
-            if encrypted_path.exists():
-                with open(encrypted_path, "r") as f:
-                    encrypted_data = yaml.safe_load(f) or {}
-            else:
-                encrypted_data = {}
-            
-            # Encrypt and add the new secret
-            encrypted_value = self.cipher_suite.encrypt(value.encode()).decode()
-            encrypted_data[key] = encrypted_value
-            
-            # Save the updated encrypted secrets
-            with open(encrypted_path, "w") as f:
-                yaml.dump(encrypted_data, f)
+            secrets = {key: str(value) for key, value in secrets.items()}
+            self.store.update({key: self.cipher_suite.encrypt(value.encode()).decode() for key, value in secrets.items()})
+            self._tokens = self.store.load()
+            self._decrypted.update(secrets)
         else:
-            # Save to plaintext file
-            with open("secrets.yaml", "w") as f:
-                yaml.dump(self.secrets, f)
-        
-        return True
\ No newline at end of file
+            self.secrets.update(secrets)
+            _write_atomic(self.secrets_path, self.secrets)
+        return True
+
+    def add_secret(self, key, value):
+        return self.add_secrets({key: value})
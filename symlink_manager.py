@@ -3,26 +3,173 @@ symlink_manager.py — Part of MetaFabric Production v1.1.0
 Auto-generated under Domino Mode
 """
 
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from enum import Enum
 from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+TOOLS_DIR = "tools"
+
+class LinkAction(Enum):
+    CREATE = "+"
+    REPLACE = "~"
+    REMOVE = "-"
+    MISSING = "X"    # The link's source does not exist; left untouched
+    CONFLICT = "!"   # A directory is in the way; left untouched
+
+@dataclass
+class LinkChange:
+    action: LinkAction
+    link: Path
+    target: Optional[Path] = None
+    current: Optional[str] = None
+
+    def describe(self) -> str:
+        if self.action is LinkAction.REMOVE:
+            return f"[{self.action.value}] {self.link} (was -> {self.current})"
+        if self.action is LinkAction.MISSING:
+            return f"[{self.action.value}] {self.link}: source missing: {self.target}"
+        if self.action is LinkAction.CONFLICT:
+            return f"[{self.action.value}] {self.link}: not a link, left as is"
+        return f"[{self.action.value}] {self.link} -> {self.target}"
+
+@dataclass
+class ProjectLinks:
+    """The links a project should have: .env and one tools/ entry per tool source"""
+    project_path: Path
+    env_source: Optional[Path] = None
+    tool_sources: List[Path] = field(default_factory=list)
+    # Symlinks in tools/ pointing into this directory and not desired are removed
+    managed_tools_root: Optional[Path] = None
+
+    def desired(self) -> Dict[Path, Path]:
+        links = {}
+        if self.env_source is not None:
+            links[self.project_path / ".env"] = self.env_source
+        for source in self.tool_sources:
+            links[self.project_path / TOOLS_DIR / source.name] = source
+        return links
+
+def _readlink(path: str) -> Optional[str]:
+    try:
+        return os.readlink(path)
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+    except OSError:
+        return ""  # Exists but is not a symlink
+
+def _resolve_source(source: Path, resolved: Dict[Path, Optional[str]]) -> Optional[str]:
+    """The resolved link target for a source (None if missing); shared sources are resolved once per pass"""
+    if source not in resolved:
+        resolved[source] = str(source.resolve()) if source.exists() else None
+    return resolved[source]
+
+def plan_links(spec: ProjectLinks, resolved: Optional[Dict[Path, Optional[str]]] = None) -> List[LinkChange]:
+    """The changes that bring a project's links to `spec`; links already right produce none"""
+    resolved = {} if resolved is None else resolved
+    changes = []
+    desired = spec.desired()
+    for link, source in desired.items():
+        target = _resolve_source(source, resolved)
+        if target is None:
+            changes.append(LinkChange(LinkAction.MISSING, link, source))
+            continue
+        current = _readlink(str(link))
+        if current is None:
+            changes.append(LinkChange(LinkAction.CREATE, link, Path(target)))
+        elif current == "" and link.is_dir():
+            changes.append(LinkChange(LinkAction.CONFLICT, link, Path(target)))
+        elif current != target:
+            changes.append(LinkChange(LinkAction.REPLACE, link, Path(target), current or None))
+
+    if spec.managed_tools_root is not None:
+        managed = _resolve_source(Path(spec.managed_tools_root), resolved)
+        wanted = {link.name for link in desired if link.parent == spec.project_path / TOOLS_DIR}
+        try:
+            with os.scandir(spec.project_path / TOOLS_DIR) as entries:
+                for entry in entries:
+                    if managed is None or entry.name in wanted or not entry.is_symlink():
+                        continue
+                    current = os.readlink(entry.path)
+                    if current.startswith(managed + os.sep):
+                        changes.append(LinkChange(LinkAction.REMOVE, Path(entry.path), current=current))
+        except (FileNotFoundError, NotADirectoryError):
+            pass
+    return changes
+
+def apply_changes(changes: Iterable[LinkChange]) -> int:
+    """Apply planned changes; each link is swapped in with an atomic rename. Returns the number applied"""
+    applied = 0
+    for change in changes:
+        if change.action is LinkAction.REMOVE:
+            try:
+                os.unlink(change.link)
+            except FileNotFoundError:
+                pass
+        elif change.action in (LinkAction.CREATE, LinkAction.REPLACE):
+            change.link.parent.mkdir(parents=True, exist_ok=True)
+            temp_link = change.link.with_name(f".{change.link.name}.{os.getpid()}.tmp")
+            try:
+                os.unlink(temp_link)
+            except FileNotFoundError:
+                pass
+            os.symlink(change.target, temp_link)
+            os.replace(temp_link, change.link)
+        else:
+            continue
+        applied += 1
+    return applied
+
+@dataclass
+class ReconcileReport:
+    projects: int = 0
+    unchanged: int = 0
+    changes: List[LinkChange] = field(default_factory=list)
+
+    def counts(self) -> Dict[str, int]:
+        counts = {action.name.lower(): 0 for action in LinkAction}
+        for change in self.changes:
+            counts[change.action.name.lower()] += 1
+        return counts
+
+    def summary(self) -> str:
+        counts = self.counts()
+        return (f"{self.projects} projects ({self.unchanged} up to date): {counts['create']} created, "
+                f"{counts['replace']} replaced, {counts['remove']} removed, {counts['missing']} missing sources, "
+                f"{counts['conflict']} conflicts")
+
+def reconcile_projects(specs: Iterable[ProjectLinks], dry_run: bool = False,
+                       max_workers: Optional[int] = None) -> ReconcileReport:
+    """Plan (and unless `dry_run`, apply) the links of many projects in one pass"""
+    resolved = {}
+
+    def reconcile(spec):
+        changes = plan_links(spec, resolved)
+        if not dry_run:
+            apply_changes(changes)
+        return changes
+
+    report = ReconcileReport()
+    with ThreadPoolExecutor(max_workers=max_workers or min(32, (os.cpu_count() or 1) + 4)) as pool:
+        for changes in pool.map(reconcile, specs):
+            report.projects += 1
+            if not any(change.action in (LinkAction.CREATE, LinkAction.REPLACE, LinkAction.REMOVE)
+                       for change in changes):
+                report.unchanged += 1
+            report.changes.extend(changes)
+    return report
+
+def reconcile_project(spec: ProjectLinks) -> List[LinkChange]:
+    changes = plan_links(spec)
+    apply_changes(changes)
+    for change in changes:
+        print(change.describe())
+    return changes
 
 def link_env(project_path: Path, env_source_path: Path):
-    if not env_source_path.exists():
-        print(f"[X] Env source missing: {env_source_path}")
-        return
-    env_link = project_path / ".env"
-    if env_link.exists() or env_link.is_symlink():
-        env_link.unlink()
-    env_link.symlink_to(env_source_path.resolve())
-    print(f"[✓] Linked .env -> {env_source_path}")
+    reconcile_project(ProjectLinks(project_path, env_source=env_source_path))
 
 def link_tool(project_path: Path, tool_source_path: Path):
-    if not tool_source_path.exists():
-        print(f"[X] Tool source missing: {tool_source_path}")
-        return
-    tools_dir = project_path / "tools"
-    tools_dir.mkdir(exist_ok=True)
-    tool_link = tools_dir / tool_source_path.name
-    if tool_link.exists() or tool_link.is_symlink():
-        tool_link.unlink()
-    tool_link.symlink_to(tool_source_path.resolve())
-    print(f"[✓] Linked {tool_source_path.name} -> tools/")
\ No newline at end of file
+    reconcile_project(ProjectLinks(project_path, tool_sources=[tool_source_path]))
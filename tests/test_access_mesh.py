@@ -0,0 +1,93 @@
+"""
+Tests for the logged, locked AccessMesh store and its reverse indexes
+"""
+
+import multiprocessing
+import os
+import sys
+
+import pytest
+import yaml
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from access_mesh import AccessMesh
+
+
+def bind_many(registry_path, worker, count):
+    mesh = AccessMesh(registry_path, compact_after=16)
+    for i in range(count):
+        mesh.bind(f"project_{worker}_{i}", [f"tool_{i % 3}"], [f"SECRET_{worker}", "SHARED_KEY"])
+
+
+class TestAccessMesh:
+
+    def test_binds_are_logged_and_compacted(self, tmp_path):
+        registry = tmp_path / "access_mesh.yaml"
+        registry.write_text(yaml.dump({"legacy": {"tools": ["git"], "secrets": ["GITHUB_TOKEN"]}}))
+
+        mesh = AccessMesh(registry, compact_after=5)
+        for i in range(4):
+            mesh.bind(f"p{i}", ["git"], [f"KEY_{i}"])
+        assert yaml.safe_load(registry.read_text()) == {"legacy": {"tools": ["git"], "secrets": ["GITHUB_TOKEN"]}}
+        assert len(mesh.log_path.read_text().splitlines()) == 4
+        assert AccessMesh(registry).get("p3") == {"tools": ["git"], "secrets": ["KEY_3"]}
+
+        mesh.bind("p4", ["docker", "git"], ["KEY_4"])
+        assert mesh.log_path.read_text() == ""
+        assert list(yaml.safe_load(registry.read_text())) == ["legacy", "p0", "p1", "p2", "p3", "p4"]
+        assert AccessMesh(registry).projects_using_tool("git") == ["legacy", "p0", "p1", "p2", "p3", "p4"]
+
+    def test_reverse_indexes_follow_rebinds_from_other_instances(self, tmp_path):
+        registry = tmp_path / "access_mesh.yaml"
+        reader = AccessMesh(registry, compact_after=3)
+        writer = AccessMesh(registry, compact_after=3)
+        writer.bind("api", ["openai"], ["OPENAI_API_KEY", "DB_URL"])
+        writer.bind("worker", [], ["DB_URL"])
+        assert reader.projects_using_secret("DB_URL") == ["api", "worker"]
+
+        writer.bind("api", ["openai"], ["OPENAI_API_KEY"])    # Compacts
+        writer.unbind("worker")
+        assert reader.projects_using_secret("DB_URL") == []
+        assert reader.projects_using_secret("OPENAI_API_KEY") == ["api"]
+        assert reader.projects_using_tool("openai") == ["api"]
+        assert "DB_URL" not in reader.by_secret
+
+    def test_torn_record_is_ignored_and_overwritten(self, tmp_path):
+        registry = tmp_path / "access_mesh.yaml"
+        AccessMesh(registry).bind("a", [], ["KEY_A"])
+        with open(registry.with_name("access_mesh.yaml.log"), "ab") as f:
+            f.write(b'{"project":"b","tools":[],"sec')
+        mesh = AccessMesh(registry)
+        assert list(mesh.mesh) == ["a"]
+        mesh.bind("c", [], ["KEY_C"])
+        assert AccessMesh(registry).projects_using_secret("KEY_C") == ["c"]
+        assert len(mesh.log_path.read_text().splitlines()) == 2
+
+    def test_failed_transaction_writes_nothing(self, tmp_path):
+        registry = tmp_path / "access_mesh.yaml"
+        mesh = AccessMesh(registry)
+        mesh.bind("kept", [], ["KEY"])
+        with pytest.raises(RuntimeError):
+            with mesh.transaction():
+                mesh.bind("lost", [], ["KEY"])
+                raise RuntimeError("link failed")
+        assert mesh.projects_using_secret("KEY") == ["kept"]
+
+        with mesh.transaction():
+            for i in range(10):
+                mesh.bind(f"batch_{i}", [], ["KEY"])
+        assert len(mesh.log_path.read_text().splitlines()) == 11
+        assert len(AccessMesh(registry).projects_using_secret("KEY")) == 11
+
+    def test_concurrent_processes_do_not_lose_binds(self, tmp_path):
+        registry = tmp_path / "access_mesh.yaml"
+        workers = [multiprocessing.Process(target=bind_many, args=(registry, w, 40)) for w in range(4)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        mesh = AccessMesh(registry)
+        assert len(mesh.mesh) == 160
+        assert len(mesh.projects_using_secret("SHARED_KEY")) == 160
+        assert mesh.projects_using_secret("SECRET_2") == sorted(f"project_2_{i}" for i in range(40))
@@ -0,0 +1,128 @@
+"""
+Tests for the action rate limiter algorithms, scoping, eviction and SQLite store
+"""
+
+import multiprocessing
+import pytest
+
+from agent_core.action_rate_limiter import (
+    ActionRateLimiter, InMemoryRateLimitStore, RateLimit, RateLimitAlgorithm
+)
+
+
+class FakeClock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def allowed_count(limiter, attempts, **kwargs):
+    return sum(limiter.check(**kwargs).allowed for _ in range(attempts))
+
+
+class TestAlgorithms:
+
+    def test_token_bucket_bursts_then_refills(self):
+        clock = FakeClock()
+        limiter = ActionRateLimiter({
+            "max_action_rate": {"limit": 60, "algorithm": "token_bucket", "burst": 5}
+        }, clock=clock)
+
+        assert allowed_count(limiter, 10, agent_id="a") == 5
+        decision = limiter.check("a")
+        assert not decision.allowed
+        assert decision.retry_after == pytest.approx(1.0)
+
+        clock.now += 2.0
+        assert allowed_count(limiter, 10, agent_id="a") == 2
+
+    def test_sliding_window_weights_previous_window(self):
+        clock = FakeClock(now=600.0)  # Start of a 60s window
+        limiter = ActionRateLimiter({"max_action_rate": 10}, clock=clock)
+
+        assert allowed_count(limiter, 15, agent_id="a") == 10
+
+        # A quarter into the next window, 75% of the previous 10 still counts
+        clock.now += 75.0
+        assert allowed_count(limiter, 15, agent_id="a") == 2
+
+    def test_sliding_window_retry_after_spans_rollover(self):
+        clock = FakeClock(now=600.0)
+        limiter = ActionRateLimiter({"max_action_rate": 3}, clock=clock)
+        allowed_count(limiter, 3, agent_id="a")
+
+        decision = limiter.check("a")
+        assert decision.retry_after == pytest.approx(60.0 + 20.0)
+
+        clock.now += decision.retry_after
+        assert limiter.check("a").allowed
+
+
+class TestScopes:
+
+    def test_action_type_and_severity_limits_are_per_agent(self):
+        limiter = ActionRateLimiter({
+            "max_action_rate": 100,
+            "action_types": {"secret_rotation": 2},
+            "severities": {"critical": 1},
+        }, clock=FakeClock())
+
+        assert allowed_count(limiter, 5, agent_id="a", action_type="secret_rotation") == 2
+        assert allowed_count(limiter, 5, agent_id="b", action_type="secret_rotation") == 2
+        assert allowed_count(limiter, 5, agent_id="a", action_type="other", severity="critical") == 1
+        assert allowed_count(limiter, 5, agent_id="a", action_type="other", severity="low") == 5
+
+    def test_rejected_action_refunds_agent_limit(self):
+        limiter = ActionRateLimiter({"max_action_rate": 3, "action_types": {"scan": 1}}, clock=FakeClock())
+
+        assert allowed_count(limiter, 3, agent_id="a", action_type="scan") == 1
+        assert allowed_count(limiter, 3, agent_id="a", action_type="read") == 2
+
+    def test_agent_override(self):
+        limiter = ActionRateLimiter({"max_action_rate": 1, "agents": {"vip": 4}}, clock=FakeClock())
+        assert allowed_count(limiter, 5, agent_id="vip") == 4
+
+
+class TestEviction:
+
+    def test_idle_keys_are_evicted(self):
+        store = InMemoryRateLimitStore(idle_ttl=10.0)
+        rule = RateLimit(limit=5)
+        for i in range(100):
+            store.apply(f"agent:{i}", rule, 1, now=0.0)
+
+        store.apply("agent:new", rule, 1, now=20.0)
+
+        assert len(store) == 1
+
+    def test_max_keys_caps_memory(self):
+        store = InMemoryRateLimitStore(max_keys=10)
+        rule = RateLimit(limit=5, algorithm=RateLimitAlgorithm.TOKEN_BUCKET)
+        for i in range(100):
+            store.apply(f"agent:{i}", rule, 1, now=float(i))
+        assert len(store) == 10
+
+
+def _consume(db_path, attempts, results):
+    limiter = ActionRateLimiter({
+        "sqlite_path": db_path,
+        "max_action_rate": {"limit": 50, "period_seconds": 3600, "algorithm": "token_bucket"},
+    })
+    results.put(allowed_count(limiter, attempts, agent_id="shared"))
+
+
+class TestSQLiteStore:
+
+    def test_processes_share_one_limit(self, tmp_path):
+        db_path = str(tmp_path / "rate_limits.db")
+        ActionRateLimiter({"sqlite_path": db_path})  # Create schema up front
+        results = multiprocessing.Queue()
+        workers = [multiprocessing.Process(target=_consume, args=(db_path, 40, results)) for _ in range(3)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join(timeout=30)
+
+        assert sum(results.get(timeout=5) for _ in workers) == 50
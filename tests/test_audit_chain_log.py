@@ -0,0 +1,152 @@
+"""
+Tests for the persistent audit chain log, checkpoints and inclusion proofs
+"""
+
+import asyncio
+import json
+from datetime import datetime, timezone
+import pytest
+
+from agent_core.audit_chain_log import (
+    AuditChainLog, CHECKPOINT_FILENAME, LOG_FILENAME, compute_audit_hash, sign
+)
+
+KEY = "test-signing-key"
+
+
+def make_record(log, n):
+    previous = log.head_hash
+    fields = dict(audit_id=f"audit_{n}", action_id=f"action_{n}", agent_id="agent", execution_status="success",
+                  duration_ms=1.5 * n)
+    audit_hash = compute_audit_hash(**fields, previous_hash=previous)
+    return dict(fields, action_type="test", timestamp=datetime.now(timezone.utc), audit_hash=audit_hash,
+                previous_audit_hash=previous, digital_signature=sign(KEY, audit_hash))
+
+
+async def append_many(log, count):
+    futures = []
+    for _ in range(count):
+        futures.append(log.enqueue(make_record(log, log.record_count)))
+    return await asyncio.gather(*futures)
+
+
+def rewrite_line(path, index, **changes):
+    lines = path.read_text().splitlines()
+    entry = json.loads(lines[index])
+    entry.update(changes)
+    lines[index] = json.dumps(entry, separators=(",", ":"))
+    path.write_text("\n".join(lines) + "\n")
+
+
+class TestAuditChainLog:
+
+    @pytest.mark.asyncio
+    async def test_group_commit_and_checkpoints(self, tmp_path):
+        log = AuditChainLog(KEY, str(tmp_path), block_size=8, fsync=False)
+        writes = []
+        original = log._write_batch
+        log._write_batch = lambda lines: (writes.append(len(lines)), original(lines))
+
+        seqs = await append_many(log, 20)
+
+        assert seqs == list(range(20))
+        assert writes == [20]
+        assert len(log.checkpoints) == 2
+        assert log.verify(full=True)["valid"]
+
+    @pytest.mark.asyncio
+    async def test_reload_resumes_from_last_checkpoint(self, tmp_path):
+        log = AuditChainLog(KEY, str(tmp_path), block_size=8, fsync=False)
+        await append_many(log, 11)
+        head = log.head_hash
+        log.close()
+
+        reopened = AuditChainLog(KEY, str(tmp_path), block_size=8, fsync=False)
+        assert reopened.record_count == 11
+        assert reopened.head_hash == head
+        assert reopened.verify()["tail_records_verified"] == 3
+
+        await append_many(reopened, 6)
+        assert len(reopened.checkpoints) == 2
+        assert reopened.verify(full=True)["valid"]
+
+    @pytest.mark.asyncio
+    async def test_tampering_detected(self, tmp_path):
+        log = AuditChainLog(KEY, str(tmp_path), block_size=8, fsync=False)
+        await append_many(log, 10)
+        log_path = tmp_path / LOG_FILENAME
+
+        # Inside a checkpointed block: only a full verification re-reads it
+        rewrite_line(log_path, 2, execution_status="SUCCESS")  # Same length keeps offsets
+        assert log.verify()["valid"]
+        assert not log.verify(full=True)["valid"]
+
+        rewrite_line(log_path, 2, execution_status="success")
+        rewrite_line(log_path, 9, agent_id="intruder")
+        assert not log.verify()["valid"]
+
+    @pytest.mark.asyncio
+    async def test_forged_checkpoint_rejected_on_load(self, tmp_path):
+        log = AuditChainLog(KEY, str(tmp_path), block_size=4, fsync=False)
+        await append_many(log, 4)
+        log.close()
+        rewrite_line(tmp_path / CHECKPOINT_FILENAME, 0, merkle_root="00" * 32)
+
+        with pytest.raises(ValueError):
+            AuditChainLog(KEY, str(tmp_path), block_size=4, fsync=False)
+
+    @pytest.mark.asyncio
+    async def test_inclusion_proof(self, tmp_path):
+        log = AuditChainLog(KEY, str(tmp_path), block_size=8, fsync=False)
+        await append_many(log, 12)
+        log.close()
+        log = AuditChainLog(KEY, str(tmp_path), block_size=8, fsync=False)
+
+        proof = log.get_inclusion_proof("audit_5")
+        assert proof["record"]["audit_id"] == "audit_5"
+        assert log.verify_inclusion_proof(proof)
+
+        proof["record"]["execution_status"] = "failed"
+        assert not log.verify_inclusion_proof(proof)
+        assert log.get_inclusion_proof("audit_10") is None  # Not checkpointed yet
+        assert log.get_inclusion_proof("missing") is None
+
+    @pytest.mark.asyncio
+    async def test_missing_checkpoints_are_written_on_load(self, tmp_path):
+        log = AuditChainLog(KEY, str(tmp_path), block_size=4, fsync=False)
+        await append_many(log, 10)
+        log.close()
+        # Crash after the log was written but before its checkpoints were
+        (tmp_path / CHECKPOINT_FILENAME).write_bytes(b"")
+
+        reopened = AuditChainLog(KEY, str(tmp_path), block_size=4, fsync=False)
+        assert len(reopened.checkpoints) == 2
+        assert reopened.verify()["tail_records_verified"] == 2
+        assert reopened.verify(full=True)["valid"]
+        await append_many(reopened, 2)
+        assert len(reopened.checkpoints) == 3
+        reopened.close()
+
+        again = AuditChainLog(KEY, str(tmp_path), block_size=4, fsync=False)
+        assert len(again.checkpoints) == 3
+        assert again.verify()["tail_records_verified"] == 0
+
+    def test_torn_write_is_truncated(self, tmp_path):
+        log = AuditChainLog(KEY, str(tmp_path), block_size=8, fsync=False)
+        for n in range(3):
+            log.enqueue(make_record(log, n))
+        log.close()
+        with open(tmp_path / LOG_FILENAME, "ab") as f:
+            f.write(b'{"seq": 3, "audit_id": "aud')
+
+        reopened = AuditChainLog(KEY, str(tmp_path), block_size=8, fsync=False)
+
+        assert reopened.record_count == 3
+        assert reopened.verify()["valid"]
+
+    def test_in_memory_log(self):
+        log = AuditChainLog(KEY, block_size=2)
+        for n in range(5):
+            log.enqueue(make_record(log, n))
+        assert len(log.checkpoints) == 2
+        assert log.verify(full=True)["valid"]
@@ -0,0 +1,245 @@
+"""
+Tests for CascadeExecutor DAG scheduling, template rendering and step policies
+"""
+
+import threading
+import time
+import pytest
+
+from vanta_seed.core.cascade_executor import (
+    CascadeExecutor, CascadeDefinitionError, compile_cascade_profile
+)
+from vanta_seed.core.cascade_profile_registry import CascadeProfileRegistry
+
+
+class RecordingVMC:
+    """Records cascade step calls; agents named 'fail*' fail, 'slow*' sleep"""
+
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.calls = []
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def execute_agent_task_sync(self, agent_id, task_type, task_data):
+        with self._lock:
+            self.calls.append((agent_id, dict(task_data)))
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            time.sleep(self.delay * (20 if agent_id.startswith("slow") else 1))
+            if agent_id.startswith("fail"):
+                return {"status": "error", "message": f"{agent_id} failed"}
+            return {"status": "success", "agent": agent_id, "value": task_data.get("value", agent_id)}
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+def make_executor(profiles, vmc=None, **kwargs):
+    registry = CascadeProfileRegistry()
+    registry.load_profiles(profiles)
+    return CascadeExecutor(vmc or RecordingVMC(), registry=registry, **kwargs)
+
+
+FAN_OUT = {
+    "profile_id": "fan_out",
+    "agent_sequence": [
+        {"name": "root", "agent": "root_agent", "task_data": {"value": "{{ step_results.initial_data.seed }}"}},
+        *[
+            {"name": f"leaf_{i}", "agent": f"leaf_agent_{i}", "depends_on": "root",
+             "task_data": {"value": "{{ step_results.root_output.value }}-%d" % i}}
+            for i in range(6)
+        ],
+        {"name": "join", "agent": "join_agent", "depends_on": [f"leaf_{i}" for i in range(6)]},
+    ],
+}
+
+
+class TestCascadeExecutor:
+
+    def test_linear_profile_runs_in_order(self):
+        vmc = RecordingVMC(delay=0.0)
+        executor = make_executor([{
+            "profile_id": "linear",
+            "agent_sequence": [
+                {"agent": "a", "task_data": {"value": "{{ step_results.initial_data.msg }}"}},
+                {"agent": "b", "task_data": {"value": "{{ step_results.step_1_output.value }}!"}},
+                {"agent": "c"},
+            ],
+        }], vmc)
+
+        result = executor.trigger_cascade("linear", {"msg": "hi"})
+
+        assert result["status"] == "success"
+        assert [c[0] for c in vmc.calls] == ["a", "b", "c"]
+        assert vmc.calls[1][1]["value"] == "hi!"
+        assert vmc.peak == 1
+
+    def test_fan_out_runs_leaves_concurrently(self):
+        vmc = RecordingVMC()
+        executor = make_executor([FAN_OUT], vmc, max_concurrency=4)
+
+        result = executor.trigger_cascade("fan_out", {"seed": "s"})
+
+        assert vmc.calls[0][0] == "root_agent"
+        assert vmc.calls[-1][0] == "join_agent"
+        assert vmc.peak == 4
+        assert result["step_results"]["leaf_3_output"]["value"] == "s-3"
+
+    def test_halt_stops_new_steps(self):
+        vmc = RecordingVMC(delay=0.0)
+        executor = make_executor([{
+            "profile_id": "halting",
+            "agent_sequence": [
+                {"agent": "fail_a", "on_failure": "LOG_AND_HALT"},
+                {"agent": "b"},
+            ],
+        }, {
+            "profile_id": "proceeding",
+            "agent_sequence": [
+                {"agent": "fail_a", "on_failure": "LOG_AND_PROCEED"},
+                {"agent": "b"},
+            ],
+        }], vmc)
+
+        halted = executor.trigger_cascade("halting")
+        assert "step_2_output" not in halted["step_results"]
+
+        proceeded = executor.trigger_cascade("proceeding")
+        assert proceeded["step_results"]["step_2_output"]["status"] == "success"
+
+    def test_timeout_and_retries(self):
+        vmc = RecordingVMC(delay=0.01)
+        executor = make_executor([{
+            "profile_id": "policies",
+            "agent_sequence": [
+                {"name": "slow", "agent": "slow_agent", "timeout_seconds": 0.05},
+                {"name": "flaky", "agent": "fail_agent", "depends_on": [], "retries": 2,
+                 "retry_delay_seconds": 0.0},
+            ],
+        }], vmc)
+
+        result = executor.trigger_cascade("policies")
+
+        assert "timed out" in result["step_results"]["slow_output"]["message"]
+        assert sum(1 for agent, _ in vmc.calls if agent == "fail_agent") == 3
+
+    def test_timed_out_step_is_not_retried(self):
+        vmc = RecordingVMC(delay=0.01)
+        executor = make_executor([{
+            "profile_id": "slow_retries",
+            "agent_sequence": [
+                {"name": "slow", "agent": "slow_agent", "timeout_seconds": 0.05, "retries": 2,
+                 "retry_delay_seconds": 0.0},
+            ],
+        }], vmc)
+
+        result = executor.trigger_cascade("slow_retries")
+
+        assert "timed out" in result["step_results"]["slow_output"]["message"]
+        time.sleep(0.3)  # Let the abandoned attempt finish
+        assert [agent for agent, _ in vmc.calls] == ["slow_agent"]
+        assert vmc.peak == 1
+
+    @pytest.mark.asyncio
+    async def test_stream_yields_as_steps_complete(self):
+        executor = make_executor([FAN_OUT], RecordingVMC(delay=0.0))
+
+        steps = [event["step"] async for event in executor.stream_cascade("fan_out", {"seed": "x"})]
+
+        assert steps[0] == "root"
+        assert steps[-1] == "join"
+        assert len(steps) == 8
+
+    @pytest.mark.asyncio
+    async def test_sync_trigger_inside_running_loop(self):
+        executor = make_executor([FAN_OUT], RecordingVMC(delay=0.0))
+        assert executor.trigger_cascade("fan_out", {"seed": "x"})["status"] == "success"
+
+
+class TestCompileCascadeProfile:
+
+    def test_template_reference_adds_dependency(self):
+        compiled = compile_cascade_profile({
+            "profile_id": "implicit",
+            "agent_sequence": [
+                {"name": "a", "agent": "a", "depends_on": []},
+                {"name": "b", "agent": "b", "depends_on": [],
+                 "task_data": {"x": "{{ step_results.a_output.value }}"}},
+            ],
+        })
+        assert compiled.steps[1].depends_on == ("a",)
+
+    def test_cycle_rejected(self):
+        with pytest.raises(CascadeDefinitionError):
+            compile_cascade_profile({
+                "profile_id": "cycle",
+                "agent_sequence": [
+                    {"name": "a", "agent": "a", "depends_on": "b"},
+                    {"name": "b", "agent": "b", "depends_on": "a"},
+                ],
+            })
+
+    def test_unresolved_reference_left_verbatim(self):
+        compiled = compile_cascade_profile({
+            "profile_id": "verbatim",
+            "agent_sequence": [{"agent": "a", "task_data": {"x": "{{ step_results.initial_data.missing }}"}}],
+        })
+        rendered = compiled.steps[0].render({"initial_data": {}}, compiled.aliases)
+        assert rendered["x"] == "{{ step_results.initial_data.missing }}"
+
+
+MDC_TEMPLATE = """---
+description: test cascades
+---
+# Cascade definitions
+profiles:
+  - profile_id: "first"
+    agent_sequence:
+      - agent: "a"
+        task_data:
+          value: "{first_value}"
+  - profile_id: "second"
+    agent_sequence:
+      - agent: "b"
+{extra}
+# trailing notes
+"""
+
+
+class TestCascadeProfileRegistry:
+
+    def write(self, path, first_value="one", extra=""):
+        path.write_text(MDC_TEMPLATE.format(first_value=first_value, extra=extra))
+
+    def test_reload_recompiles_only_changed_profiles(self, tmp_path):
+        mdc = tmp_path / "agent_cascade_definitions.mdc"
+        self.write(mdc)
+        registry = CascadeProfileRegistry(str(mdc))
+        first, second = registry.compiled["first"], registry.compiled["second"]
+
+        assert registry.refresh() is False
+
+        self.write(mdc, first_value="two")
+        assert registry.refresh(force=True) is True
+        assert registry.compiled["second"] is second
+        assert registry.compiled["first"] is not first
+        assert registry.compiled["first"].steps[0].task_data["value"] == "two"
+
+    def test_invalid_profile_rejected_at_load(self, tmp_path):
+        mdc = tmp_path / "agent_cascade_definitions.mdc"
+        self.write(mdc, extra=(
+            '  - profile_id: "broken"\n'
+            '    agent_sequence:\n'
+            '      - agent: "c"\n'
+            '        depends_on: "nowhere"\n'
+        ))
+        registry = CascadeProfileRegistry(str(mdc))
+        executor = CascadeExecutor(RecordingVMC(delay=0.0), registry=registry)
+
+        assert set(registry.compiled) == {"first", "second"}
+        assert "broken" in registry.errors
+        assert executor.trigger_cascade("broken")["status"] == "error"
+        assert executor.trigger_cascade("first")["status"] == "success"
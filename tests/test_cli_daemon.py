@@ -0,0 +1,127 @@
+"""
+Tests for serving cli.py commands from a warm daemon
+"""
+
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+
+import cli
+from cli_daemon import CommandDaemon, control, forward_to_daemon
+
+
+def start_daemon(path):
+    server = CommandDaemon(path)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    deadline = time.time() + 10
+    while control("ping", path) is None:
+        assert time.time() < deadline, "daemon did not start"
+        time.sleep(0.05)
+    return thread
+
+
+def stop_daemon(path, thread):
+    control("stop", path)
+    thread.join(timeout=5)
+    assert not thread.is_alive()
+    assert not os.path.exists(path)
+
+
+@pytest.fixture
+def daemon(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path / "home"))
+    monkeypatch.chdir(tmp_path)
+    path = str(tmp_path / "cli.sock")
+    thread = start_daemon(path)
+    yield path
+    stop_daemon(path, thread)
+
+
+def run_cli(socket, *argv, cwd):
+    """cli.py in a separate process, as a user runs it; the daemon is shared state of this one"""
+    env = dict(os.environ, VANTA_DAEMON_SOCKET=socket)
+    return subprocess.run([sys.executable, os.path.join(ROOT, "cli.py"), *argv], cwd=cwd, env=env,
+                          capture_output=True, text=True, timeout=60)
+
+
+def make_project(tmp_path):
+    project = tmp_path / "project"
+    project.mkdir()
+    (project / "app.py").write_text('import os\nos.getenv("API_TOKEN")\n')
+    return project
+
+
+class TestCommandDaemon:
+
+    def test_command_output_is_streamed_back(self, daemon, tmp_path):
+        project = make_project(tmp_path)
+        result = run_cli(daemon, "scan", str(project), cwd=tmp_path)
+        assert result.returncode == 0
+        assert "[SCAN RESULT]" in result.stdout
+        assert "API_TOKEN" in result.stdout
+        assert control("ping", daemon)["commands"] == 1
+
+    def test_errors_keep_their_exit_code(self, daemon, tmp_path):
+        result = run_cli(daemon, "no-such-command", cwd=tmp_path)
+        assert result.returncode == 2
+        assert "invalid choice" in result.stderr
+        assert control("ping", daemon)["commands"] == 1  # Served, and still serving
+
+    def test_commands_run_in_the_client_cwd_with_warm_state(self, daemon, tmp_path):
+        project = make_project(tmp_path)
+        client_dir = tmp_path / "client"
+        client_dir.mkdir()
+        (client_dir / "secrets.yaml").write_text("API_TOKEN: token\n")
+        assert run_cli(daemon, "link", str(project), cwd=client_dir).returncode == 0
+        assert (client_dir / "access_mesh.yaml.log").exists()
+        registry = (client_dir / "access_mesh.yaml").resolve()
+        mesh = cli._meshes[registry]
+        assert run_cli(daemon, "link", str(project), cwd=client_dir).returncode == 0
+        assert cli._meshes[registry] is mesh
+        assert mesh.get(project.name)["secrets"] == ["API_TOKEN"]
+        assert control("ping", daemon)["commands"] == 2
+
+    def test_runs_locally_without_a_daemon(self, tmp_path):
+        path = str(tmp_path / "absent.sock")
+        assert forward_to_daemon(["scan", str(tmp_path)], path) is None
+        assert forward_to_daemon(["watch", str(tmp_path)], path) is None
+        assert control("ping", path) is None
+
+    def test_peers_of_another_user_are_refused(self, daemon, monkeypatch):
+        import cli_daemon
+        real_uid = os.getuid()
+        with monkeypatch.context() as patch:
+            patch.setattr(cli_daemon.os, "getuid", lambda: real_uid + 1)
+            # The client will not send to a daemon of another user...
+            assert forward_to_daemon(["add-secret", "KEY", "value", "--secure"], daemon) is None
+            assert control("ping", daemon) is None
+            # ...and the daemon drops connections from other users
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.connect(daemon)
+                try:
+                    sock.sendall(b'{"control": "ping"}\n')
+                    reply = sock.recv(1024)
+                except (BrokenPipeError, ConnectionResetError):
+                    reply = b""
+                assert reply == b""
+        assert control("ping", daemon)["commands"] == 0
+
+    def test_socket_directory_is_made_private(self, tmp_path):
+        directory = tmp_path / ".vanta"
+        directory.mkdir(mode=0o755)
+        path = str(directory / "cli.sock")
+        thread = start_daemon(path)
+        try:
+            assert directory.stat().st_mode & 0o777 == 0o700
+            assert os.stat(path).st_mode & 0o777 == 0o600
+        finally:
+            stop_daemon(path, thread)
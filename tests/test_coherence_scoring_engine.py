@@ -0,0 +1,111 @@
+"""
+Tests for fleet scoring, digest skipping and the SQLite score history in
+CoherenceScoringEngine
+"""
+
+import asyncio
+import os
+import sys
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from coherence_scoring_engine import CoherenceCategory, CoherenceScoringEngine
+
+
+def agent_data(completion_rate=0.85, **extra):
+    data = {
+        "task_completion_rate": completion_rate,
+        "resource_efficiency": 0.75,
+        "avg_response_time_ms": 200,
+        "archetypal_alignment": "athena",
+        "trinity_role": "cube",
+        "usage_frequency": 0.7,
+        "conflicts_generated_last_week": 1,
+    }
+    data.update(extra)
+    return data
+
+
+def performance_trend(agent_score):
+    return next(m.trend_direction for m in agent_score.coherence_metrics
+                if m.category == CoherenceCategory.PERFORMANCE_EFFICIENCY)
+
+
+class TestCoherenceScoringEngine:
+
+    @pytest.mark.asyncio
+    async def test_unchanged_agents_are_skipped(self, tmp_path):
+        engine = CoherenceScoringEngine(tmp_path, auto_scoring=False)
+        fleet = {f"agent_{i}": agent_data(0.5 + i / 100) for i in range(10)}
+
+        first = await engine.score_fleet(fleet)
+        calls = []
+        original = engine._compute_agent_score
+
+        async def counting(agent_id, data):
+            calls.append(agent_id)
+            return await original(agent_id, data)
+
+        engine._compute_agent_score = counting
+        fleet["agent_3"] = agent_data(0.2)
+        second = await engine.score_fleet(fleet)
+
+        assert calls == ["agent_3"]
+        assert list(second) == list(fleet)
+        assert second["agent_0"] is first["agent_0"]
+        assert second["agent_3"].coherence_score < first["agent_3"].coherence_score
+
+        await engine.score_fleet(fleet, force=True)
+        assert len(calls) == 11
+
+    @pytest.mark.asyncio
+    async def test_history_survives_restart_and_feeds_trends(self, tmp_path):
+        engine = CoherenceScoringEngine(tmp_path, auto_scoring=False)
+        assert performance_trend(await engine.score_agent("agent", agent_data(0.9))) == "stable"
+        engine.score_history.close()
+
+        engine = CoherenceScoringEngine(tmp_path, auto_scoring=False)
+        cached = (await engine.score_fleet({"agent": agent_data(0.9)}))["agent"]
+        assert performance_trend(cached) == "stable"
+
+        declining = await engine.score_fleet({"agent": agent_data(0.2)})
+        assert performance_trend(declining["agent"]) == "declining"
+
+        series = engine.score_history.metric_series("agent", CoherenceCategory.PERFORMANCE_EFFICIENCY.value)
+        assert len(series) == 2
+        assert series[0][1] > series[1][1]
+        assert engine.score_history.metric_series("agent", "coherence_loss", limit=1)[0][0] == series[1][0]
+
+    @pytest.mark.asyncio
+    async def test_fleet_scoring_is_bounded(self, tmp_path):
+        engine = CoherenceScoringEngine(tmp_path, auto_scoring=False, max_concurrency=4)
+        active = peak = 0
+        original = engine._compute_agent_score
+
+        async def tracked(agent_id, data):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            try:
+                return await original(agent_id, data)
+            finally:
+                active -= 1
+
+        engine._compute_agent_score = tracked
+        scores = await engine.score_fleet({f"agent_{i}": agent_data() for i in range(20)})
+
+        assert len(scores) == 20
+        assert peak == 4
+
+    @pytest.mark.asyncio
+    async def test_intervention_triggers_are_logged_in_one_batch(self, tmp_path):
+        engine = CoherenceScoringEngine(tmp_path, auto_scoring=False)
+        failing = agent_data(0.0, resource_efficiency=0.0, avg_response_time_ms=10000, usage_frequency=0.0,
+                             task_success_rate=0.0, relevance_score=0.0, conflicts_generated_last_week=20)
+        await engine.score_fleet({"healthy": agent_data(), "failing_a": failing, "failing_b": failing})
+
+        log_lines = (tmp_path / "runtime" / "intervention_log.jsonl").read_text().splitlines()
+        assert len(log_lines) == 2
+        assert all("failing" in line for line in log_lines)
@@ -0,0 +1,174 @@
+"""
+Tests for streaming accuracy statistics, context similarity lookups and
+persistence in HistoricalAccuracyTracker
+"""
+
+import math
+import os
+import random
+import sys
+from datetime import datetime
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'vanta_2_0', 'src', 'core')))
+
+from decision_confidence_scoring import (
+    ContextSimilarityIndex, DecisionConfidenceScorer, ExpertVote, HistoricalAccuracyTracker, HistoricalDecision,
+    decision_context_features
+)
+
+AREAS = ["security", "performance", "integration", "compliance", "ai_systems"]
+
+
+def make_decision(i, rng, outcome=True):
+    return HistoricalDecision(
+        decision_id=f"decision_{i}",
+        decision_date=datetime(2025, 1, 1),
+        confidence_score=rng.random(),
+        predicted_success=rng.random(),
+        actual_outcome=rng.random() if outcome else None,
+        outcome_date=None,
+        lessons_learned=[],
+        decision_context={
+            "complexity_score": rng.random(),
+            "strategic_importance": rng.choice(["low", "medium", "high"]),
+            "required_expertise": rng.sample(AREAS, rng.randint(1, 3)),
+        },
+    )
+
+
+class TestHistoricalAccuracyTracker:
+
+    def test_streaming_stats_match_full_recomputation(self):
+        rng = random.Random(1)
+        tracker = HistoricalAccuracyTracker()
+        decisions = [make_decision(i, rng) for i in range(500)]
+        for decision in decisions:
+            tracker.add_historical_decision(decision)
+
+        predicted = [d.predicted_success for d in decisions]
+        actual = [d.actual_outcome for d in decisions]
+        correct = sum(1 for p, a in zip(predicted, actual) if (p >= 0.7) == (a >= 0.7))
+        metrics = tracker.accuracy_metrics
+
+        assert metrics["sample_size"] == 500
+        assert metrics["overall_accuracy"] == pytest.approx(correct / 500)
+        assert metrics["prediction_correlation"] == pytest.approx(max(0.0, np.corrcoef(predicted, actual)[0, 1]))
+
+    def test_empty_and_constant_history(self):
+        tracker = HistoricalAccuracyTracker()
+        assert tracker.calculate_predictor_accuracy() == {"overall_accuracy": 0.5, "prediction_correlation": 0.0}
+
+        rng = random.Random(2)
+        for i in range(3):
+            decision = make_decision(i, rng)
+            decision.predicted_success = 0.8
+            tracker.add_historical_decision(decision)
+        assert tracker.calculate_predictor_accuracy()["prediction_correlation"] == 0.0
+
+    def test_similar_outcomes_are_nearest_by_context(self):
+        rng = random.Random(3)
+        tracker = HistoricalAccuracyTracker()
+        decisions = [make_decision(i, rng) for i in range(2000)]
+        for decision in decisions:
+            tracker.add_historical_decision(decision)
+        context = {"complexity_score": 0.42, "strategic_importance": "high",
+                   "required_expertise": ["security", "performance"]}
+
+        query = decision_context_features(context)
+        brute_force = sorted(
+            decisions, key=lambda d: math.dist(query, decision_context_features(d.decision_context))
+        )[:10]
+
+        assert tracker.get_similar_decision_outcomes(context) == [d.actual_outcome for d in brute_force]
+
+    def test_index_stays_shallow_for_sorted_inserts(self):
+        index = ContextSimilarityIndex(continuous_dims=2)
+        for i in range(5000):
+            index.add((i / 5000.0, 0.0), i)
+
+        assert index._buckets[()]._max_depth <= 4 * math.log2(5001) + 8
+        assert [item for _, item in index.nearest((0.5, 0.0), 3)] in ([2500, 2499, 2501], [2500, 2501, 2499])
+
+    def test_outcomes_persist_across_scorers(self, tmp_path):
+        db_path = str(tmp_path / "decisions.db")
+        rng = random.Random(4)
+        scorer = DecisionConfidenceScorer(storage_path=db_path)
+        pending = make_decision(1, rng, outcome=False)
+        scorer.historical_tracker.add_historical_decision(pending)
+        scorer._save_historical_data()
+
+        scorer.update_decision_outcome("decision_1", 0.9, ["shipped on time"])
+
+        reloaded = DecisionConfidenceScorer(storage_path=db_path)
+        decision = reloaded.historical_tracker.get_decision("decision_1")
+        assert decision.actual_outcome == 0.9
+        assert decision.decision_context == pending.decision_context
+        assert reloaded.historical_tracker.calculate_predictor_accuracy()["sample_size"] == 1
+        assert reloaded.historical_tracker.get_similar_decision_outcomes(pending.decision_context) == [0.9]
+
+    def test_scored_decisions_are_tracked_with_their_context(self, tmp_path):
+        db_path = str(tmp_path / "decisions.db")
+        scorer = DecisionConfidenceScorer(storage_path=db_path)
+        vote = ExpertVote("security_expert", "security", "approve", 0.8, 0.8, 0.9, datetime(2025, 1, 1),
+                          "Risk analysis based on benchmark data", {"overall_risk": "low"}, [])
+        near = {"complexity_score": 0.3, "required_expertise": ["security"], "timeline_weeks": 4}
+        far = {"complexity_score": 0.9, "required_expertise": ["compliance"], "timeline_weeks": 40}
+
+        near_metrics = scorer.calculate_decision_confidence([vote], near)
+        far_metrics = scorer.calculate_decision_confidence([vote], far, decision_id="far")
+        assert far_metrics.decision_id == "far"
+        scorer.update_decision_outcome(near_metrics.decision_id, 0.95, [])
+        scorer.update_decision_outcome("far", 0.1, [])
+
+        reloaded = DecisionConfidenceScorer(storage_path=db_path)
+        decision = reloaded.historical_tracker.get_decision(near_metrics.decision_id)
+        assert decision.decision_context == near
+        assert decision.predicted_success == pytest.approx(near_metrics.predicted_success_probability)
+        assert reloaded.historical_tracker.get_similar_decision_outcomes(
+            {"complexity_score": 0.35, "required_expertise": ["security"], "timeline_weeks": 5}, limit=1
+        ) == [0.95]
+
+    def test_second_outcome_is_rejected(self, tmp_path):
+        db_path = str(tmp_path / "decisions.db")
+        scorer = DecisionConfidenceScorer(storage_path=db_path)
+        context = {"complexity_score": 0.4, "required_expertise": ["security"]}
+        metrics = scorer.calculate_decision_confidence([], context, decision_id="d1")
+
+        assert scorer.update_decision_outcome("d1", 0.9, []) is True
+        assert scorer.update_decision_outcome("d1", 0.6, []) is False
+
+        tracker = scorer.historical_tracker
+        assert tracker.calculate_predictor_accuracy()["sample_size"] == 1
+        assert len(tracker.historical_decisions) == len(tracker.similarity_index) == 1
+        reloaded = DecisionConfidenceScorer(storage_path=db_path).historical_tracker.get_decision("d1")
+        assert (reloaded.actual_outcome, reloaded.decision_context) == (0.9, context)
+        assert reloaded.predicted_success == pytest.approx(metrics.predicted_success_probability)
+
+    def test_pending_predictions_are_bounded(self, tmp_path):
+        db_path = str(tmp_path / "decisions.db")
+        scorer = DecisionConfidenceScorer(storage_path=db_path, max_pending=3)
+        for i in range(5):
+            scorer.calculate_decision_confidence([], {"complexity_score": i / 5}, decision_id=f"d{i}")
+        scorer.calculate_decision_confidence([], {}, decision_id="d2")  # Re-scored: most recent again
+        scorer.calculate_decision_confidence([], {}, decision_id="d5")
+
+        tracker = scorer.historical_tracker
+        assert [tracker.get_decision(f"d{i}") is not None for i in range(6)] == [
+            False, False, True, False, True, True]
+        assert scorer.update_decision_outcome("d4", 0.8, []) is True
+        assert list(tracker._pending) == ["d2", "d5"]
+
+        reloaded = DecisionConfidenceScorer(storage_path=db_path, max_pending=1).historical_tracker
+        assert sorted(reloaded._decisions_by_id) == ["d4", "d5"]
+        assert len(DecisionConfidenceScorer(storage_path=db_path).historical_tracker._decisions_by_id) == 2
+
+    def test_non_numeric_context_values_fall_back_to_defaults(self):
+        default = decision_context_features({})
+        assert decision_context_features({"timeline_weeks": "6-8", "complexity_score": None}) == default
+        assert decision_context_features({"complexity_score": "0.5", "required_expertise": None}) == default
+
+        scorer = DecisionConfidenceScorer()
+        metrics = scorer.calculate_decision_confidence([], {"timeline_weeks": "6-8", "complexity_score": "high"})
+        assert 0.0 <= metrics.predicted_success_probability <= 1.0
@@ -0,0 +1,94 @@
+"""
+Tests for pruned, parallel and cached discovery in env_scanner
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import env_scanner
+from agent_core.ignore_rules import IgnoreRules, parse_ignore_lines
+from env_scanner import iter_project_files, scan_env_and_tools
+
+
+def write(path, text):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+    past = time.time() - 60  # Outside the scan cache's racily-clean window
+    os.utime(path, (past, past))
+
+
+def build_project(root):
+    write(root / "app.py", "import os\nos.getenv('APP_TOKEN')\n")
+    write(root / "docs" / "guide.md", "Uses ChronoMesh for sync\n")
+    write(root / "node_modules" / "pkg" / "index.py", "os.getenv('VENDORED_KEY')\n")
+    write(root / ".git" / "hooks" / "hook.py", "os.getenv('GIT_HOOK_KEY')\n")
+    write(root / "build" / "gen.py", "os.getenv('BUILD_KEY')\n")
+    write(root / "logs" / "keep.yaml", "key: os.getenv('KEPT_KEY')\n")
+    write(root / "logs" / "drop.yaml", "key: os.getenv('DROPPED_KEY')\n")
+    write(root / ".gitignore", "build/\nlogs/*.yaml\n!logs/keep.yaml\n")
+
+
+class TestIgnoreRules:
+
+    def test_gitignore_semantics(self, tmp_path):
+        rules = parse_ignore_lines(["*.log", "!keep.log", "/dist", "docs/**/draft.md", "cache/", "\\#notes"])
+        ignored = lambda path, is_dir=False: any(r.matches(path, is_dir) for r in rules if not r.negated)
+        assert ignored("a/b/err.log") and ignored("dist") and not ignored("src/dist")
+        assert ignored("docs/draft.md") and ignored("docs/a/b/draft.md")
+        assert ignored("x/cache", is_dir=True) and not ignored("x/cache")
+        assert ignored("#notes")
+
+        write(tmp_path / "sub" / ".gitignore", "*.tmp\n")
+        write(tmp_path / ".gitignore", "!*.tmp\nvendor\n")
+        project = IgnoreRules(tmp_path)
+        assert project.is_ignored("sub/a.tmp") and not project.is_ignored("a.tmp")
+        assert project.is_ignored("vendor/lib/x.py") and project.is_ignored("node_modules/x.py")
+
+
+class TestEnvDiscovery:
+
+    def test_ignored_directories_are_pruned(self, tmp_path):
+        build_project(tmp_path)
+        assert scan_env_and_tools(tmp_path) == {"env_keys": ["APP_TOKEN", "KEPT_KEY"], "tools": ["ChronoMeshSync"]}
+        files = {os.path.relpath(file, tmp_path) for file, _ in iter_project_files(tmp_path, max_workers=3)}
+        assert files == {"app.py", os.path.join("docs", "guide.md"), os.path.join("logs", "keep.yaml")}
+
+    def test_repeated_scans_come_from_the_cache(self, tmp_path, monkeypatch):
+        build_project(tmp_path)
+        first = dict(iter_project_files(tmp_path))
+
+        scanned = []
+        real_scan = env_scanner.scan_content
+        monkeypatch.setattr(env_scanner, "scan_content", lambda text: scanned.append(text) or real_scan(text))
+        assert dict(iter_project_files(tmp_path)) == first
+        assert scanned == []
+
+        write(tmp_path / "app.py", "import os\nos.getenv('ROTATED_TOKEN')\n")
+        assert scan_env_and_tools(tmp_path)["env_keys"] == ["KEPT_KEY", "ROTATED_TOKEN"]
+        assert len(scanned) == 1
+
+    def test_idle_scan_caches_are_closed_beyond_the_limit(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(env_scanner, "MAX_OPEN_SCAN_CACHES", 2)
+        monkeypatch.setattr(env_scanner, "_scan_caches", env_scanner.OrderedDict())
+        closed = []
+        real_close = env_scanner.ScanCache.close
+        monkeypatch.setattr(env_scanner.ScanCache, "close", lambda cache: closed.append(str(cache.db_path)) or real_close(cache))
+        projects = []
+        for name in ("a", "b", "c"):
+            build_project(tmp_path / name)
+            projects.append(tmp_path / name)
+
+        scans = iter_project_files(projects[0])
+        next(scans)  # Keeps the first project's cache in use
+        for project in projects[1:]:
+            scan_env_and_tools(project)
+        assert len(env_scanner._scan_caches) == 2
+        assert closed == [os.path.abspath(projects[1] / ".vanta" / "scan_cache.db")]
+
+        list(scans)
+        scan_env_and_tools(projects[1])
+        assert len(env_scanner._scan_caches) == 2
+        assert len(closed) == 2
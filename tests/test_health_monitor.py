@@ -0,0 +1,107 @@
+"""
+Tests for concurrent HealthMonitor checks, deadlines and cached trigger evaluation
+"""
+
+import asyncio
+import os
+import sys
+import time
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'vanta_2_0', 'src', 'core')))
+
+from rollback_recovery_manager import HealthMonitor, SystemState
+
+
+def probe(delay=0.0, metrics=None):
+    async def check():
+        await asyncio.sleep(delay)
+        return dict(metrics or {"cpu_usage": 10})
+    return check
+
+
+async def hang():
+    await asyncio.Event().wait()
+
+
+async def stubborn_hang():
+    """Swallows the first cancellation"""
+    try:
+        await asyncio.sleep(3600)
+    except asyncio.CancelledError:
+        await asyncio.sleep(3600)
+
+
+class TestHealthMonitor:
+
+    @pytest.mark.asyncio
+    async def test_checks_run_concurrently_with_cap(self):
+        monitor = HealthMonitor({"max_concurrent_checks": 5})
+        active = peak = 0
+
+        async def tracked():
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.05)
+            active -= 1
+            return {"cpu_usage": 10}
+
+        for i in range(20):
+            await monitor.register_health_check(f"check_{i}", tracked, "api")
+
+        start = time.perf_counter()
+        results = await monitor.run_all_health_checks()
+
+        assert len(results) == 20
+        assert peak == 5
+        assert time.perf_counter() - start < 0.5
+
+    @pytest.mark.asyncio
+    async def test_hung_checks_fail_at_deadline(self):
+        monitor = HealthMonitor({"check_timeout_seconds": 0.1, "consecutive_failures_threshold": 1})
+        await monitor.register_health_check("ok", probe(), "api")
+        await monitor.register_health_check("hung", hang, "db")
+        await monitor.register_health_check("stubborn", stubborn_hang, "cache", timeout_seconds=0.05)
+
+        start = time.perf_counter()
+        results = {check.check_id: check for check in await monitor.run_all_health_checks()}
+
+        assert time.perf_counter() - start < 0.5
+        assert results["ok"].status == SystemState.HEALTHY
+        assert results["hung"].threshold_violations == ["health_check_timed_out"]
+        assert results["stubborn"].status == SystemState.FAILED
+        assert monitor.should_trigger_rollback()[0] is True
+
+    @pytest.mark.asyncio
+    async def test_stale_results_do_not_trigger(self):
+        monitor = HealthMonitor({"consecutive_failures_threshold": 1, "result_ttl_seconds": 60,
+                                 "component_ttl_seconds": {"db": 0.05}})
+        await monitor.register_health_check("db", probe(metrics={"error": "down"}), "db")
+        await monitor.run_all_health_checks()
+
+        assert monitor.should_trigger_rollback()[0] is True
+        assert len(monitor.get_cached_results("db")) == 1
+
+        await asyncio.sleep(0.1)
+
+        assert monitor.should_trigger_rollback() == (False, "")
+        assert monitor.get_cached_results("db") == []
+
+    @pytest.mark.asyncio
+    async def test_monitoring_decides_on_cadence_despite_hung_probe(self):
+        monitor = HealthMonitor({"check_interval_seconds": 0.05, "evaluation_interval_seconds": 0.02,
+                                 "check_timeout_seconds": 0.2, "consecutive_failures_threshold": 1})
+        await monitor.register_health_check("db", probe(metrics={"error": "down"}), "db")
+        await monitor.register_health_check("hung", hang, "api")
+        triggered = []
+
+        async def on_rollback(reason):
+            triggered.append(reason)
+
+        await monitor.start_monitoring(on_rollback)
+        await asyncio.sleep(0.15)
+        await monitor.stop_monitoring()
+
+        assert triggered == ["Health check db failed 1 consecutive times"]
+        assert monitor.last_decision["rollback"] is True
@@ -0,0 +1,141 @@
+"""
+Tests for the IdentityKernel mutation journal, snapshots, incremental
+identity hash and rollback
+"""
+
+import copy
+import json
+from dataclasses import asdict
+
+from agent_core.identity_kernel import IdentityKernel, IdentityMerkleMap
+
+
+def make_kernel(tmp_path, **kwargs):
+    return IdentityKernel("agent", identity_store_path=str(tmp_path / "identity_agent.json"), **kwargs)
+
+
+def state(kernel):
+    return asdict(kernel.symbolic_self), copy.deepcopy(kernel.mcp_context)
+
+
+class TestIdentityKernel:
+
+    def test_mutations_append_to_journal_and_reload(self, tmp_path):
+        kernel = make_kernel(tmp_path, snapshot_interval=100)
+        snapshot = (tmp_path / "identity_agent.json").read_text()
+
+        kernel.evolve_symbolic_self({"purpose_vector": "security"}, "specialize")
+        for i in range(5):
+            kernel.update_mcp_context({f"tool_{i}": i})
+
+        assert (tmp_path / "identity_agent.json").read_text() == snapshot
+        assert len((tmp_path / "identity_agent.json.journal").read_text().splitlines()) == 6
+
+        reloaded = make_kernel(tmp_path, snapshot_interval=100)
+        assert state(reloaded) == state(kernel)
+        assert reloaded.identity_hash == kernel.identity_hash
+        assert len(reloaded.mutation_lineage) == len(kernel.mutation_lineage)
+        assert reloaded.validate_identity_integrity()
+
+    def test_incremental_hash_matches_full_rebuild(self, tmp_path):
+        kernel = make_kernel(tmp_path)
+        for i in range(20):
+            kernel.update_mcp_context({f"key_{i % 7}": [i, str(i)]})
+        kernel.evolve_symbolic_self({"core_values": ["a", "b"]}, "values")
+
+        assert kernel.identity_hash == kernel._rebuild_merkle().root()
+
+        kernel.mcp_context["key_0"] = "tampered"
+        assert kernel.validate_identity_integrity() is False
+
+    def test_merkle_map_is_order_independent(self):
+        first, second = IdentityMerkleMap(), IdentityMerkleMap()
+        for i in range(100):
+            first.set(f"k{i}", i)
+        for i in reversed(range(100)):
+            second.set(f"k{i}", i)
+        second.set("extra", 1)
+        second.delete("extra")
+
+        assert first.root() == second.root()
+
+    def test_snapshot_compacts_journal(self, tmp_path):
+        kernel = make_kernel(tmp_path, snapshot_interval=4)
+        initial = len(kernel.mutation_lineage)
+        for i in range(10):
+            kernel.update_mcp_context({"counter": i})
+
+        journal = (tmp_path / "identity_agent.json.journal").read_text().splitlines()
+        assert 4 <= len(journal) < 10
+        assert initial + 10 == len(kernel.mutation_lineage)
+        assert json.loads((tmp_path / "identity_agent.json").read_text())["journal_seq"] == \
+            len(kernel.mutation_lineage) - len(journal)
+
+        reloaded = make_kernel(tmp_path, snapshot_interval=4)
+        assert reloaded.mcp_context["counter"] == 9
+        assert reloaded.identity_hash == kernel.identity_hash
+
+    def test_torn_and_tampered_journal_tail_is_discarded(self, tmp_path):
+        kernel = make_kernel(tmp_path, snapshot_interval=100)
+        kernel.update_mcp_context({"a": 1})
+        kernel.update_mcp_context({"b": 2})
+        journal = tmp_path / "identity_agent.json.journal"
+        lines = journal.read_text().splitlines(keepends=True)
+
+        tampered = json.loads(lines[1])
+        tampered["mutation"]["delta"]["mcp_context"]["after"]["b"] = 3
+        journal.write_text(lines[0] + json.dumps(tampered) + "\n")
+        reloaded = make_kernel(tmp_path, snapshot_interval=100)
+        assert "a" in reloaded.mcp_context and "b" not in reloaded.mcp_context
+
+        with open(journal, "a") as f:
+            f.write('{"seq": 4, "prev"')
+        reloaded = make_kernel(tmp_path, snapshot_interval=100)
+        reloaded.update_mcp_context({"c": 3})
+        reloaded = make_kernel(tmp_path, snapshot_interval=100)
+        assert reloaded.mcp_context["c"] == 3
+        assert reloaded.validate_identity_integrity()
+
+    def test_rollback_from_checkpoint_and_by_rewind(self, tmp_path):
+        kernel = make_kernel(tmp_path, snapshot_interval=8)
+        history = []
+        for i in range(40):
+            history.append(state(kernel))
+            if i % 3 == 0:
+                kernel.evolve_symbolic_self({"purpose_vector": f"purpose_{i}", "capabilities": [str(i)]}, "evolve")
+            else:
+                kernel.update_mcp_context({f"key_{i % 5}": i})
+        offset = len(kernel.mutation_lineage) - 40
+
+        for target in (9, 39):
+            mutation_id = kernel.mutation_lineage[offset + target].mutation_id
+            assert kernel.rollback_to_mutation(mutation_id)
+            assert state(kernel) == history[target]
+
+        reloaded = make_kernel(tmp_path, snapshot_interval=8)
+        assert state(reloaded) == history[39]
+        assert reloaded.rollback_to_mutation(reloaded.mutation_lineage[offset + 2].mutation_id)
+        assert state(reloaded) == history[2]
+        assert reloaded.rollback_to_mutation("unknown") is False
+
+    def test_legacy_identity_file_is_migrated(self, tmp_path):
+        legacy_self = {"purpose_vector": "old", "core_values": [], "capabilities": [], "behavioral_patterns": {},
+                       "interaction_preferences": {}, "learning_style": "adaptive",
+                       "symbolic_representation": "Agent(agent)"}
+        legacy = {
+            "agent_id": "agent", "identity_hash": "0" * 64, "created_at": "2025-01-01T00:00:00+00:00",
+            "anchor_traits": {}, "mcp_context": {"protocol_version": "1.0"},
+            "symbolic_self": dict(legacy_self, purpose_vector="new"),
+            "mutation_lineage": [{
+                "mutation_id": "agent_0_1", "timestamp": "2025-01-01T00:00:00+00:00",
+                "mutation_type": "symbolic_self_evolution", "description": "evolve",
+                "impact_assessment": {}, "rollback_data": legacy_self, "success": True
+            }]
+        }
+        (tmp_path / "identity_agent.json").write_text(json.dumps(legacy))
+
+        kernel = make_kernel(tmp_path)
+        assert kernel.get_identity_summary()["integrity_status"] == "valid"
+        assert kernel.rollback_to_mutation("agent_0_1")
+        assert kernel.symbolic_self.purpose_vector == "old"
+        assert make_kernel(tmp_path).symbolic_self.purpose_vector == "old"
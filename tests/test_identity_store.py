@@ -0,0 +1,122 @@
+"""
+Tests for batched, crash-consistent identity persistence in SharedIdentityStore
+"""
+
+import os
+import sqlite3
+import subprocess
+import sys
+import textwrap
+import time
+
+from agent_core.identity_store import SharedIdentityStore
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+
+def row_counts(db_path):
+    with sqlite3.connect(str(db_path)) as conn:
+        return (conn.execute("SELECT COUNT(*) FROM identity_snapshots").fetchone()[0],
+                conn.execute("SELECT COUNT(*) FROM identity_journal").fetchone()[0])
+
+
+class TestSharedIdentityStore:
+
+    def test_mutations_are_buffered_and_flushed_together(self, tmp_path):
+        db_path = tmp_path / "identities.db"
+        store = SharedIdentityStore(str(db_path), flush_interval=None)
+        kernels = [store.get_kernel(f"agent_{i}") for i in range(50)]
+        for round_number in range(3):
+            for kernel in kernels:
+                kernel.update_mcp_context({"round": round_number})
+
+        assert row_counts(db_path) == (0, 0)
+        assert store.flush() == 50 + 150
+        assert store.stats["flushes"] == 1
+        assert row_counts(db_path) == (50, 150)
+        store.close()
+
+        reopened = SharedIdentityStore(str(db_path), flush_interval=None)
+        for kernel in kernels:
+            loaded = reopened.get_kernel(kernel.agent_id)
+            assert loaded.mcp_context == kernel.mcp_context
+            assert loaded.identity_hash == kernel.identity_hash
+            assert loaded.validate_identity_integrity()
+        reopened.close()
+
+    def test_snapshots_coalesce_buffered_entries(self, tmp_path):
+        db_path = tmp_path / "identities.db"
+        store = SharedIdentityStore(str(db_path), flush_interval=None, kernel_options={"snapshot_interval": 4})
+        kernel = store.get_kernel("agent")
+        for i in range(40):
+            kernel.update_mcp_context({"counter": i})
+        store.flush()
+
+        snapshots, journal_rows = row_counts(db_path)
+        assert snapshots == 1
+        assert journal_rows == len(kernel.mutation_lineage) - kernel._snapshot_seq
+        assert store.stats["entries_coalesced"] + journal_rows == 40
+        store.close()
+
+        reopened = SharedIdentityStore(str(db_path), flush_interval=None)
+        assert reopened.get_kernel("agent").mcp_context["counter"] == 39
+        reopened.close()
+
+    def test_identities_load_lazily(self, tmp_path):
+        db_path = tmp_path / "identities.db"
+        with SharedIdentityStore(str(db_path), flush_interval=None) as store:
+            for i in range(5):
+                store.get_kernel(f"agent_{i}").evolve_symbolic_self({"purpose_vector": f"p{i}"}, "evolve")
+
+        store = SharedIdentityStore(str(db_path), flush_interval=None)
+        assert sorted(store.agent_ids()) == [f"agent_{i}" for i in range(5)]
+        assert store.loaded_agent_ids() == []
+
+        kernel = store.get_kernel("agent_3")
+        assert kernel.symbolic_self.purpose_vector == "p3"
+        assert store.get_kernel("agent_3") is kernel
+        assert store.loaded_agent_ids() == ["agent_3"]
+        store.close()
+
+    def test_background_flush(self, tmp_path):
+        db_path = tmp_path / "identities.db"
+        store = SharedIdentityStore(str(db_path), flush_interval=0.02)
+        store.get_kernel("agent").update_mcp_context({"x": 1})
+
+        deadline = time.monotonic() + 2
+        while row_counts(db_path)[1] == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert row_counts(db_path) == (1, 1)
+        store.close()
+
+    def test_crash_keeps_last_flushed_state(self, tmp_path):
+        db_path = tmp_path / "identities.db"
+        script = textwrap.dedent(f"""
+            import os, sys
+            sys.path.insert(0, {ROOT!r})
+            from agent_core.identity_store import SharedIdentityStore
+            store = SharedIdentityStore({str(db_path)!r}, flush_interval=None, max_pending=7,
+                                        kernel_options={{"snapshot_interval": 5}})
+            kernels = [store.get_kernel(f"agent_{{i}}") for i in range(20)]
+            for step in range(30):
+                for kernel in kernels:
+                    kernel.update_mcp_context({{"step": step}})
+                if step == 19:
+                    store.flush()
+            os._exit(1)
+        """)
+        result = subprocess.run([sys.executable, "-c", script], capture_output=True)
+        assert result.returncode == 1
+
+        store = SharedIdentityStore(str(db_path), flush_interval=None)
+        steps = []
+        for i in range(20):
+            kernel = store.get_kernel(f"agent_{i}")
+            assert kernel.validate_identity_integrity()
+            assert kernel.get_identity_summary()["integrity_status"] == "valid"
+            steps.append(kernel.mcp_context["step"])
+            assert len(kernel.mutation_lineage) == 2 + steps[-1] + 1
+        # Only mutations buffered after the last automatic flush are lost
+        assert min(steps) >= 19
+        assert sum(29 - step for step in steps) < 7
+        store.close()
@@ -0,0 +1,249 @@
+"""
+Tests for MCPHandler transport dispatch, batching and tool indexing
+"""
+
+import asyncio
+import pytest
+from contextlib import asynccontextmanager
+
+from agent_core.unified_communication import (
+    AgentInfo, MessageType as UnifiedMessageType, UnifiedCommunicationLayer, UnifiedMessage
+)
+from vanta_seed.core.component_registry import COMPONENT_REGISTRY
+from vanta_seed.core.protocol_handlers import MCPHandler
+from vanta_seed.protocols.message_types import (
+    AgentMessage, MCPToolDefinition, MessageType, ProtocolType
+)
+
+
+class InMemoryTransport:
+    """Minimal UnifiedCommunicationLayer stand-in that delivers to local handlers"""
+
+    def __init__(self):
+        self.registered_agents = {}
+        self.message_handlers = {}
+        self.batches = []
+
+    async def register_agent(self, agent_id, agent_type, capabilities=None, language="python", endpoint=None):
+        self.registered_agents[agent_id] = agent_type
+        return True
+
+    def register_message_handler(self, agent_id, handler):
+        self.message_handlers[agent_id] = handler
+
+    async def send_message(self, message):
+        return (await self.send_messages([message]))[0]
+
+    async def send_messages(self, messages):
+        self.batches.append(len(messages))
+        results = []
+        for message in messages:
+            handler = self.message_handlers.get(message.target_agent)
+            if handler is None:
+                results.append(False)
+                continue
+            asyncio.get_running_loop().create_task(handler(message))
+            results.append(True)
+        return results
+
+
+class EchoToolAgent:
+    """Agent that echoes tool parameters back, optionally never answering"""
+
+    def __init__(self, agent_id, silent=False):
+        self.agent_id = agent_id
+        self.silent = silent
+
+    def get_capabilities(self):
+        return ["echo"]
+
+    async def handle_message(self, message: AgentMessage):
+        if self.silent:
+            await asyncio.sleep(3600)
+        return AgentMessage(
+            agent_id=self.agent_id,
+            target_agent=message.agent_id,
+            action="mcp_response",
+            parameters={"success": True, "result": {"echo": message.parameters}},
+            correlation_id=message.correlation_id,
+            protocol=ProtocolType.MCP,
+            message_type=MessageType.RESPONSE
+        )
+
+
+ECHO_TOOL_SCHEMA = {
+    "type": "object",
+    "properties": {"text": {"type": "string"}},
+    "required": ["text"]
+}
+
+
+@asynccontextmanager
+async def echo_setup():
+    transport = InMemoryTransport()
+    handler = MCPHandler(request_timeout=0.2)
+    await handler.attach_transport(transport)
+
+    await COMPONENT_REGISTRY.register_agent(
+        "echo_agent", ["echo"], [ProtocolType.MCP],
+        [MCPToolDefinition("echo", "Echo text", ECHO_TOOL_SCHEMA, "echo_agent")]
+    )
+    await COMPONENT_REGISTRY.register_agent(
+        "silent_agent", ["echo"], [ProtocolType.MCP],
+        [MCPToolDefinition("silent", "Never answers", {}, "silent_agent")]
+    )
+    await handler.serve_agent(EchoToolAgent("echo_agent"))
+    await handler.serve_agent(EchoToolAgent("silent_agent", silent=True))
+
+    try:
+        yield handler, transport
+    finally:
+        await COMPONENT_REGISTRY.unregister_agent("echo_agent")
+        await COMPONENT_REGISTRY.unregister_agent("silent_agent")
+
+
+class TestMCPHandlerDispatch:
+
+    @pytest.mark.asyncio
+    async def test_execute_tool_round_trip(self):
+        async with echo_setup() as (handler, _):
+            response = await handler.execute_tool("echo", {"text": "hi"}, requesting_agent="tester")
+
+            assert response.success
+            assert response.result == {"echo": {"text": "hi"}}
+            assert response.agent_id == "echo_agent"
+            assert handler._pending == {}
+
+    @pytest.mark.asyncio
+    async def test_execute_tools_pipelines_one_batch(self):
+        async with echo_setup() as (handler, transport):
+            calls = [{"tool_name": "echo", "parameters": {"text": str(i)}} for i in range(5)]
+
+            responses = await handler.execute_tools(calls)
+
+            assert [r.result["echo"]["text"] for r in responses] == [str(i) for i in range(5)]
+            # Five requests in one publish, then the replies
+            assert transport.batches[0] == 5
+
+    @pytest.mark.asyncio
+    async def test_per_tool_concurrency_limit(self):
+        async with echo_setup() as (handler, transport):
+            handler.set_tool_concurrency("echo", 2)
+            calls = [{"tool_name": "echo", "parameters": {"text": "x"}} for _ in range(6)]
+
+            responses = await handler.execute_tools(calls)
+
+            assert all(r.success for r in responses)
+            assert transport.batches[0] == 2
+
+    @pytest.mark.asyncio
+    async def test_validation_rejects_before_dispatch(self):
+        async with echo_setup() as (handler, transport):
+            response = await handler.execute_tool("echo", {"text": 42})
+
+            assert not response.success
+            assert "Missing required parameter: text" not in response.errors
+            assert "Parameter 'text' has incorrect type" in response.errors
+            assert transport.batches == []
+
+    @pytest.mark.asyncio
+    async def test_timeout_clears_pending(self):
+        async with echo_setup() as (handler, _):
+            response = await handler.execute_tool("silent", {})
+
+            assert not response.success
+            assert "timed out" in response.errors[0]
+            assert handler._pending == {}
+
+    @pytest.mark.asyncio
+    async def test_tool_index_follows_registry_version(self):
+        async with echo_setup() as (handler, _):
+            assert (await handler.validate_tool_parameters("late", {}))["valid"] is False
+
+            await COMPONENT_REGISTRY.register_agent(
+                "late_agent", [], [ProtocolType.MCP],
+                [MCPToolDefinition("late", "Registered later", {"required": ["x"]}, "late_agent")]
+            )
+            try:
+                result = await handler.validate_tool_parameters("late", {})
+                assert result["errors"] == ["Missing required parameter: x"]
+            finally:
+                await COMPONENT_REGISTRY.unregister_agent("late_agent")
+
+
+def test_error_reply_becomes_failed_response():
+    handler = MCPHandler()
+    request = AgentMessage(agent_id="a", target_agent="b", action="tool", protocol=ProtocolType.MCP)
+    reply = AgentMessage(
+        agent_id="b", action="mcp_error", parameters={"error": "boom"},
+        correlation_id=request.correlation_id, message_type=MessageType.ERROR
+    ).to_dict()
+
+    response = handler._response_from_payload(reply, request, 0.0)
+
+    assert not response.success
+    assert response.errors == ["boom"]
+
+
+class RecordingKEBClient:
+    """KEBClient stand-in that records what is published to which stream"""
+
+    def __init__(self):
+        self.published = []
+
+    def create_consumer_group(self, stream_name, group_name, start_id='$'):
+        return True
+
+    def publish(self, stream_name, event):
+        self.published.append((stream_name, event))
+        return f"{len(self.published)}-0"
+
+    def publish_many(self, stream_name, events):
+        return [self.publish(stream_name, event) for event in events]
+
+
+class TestUnifiedRouting:
+
+    def make_layer(self):
+        layer = UnifiedCommunicationLayer(RecordingKEBClient())
+        layer.registered_agents["py_agent"] = AgentInfo("py_agent", "worker")
+        layer.registered_agents["ts_agent"] = AgentInfo("ts_agent", "ui", language="typescript")
+        return layer
+
+    @pytest.mark.asyncio
+    async def test_single_and_batched_sends_route_alike(self):
+        messages = [
+            UnifiedMessage(UnifiedMessageType.AGENT_REQUEST, "py_agent", target, message_id=f"m{i}")
+            for i, target in enumerate(["py_agent", "ts_agent", None, "unknown"])
+        ]
+
+        single = self.make_layer()
+        sent_one_by_one = [await single.send_message(message) for message in messages]
+        batched = self.make_layer()
+        sent_in_batch = await batched.send_messages(messages)
+
+        assert sent_one_by_one == sent_in_batch == [True, True, True, False]
+
+        def routes(layer):
+            return sorted((stream, event["message_id"], event.get("routing", {}).get("destination"))
+                          for stream, event in layer.keb_client.published)
+
+        assert routes(single) == routes(batched) == [
+            ("agent_broadcasts", "m2", None),
+            ("agent_messages", "m0", None),
+            ("typescript_bridge", "m1", "typescript"),
+        ]
+        assert single.registered_agents["py_agent"].message_count == 4
+        assert batched.registered_agents["py_agent"].message_count == 4
+
+    @pytest.mark.asyncio
+    async def test_failed_publish_is_not_sent(self, monkeypatch):
+        layer = self.make_layer()
+        monkeypatch.setattr(layer.keb_client, "publish", lambda stream_name, event: None)
+        logged = []
+        monkeypatch.setattr(layer, "_log_routed", lambda message, stream: logged.append(message))
+        message = UnifiedMessage(UnifiedMessageType.AGENT_REQUEST, "py_agent", "py_agent")
+
+        assert await layer.send_message(message) is False
+        assert await layer.send_messages([message]) == [False]
+        assert logged == []
@@ -0,0 +1,112 @@
+"""
+Tests for the compiled rule index and cached rule loading in project_scanner
+"""
+
+import glob
+import os
+import random
+import sys
+from pathlib import Path
+
+import yaml
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import project_scanner
+from project_scanner import RuleIndex, load_rules, match_rules, scan_projects_with_rules
+
+PATTERNS = [
+    "README.md", "src/", "src", "**/*.py", "*.py", "src/**/*.ts", "**/config/*.yaml", "docs/**",
+    "**", "**/.env", ".vanta/*", "*/.*", "tests/test_*.py", "src/**/", "lib/[ab]*.js", "**/missing.txt",
+    "./src/main.py", "src/*/index.?s", "**/**/deep.txt", "../outside.txt", "a/**/b/**/c.txt",
+]
+
+NAMES = ["README.md", "main.py", "index.ts", "index.js", "deep.txt", "c.txt", ".env", "app.yaml", "b.js", "x.cfg"]
+DIRS = ["src", "lib", "docs", "tests", "config", ".vanta", "a", "b", "pkg", ".hidden"]
+
+
+def build_project(root, rng):
+    root.mkdir(parents=True)
+    directories = [root]
+    for _ in range(rng.randint(0, 12)):
+        parent = rng.choice(directories)
+        if len(parent.relative_to(root).parts) < 4:
+            child = parent / rng.choice(DIRS)
+            child.mkdir(exist_ok=True)
+            directories.append(child)
+    for _ in range(rng.randint(0, 15)):
+        name = rng.choice(NAMES + ["test_%d.py" % rng.randint(0, 3)])
+        target = rng.choice(directories) / name
+        if not target.is_dir():
+            target.write_text("x")
+
+
+def glob_matches(project, patterns):
+    # glob yields 'missing/' for 'missing/**' without checking it exists; the index does not
+    return [i for i, pattern in enumerate(patterns)
+            if any(os.path.lexists(path) for path in glob.glob(str(project / pattern), recursive=True))]
+
+
+class TestRuleIndex:
+
+    def test_single_walk_matches_glob(self, tmp_path):
+        rng = random.Random(4)
+        index = RuleIndex(PATTERNS)
+        for n in range(60):
+            project = tmp_path / f"project_{n}"
+            build_project(project, rng)
+            matched = index.match(project)
+            assert [i for i in range(len(PATTERNS)) if matched >> i & 1] == glob_matches(project, PATTERNS), n
+
+    def test_globstar_does_not_follow_symlink_cycles(self, tmp_path):
+        project = tmp_path / "project"
+        (project / "src").mkdir(parents=True)
+        os.symlink(project, project / "src" / "loop")
+        index = RuleIndex(["**/never.txt", "src/loop/src/"])
+        assert index.match(project) == 0b10
+
+    def test_match_rules_returns_headers_in_rule_order(self, tmp_path):
+        project = tmp_path / "project"
+        (project / "src").mkdir(parents=True)
+        (project / "src" / "app.py").write_text("")
+        rules = [{"match": "**/*.py", "header": {"lang": "python"}}, {"match": "**/*.go", "header": {"lang": "go"}},
+                 {"header": {"no": "match"}}, {"match": "src/", "header": {"layout": "src"}}]
+        assert match_rules(project, rules) == [{"lang": "python"}, {"layout": "src"}]
+
+
+class TestRuleLoading:
+
+    def test_rules_are_reparsed_only_when_changed(self, tmp_path, monkeypatch):
+        rule_dir = tmp_path / "rules"
+        rule_dir.mkdir()
+        for i in range(3):
+            (rule_dir / f"rule_{i}.yaml").write_text(yaml.safe_dump({"match": f"*.{i}", "header": {"id": i}}))
+
+        parses = []
+        real_load = yaml.safe_load
+        monkeypatch.setattr(project_scanner.yaml, "safe_load", lambda text: parses.append(text) or real_load(text))
+
+        first = load_rules(rule_dir)
+        assert len(parses) == 3
+        assert sorted(rule["header"]["id"] for rule in load_rules(rule_dir)) == [0, 1, 2]
+        assert len(parses) == 3
+
+        (rule_dir / "rule_1.yaml").write_text(yaml.safe_dump({"match": "*.changed", "header": {"id": 10}}))
+        (rule_dir / "rule_2.yaml").unlink()
+        rules = load_rules(rule_dir)
+        assert len(parses) == 4
+        assert sorted(rule["header"]["id"] for rule in rules) == [0, 10]
+        assert len(first) == 3
+
+    def test_scan_projects_in_parallel(self, tmp_path):
+        rule_dir = tmp_path / "rules"
+        rule_dir.mkdir()
+        (rule_dir / "python.yaml").write_text(yaml.safe_dump({"match": "**/*.py", "header": {"lang": "python"}}))
+        root = tmp_path / "projects"
+        for i in range(6):
+            (root / f"p{i}").mkdir(parents=True)
+            if i % 2:
+                (root / f"p{i}" / "main.py").write_text("")
+
+        results = scan_projects_with_rules(root, rule_dir, max_workers=3)
+        assert results == {f"p{i}": [{"lang": "python"}] if i % 2 else [] for i in range(6)}
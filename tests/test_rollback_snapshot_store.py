@@ -0,0 +1,187 @@
+"""
+Tests for content-addressed incremental file system snapshots
+"""
+
+import asyncio
+import hashlib
+import os
+import sqlite3
+import sys
+import zlib
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'vanta_2_0', 'src', 'core')))
+
+from rollback_recovery_manager import ContentAddressedSnapshotStore, FileSystemBackupManager, VantaRollbackManager
+
+
+def make_tree(root, files=20):
+    src = root / "src"
+    (src / "pkg").mkdir(parents=True)
+    for i in range(files):
+        (src / "pkg" / f"module_{i}.py").write_text(f"value = {i}\n" * (i + 1))
+    (src / "app.log").write_text("excluded\n")
+    return src
+
+
+class TestContentAddressedSnapshotStore:
+
+    def test_incremental_snapshot_reuses_unchanged_files(self, tmp_path):
+        src = make_tree(tmp_path)
+        store = ContentAddressedSnapshotStore(tmp_path / "backups", exclude_patterns=["*.log"])
+
+        _, first = store.create_snapshot("s1", [str(src)])
+        assert first.files_total == 20
+        assert first.files_stored == 20
+
+        (src / "pkg" / "module_3.py").write_text("value = 'changed'\n")
+        _, second = store.create_snapshot("s2", [str(src)])
+
+        assert second.files_reused == 19
+        assert second.files_stored == 1
+        assert second.chunks_written == 1
+        assert "src/app.log" not in store.load_manifest("s2")["files"]
+
+    def test_identical_content_is_stored_once(self, tmp_path):
+        src = tmp_path / "src"
+        src.mkdir()
+        for name in ("a.txt", "b.txt", "c.txt"):
+            (src / name).write_bytes(b"same bytes" * 1000)
+        store = ContentAddressedSnapshotStore(tmp_path / "backups", chunk_size=4096)
+
+        _, stats = store.create_snapshot("s1", [str(src)])
+
+        manifest = store.load_manifest("s1")
+        assert len(manifest["files"]["src/a.txt"]["chunks"]) == 3
+        assert stats.chunks_written == 3
+
+    def test_restore_rewrites_only_changed_files_and_prunes(self, tmp_path):
+        src = make_tree(tmp_path)
+        store = ContentAddressedSnapshotStore(tmp_path / "backups", exclude_patterns=["*.log"])
+        store.create_snapshot("s1", [str(src)])
+        untouched_inode = (src / "pkg" / "module_0.py").stat().st_ino
+
+        (src / "pkg" / "module_5.py").write_text("broken\n")
+        (src / "pkg" / "module_6.py").unlink()
+        (src / "pkg" / "new_file.py").write_text("added\n")
+
+        result = store.restore_snapshot("s1", [str(src)])
+
+        assert result == {"files_written": 2, "files_deleted": 1, "files_unchanged": 18}
+        assert (src / "pkg" / "module_5.py").read_text() == "value = 5\n" * 6
+        assert (src / "pkg" / "module_6.py").exists()
+        assert not (src / "pkg" / "new_file.py").exists()
+        assert (src / "app.log").exists()
+        assert (src / "pkg" / "module_0.py").stat().st_ino == untouched_inode
+
+        assert store.restore_snapshot("s1", [str(src)])["files_written"] == 0
+
+    def test_collect_garbage_keeps_referenced_chunks(self, tmp_path):
+        src = make_tree(tmp_path, files=3)
+        store = ContentAddressedSnapshotStore(tmp_path / "backups")
+        store.create_snapshot("s1", [str(src)])
+        (src / "pkg" / "module_0.py").write_text("replaced\n")
+        store.create_snapshot("s2", [str(src)])
+
+        store.delete_snapshot("s1")
+
+        assert store.collect_garbage() == 1
+        assert store.restore_snapshot("s2", [str(src)])["files_written"] == 0
+
+
+class TestFileSystemBackupManager:
+
+    def test_backup_and_restore_round_trip(self, tmp_path):
+        src = make_tree(tmp_path, files=5)
+        manager = FileSystemBackupManager({"backup_directory": str(tmp_path / "backups")})
+
+        manifest_path = asyncio.run(manager.create_filesystem_backup("snap", [str(src)]))
+        assert manifest_path.endswith("snap.manifest")
+        assert manager.backup_size_bytes(manifest_path) == manager.last_backup_stats.total_bytes
+
+        (src / "pkg" / "module_1.py").write_text("oops\n")
+        assert asyncio.run(manager.restore_filesystem_backup(manifest_path, [str(src)])) is True
+
+        assert (src / "pkg" / "module_1.py").read_text() == "value = 1\n" * 2
+        snapshots = manager.store.list_snapshots()
+        assert len(snapshots) == 2
+        assert manager.store.head_snapshot_id() == "snap"
+
+    def test_zip_format_still_available(self, tmp_path):
+        src = make_tree(tmp_path, files=2)
+        manager = FileSystemBackupManager({"backup_directory": str(tmp_path / "backups"), "format": "zip"})
+
+        backup_path = asyncio.run(manager.create_filesystem_backup("snap", [str(src)]))
+
+        assert backup_path.endswith(".zip")
+        assert manager.store is None
+
+
+def make_manager(tmp_path, src):
+    db_path = tmp_path / "app.db"
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE t (v TEXT)")
+    conn.execute("INSERT INTO t VALUES ('original')")
+    conn.commit()
+    conn.close()
+    return VantaRollbackManager({
+        "database": {"type": "sqlite", "path": str(db_path),
+                     "backup_directory": str(tmp_path / "backups" / "database"),
+                     "hash_chunk_size_bytes": 1024},
+        "filesystem": {"backup_directory": str(tmp_path / "backups" / "filesystem"), "exclude_patterns": ["*.log"]},
+        "backup_paths": [str(src)],
+        "storage_db_path": str(tmp_path / "rollback_manager.db"),
+    }), db_path
+
+
+class TestSnapshotManifestTree:
+
+    @pytest.mark.asyncio
+    async def test_snapshot_records_streaming_digests(self, tmp_path):
+        src = make_tree(tmp_path, files=4)
+        manager, db_path = make_manager(tmp_path, src)
+
+        snapshot = await manager.create_system_snapshot("baseline")
+
+        tree = snapshot.manifest_tree
+        assert tree["database"]["sha256"] == hashlib.sha256(db_path.read_bytes()).hexdigest()
+        assert len(tree["database"]["chunks"]) == -(-db_path.stat().st_size // 1024)
+        assert tree["filesystem"]["files"] == 4
+
+        manager.snapshots.clear()
+        assert manager._get_snapshot(snapshot.snapshot_id).manifest_tree == tree
+
+    @pytest.mark.asyncio
+    async def test_rollback_is_verified(self, tmp_path):
+        src = make_tree(tmp_path, files=4)
+        manager, db_path = make_manager(tmp_path, src)
+        snapshot = await manager.create_system_snapshot("baseline")
+
+        (src / "pkg" / "module_2.py").write_text("regressed\n")
+        conn = sqlite3.connect(db_path)
+        conn.execute("UPDATE t SET v = 'changed'")
+        conn.commit()
+        conn.close()
+
+        event = await manager.execute_graceful_rollback(snapshot.snapshot_id)
+
+        assert event.success is True
+        assert (src / "pkg" / "module_2.py").read_text() == "value = 2\n" * 3
+        assert sqlite3.connect(db_path).execute("SELECT v FROM t").fetchone()[0] == "original"
+        integrity = await manager._verify_rollback_integrity(snapshot)
+        assert integrity["verified"] == ["database", "filesystem", "configuration"]
+
+    @pytest.mark.asyncio
+    async def test_corrupt_chunk_is_not_restored(self, tmp_path):
+        src = make_tree(tmp_path, files=4)
+        manager, _ = make_manager(tmp_path, src)
+        snapshot = await manager.create_system_snapshot("baseline")
+        store = manager.fs_backup_manager.store
+        digest = store.load_manifest(snapshot.snapshot_id)["files"]["src/pkg/module_1.py"]["chunks"][0]
+        store._object_path(digest).write_bytes(zlib.compress(b"tampered"))
+
+        (src / "pkg" / "module_1.py").write_text("local edit\n")
+        restored = await manager.fs_backup_manager.restore_filesystem_backup(snapshot.file_system_state, [str(src)])
+
+        assert restored is False
+        assert (src / "pkg" / "module_1.py").read_text() == "local edit\n"
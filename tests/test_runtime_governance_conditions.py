@@ -0,0 +1,113 @@
+"""
+Tests for compiled governance rule conditions and the per-context rule index
+"""
+
+import logging
+from datetime import datetime, timezone
+import pytest
+
+from agent_core.runtime_governance_engine import (
+    AutonomyLevel, DecisionContext, GovernanceConditionError, GovernanceLevel,
+    GovernanceRule, create_runtime_governance_engine, compile_condition
+)
+
+
+def make_rule(rule_id, condition, context=DecisionContext.OPERATIONS, priority=10):
+    now = datetime.now(timezone.utc)
+    return GovernanceRule(
+        rule_id=rule_id, level=GovernanceLevel.TACTICAL, context=context,
+        condition=condition, action="noop", priority=priority,
+        autonomy_level=AutonomyLevel.GUIDED, created_at=now, last_modified=now
+    )
+
+
+class TestCompileCondition:
+
+    @pytest.mark.parametrize("condition, situation, expected", [
+        ("response_time > baseline * 1.5", {"response_time": 3.5, "baseline": 2.0}, True),
+        ("threat_level >= 'HIGH'", {"threat_level": "LOW"}, True),
+        ("0 < load <= 0.5 and not degraded", {"load": 0.4, "degraded": False}, True),
+        ("region in ('eu', 'us') or override", {"region": "ap", "override": False}, False),
+        ("metrics.cpu > 0.9", {"metrics": {"cpu": 0.95}}, True),
+        ("nodes[0] == 'primary'", {"nodes": ["primary"]}, True),
+    ])
+    def test_matches_python_semantics(self, condition, situation, expected):
+        assert bool(compile_condition(condition)(situation)) is expected
+        assert bool(eval(condition, {"__builtins__": {}}, situation_namespace(situation))) is expected
+
+    @pytest.mark.parametrize("condition", [
+        "__import__('os').system('true')",
+        "metrics.__class__",
+        "(lambda: 1)()",
+        "[x for x in items]",
+        "a if b else c",
+        "load >",
+    ])
+    def test_rejects_unsafe_or_invalid_syntax(self, condition):
+        with pytest.raises(GovernanceConditionError):
+            compile_condition(condition)
+
+    def test_missing_field_is_not_met(self, caplog):
+        caplog.set_level(logging.WARNING)
+        rule = make_rule("r", "compliance_score < 0.8")
+        assert rule.matches({}) is False
+        assert rule.matches({}) is False
+        assert caplog.text.count("Failed to evaluate rule r") == 1
+
+        rule.condition = "compliance_score < 0.5"
+        assert rule.matches({}) is False
+        assert caplog.text.count("Failed to evaluate rule r") == 2
+
+    def test_rule_caches_and_recompiles_on_change(self):
+        rule = make_rule("r", "x > 1")
+        compiled = rule.compiled_condition()
+        assert rule.compiled_condition() is compiled
+
+        rule.condition = "x > 5"
+        assert rule.matches({"x": 3}) is False
+
+    def test_invalid_condition_never_matches(self):
+        assert make_rule("r", "open('f')").matches({"f": 1}) is False
+
+
+def situation_namespace(situation):
+    """Mirror dotted access on dicts so eval can be used as a reference"""
+    class Namespace(dict):
+        __getattr__ = dict.__getitem__
+    return {k: Namespace(v) if isinstance(v, dict) else v for k, v in situation.items()}
+
+
+class TestRuleIndex:
+
+    @pytest.mark.asyncio
+    async def test_only_rules_for_context_are_evaluated(self):
+        engine = create_runtime_governance_engine("test")
+        engine.rules["ops"] = make_rule("ops", "x > 0")
+        engine.rules["perf"] = make_rule("perf", "x > 0", context=DecisionContext.PERFORMANCE)
+        engine.rules["perf"].matches = lambda situation: pytest.fail("wrong context evaluated")
+
+        rules = await engine._evaluate_rules(DecisionContext.OPERATIONS, {"x": 1})
+
+        assert [r.rule_id for r in rules] == ["ops"]
+
+    @pytest.mark.asyncio
+    async def test_index_follows_replacement_and_removal(self):
+        engine = create_runtime_governance_engine("test")
+        engine.rules = {"a": make_rule("a", "True", priority=1), "b": make_rule("b", "True", priority=5)}
+
+        engine.rules["a"] = make_rule("a", "True", context=DecisionContext.SECURITY)
+        del engine.rules["b"]
+
+        assert await engine._evaluate_rules(DecisionContext.OPERATIONS, {}) == []
+        assert [r.rule_id for r in await engine._evaluate_rules(DecisionContext.SECURITY, {})] == ["a"]
+
+    @pytest.mark.asyncio
+    async def test_default_rules_still_decide(self):
+        engine = create_runtime_governance_engine("test")
+        await engine.initialize_governance()
+
+        decision = await engine.make_governance_decision(
+            DecisionContext.PERFORMANCE, {"response_time": 3.5, "baseline": 2.0}
+        )
+
+        assert decision["rule_id"] == "performance_optimization"
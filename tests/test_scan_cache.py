@@ -0,0 +1,115 @@
+"""
+Tests for fingerprinted, incremental scan results in ScanCache
+"""
+
+import os
+import time
+
+from agent_core.scan_cache import ScanCache
+from agent_core.secret_discovery import SecretDiscoveryScanner
+
+PATTERNS = {"api_key": [r"(?i)api[_-]?key['\"\s]*[:=]['\"\s]*([a-zA-Z0-9_\-]{20,})"]}
+SECRET_LINE = 'API_KEY = "k3Yq9ZpL2mXv8RtW5nBc7DfG"\n'
+
+
+def age(path, seconds=60):
+    """Move a file's mtime into the past so its cache entry is not racily clean"""
+    past = time.time() - seconds
+    os.utime(path, (past, past))
+
+
+def build_tree(root, files=30):
+    paths = []
+    for i in range(files):
+        path = root / f"pkg_{i % 3}" / f"module_{i}.py"
+        path.parent.mkdir(exist_ok=True)
+        path.write_text(SECRET_LINE if i % 3 == 0 else f"value = {i}\n")
+        age(path)
+        paths.append(path)
+    return paths
+
+
+class CountingScan:
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, data):
+        self.calls += 1
+        return [len(data)]
+
+
+class TestScanCache:
+
+    def test_fingerprint_hash_and_ruleset_invalidation(self, tmp_path):
+        path = tmp_path / "config.py"
+        path.write_text("token = 'abc'\n")
+        age(path)
+        scan = CountingScan()
+        db_path = tmp_path / ".vanta" / "scan_cache.db"
+
+        with ScanCache(db_path, namespace="test", ruleset_version="v1") as cache:
+            assert cache.scan_file(str(path), scan) == [14]
+            assert cache.scan_file(str(path), scan) == [14]
+            assert scan.calls == 1 and cache.stats["hits"] == 1
+
+            # Touched but unchanged: verified by content hash, not rescanned
+            os.utime(path, None)
+            assert cache.scan_file(str(path), scan) == [14]
+            assert scan.calls == 1 and cache.stats["hash_hits"] == 1
+
+            # Same size, new content: rescanned
+            path.write_text("token = 'xyz'\n")
+            cache.scan_file(str(path), scan)
+            assert scan.calls == 2
+
+        # Persisted; a different ruleset invalidates, a different namespace is independent
+        age(path)
+        with ScanCache(db_path, namespace="test", ruleset_version="v1") as cache:
+            cache.scan_file(str(path), scan)
+            assert cache.stats["misses"] == 0
+        with ScanCache(db_path, namespace="test", ruleset_version="v2") as cache:
+            cache.scan_file(str(path), scan)
+            assert cache.stats["misses"] == 1
+        with ScanCache(db_path, namespace="other", ruleset_version="v2") as cache:
+            cache.scan_file(str(path), scan)
+            assert cache.stats["misses"] == 1
+        assert scan.calls == 4
+
+    def test_racily_clean_entries_are_verified(self, tmp_path):
+        path = tmp_path / "fresh.py"
+        path.write_text("a = 1\n")
+        scan = CountingScan()
+        with ScanCache(tmp_path / "cache.db", namespace="test") as cache:
+            cache.scan_file(str(path), scan)
+            cache.scan_file(str(path), scan)
+            # Modified within the scan's timestamp window: the fingerprint alone is not trusted
+            assert cache.stats["hits"] == 0 and cache.stats["hash_hits"] == 1
+            assert scan.calls == 1
+
+    def test_discovery_rescans_only_changed_files(self, tmp_path):
+        paths = build_tree(tmp_path)
+        db_path = tmp_path / "cache.db"
+
+        def scan(patterns=PATTERNS):
+            with ScanCache(db_path, namespace="secret_discovery") as cache:
+                scanner = SecretDiscoveryScanner(patterns, max_workers=2, batch_files=4, cache=cache)
+                found = sorted(secret.location for secret in scanner.scan([str(tmp_path / f"pkg_{i}") for i in range(3)]))
+            return found, scanner.stats
+
+        first, stats = scan()
+        assert len(first) == 10 and stats["files_cached"] == 0 and stats["files_scanned"] == 30
+
+        second, stats = scan()
+        assert second == first
+        assert stats["files_cached"] == 30 and stats["bytes_scanned"] == 0
+
+        paths[1].write_text(SECRET_LINE)
+        age(paths[1])
+        os.utime(paths[2], None)
+        third, stats = scan()
+        assert len(third) == 11
+        assert stats["files_cached"] == 29 and stats["bytes_scanned"] == len(SECRET_LINE)
+
+        _, stats = scan(dict(PATTERNS, password=[r"(?i)password\s*=\s*(\w{8,})"]))
+        assert stats["files_cached"] == 0
@@ -0,0 +1,111 @@
+"""
+Tests for the key cache, lazy decryption and batched writes in SecretBroker
+"""
+
+import base64
+import os
+import secrets
+import sys
+
+import pytest
+import yaml
+from cryptography.fernet import Fernet
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import secret_broker
+from secret_broker import KeyRing, SecretBroker
+
+PASSWORD = "correct horse battery staple"
+
+
+@pytest.fixture
+def secure_store(tmp_path, monkeypatch):
+    """A secrets_secure/ store in the same layout setup_secure_secrets.py writes"""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(secret_broker, "PBKDF2_ITERATIONS", 1000)
+    derivations = []
+    real_derive = secret_broker.derive_key
+    monkeypatch.setattr(secret_broker, "derive_key", lambda *args: derivations.append(args) or real_derive(*args))
+
+    salt = secrets.token_hex(16)
+    key = real_derive(PASSWORD, salt)
+    secure_dir = tmp_path / "secrets_secure"
+    secure_dir.mkdir()
+    (secure_dir / "config.yaml").write_text(yaml.dump({"salt": salt, "key_hash": key.hex()}))
+    cipher = Fernet(base64.b64encode(key))
+    tokens = {f"KEY_{i}": cipher.encrypt(f"value-{i}".encode()).decode() for i in range(50)}
+    tokens["BROKEN"] = "not-a-fernet-token"
+    (secure_dir / "encrypted_secrets.yaml").write_text(yaml.dump(tokens))
+    return secure_dir, derivations
+
+
+class TestSecureBroker:
+
+    def test_key_is_derived_once_and_cached_until_expiry(self, secure_store):
+        _, derivations = secure_store
+        keyring = KeyRing(ttl=60)
+        SecretBroker(None, secure=True, password=PASSWORD, keyring=keyring)
+        SecretBroker(None, secure=True, password=PASSWORD, keyring=keyring)
+        assert len(derivations) == 1
+
+        with pytest.raises(ValueError):
+            SecretBroker(None, secure=True, password="wrong", keyring=keyring)
+        assert len(derivations) == 2
+
+        expired = KeyRing(ttl=0)
+        SecretBroker(None, secure=True, password=PASSWORD, keyring=expired)
+        SecretBroker(None, secure=True, password=PASSWORD, keyring=expired)
+        assert len(derivations) == 4
+
+    def test_values_are_decrypted_lazily(self, secure_store):
+        broker = SecretBroker(None, secure=True, password=PASSWORD, keyring=KeyRing())
+        assert broker._decrypted == {}
+        assert len(broker.secrets) == 51 and "KEY_7" in broker.secrets
+
+        assert broker.resolve(["KEY_3", "BROKEN", "MISSING"]) == {"KEY_3": "value-3", "BROKEN": "", "MISSING": ""}
+        assert set(broker._decrypted) == {"KEY_3", "BROKEN"}
+        assert broker.secrets["KEY_7"] == "value-7"
+
+    def test_batched_writes_replace_the_store_once(self, secure_store, monkeypatch):
+        secure_dir, _ = secure_store
+        writes = []
+        real_write = secret_broker._write_atomic
+        monkeypatch.setattr(secret_broker, "_write_atomic", lambda *args: writes.append(args) or real_write(*args))
+
+        broker = SecretBroker(None, secure=True, password=PASSWORD, keyring=KeyRing())
+        with broker.batch():
+            for i in range(20):
+                broker.add_secret(f"NEW_{i}", f"new-{i}")
+            broker.add_secret("KEY_0", "rotated")
+        assert len(writes) == 1
+        assert not (secure_dir / "encrypted_secrets.yaml.tmp").exists()
+
+        reopened = SecretBroker(None, secure=True, password=PASSWORD, keyring=KeyRing())
+        assert reopened.resolve(["NEW_19", "KEY_0", "KEY_1"]) == {"NEW_19": "new-19", "KEY_0": "rotated",
+                                                                  "KEY_1": "value-1"}
+
+
+class TestPlaintextBroker:
+
+    def test_add_secret_writes_the_broker_file(self, tmp_path):
+        secrets_path = tmp_path / "secrets.yaml"
+        secrets_path.write_text(yaml.dump({"A": "1"}))
+        broker = SecretBroker(secrets_path)
+        broker.add_secret("B", "2")
+        assert yaml.safe_load(secrets_path.read_text()) == {"A": "1", "B": "2"}
+        assert broker.resolve(["A", "C"]) == {"A": "1", "C": ""}
+
+    @pytest.mark.skipif(os.name == "nt", reason="POSIX permissions")
+    def test_writes_keep_the_file_mode(self, tmp_path, secure_store):
+        secrets_path = tmp_path / "secrets.yaml"
+        secrets_path.write_text(yaml.dump({"A": "1"}))
+        os.chmod(secrets_path, 0o600)
+        SecretBroker(secrets_path).add_secret("B", "2")
+        assert os.stat(secrets_path).st_mode & 0o777 == 0o600
+
+        secure_dir, _ = secure_store
+        encrypted_path = secure_dir / "encrypted_secrets.yaml"
+        os.chmod(encrypted_path, 0o640)
+        SecretBroker(None, secure=True, password=PASSWORD, keyring=KeyRing()).add_secret("NEW", "value")
+        assert os.stat(encrypted_path).st_mode & 0o777 == 0o640
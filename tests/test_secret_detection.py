@@ -0,0 +1,110 @@
+"""
+Tests for the single-pass, prefiltered SecretDetector and its scanners
+"""
+
+import os
+import random
+import re
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from agent_core.secret_detection import DetectionRule, SecretDetector, derive_keywords, shannon_entropy
+from env_scanner import scan_env_and_tools
+from vanta_secrets_audit import scan_file
+
+SECRET_PATTERNS = {
+    "api_key": [r"(?i)api[_-]?key['\"\s]*[:=]['\"\s]*([a-zA-Z0-9_\-]{20,})"],
+    "password": [r"(?i)password['\"\s]*[:=]['\"\s]*([a-zA-Z0-9_\-]{8,})"],
+    "database": [r"(?i)db[_-]?password['\"\s]*[:=]['\"\s]*(['\"][^'\"]{6,}['\"])"],
+    "crypto": [r"-----BEGIN [A-Z ]+-----[\s\S]*?-----END [A-Z ]+-----"],
+}
+
+FRAGMENTS = [
+    "x = compute(y)\n", "API_KEY = 'k3Yq9ZpL2mXv8RtW5nBc7DfG'\n", "db_password: \"hunter2hunter\"\n",
+    "password=abcdefgh12\n", "-----BEGIN RSA KEY-----\nMIIE\n-----END RSA KEY-----\n",
+    "apikey apikey: short\n", "# PASSWORD = 'passwordpassword'\n",
+]
+
+
+def per_pattern_matches(content):
+    return sorted((category, match.start(), match.group(0))
+                  for category, patterns in SECRET_PATTERNS.items()
+                  for pattern in patterns
+                  for match in re.finditer(pattern, content, re.MULTILINE))
+
+
+class TestSecretDetector:
+
+    def test_single_pass_matches_per_pattern_finditer(self):
+        detector = SecretDetector.from_patterns(SECRET_PATTERNS, re.MULTILINE)
+        rng = random.Random(3)
+        for _ in range(200):
+            content = "".join(rng.choice(FRAGMENTS) for _ in range(rng.randint(0, 12)))
+            found = sorted((d.category, d.start, d.text) for d in detector.scan(content))
+            assert found == per_pattern_matches(content)
+
+    def test_rules_matching_at_the_same_offset_are_all_reported(self):
+        patterns = {"api_key": [r"(?i)api[_-]?key['\"\s]*[:=]['\"\s]*([a-zA-Z0-9_\-]{20,})",
+                                r"(?i)apikey['\"\s]*[:=]['\"\s]*([a-zA-Z0-9_\-]{20,})"],
+                    "secret": [r"(?i)(?:api)?key=([A-Z]+)"]}
+        detector = SecretDetector.from_patterns(patterns)
+        content = "api_key=XXXXXXXXXXXXXXXXXXXXapikey=YYYYYYYYYYYYYYYYYYYYYYYY"
+        expected = sorted((category, match.start(), match.group(0))
+                          for category, rules in patterns.items()
+                          for pattern in rules
+                          for match in re.finditer(pattern, content))
+        found = sorted((d.category, d.start, d.text) for d in detector.scan(content))
+        assert found == expected
+        assert ("api_key", 28, "apikey=" + "Y" * 24) in found
+
+    def test_rules_matching_the_empty_string_terminate(self):
+        assert [(d.start, d.text) for d in SecretDetector([DetectionRule("a", "c", r"a*")]).scan("xyz")] == \
+            [(0, ""), (1, ""), (2, ""), (3, "")]
+
+        rules = [DetectionRule("spaces", "c", r"\s*"), DetectionRule("key", "api_key", r"(?i)key=(\w+)"),
+                 DetectionRule("x", "c", r"x*")]
+        content = "key=abc xx KEY=def"
+        expected = sorted(((match.start(), index, match.group())
+                           for index, rule in enumerate(rules)
+                           for match in re.finditer(rule.pattern, content)), key=lambda item: item[:2])
+        found = [(d.start, [r.name for r in rules].index(d.rule), d.text) for d in SecretDetector(rules).scan(content)]
+        assert found == expected
+
+    def test_keywords_are_derived_from_patterns(self):
+        assert derive_keywords(r"api[_-]?key\s*=", re.IGNORECASE)[0] == ("api",)
+        assert derive_keywords(r"(api|secret|token)_\w+")[0] == ("api", "secret", "token")
+        assert derive_keywords(r"[a-z]+\d+")[0] is None
+
+    def test_prefilter_skips_content_without_keywords(self):
+        detector = SecretDetector.from_patterns(SECRET_PATTERNS)
+        assert detector.prefilter("def handler(event):\n    return 1\n")[0] == 0
+        assert detector.scan("def handler(event):\n    return 1\n") == []
+
+        active, start = detector.prefilter("x" * 500 + "api_key = 'abc'")
+        assert active == 1 and 400 < start <= 500
+
+        always = SecretDetector([DetectionRule("digits", "number", r"\d{4}")])
+        assert [d.value for d in always.scan("pin 1234")] == ["1234"]
+
+    def test_entropy_scores_confidence(self):
+        assert shannon_entropy("aaaaaaaa") == 0.0
+        assert shannon_entropy("abcd") == 2.0
+        detector = SecretDetector.from_patterns(SECRET_PATTERNS)
+        random_value, repeated = detector.scan("api_key=k3Yq9ZpL2mXv8RtW5nBc7DfG\napi_key=xxxxxxxxxxxxxxxxxxxxxxxx")
+        assert random_value.entropy > 4 and repeated.entropy == 0.0
+        assert random_value.confidence > repeated.confidence
+
+    def test_audit_and_env_scanners(self, tmp_path):
+        source = tmp_path / "app.py"
+        source.write_text(
+            "API_TOKEN = 'abc123'\nsecret_key = \"s3cr3t\"\nname = 'x'\n"
+            "import os\nkey = os.getenv('OPENAI_API_KEY')\nurl = os.getenv(\"SERVICE_URL\")\n"
+        )
+        (tmp_path / "README.md").write_text("Uses ChronoMesh to summarize transcripts.\n")
+
+        assert scan_file(source) == ["API", "secret"]
+        assert scan_env_and_tools(tmp_path) == {
+            "env_keys": ["OPENAI_API_KEY", "SERVICE_URL"],
+            "tools": ["ChronoMeshSync", "SummarizeTranscript"],
+        }
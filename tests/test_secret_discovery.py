@@ -0,0 +1,88 @@
+"""
+Tests for the parallel, streaming SecretDiscoveryScanner
+"""
+
+import contextlib
+from pathlib import Path
+
+import pytest
+
+from agent_core.secret_discovery import BusinessImpactLevel, SecretDiscoveryScanner, scan_content, flatten_patterns
+
+PATTERNS = {
+    "api_key": [r"(?i)api[_-]?key['\"\s]*[:=]['\"\s]*([a-zA-Z0-9_\-]{20,})"],
+    "password": [r"(?i)password['\"\s]*[:=]['\"\s]*([a-zA-Z0-9_\-]{8,})"],
+}
+
+SECRET_LINE = 'API_KEY = "k3Yq9ZpL2mXv8RtW5nBc7DfG"\n'
+
+
+def build_tree(root: Path, files: int = 40):
+    for i in range(files):
+        directory = root / f"pkg_{i % 4}"
+        directory.mkdir(exist_ok=True)
+        body = SECRET_LINE if i % 5 == 0 else "value = 1\n"
+        (directory / f"module_{i}.py").write_text(body * (1 + i))
+    for ignored in ("node_modules", ".git", "__pycache__"):
+        (root / ignored).mkdir()
+        (root / ignored / "leak.py").write_text(SECRET_LINE)
+    (root / "notes.txt").write_text(SECRET_LINE)
+
+
+class TestSecretDiscoveryScanner:
+
+    def test_walk_prunes_ignored_directories_without_cap(self, tmp_path):
+        build_tree(tmp_path, files=1200)
+        scanner = SecretDiscoveryScanner(PATTERNS, max_workers=1)
+        files = [Path(path) for path, _ in scanner.iter_files([str(tmp_path)])]
+
+        assert len(files) == 1200
+        assert all(path.suffix == ".py" and path.parent.name.startswith("pkg_") for path in files)
+        # Overlapping scan paths yield each file once
+        assert len(list(scanner.iter_files([str(tmp_path), str(tmp_path / "pkg_0")]))) == 1200
+
+    def test_batches_are_size_balanced(self, tmp_path):
+        build_tree(tmp_path)
+        scanner = SecretDiscoveryScanner(PATTERNS, batch_bytes=2000, batch_files=8)
+        sizes = dict(scanner.iter_files([str(tmp_path)]))
+        batches = list(scanner.iter_batches([str(tmp_path)]))
+
+        assert sorted(path for batch in batches for path in batch) == sorted(sizes)
+        for batch in batches[:-1]:
+            total = sum(sizes[path] for path in batch)
+            assert len(batch) == 8 or (total >= 2000 and total - sizes[batch[-1]] < 2000)
+
+    def test_parallel_scan_matches_sequential(self, tmp_path):
+        build_tree(tmp_path)
+        patterns = flatten_patterns(PATTERNS)
+        expected = sorted(
+            secret.location
+            for path in tmp_path.rglob("*.py")
+            if "pkg_" in path.parent.name
+            for secret in scan_content(path, path.read_text(), patterns)
+        )
+
+        scanner = SecretDiscoveryScanner(PATTERNS, max_workers=2, batch_files=3)
+        found = list(scanner.scan([str(tmp_path)]))
+
+        assert sorted(secret.location for secret in found) == expected
+        assert len(expected) == 148  # module_{0,5,...,35}: 1 + i matching lines each
+        assert scanner.stats["files_scanned"] == 40
+        assert scanner.stats["batches"] == 14
+        assert all(secret.business_impact == BusinessImpactLevel.LOW for secret in found)  # tmp_path contains 'test'
+
+    @pytest.mark.asyncio
+    async def test_async_scan_streams_and_stops_early(self, tmp_path):
+        build_tree(tmp_path)
+        scanner = SecretDiscoveryScanner(PATTERNS, max_workers=2, batch_files=2)
+
+        streamed = [secret async for secret in scanner.scan_async([str(tmp_path)])]
+        assert len(streamed) == 148
+
+        first = None
+        async with contextlib.aclosing(scanner.scan_async([str(tmp_path)], max_buffered_batches=1)) as stream:
+            async for secret in stream:
+                first = secret
+                break
+        assert first is not None and first.secret_type == "api_key"
+        assert scanner.stats["files_scanned"] < 40
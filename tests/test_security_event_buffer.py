@@ -0,0 +1,77 @@
+"""
+Tests for the security event ring buffer and rolling per-minute counters
+"""
+
+import asyncio
+from datetime import datetime, timezone
+import pytest
+
+from agent_core.security_event_buffer import (
+    SecurityEventBuffer, SecurityEventCategory, categorize_event_type, export_security_event_metrics
+)
+
+
+class FakeClock:
+    def __init__(self, now=6000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class TestSecurityEventBuffer:
+
+    def test_ring_overwrites_oldest(self):
+        buffer = SecurityEventBuffer(capacity=3, clock=FakeClock())
+        for n in range(5):
+            buffer.record("threat_detected" if n < 2 else "action_validation", {"n": n})
+
+        assert len(buffer) == 3
+        assert [e.data["n"] for e in buffer.events()] == [2, 3, 4]
+        assert buffer.retained_count("threat_detected") == 0
+        assert buffer.retained_count("action_validation") == 3
+        assert buffer.total_recorded == 5
+
+    def test_counters_roll_by_minute(self):
+        clock = FakeClock()
+        buffer = SecurityEventBuffer(capacity=10, window_minutes=60, clock=clock)
+        buffer.record("threat_detected")
+        clock.now += 120
+        buffer.record("threat_detected")
+        buffer.record("validation_failed")
+
+        assert buffer.count_recent(SecurityEventCategory.THREAT, 3600) == 2
+        assert buffer.count_recent(SecurityEventCategory.THREAT, 60) == 1
+        assert buffer.count_recent(seconds=3600) == 3
+        assert buffer.per_minute(SecurityEventCategory.THREAT, 3) == [1, 0, 1]
+
+        # An hour later the first bucket has aged out; a reused slot is reset
+        clock.now += 3600 - 120
+        buffer.record("action_validation")
+        assert buffer.count_recent(SecurityEventCategory.THREAT, 3600) == 1
+        assert buffer.count_recent(SecurityEventCategory.VALIDATION, 3600) == 2
+
+    def test_counters_outlive_ring_capacity(self):
+        buffer = SecurityEventBuffer(capacity=2, clock=FakeClock())
+        for _ in range(5):
+            buffer.record("threat_detected")
+        assert buffer.count_recent(SecurityEventCategory.THREAT) == 5
+
+    def test_categories(self):
+        assert categorize_event_type("threat_detected") is SecurityEventCategory.THREAT
+        assert categorize_event_type("action_validation") is SecurityEventCategory.VALIDATION
+        assert categorize_event_type("execution_anomaly") is SecurityEventCategory.ANOMALY
+        assert categorize_event_type("action_executed") is SecurityEventCategory.EXECUTION
+        assert categorize_event_type("login") is SecurityEventCategory.OTHER
+
+    def test_to_dict_keeps_legacy_shape(self):
+        event = SecurityEventBuffer(clock=FakeClock(0.0)).record("threat_detected", {"x": 1})
+        as_dict = event.to_dict()
+        assert as_dict["type"] == "threat_detected"
+        assert datetime.fromisoformat(as_dict["timestamp"]) == datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+    def test_export_aggregates_live_buffers(self):
+        before = export_security_event_metrics()["last_hour"]["anomaly"]
+        buffer = SecurityEventBuffer(clock=lambda: __import__("time").time())
+        buffer.record("execution_anomaly")
+        assert export_security_event_metrics()["last_hour"]["anomaly"] == before + 1
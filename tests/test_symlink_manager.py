@@ -0,0 +1,85 @@
+"""
+Tests for planned, atomic link reconciliation in symlink_manager
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from symlink_manager import LinkAction, ProjectLinks, apply_changes, plan_links, reconcile_projects
+
+
+def sources(tmp_path, *names):
+    root = tmp_path / "vanta" / "tools"
+    root.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for name in names:
+        (root / name).write_text(f"# MCP tool: {name}")
+        paths.append(root / name)
+    return root, paths
+
+
+class TestReconcile:
+
+    def test_only_differences_are_applied(self, tmp_path):
+        tools_root, (a, b, c) = sources(tmp_path, "a.mcp", "b.mcp", "c.mcp")
+        env = tmp_path / "project.env"
+        env.write_text("KEY=1\n")
+        project = tmp_path / "project"
+        project.mkdir()
+
+        spec = ProjectLinks(project, env, [a, b], managed_tools_root=tools_root)
+        changes = plan_links(spec)
+        assert [change.action for change in changes] == [LinkAction.CREATE] * 3
+        assert apply_changes(changes) == 3
+        before = os.lstat(project / "tools" / "a.mcp").st_ino
+        assert plan_links(spec) == []
+
+        (project / "tools" / "mine.txt").symlink_to(env)     # Not managed: kept
+        spec = ProjectLinks(project, env, [a, c], managed_tools_root=tools_root)
+        changes = {(change.action, change.link.name) for change in plan_links(spec)}
+        assert changes == {(LinkAction.CREATE, "c.mcp"), (LinkAction.REMOVE, "b.mcp")}
+        apply_changes(plan_links(spec))
+        assert sorted(os.listdir(project / "tools")) == ["a.mcp", "c.mcp", "mine.txt"]
+        assert os.lstat(project / "tools" / "a.mcp").st_ino == before
+
+    def test_changed_target_is_swapped_atomically(self, tmp_path):
+        _, (a,) = sources(tmp_path, "a.mcp")
+        moved = tmp_path / "elsewhere" / "a.mcp"
+        moved.parent.mkdir()
+        moved.write_text("# moved")
+        project = tmp_path / "project"
+        (project / "tools").mkdir(parents=True)
+        (project / "tools" / "a.mcp").symlink_to(a)
+        (project / ".env").write_text("PLAIN=1\n")
+        (project / "tools" / "dir.mcp").mkdir()
+        _, (dir_source,) = sources(tmp_path, "dir.mcp")
+
+        env = tmp_path / "project.env"
+        env.write_text("KEY=1\n")
+        spec = ProjectLinks(project, env, [moved, dir_source, tmp_path / "gone.mcp"])
+        actions = {change.link.name: change.action for change in plan_links(spec)}
+        assert actions == {".env": LinkAction.REPLACE, "a.mcp": LinkAction.REPLACE,
+                           "dir.mcp": LinkAction.CONFLICT, "gone.mcp": LinkAction.MISSING}
+        apply_changes(plan_links(spec))
+        assert os.readlink(project / "tools" / "a.mcp") == str(moved.resolve())
+        assert os.readlink(project / ".env") == str(env.resolve())
+        assert not [name for name in os.listdir(project / "tools") if name.endswith(".tmp")]
+
+    def test_many_projects_in_one_pass_with_dry_run(self, tmp_path):
+        tools_root, tools = sources(tmp_path, "a.mcp", "b.mcp")
+        specs = []
+        for i in range(200):
+            project = tmp_path / "projects" / f"p{i}"
+            project.mkdir(parents=True)
+            specs.append(ProjectLinks(project, None, tools[:1 + i % 2], managed_tools_root=tools_root))
+
+        plan = reconcile_projects(specs, dry_run=True, max_workers=4)
+        assert plan.counts()["create"] == 300 and plan.unchanged == 0
+        assert not (tmp_path / "projects" / "p0" / "tools").exists()
+
+        applied = reconcile_projects(specs, max_workers=4)
+        assert applied.counts()["create"] == 300
+        again = reconcile_projects(specs, max_workers=4)
+        assert again.changes == [] and again.unchanged == 200
@@ -0,0 +1,157 @@
+"""
+Tests for VantaMasterCore non-blocking agent dispatch and batched completion events
+"""
+
+import asyncio
+import threading
+import time
+import pytest
+
+from vanta_seed.core import vanta_master_core
+from vanta_seed.core.vanta_master_core import VantaMasterCore
+
+
+class FakeKEBClient:
+    """Records publishes instead of talking to Redis"""
+
+    def __init__(self, **kwargs):
+        self.redis_client = object()
+        self.published = []
+        self.batches = []
+
+    def publish(self, stream_name, event_data, event_id=None):
+        self.published.append((stream_name, event_data))
+        return "id"
+
+    def publish_many(self, stream_name, events):
+        self.batches.append((stream_name, list(events)))
+        return ["id"] * len(events)
+
+    def disconnect(self):
+        pass
+
+
+class SleepyAgent:
+    """Blocking agent that tracks how many calls overlap"""
+
+    def __init__(self, delay=0.05, max_concurrency=None):
+        self.delay = delay
+        if max_concurrency:
+            self.max_concurrency = max_concurrency
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def process_task(self, task_type, task_data):
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            time.sleep(self.delay)
+            if task_type == "explode":
+                raise RuntimeError("boom")
+            return {"status": "success", "result": {"echo": task_data}}
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+class CoroutineAgent:
+    async def process_task(self, task_type, task_data):
+        await asyncio.sleep(0)
+        return {"status": "success", "result": {"thread": threading.current_thread().name}}
+
+
+@pytest.fixture(autouse=True)
+def fake_keb(monkeypatch):
+    monkeypatch.setattr(vanta_master_core, "KEBClient", FakeKEBClient)
+
+
+def make_vmc(**dispatch):
+    return VantaMasterCore({"dispatch": dispatch})
+
+
+class TestAsyncDispatch:
+
+    @pytest.mark.asyncio
+    async def test_blocking_agents_do_not_block_loop(self):
+        vmc = make_vmc(agent_concurrency=8)
+        agent = SleepyAgent(delay=0.1)
+        vmc.register_agent("sleepy", agent)
+
+        start = time.perf_counter()
+        results = await asyncio.gather(*[
+            vmc.dispatch_task_async("sleepy", "work", {"i": i}) for i in range(8)
+        ])
+        elapsed = time.perf_counter() - start
+
+        assert all(r["status"] == "success" for r in results)
+        assert agent.peak == 8
+        assert elapsed < 0.5
+
+    @pytest.mark.asyncio
+    async def test_agent_concurrency_limit(self):
+        vmc = make_vmc()
+        agent = SleepyAgent(delay=0.02, max_concurrency=2)
+        vmc.register_agent("sleepy", agent)
+
+        await asyncio.gather(*[vmc.dispatch_task_async("sleepy", "work", {}) for _ in range(6)])
+
+        assert agent.peak == 2
+
+    @pytest.mark.asyncio
+    async def test_queue_full_rejects_with_error_event(self):
+        vmc = make_vmc(agent_concurrency=1, max_queue_depth=2)
+        vmc.register_agent("sleepy", SleepyAgent(delay=0.05))
+
+        results = await asyncio.gather(*[vmc.dispatch_task_async("sleepy", "work", {}) for _ in range(3)])
+        await vmc.flush_completion_events()
+
+        assert [r["status"] for r in results].count("error") == 1
+        events = [e for _, batch in vmc.keb_client.batches for e in batch]
+        codes = [e.get("error_details", {}).get("error_code") for e in events]
+        assert codes.count("AGENT_QUEUE_FULL") == 1
+
+    @pytest.mark.asyncio
+    async def test_coroutine_agents_run_on_loop(self):
+        vmc = make_vmc()
+        vmc.register_agent("native", CoroutineAgent())
+
+        result = await vmc.dispatch_task_async("native", "work", {})
+
+        assert result["result"]["thread"] == threading.current_thread().name
+
+    @pytest.mark.asyncio
+    async def test_completion_events_are_batched(self):
+        vmc = make_vmc(completion_batch_size=100, completion_flush_interval_s=0.01)
+        vmc.register_agent("sleepy", SleepyAgent(delay=0.0))
+
+        results = await asyncio.gather(*[
+            vmc.dispatch_task_async("sleepy", "work", {}) for _ in range(4)
+        ] + [vmc.dispatch_task_async("sleepy", "explode", {})])
+        await asyncio.sleep(0.05)
+
+        assert results[-1]["status"] == "error"
+        assert [stream for stream, _ in vmc.keb_client.published if stream == "task_events"] == []
+        assert len(vmc.keb_client.batches) == 1
+        stream, batch = vmc.keb_client.batches[0]
+        assert stream == "task_events"
+        assert sorted(e["status"] for e in batch) == ["error"] + ["success"] * 4
+
+    @pytest.mark.asyncio
+    async def test_control_event_schedules_dispatch(self):
+        vmc = make_vmc()
+        agent = SleepyAgent(delay=0.05)
+        vmc.register_agent("sleepy", agent)
+
+        vmc.handle_control_event("1-0", {
+            "event_type": "TriggerAgentActionEvent",
+            "target_agent_id": "sleepy", "task_type": "work", "task_parameters": {}
+        })
+        # The callback returned before the agent ran
+        assert agent.peak == 0
+        assert len(vmc._dispatch_tasks) == 1
+
+        await vmc.shutdown()
+        assert agent.peak == 1
+        assert any(batch for _, batch in vmc.keb_client.batches)
@@ -0,0 +1,131 @@
+"""
+Tests for debounced, incremental rebinding in watcher_daemon
+"""
+
+import os
+import sys
+import threading
+import time
+
+import yaml
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from watcher_daemon import RebindingEngine
+
+
+class Recorder:
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.calls = []
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, project_path, *args):
+        with self.lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(self.delay)
+        with self.lock:
+            self.active -= 1
+            self.calls.append(project_path.name)
+
+
+def make_project(root, name, env_key):
+    project = root / name
+    project.mkdir()
+    (project / "main.py").write_text(f"import os\nos.getenv('{env_key}')\n")
+    return project
+
+
+def make_engine(tmp_path, link, sync=None, **options):
+    secrets = tmp_path / "secrets.yaml"
+    secrets.write_text(yaml.safe_dump({"ALPHA_KEY": "a1", "BETA_KEY": "b1"}))
+    engine = RebindingEngine(secrets, tmp_path / "shared_resources.yaml", link=link,
+                             sync=sync or Recorder(), **options)
+    return engine, secrets
+
+
+class TestRebindingEngine:
+
+    def test_burst_of_events_coalesces_into_one_run(self, tmp_path):
+        link = Recorder()
+        engine, _ = make_engine(tmp_path, link, debounce=0.2)
+        project = make_project(tmp_path, "alpha", "ALPHA_KEY")
+        engine.add_project(project)
+        engine.start()
+        try:
+            for i in range(500):
+                path = project / "src" / f"module_{i}.py"
+                path.parent.mkdir(exist_ok=True)
+                path.write_text("import os\nos.getenv('BETA_KEY')\n" if i == 250 else "x = 1\n")
+                engine.notify(str(path))
+            assert engine.wait_idle()
+        finally:
+            engine.stop()
+        assert engine.stats["events"] == 500
+        assert engine.stats["runs"] == 1
+        assert link.calls == ["alpha"]
+        assert engine.projects[project.resolve()].bound["env_keys"] == ["ALPHA_KEY", "BETA_KEY"]
+
+    def test_one_run_in_flight_per_project(self, tmp_path):
+        link = Recorder(delay=0.3)
+        engine, _ = make_engine(tmp_path, link, debounce=0.01)
+        project = make_project(tmp_path, "alpha", "ALPHA_KEY")
+        engine.add_project(project)
+        engine.start()
+        try:
+            for i in range(5):
+                path = project / f"extra_{i}.py"
+                path.write_text(f"import os\nos.getenv('KEY_{i}')\n")
+                engine.notify(str(path))
+                time.sleep(0.1)
+            assert engine.wait_idle()
+        finally:
+            engine.stop()
+        assert link.max_active == 1
+        # Events arriving during a run are folded into the following one
+        assert 2 <= engine.stats["runs"] < 5
+        assert engine.projects[project.resolve()].bound["env_keys"] == ["ALPHA_KEY"] + [f"KEY_{i}" for i in range(5)]
+
+    def test_changes_that_do_not_affect_bindings_are_skipped(self, tmp_path):
+        link = Recorder()
+        engine, _ = make_engine(tmp_path, link, debounce=0.01)
+        project = make_project(tmp_path, "alpha", "ALPHA_KEY")
+        engine.add_project(project)
+        engine.start()
+        try:
+            (project / "notes.md").write_text("# Notes\n")
+            (project / "image.png").write_bytes(b"\x89PNG")
+            engine.notify(str(project / "notes.md"))
+            engine.notify(str(project / "image.png"))
+            assert engine.wait_idle()
+        finally:
+            engine.stop()
+        assert link.calls == []
+        assert engine.stats["runs"] == 1
+        assert engine.stats["unchanged"] == 1
+
+    def test_secret_change_rebinds_only_dependent_projects(self, tmp_path):
+        link, sync = Recorder(), Recorder()
+        engine, secrets = make_engine(tmp_path, link, sync, debounce=0.01)
+        alpha = make_project(tmp_path, "alpha", "ALPHA_KEY")
+        beta = make_project(tmp_path, "beta", "BETA_KEY")
+        engine.add_project(alpha)
+        engine.add_project(beta)
+        engine.start()
+        try:
+            secrets.write_text(yaml.safe_dump({"ALPHA_KEY": "a1", "BETA_KEY": "b2-rotated"}))
+            engine.notify(str(secrets))
+            assert engine.wait_idle()
+
+            manifest = tmp_path / "shared_resources.yaml"
+            manifest.write_text(yaml.safe_dump({"shared_resources": []}))
+            engine.notify(str(manifest))
+            assert engine.wait_idle()
+        finally:
+            engine.stop()
+        assert link.calls == ["beta"]
+        assert sorted(sync.calls) == ["alpha", "beta"]
@@ -5,14 +5,18 @@ Advanced system for measuring CoE decision quality and success probability
 """
 
 import numpy as np
+import heapq
 import json
+import math
+import sqlite3
 from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime, timedelta
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, field
 from enum import Enum
 import statistics
 import logging
-from collections import defaultdict
+import uuid
+from collections import OrderedDict, defaultdict
 
 class ConfidenceLevel(Enum):
     VERY_LOW = "very_low"
@@ -54,6 +58,7 @@ class DecisionMetrics:
     confidence_level: ConfidenceLevel
     predicted_success_probability: float
     recommended_oversight_level: str
+    decision_id: Optional[str] = None  # Pass to update_decision_outcome once the outcome is known
 
 @dataclass
 class HistoricalDecision:
@@ -64,6 +69,7 @@ class HistoricalDecision:
     actual_outcome: Optional[float]  # Set after implementation
     outcome_date: Optional[datetime]
     lessons_learned: List[str]
+    decision_context: Dict[str, Any] = field(default_factory=dict)
 
 class ReasoningAnalyzer:
     """
@@ -198,59 +204,371 @@ class ConsensusAnalyzer:
         relevance_scores = [vote.expertise_relevance for vote in expert_votes]
         return np.mean(relevance_scores)
 
+SUCCESS_THRESHOLD = 0.7
+MAX_PENDING_DECISIONS = 10000  # Scored decisions kept while awaiting an outcome
+
+@dataclass
+class RunningAccuracyStats:
+    """
+    Streaming predicted-vs-actual statistics: Welford running means and
+    co-moments for the correlation, plus confusion counts at SUCCESS_THRESHOLD
+    """
+    count: int = 0
+    mean_predicted: float = 0.0
+    mean_actual: float = 0.0
+    m2_predicted: float = 0.0
+    m2_actual: float = 0.0
+    co_moment: float = 0.0
+    true_positive: int = 0
+    true_negative: int = 0
+    false_positive: int = 0
+    false_negative: int = 0
+
+    def update(self, predicted: float, actual: float):
+        self.count += 1
+        d_predicted = predicted - self.mean_predicted
+        self.mean_predicted += d_predicted / self.count
+        d_actual = actual - self.mean_actual
+        self.mean_actual += d_actual / self.count
+        self.m2_predicted += d_predicted * (predicted - self.mean_predicted)
+        self.m2_actual += d_actual * (actual - self.mean_actual)
+        self.co_moment += d_predicted * (actual - self.mean_actual)
+
+        predicted_success = predicted >= SUCCESS_THRESHOLD
+        actual_success = actual >= SUCCESS_THRESHOLD
+        if predicted_success and actual_success:
+            self.true_positive += 1
+        elif not predicted_success and not actual_success:
+            self.true_negative += 1
+        elif predicted_success:
+            self.false_positive += 1
+        else:
+            self.false_negative += 1
+
+    @property
+    def correlation(self) -> float:
+        if self.count < 2 or self.m2_predicted <= 0.0 or self.m2_actual <= 0.0:
+            return 0.0
+        return self.co_moment / math.sqrt(self.m2_predicted * self.m2_actual)
+
+    @property
+    def accuracy(self) -> float:
+        return (self.true_positive + self.true_negative) / self.count if self.count else 0.5
+
+_LEVEL_SCORES = {'low': 0.2, 'medium': 0.5, 'high': 0.8, 'critical': 1.0}
+_EXPERTISE_AREAS = [area.value for area in ExpertiseArea]
+
+def context_number(context: Dict[str, Any], key: str, default: float) -> float:
+    """A numeric context value, or `default` when it is missing or not a number (e.g. "6-8")"""
+    try:
+        value = float(context.get(key, default))
+    except (TypeError, ValueError):
+        return default
+    return value if math.isfinite(value) else default
+
+def decision_context_features(context: Dict[str, Any]) -> Tuple[float, ...]:
+    """Fixed-length feature vector for similarity lookups on a decision context"""
+    expertise = set(context.get('required_expertise') or [])
+    return (
+        context_number(context, 'complexity_score', 0.5),
+        _LEVEL_SCORES.get(str(context.get('risk_level', 'medium')).lower(), 0.5),
+        _LEVEL_SCORES.get(str(context.get('strategic_importance', 'medium')).lower(), 0.5),
+        min(1.0, context_number(context, 'timeline_weeks', 26) / 52.0),
+        *(0.5 if area in expertise else 0.0 for area in _EXPERTISE_AREAS)
+    )
+
+class _KDTree:
+    """Incremental k-d tree, rebuilt balanced when insertion order makes it too deep"""
+
+    def __init__(self):
+        self._root = None  # node: [vector, item, axis, left, right]
+        self._points: List[Tuple[Tuple[float, ...], Any]] = []
+        self._max_depth = 0
+
+    def __len__(self) -> int:
+        return len(self._points)
+
+    def add(self, vector: Tuple[float, ...], item: Any):
+        self._points.append((vector, item))
+        if self._root is None:
+            self._root = [vector, item, 0, None, None]
+            self._max_depth = 1
+            return
+        node = self._root
+        depth = 1
+        while True:
+            axis = node[2]
+            side = 3 if vector[axis] < node[0][axis] else 4
+            depth += 1
+            if node[side] is None:
+                node[side] = [vector, item, (axis + 1) % len(vector), None, None]
+                break
+            node = node[side]
+        self._max_depth = max(self._max_depth, depth)
+        if self._max_depth > 4 * math.log2(len(self._points) + 1) + 8:
+            self._rebuild()
+
+    def _rebuild(self):
+        def build(points, depth):
+            if not points:
+                return None, depth
+            axis = depth % len(points[0][0])
+            points.sort(key=lambda point: point[0][axis])
+            middle = len(points) // 2
+            left, left_depth = build(points[:middle], depth + 1)
+            right, right_depth = build(points[middle + 1:], depth + 1)
+            vector, item = points[middle]
+            return [vector, item, axis, left, right], max(left_depth, right_depth)
+        self._root, self._max_depth = build(list(self._points), 0)
+
+    def nearest(self, vector: Tuple[float, ...], k: int, offset: float = 0.0,
+                heap: Optional[list] = None) -> list:
+        """
+        Merge this tree's nearest points into `heap`, a max-heap of
+        (-squared distance, tiebreak, item) holding at most k entries.
+        `offset` is added to every squared distance.
+        """
+        heap = [] if heap is None else heap
+        stack = [(self._root, offset)] if self._root is not None else []
+        while stack:
+            node, bound = stack.pop()
+            # Skip subtrees whose splitting plane is farther than the current k-th best
+            if len(heap) == k and bound >= -heap[0][0]:
+                continue
+            point, item, axis, left, right = node
+            distance = offset + sum((a - b) ** 2 for a, b in zip(vector, point))
+            if len(heap) < k:
+                heapq.heappush(heap, (-distance, id(item), item))
+            elif distance < -heap[0][0]:
+                heapq.heapreplace(heap, (-distance, id(item), item))
+            diff = vector[axis] - point[axis]
+            near, far = (left, right) if diff < 0 else (right, left)
+            if far is not None:
+                stack.append((far, max(bound, offset + diff * diff)))
+            if near is not None:
+                stack.append((near, bound))
+        return heap
+
+class ContextSimilarityIndex:
+    """
+    Nearest-neighbour index over decision-context feature vectors. The first
+    `continuous_dims` features go into a k-d tree per distinct value of the
+    remaining (discrete) features; buckets are searched in order of their
+    discrete distance and skipped once that alone exceeds the k-th best.
+    """
+
+    def __init__(self, continuous_dims: int = 4):
+        self.continuous_dims = continuous_dims
+        self._buckets: Dict[Tuple[float, ...], _KDTree] = {}
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, vector: Tuple[float, ...], item: Any):
+        key = vector[self.continuous_dims:]
+        tree = self._buckets.get(key)
+        if tree is None:
+            tree = self._buckets[key] = _KDTree()
+        tree.add(vector[:self.continuous_dims], item)
+        self._size += 1
+
+    def nearest(self, vector: Tuple[float, ...], k: int) -> List[Tuple[float, Any]]:
+        """The k nearest items as (distance, item), closest first"""
+        head, tail = vector[:self.continuous_dims], vector[self.continuous_dims:]
+        offsets = sorted(
+            (sum((a - b) ** 2 for a, b in zip(tail, key)), i, key) for i, key in enumerate(self._buckets)
+        )
+        heap: list = []
+        for offset, _, key in offsets:
+            if len(heap) == k and offset >= -heap[0][0]:
+                break
+            self._buckets[key].nearest(head, k, offset, heap)
+        return [(math.sqrt(-d), item) for d, _, item in sorted(heap, reverse=True)]
+
+class HistoricalDecisionStore:
+    """
+    SQLite persistence for historical decisions
+    """
+    
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path)
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS historical_decisions (
+                decision_id TEXT PRIMARY KEY,
+                decision_date TEXT,
+                confidence_score REAL,
+                predicted_success REAL,
+                actual_outcome REAL,
+                outcome_date TEXT,
+                lessons_learned TEXT,
+                decision_context TEXT
+            )
+        ''')
+        self.conn.commit()
+    
+    def save(self, decisions: List[HistoricalDecision]):
+        """Insert or update decisions in one transaction"""
+        with self.conn:
+            self.conn.executemany(
+                'INSERT OR REPLACE INTO historical_decisions VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                [(
+                    d.decision_id,
+                    d.decision_date.isoformat(),
+                    d.confidence_score,
+                    d.predicted_success,
+                    d.actual_outcome,
+                    d.outcome_date.isoformat() if d.outcome_date else None,
+                    json.dumps(d.lessons_learned),
+                    json.dumps(d.decision_context, default=str)
+                ) for d in decisions]
+            )
+    
+    def delete(self, decision_ids: List[str]):
+        with self.conn:
+            self.conn.executemany('DELETE FROM historical_decisions WHERE decision_id = ?',
+                                  [(decision_id,) for decision_id in decision_ids])
+    
+    def load(self) -> List[HistoricalDecision]:
+        cursor = self.conn.execute('SELECT * FROM historical_decisions ORDER BY decision_date, rowid')
+        return [
+            HistoricalDecision(
+                decision_id=row[0],
+                decision_date=datetime.fromisoformat(row[1]),
+                confidence_score=row[2],
+                predicted_success=row[3],
+                actual_outcome=row[4],
+                outcome_date=datetime.fromisoformat(row[5]) if row[5] else None,
+                lessons_learned=json.loads(row[6]),
+                decision_context=json.loads(row[7]) if row[7] else {}
+            )
+            for row in cursor
+        ]
+    
+    def close(self):
+        self.conn.close()
+
 class HistoricalAccuracyTracker:
     """
-    Tracks historical decision accuracy to improve future predictions
+    Tracks historical decision accuracy to improve future predictions.
+    Accuracy statistics are updated in O(1) per completed decision, and
+    completed decisions are indexed by context for similarity lookups.
+    At most `max_pending` decisions awaiting an outcome are kept; beyond
+    that the least recently scored one is dropped.
     """
     
-    def __init__(self):
-        self.historical_decisions: List[HistoricalDecision] = []
+    def __init__(self, max_pending: int = MAX_PENDING_DECISIONS):
+        self.historical_decisions: List[HistoricalDecision] = []  # Completed decisions
         self.accuracy_metrics = {}
-        
-    def add_historical_decision(self, decision: HistoricalDecision):
+        self.running_stats = RunningAccuracyStats()
+        self.similarity_index = ContextSimilarityIndex()
+        self.max_pending = max_pending
+        self._decisions_by_id: Dict[str, HistoricalDecision] = {}
+        self._pending: "OrderedDict[str, HistoricalDecision]" = OrderedDict()  # Least recently scored first
+        self._unsaved: Dict[str, HistoricalDecision] = {}
+        self._evicted: List[str] = []
+        
+    def add_historical_decision(self, decision: HistoricalDecision, persisted: bool = False):
         """Add a historical decision for tracking"""
+        self._decisions_by_id[decision.decision_id] = decision
+        if not persisted:
+            self._unsaved[decision.decision_id] = decision
+        if decision.actual_outcome is None:
+            self._pending[decision.decision_id] = decision
+            self._evict_pending()
+        else:
+            self.historical_decisions.append(decision)
+            self._record_completed(decision)
+    
+    def get_decision(self, decision_id: str) -> Optional[HistoricalDecision]:
+        return self._decisions_by_id.get(decision_id)
+    
+    def record_prediction(self, decision_id: str, confidence_score: float, predicted_success: float,
+                          decision_context: Dict[str, Any]) -> HistoricalDecision:
+        """Track a scored decision until its outcome arrives; re-scoring a pending decision updates it"""
+        decision = self._decisions_by_id.get(decision_id)
+        if decision is None:
+            decision = HistoricalDecision(
+                decision_id=decision_id,
+                decision_date=datetime.now(),
+                confidence_score=confidence_score,
+                predicted_success=predicted_success,
+                actual_outcome=None,
+                outcome_date=None,
+                lessons_learned=[],
+                decision_context=dict(decision_context)
+            )
+            self.add_historical_decision(decision)
+        elif decision.actual_outcome is None:
+            decision.decision_date = datetime.now()
+            decision.confidence_score = confidence_score
+            decision.predicted_success = predicted_success
+            decision.decision_context = dict(decision_context)
+            self._unsaved[decision_id] = decision
+            self._pending.move_to_end(decision_id)
+        return decision
+    
+    def record_outcome(self, decision_id: str, actual_outcome: float,
+                       lessons_learned: Optional[List[str]] = None) -> Optional[HistoricalDecision]:
+        """Set the outcome of a tracked decision that had none yet"""
+        decision = self._decisions_by_id.get(decision_id)
+        if decision is None or decision.actual_outcome is not None:
+            return None
+        decision.actual_outcome = actual_outcome
+        decision.outcome_date = datetime.now()
+        if lessons_learned:
+            decision.lessons_learned = list(lessons_learned)
+        self._unsaved[decision_id] = decision
+        self._pending.pop(decision_id, None)
         self.historical_decisions.append(decision)
-        self._update_accuracy_metrics()
+        self._record_completed(decision)
+        return decision
+    
+    def take_unsaved(self) -> List[HistoricalDecision]:
+        """Decisions added or changed since the last call"""
+        unsaved = list(self._unsaved.values())
+        self._unsaved.clear()
+        return unsaved
+    
+    def take_evicted(self) -> List[str]:
+        """Ids of pending decisions dropped since the last call"""
+        evicted, self._evicted = self._evicted, []
+        return evicted
+    
+    def _evict_pending(self):
+        while len(self._pending) > self.max_pending:
+            decision_id, _ = self._pending.popitem(last=False)
+            del self._decisions_by_id[decision_id]
+            self._unsaved.pop(decision_id, None)
+            self._evicted.append(decision_id)
     
     def calculate_predictor_accuracy(self) -> Dict[str, float]:
         """Calculate accuracy of confidence score predictions"""
-        completed_decisions = [
-            d for d in self.historical_decisions 
-            if d.actual_outcome is not None
-        ]
-        
-        if not completed_decisions:
+        stats = self.running_stats
+        if not stats.count:
             return {"overall_accuracy": 0.5, "prediction_correlation": 0.0}
         
-        # Calculate correlation between predicted and actual success
-        predicted = [d.predicted_success for d in completed_decisions]
-        actual = [d.actual_outcome for d in completed_decisions]
-        
-        correlation = np.corrcoef(predicted, actual)[0, 1] if len(predicted) > 1 else 0.0
-        
-        # Calculate accuracy based on threshold
-        correct_predictions = sum(
-            1 for p, a in zip(predicted, actual)
-            if (p >= 0.7 and a >= 0.7) or (p < 0.7 and a < 0.7)
-        )
-        accuracy = correct_predictions / len(completed_decisions)
-        
         return {
-            "overall_accuracy": accuracy,
-            "prediction_correlation": max(0.0, correlation),  # Ensure non-negative
-            "sample_size": len(completed_decisions)
+            "overall_accuracy": stats.accuracy,
+            "prediction_correlation": max(0.0, stats.correlation),  # Ensure non-negative
+            "sample_size": stats.count
         }
     
-    def get_similar_decision_outcomes(self, current_decision_context: Dict[str, Any]) -> List[float]:
-        """Find outcomes of similar historical decisions"""
-        similar_outcomes = []
-        
-        for decision in self.historical_decisions:
-            if decision.actual_outcome is not None:
-                # Simple similarity check (could be enhanced with ML)
-                similar_outcomes.append(decision.actual_outcome)
-        
-        return similar_outcomes[-10:]  # Return last 10 similar decisions
+    def get_similar_decision_outcomes(self, current_decision_context: Dict[str, Any], limit: int = 10) -> List[float]:
+        """Outcomes of the completed decisions nearest to this context, closest first"""
+        if not current_decision_context or not len(self.similarity_index):
+            # Without context features, fall back to the most recent outcomes
+            completed = [d.actual_outcome for d in self.historical_decisions if d.actual_outcome is not None]
+            return completed[-limit:]
+        
+        neighbours = self.similarity_index.nearest(decision_context_features(current_decision_context), limit)
+        return [decision.actual_outcome for _, decision in neighbours]
+    
+    def _record_completed(self, decision: HistoricalDecision):
+        self.running_stats.update(decision.predicted_success, decision.actual_outcome)
+        self.similarity_index.add(decision_context_features(decision.decision_context), decision)
+        self._update_accuracy_metrics()
     
     def _update_accuracy_metrics(self):
         """Update internal accuracy metrics"""
@@ -261,19 +579,23 @@ class DecisionConfidenceScorer:
     Main class for calculating comprehensive decision confidence scores
     """
     
-    def __init__(self):
+    def __init__(self, storage_path: Optional[str] = None, max_pending: int = MAX_PENDING_DECISIONS):
         self.reasoning_analyzer = ReasoningAnalyzer()
         self.consensus_analyzer = ConsensusAnalyzer()
-        self.historical_tracker = HistoricalAccuracyTracker()
+        self.historical_tracker = HistoricalAccuracyTracker(max_pending)
+        self.store = HistoricalDecisionStore(storage_path) if storage_path else None
         
         # Load historical data if available
         self._load_historical_data()
     
     def calculate_decision_confidence(self, 
                                     expert_votes: List[ExpertVote],
-                                    decision_context: Dict[str, Any]) -> DecisionMetrics:
+                                    decision_context: Dict[str, Any],
+                                    decision_id: Optional[str] = None) -> DecisionMetrics:
         """
-        Calculate comprehensive confidence metrics for a CoE decision
+        Calculate comprehensive confidence metrics for a CoE decision.
+        The decision is tracked with its context under `decision_id` (generated
+        if not given) so its outcome can later be recorded against the prediction.
         """
         # Analyze consensus strength
         consensus_metrics = self.consensus_analyzer.calculate_consensus_strength(expert_votes)
@@ -315,6 +637,13 @@ class DecisionConfidenceScorer:
         # Recommend oversight level
         oversight_level = self._recommend_oversight_level(overall_confidence, success_probability)
         
+        # Track the prediction; update_decision_outcome completes it
+        decision_id = decision_id or f"decision_{uuid.uuid4().hex[:12]}"
+        self.historical_tracker.record_prediction(
+            decision_id, overall_confidence, success_probability, decision_context
+        )
+        self._save_historical_data()
+        
         return DecisionMetrics(
             consensus_strength=consensus_metrics['overall'],
             reasoning_depth=reasoning_depth,
@@ -324,7 +653,8 @@ class DecisionConfidenceScorer:
             overall_confidence=overall_confidence,
             confidence_level=confidence_level,
             predicted_success_probability=success_probability,
-            recommended_oversight_level=oversight_level
+            recommended_oversight_level=oversight_level,
+            decision_id=decision_id
         )
     
     def _calculate_expertise_coverage(self, 
@@ -417,7 +747,7 @@ class DecisionConfidenceScorer:
         consensus_adjustment = (consensus_metrics['overall'] - 0.5) * 0.2
         
         # Adjust based on project complexity
-        complexity = decision_context.get('complexity_score', 0.5)
+        complexity = context_number(decision_context, 'complexity_score', 0.5)
         complexity_adjustment = (0.5 - complexity) * 0.1
         
         # Adjust based on similar historical decisions
@@ -448,8 +778,20 @@ class DecisionConfidenceScorer:
     def update_decision_outcome(self, 
                               decision_id: str, 
                               actual_outcome: float,
-                              lessons_learned: List[str]):
-        """Update historical data with actual decision outcome"""
+                              lessons_learned: List[str]) -> bool:
+        """
+        Update historical data with actual decision outcome. An outcome is
+        recorded once: returns False, changing nothing, if the decision
+        already has one.
+        """
+        existing = self.historical_tracker.get_decision(decision_id)
+        if existing is not None:
+            if self.historical_tracker.record_outcome(decision_id, actual_outcome, lessons_learned) is None:
+                return False
+            self._save_historical_data()
+            return True
+        
+        # Outcome of a decision that was never scored here
         historical_decision = HistoricalDecision(
             decision_id=decision_id,
             decision_date=datetime.now(),
@@ -462,16 +804,28 @@ class DecisionConfidenceScorer:
         
         self.historical_tracker.add_historical_decision(historical_decision)
         self._save_historical_data()
+        return True
     
     def _load_historical_data(self):
         """Load historical decision data"""
-        # Implementation would load from persistent storage
-        pass
+        if self.store is None:
+            return
+        for decision in self.store.load():
+            self.historical_tracker.add_historical_decision(decision, persisted=True)
+        self._save_historical_data()  # Drops pending rows beyond max_pending
     
     def _save_historical_data(self):
-        """Save historical decision data"""
-        # Implementation would save to persistent storage
-        pass
+        """Save decisions added or changed since the last save, and forget evicted ones"""
+        if self.store is None:
+            self.historical_tracker.take_unsaved()
+            self.historical_tracker.take_evicted()
+            return
+        unsaved = self.historical_tracker.take_unsaved()
+        if unsaved:
+            self.store.save(unsaved)
+        evicted = self.historical_tracker.take_evicted()
+        if evicted:
+            self.store.delete(evicted)
 
 # Enhanced reporting and visualization
 class ConfidenceReporter:
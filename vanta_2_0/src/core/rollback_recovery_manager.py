@@ -5,19 +5,26 @@ Enterprise-grade rollback capabilities for failed implementations
 """
 
 import asyncio
+import concurrent.futures
+import fnmatch
 import json
 import shutil
 import os
+import stat
+import time
+import uuid
+import zlib
 from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime, timedelta
-from dataclasses import dataclass, asdict
-from pathlib import Path
+from dataclasses import dataclass, asdict, field
+from pathlib import Path, PurePosixPath
 from enum import Enum
 import logging
 import hashlib
 import sqlite3
 import zipfile
 import subprocess
+import threading
 from contextlib import contextmanager
 
 class RollbackTrigger(Enum):
@@ -52,6 +59,7 @@ class SystemSnapshot:
     checksum: str
     size_bytes: int
     creation_duration: float
+    manifest_tree: Dict[str, Any] = field(default_factory=dict)  # Streaming per-file/per-chunk digests
 
 @dataclass
 class RollbackEvent:
@@ -89,6 +97,11 @@ class DatabaseBackupManager:
         self.db_config = db_config
         self.backup_dir = Path(db_config.get('backup_directory', './backups/database'))
         self.backup_dir.mkdir(parents=True, exist_ok=True)
+        self.chunk_size = db_config.get('hash_chunk_size_bytes', DEFAULT_CHUNK_SIZE)
+        
+        # Streaming digests computed while backups/restores are copied, keyed by path
+        self.backup_digests: Dict[str, Dict[str, Any]] = {}
+        self.last_restore_digest: Optional[Dict[str, Any]] = None
         
     async def create_database_backup(self, snapshot_id: str) -> str:
         """Create a full database backup"""
@@ -114,11 +127,19 @@ class DatabaseBackupManager:
                 
                 if result.returncode != 0:
                     raise Exception(f"Database backup failed: {result.stderr}")
+                
+                digest = await asyncio.get_running_loop().run_in_executor(
+                    None, stream_file_digest, str(backup_path), self.chunk_size
+                )
+                self.backup_digests[str(backup_path)] = digest
                     
             # SQLite backup example
             elif self.db_config.get('type') == 'sqlite':
                 source_db = self.db_config.get('path')
-                shutil.copy2(source_db, backup_path)
+                digest = await asyncio.get_running_loop().run_in_executor(
+                    None, copy_file_with_digest, source_db, str(backup_path), self.chunk_size
+                )
+                self.backup_digests[str(backup_path)] = digest
                 
             return str(backup_path)
             
@@ -169,7 +190,9 @@ class DatabaseBackupManager:
                         
             elif self.db_config.get('type') == 'sqlite':
                 target_db = self.db_config.get('path')
-                shutil.copy2(backup_path, target_db)
+                self.last_restore_digest = await asyncio.get_running_loop().run_in_executor(
+                    None, copy_file_with_digest, backup_path, target_db, self.chunk_size
+                )
                 
             return True
             
@@ -177,6 +200,333 @@ class DatabaseBackupManager:
             logging.error(f"Database restore failed: {e}")
             return False
 
+DEFAULT_CHUNK_SIZE = 4 * 1024 * 1024
+
+class SnapshotIntegrityError(Exception):
+    """Snapshot content does not match its recorded digests"""
+    pass
+
+def stream_file_digest(path: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Dict[str, Any]:
+    """Hash a file `chunk_size` bytes at a time; returns size, file SHA-256 and per-chunk digests"""
+    return copy_file_with_digest(path, None, chunk_size)
+
+def copy_file_with_digest(source: str, destination: Optional[str],
+                          chunk_size: int = DEFAULT_CHUNK_SIZE) -> Dict[str, Any]:
+    """Stream `source` to `destination` (if given), hashing each chunk as it passes"""
+    file_hasher = hashlib.sha256()
+    chunks = []
+    size = 0
+    out = open(destination, 'wb') if destination else None
+    try:
+        with open(source, 'rb') as f:
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    break
+                file_hasher.update(chunk)
+                chunks.append(hashlib.sha256(chunk).hexdigest())
+                size += len(chunk)
+                if out is not None:
+                    out.write(chunk)
+    finally:
+        if out is not None:
+            out.close()
+    if destination:
+        shutil.copystat(source, destination)
+    return {'path': str(destination or source), 'size': size, 'sha256': file_hasher.hexdigest(),
+            'chunk_size': chunk_size, 'chunks': chunks}
+
+def manifest_files_root(files: Dict[str, Dict[str, Any]]) -> str:
+    """Root digest over (archive path, file SHA-256) for every file in a manifest"""
+    hasher = hashlib.sha256()
+    for arcname in sorted(files):
+        hasher.update(f"{arcname}\0{files[arcname]['sha256']}\n".encode('utf-8'))
+    return hasher.hexdigest()
+
+@dataclass
+class SnapshotStats:
+    """What one content-addressed snapshot read and wrote"""
+    snapshot_id: str
+    files_total: int = 0
+    files_reused: int = 0
+    files_stored: int = 0
+    chunks_written: int = 0
+    total_bytes: int = 0
+    bytes_read: int = 0
+    bytes_written: int = 0
+    duration_seconds: float = 0.0
+
+class ContentAddressedSnapshotStore:
+    """
+    Chunked, content-addressed file system snapshots
+
+    File contents are split into fixed-size chunks and stored once under
+    objects/ by SHA-256, zlib-compressed in a worker pool. A snapshot is a
+    manifest (zlib-compressed JSON) mapping archive paths to their stat
+    signature and chunk list. Files
+    whose size/mtime/inode match the previous manifest are referenced without
+    being read; restores rewrite only files that differ from the manifest.
+    """
+
+    HEAD_FILENAME = 'HEAD'
+
+    def __init__(self, root: str, chunk_size: int = DEFAULT_CHUNK_SIZE, compression_level: int = 6,
+                 max_workers: Optional[int] = None, exclude_patterns: Optional[List[str]] = None):
+        self.root = Path(root)
+        self.objects_dir = self.root / 'objects'
+        self.manifests_dir = self.root / 'manifests'
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        self.manifests_dir.mkdir(parents=True, exist_ok=True)
+        self.chunk_size = chunk_size
+        self.compression_level = compression_level
+        self.max_workers = max_workers or min(32, (os.cpu_count() or 1) + 4)
+        self.exclude_patterns = list(exclude_patterns or [])
+        self.last_stats: Optional[SnapshotStats] = None
+        self._manifest_cache: Dict[str, Dict[str, Any]] = {}
+        self._claimed_chunks = set()
+        self._claim_lock = threading.Lock()
+
+    # === MANIFESTS ===
+
+    def manifest_path(self, snapshot_id: str) -> Path:
+        return self.manifests_dir / f"{snapshot_id}.manifest"
+
+    def load_manifest(self, snapshot: str) -> Dict[str, Any]:
+        """Load a manifest by snapshot id or manifest path"""
+        path = Path(snapshot) if snapshot.endswith('.manifest') else self.manifest_path(snapshot)
+        snapshot_id = path.stem
+        cached = self._manifest_cache.get(snapshot_id)
+        if cached is not None:
+            return cached
+        with open(path, 'rb') as f:
+            manifest = json.loads(zlib.decompress(f.read()))
+        self._manifest_cache = {snapshot_id: manifest}
+        return manifest
+
+    def head_snapshot_id(self) -> Optional[str]:
+        head = self.root / self.HEAD_FILENAME
+        if not head.exists():
+            return None
+        snapshot_id = head.read_text(encoding='utf-8').strip()
+        return snapshot_id if self.manifest_path(snapshot_id).exists() else None
+
+    def manifest_root(self, snapshot: str) -> str:
+        return manifest_files_root(self.load_manifest(snapshot)['files'])
+
+    def list_snapshots(self) -> List[str]:
+        return sorted(path.stem for path in self.manifests_dir.glob('*.manifest'))
+
+    # === SNAPSHOT ===
+
+    def create_snapshot(self, snapshot_id: str, source_paths: List[str],
+                        parent_id: Optional[str] = None, update_head: bool = True) -> Tuple[Path, SnapshotStats]:
+        """Snapshot `source_paths`, reusing unchanged files from `parent_id` (default: HEAD)"""
+        start_time = time.perf_counter()
+        stats = SnapshotStats(snapshot_id=snapshot_id)
+        parent_id = parent_id or self.head_snapshot_id()
+        parent_files = self.load_manifest(parent_id)['files'] if parent_id else {}
+
+        files: Dict[str, Dict[str, Any]] = {}
+        to_store = []
+        for arcname, (path, st) in self._scan(source_paths).items():
+            previous = parent_files.get(arcname)
+            if (previous is not None and previous['size'] == st.st_size
+                    and previous['mtime_ns'] == st.st_mtime_ns and previous['ino'] == st.st_ino):
+                files[arcname] = previous
+                stats.files_reused += 1
+            else:
+                to_store.append((arcname, path, st))
+
+        if to_store:
+            self._claimed_chunks = set()
+            with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                for arcname, entry, chunks_written, bytes_written in pool.map(self._store_file, to_store):
+                    files[arcname] = entry
+                    stats.files_stored += 1
+                    stats.chunks_written += chunks_written
+                    stats.bytes_written += bytes_written
+                    stats.bytes_read += entry['size']
+
+        stats.files_total = len(files)
+        stats.total_bytes = sum(entry['size'] for entry in files.values())
+        manifest = {
+            'snapshot_id': snapshot_id,
+            'parent': parent_id,
+            'created_at': datetime.now().isoformat(),
+            'chunk_size': self.chunk_size,
+            'total_bytes': stats.total_bytes,
+            'files': dict(sorted(files.items())),
+        }
+        manifest_path = self.manifest_path(snapshot_id)
+        stats.bytes_written += self._write_atomic(
+            manifest_path, zlib.compress(json.dumps(manifest, separators=(',', ':')).encode('utf-8')))
+        if update_head:
+            self._write_atomic(self.root / self.HEAD_FILENAME, snapshot_id.encode('utf-8'))
+        self._manifest_cache = {snapshot_id: manifest}
+
+        stats.duration_seconds = time.perf_counter() - start_time
+        self.last_stats = stats
+        return manifest_path, stats
+
+    def _store_file(self, item: Tuple[str, str, os.stat_result]) -> Tuple[str, Dict[str, Any], int, int]:
+        arcname, path, st = item
+        file_hasher = hashlib.sha256()
+        chunks = []
+        chunks_written = 0
+        bytes_written = 0
+        with open(path, 'rb') as f:
+            while True:
+                chunk = f.read(self.chunk_size)
+                if not chunk:
+                    break
+                file_hasher.update(chunk)
+                digest = hashlib.sha256(chunk).hexdigest()
+                chunks.append(digest)
+                with self._claim_lock:
+                    if digest in self._claimed_chunks:
+                        continue
+                    self._claimed_chunks.add(digest)
+                object_path = self._object_path(digest)
+                if not object_path.exists():
+                    object_path.parent.mkdir(exist_ok=True)
+                    bytes_written += self._write_atomic(object_path, zlib.compress(chunk, self.compression_level))
+                    chunks_written += 1
+        entry = {
+            'size': st.st_size,
+            'mtime_ns': st.st_mtime_ns,
+            'ino': st.st_ino,
+            'mode': stat.S_IMODE(st.st_mode),
+            'sha256': file_hasher.hexdigest(),
+            'chunks': chunks,
+        }
+        return arcname, entry, chunks_written, bytes_written
+
+    # === RESTORE ===
+
+    def restore_snapshot(self, snapshot: str, target_paths: List[str], prune: bool = True) -> Dict[str, int]:
+        """
+        Bring `target_paths` back to the snapshot by rewriting only files whose
+        size or mtime differ from the manifest. With `prune`, files the snapshot
+        does not contain are deleted (excluded files are never touched).
+        Every chunk read is verified; a mismatch raises SnapshotIntegrityError
+        and leaves that target file untouched.
+        """
+        files = self.load_manifest(snapshot)['files']
+        to_write = []
+        to_delete = []
+        considered = 0
+        for target in target_paths:
+            target = Path(target)
+            prefix = target.name
+            current = self._scan([str(target)])
+            for arcname, entry in files.items():
+                if arcname != prefix and not arcname.startswith(prefix + '/'):
+                    continue
+                considered += 1
+                existing = current.get(arcname)
+                if existing is None or existing[1].st_size != entry['size'] or existing[1].st_mtime_ns != entry['mtime_ns']:
+                    to_write.append((target.parent / arcname, entry))
+            if prune:
+                to_delete.extend(path for arcname, (path, _) in current.items() if arcname not in files)
+
+        if to_write:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                list(pool.map(self._restore_file, to_write))
+        for path in to_delete:
+            os.unlink(path)
+
+        return {'files_written': len(to_write), 'files_deleted': len(to_delete),
+                'files_unchanged': considered - len(to_write)}
+
+    def _restore_file(self, item: Tuple[Path, Dict[str, Any]]):
+        """Write one file from its chunks, verifying every chunk and the file digest before it replaces the target"""
+        path, entry = item
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.restore-{uuid.uuid4().hex}")
+        try:
+            file_hasher = hashlib.sha256()
+            with open(tmp_path, 'wb') as f:
+                for digest in entry['chunks']:
+                    with open(self._object_path(digest), 'rb') as obj:
+                        chunk = zlib.decompress(obj.read())
+                    if hashlib.sha256(chunk).hexdigest() != digest:
+                        raise SnapshotIntegrityError(f"Chunk {digest} for {path} is corrupt")
+                    file_hasher.update(chunk)
+                    f.write(chunk)
+            if file_hasher.hexdigest() != entry['sha256']:
+                raise SnapshotIntegrityError(f"Restored content of {path} does not match the manifest")
+            os.chmod(tmp_path, entry['mode'])
+            os.utime(tmp_path, ns=(entry['mtime_ns'], entry['mtime_ns']))
+            os.replace(tmp_path, path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+
+    # === MAINTENANCE ===
+
+    def delete_snapshot(self, snapshot_id: str):
+        self.manifest_path(snapshot_id).unlink(missing_ok=True)
+        self._manifest_cache.pop(snapshot_id, None)
+
+    def collect_garbage(self) -> int:
+        """Delete chunk objects no remaining manifest references; returns objects removed"""
+        referenced = set()
+        for snapshot_id in self.list_snapshots():
+            for entry in self.load_manifest(snapshot_id)['files'].values():
+                referenced.update(entry['chunks'])
+        removed = 0
+        for object_path in self.objects_dir.glob('*/*'):
+            if object_path.name not in referenced:
+                object_path.unlink()
+                removed += 1
+        return removed
+
+    # === HELPERS ===
+
+    def _object_path(self, digest: str) -> Path:
+        return self.objects_dir / digest[:2] / digest
+
+    @staticmethod
+    def _write_atomic(path: Path, data: bytes) -> int:
+        tmp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}")
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        return len(data)
+
+    def _is_excluded(self, name: str, relpath: str) -> bool:
+        for pattern in self.exclude_patterns:
+            if '/' in pattern:
+                if PurePosixPath(relpath).match(pattern):
+                    return True
+            elif fnmatch.fnmatch(name, pattern):
+                return True
+        return False
+
+    def _scan(self, source_paths: List[str]) -> Dict[str, Tuple[str, os.stat_result]]:
+        """Map archive name (relative to each source's parent) to (path, stat)"""
+        found: Dict[str, Tuple[str, os.stat_result]] = {}
+        for source_path in source_paths:
+            source = Path(source_path)
+            if source.is_file():
+                found[source.name] = (str(source), source.stat())
+                continue
+            if not source.is_dir():
+                continue
+            pending = [(str(source), source.name)]
+            while pending:
+                directory, arcdir = pending.pop()
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        arcname = f"{arcdir}/{entry.name}"
+                        if self._is_excluded(entry.name, arcname):
+                            continue
+                        if entry.is_dir(follow_symlinks=False):
+                            pending.append((entry.path, arcname))
+                        elif entry.is_file():
+                            found[arcname] = (entry.path, entry.stat())
+        return found
+
 class FileSystemBackupManager:
     """
     Manages file system backups and restoration
@@ -190,8 +540,39 @@ class FileSystemBackupManager:
             '*.log', '*.tmp', '__pycache__', '.git', 'node_modules'
         ])
         
+        # 'content_addressed' (incremental chunk store) or 'zip' (full archive per snapshot)
+        self.backup_format = backup_config.get('format', 'content_addressed')
+        self.store = None
+        if self.backup_format == 'content_addressed':
+            self.store = ContentAddressedSnapshotStore(
+                self.backup_dir,
+                chunk_size=backup_config.get('chunk_size_bytes', DEFAULT_CHUNK_SIZE),
+                compression_level=backup_config.get('compression_level', 6),
+                max_workers=backup_config.get('max_workers'),
+                exclude_patterns=self.exclude_patterns
+            )
+        self.pre_restore_snapshot = backup_config.get('pre_restore_snapshot', True)
+        self.last_backup_stats: Optional[SnapshotStats] = None
+        self.last_restore_result: Optional[Dict[str, int]] = None
+        
     async def create_filesystem_backup(self, snapshot_id: str, source_paths: List[str]) -> str:
-        """Create compressed file system backup"""
+        """Create file system backup; returns the manifest (or zip) path"""
+        if self.store is not None:
+            try:
+                loop = asyncio.get_running_loop()
+                manifest_path, stats = await loop.run_in_executor(
+                    None, self.store.create_snapshot, snapshot_id, source_paths
+                )
+                self.last_backup_stats = stats
+                logging.info(
+                    f"Filesystem snapshot {snapshot_id}: {stats.files_stored} files stored, "
+                    f"{stats.files_reused} reused, {stats.bytes_written} bytes written"
+                )
+                return str(manifest_path)
+            except Exception as e:
+                logging.error(f"Filesystem backup failed: {e}")
+                raise
+        
         backup_path = self.backup_dir / f"{snapshot_id}_filesystem.zip"
         
         try:
@@ -215,6 +596,9 @@ class FileSystemBackupManager:
     
     async def restore_filesystem_backup(self, backup_path: str, target_paths: List[str]) -> bool:
         """Restore file system from backup"""
+        if backup_path.endswith('.manifest'):
+            return await self._restore_from_manifest(backup_path, target_paths)
+        
         try:
             with zipfile.ZipFile(backup_path, 'r') as zipf:
                 for target_path in target_paths:
@@ -237,6 +621,58 @@ class FileSystemBackupManager:
             logging.error(f"Filesystem restore failed: {e}")
             return False
     
+    async def _restore_from_manifest(self, manifest_path: str, target_paths: List[str]) -> bool:
+        """Restore by manifest diff; the pre-restore state is kept as an incremental snapshot"""
+        store = self.store or ContentAddressedSnapshotStore(
+            Path(manifest_path).parent.parent, exclude_patterns=self.exclude_patterns
+        )
+        loop = asyncio.get_running_loop()
+        try:
+            if self.pre_restore_snapshot:
+                existing = [path for path in target_paths if Path(path).exists()]
+                if existing:
+                    pre_restore_id = f"pre_restore_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}"
+                    await loop.run_in_executor(
+                        None, lambda: store.create_snapshot(pre_restore_id, existing, update_head=False)
+                    )
+            
+            result = await loop.run_in_executor(None, store.restore_snapshot, manifest_path, target_paths)
+            self.last_restore_result = result
+            logging.info(
+                f"Filesystem restore: {result['files_written']} files written, "
+                f"{result['files_deleted']} deleted, {result['files_unchanged']} unchanged"
+            )
+            return True
+            
+        except Exception as e:
+            logging.error(f"Filesystem restore failed: {e}")
+            return False
+    
+    def describe_backup(self, backup_path: str) -> Dict[str, Any]:
+        """
+        Manifest tree node for a backup. Content-addressed snapshots already carry
+        per-file and per-chunk digests, so only the manifest is read; zip archives
+        are hashed in streaming chunks.
+        """
+        if backup_path.endswith('.manifest'):
+            store = self.store or ContentAddressedSnapshotStore(Path(backup_path).parent.parent)
+            manifest = store.load_manifest(backup_path)
+            return {
+                'path': backup_path,
+                'format': 'content_addressed',
+                'files': len(manifest['files']),
+                'total_bytes': manifest['total_bytes'],
+                'sha256': manifest_files_root(manifest['files']),
+            }
+        return {'format': 'zip', **stream_file_digest(backup_path)}
+    
+    def backup_size_bytes(self, backup_path: str) -> int:
+        """Logical size of a backup (file bytes covered, for content-addressed snapshots)"""
+        if backup_path.endswith('.manifest'):
+            store = self.store or ContentAddressedSnapshotStore(Path(backup_path).parent.parent)
+            return store.load_manifest(backup_path)['total_bytes']
+        return Path(backup_path).stat().st_size
+    
     def _should_exclude(self, file_path: Path) -> bool:
         """Check if file should be excluded from backup"""
         for pattern in self.exclude_patterns:
@@ -257,17 +693,31 @@ class HealthMonitor:
         self.consecutive_failures_threshold = health_config.get('consecutive_failures_threshold', 3)
         self.failure_counts = {}
         
-    async def register_health_check(self, check_id: str, check_function, component: str):
+        # Concurrency, deadlines and result caching
+        self.check_timeout = health_config.get('check_timeout_seconds', 10.0)
+        self.max_concurrent_checks = health_config.get('max_concurrent_checks', 16)
+        self.result_ttl = health_config.get('result_ttl_seconds', self.check_interval * 2 + self.check_timeout)
+        self.component_ttls = health_config.get('component_ttl_seconds', {})
+        self.evaluation_interval = health_config.get('evaluation_interval_seconds', self.check_interval)
+        self.last_decision: Optional[Dict[str, Any]] = None
+        self._probe_tasks: Dict[str, asyncio.Task] = {}
+        self._monitor_task: Optional[asyncio.Task] = None
+        
+    async def register_health_check(self, check_id: str, check_function, component: str,
+                                    timeout_seconds: Optional[float] = None):
         """Register a health check function"""
         self.health_checks[check_id] = {
             'function': check_function,
             'component': component,
+            'timeout': timeout_seconds or self.check_timeout,
             'last_check': None,
-            'consecutive_failures': 0
+            'last_check_monotonic': None,
+            'consecutive_failures': 0,
+            'in_flight': None
         }
         
     async def run_health_check(self, check_id: str) -> HealthCheck:
-        """Run a specific health check"""
+        """Run a specific health check, failing it if it misses its deadline"""
         check_info = self.health_checks.get(check_id)
         if not check_info:
             raise ValueError(f"Health check {check_id} not found")
@@ -275,8 +725,18 @@ class HealthMonitor:
         start_time = datetime.now()
         
         try:
-            # Run the health check function
-            result = await check_info['function']()
+            # A probe still hung from an earlier run is not started again
+            probe = check_info['in_flight']
+            if probe is None or probe.done():
+                probe = asyncio.ensure_future(check_info['function']())
+                check_info['in_flight'] = probe
+            
+            # Wait without awaiting cancellation, so a probe that ignores it cannot block us
+            done, _ = await asyncio.wait({probe}, timeout=check_info['timeout'])
+            if not done:
+                probe.cancel()
+                raise asyncio.TimeoutError(f"timed out after {check_info['timeout']}s")
+            result = probe.result()
             
             # Analyze results
             status = self._analyze_health_metrics(result)
@@ -302,48 +762,121 @@ class HealthMonitor:
                 check_info['consecutive_failures'] = 0
                 
             check_info['last_check'] = health_check
+            check_info['last_check_monotonic'] = time.monotonic()
             
             return health_check
             
         except Exception as e:
-            # Health check failed to execute
+            # Health check failed to execute or missed its deadline
+            timed_out = isinstance(e, asyncio.TimeoutError)
             health_check = HealthCheck(
                 check_id=check_id,
                 component=check_info['component'],
                 check_type="automated",
                 status=SystemState.FAILED,
-                metrics={'error': str(e)},
-                threshold_violations=['health_check_execution_failed'],
+                metrics={'error': str(e) or type(e).__name__},
+                threshold_violations=['health_check_timed_out' if timed_out else 'health_check_execution_failed'],
                 timestamp=datetime.now(),
                 response_time_ms=(datetime.now() - start_time).total_seconds() * 1000
             )
             
             check_info['consecutive_failures'] += 1
             check_info['last_check'] = health_check
+            check_info['last_check_monotonic'] = time.monotonic()
             
             return health_check
     
     async def run_all_health_checks(self) -> List[HealthCheck]:
-        """Run all registered health checks"""
-        results = []
+        """Run all registered health checks concurrently, at most max_concurrent_checks at a time"""
+        semaphore = asyncio.Semaphore(self.max_concurrent_checks)
+        check_ids = list(self.health_checks.keys())
+        outcomes = await asyncio.gather(
+            *(self._run_bounded(semaphore, check_id) for check_id in check_ids), return_exceptions=True
+        )
         
-        for check_id in self.health_checks.keys():
-            try:
-                result = await self.run_health_check(check_id)
-                results.append(result)
-            except Exception as e:
-                logging.error(f"Health check {check_id} failed: {e}")
+        results = []
+        for check_id, outcome in zip(check_ids, outcomes):
+            if isinstance(outcome, BaseException):
+                logging.error(f"Health check {check_id} failed: {outcome}")
+            else:
+                results.append(outcome)
                 
         return results
     
+    async def _run_bounded(self, semaphore: asyncio.Semaphore, check_id: str) -> HealthCheck:
+        async with semaphore:
+            return await self.run_health_check(check_id)
+    
+    def get_cached_results(self, component: Optional[str] = None) -> List[HealthCheck]:
+        """Latest result of each check that is still within its component's TTL"""
+        now = time.monotonic()
+        results = []
+        for check_info in self.health_checks.values():
+            if component is not None and check_info['component'] != component:
+                continue
+            if self._is_fresh(check_info, now):
+                results.append(check_info['last_check'])
+        return results
+    
+    def _is_fresh(self, check_info: Dict[str, Any], now: float) -> bool:
+        checked_at = check_info['last_check_monotonic']
+        if checked_at is None:
+            return False
+        return now - checked_at <= self.component_ttls.get(check_info['component'], self.result_ttl)
+    
     def should_trigger_rollback(self) -> Tuple[bool, str]:
-        """Determine if automatic rollback should be triggered"""
+        """Determine if automatic rollback should be triggered, from cached results only"""
+        now = time.monotonic()
         for check_id, check_info in self.health_checks.items():
+            if not self._is_fresh(check_info, now):
+                continue
             if check_info['consecutive_failures'] >= self.consecutive_failures_threshold:
                 return True, f"Health check {check_id} failed {check_info['consecutive_failures']} consecutive times"
                 
         return False, ""
     
+    async def start_monitoring(self, on_rollback=None):
+        """
+        Re-probe each check check_interval after its previous run started (never
+        overlapping itself) and evaluate triggers every evaluation_interval.
+        Evaluation reads cached results and never waits for probes;
+        `on_rollback(reason)` is awaited when the decision turns to rollback.
+        """
+        if self._monitor_task is None or self._monitor_task.done():
+            self._monitor_task = asyncio.create_task(self._monitor_loop(on_rollback))
+    
+    async def stop_monitoring(self):
+        tasks = [task for task in [self._monitor_task, *self._probe_tasks.values()]
+                 if task is not None and not task.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._monitor_task = None
+        self._probe_tasks = {}
+    
+    async def _monitor_loop(self, on_rollback):
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(self.max_concurrent_checks)
+        next_due: Dict[str, float] = {}
+        while True:
+            now = loop.time()
+            for check_id in list(self.health_checks):
+                task = self._probe_tasks.get(check_id)
+                if (task is None or task.done()) and now >= next_due.get(check_id, 0.0):
+                    self._probe_tasks[check_id] = asyncio.create_task(self._run_bounded(semaphore, check_id))
+                    next_due[check_id] = now + self.check_interval
+            
+            triggered, reason = self.should_trigger_rollback()
+            previously_triggered = bool(self.last_decision and self.last_decision['rollback'])
+            self.last_decision = {'rollback': triggered, 'reason': reason, 'timestamp': datetime.now()}
+            if triggered and not previously_triggered and on_rollback is not None:
+                try:
+                    await on_rollback(reason)
+                except Exception as e:
+                    logging.error(f"Rollback trigger handler failed: {e}")
+            
+            await asyncio.sleep(self.evaluation_interval)
+    
     def _analyze_health_metrics(self, metrics: Dict[str, Any]) -> SystemState:
         """Analyze health metrics to determine system state"""
         if 'error' in metrics:
@@ -419,10 +952,16 @@ class VantaRollbackManager:
                 version_info TEXT,
                 checksum TEXT,
                 size_bytes INTEGER,
-                creation_duration REAL
+                creation_duration REAL,
+                manifest_tree TEXT
             )
         ''')
         
+        # Databases created before manifest trees were recorded
+        columns = [row[1] for row in self.conn.execute('PRAGMA table_info(snapshots)')]
+        if 'manifest_tree' not in columns:
+            self.conn.execute('ALTER TABLE snapshots ADD COLUMN manifest_tree TEXT')
+        
         self.conn.execute('''
             CREATE TABLE IF NOT EXISTS rollback_events (
                 event_id TEXT PRIMARY KEY,
@@ -453,21 +992,24 @@ class VantaRollbackManager:
             # Capture current system state
             system_state = await self._capture_system_state()
             
-            # Create database backup
-            db_backup_path = await self.db_backup_manager.create_database_backup(snapshot_id)
-            
-            # Create filesystem backup
+            # Create database and filesystem backups concurrently; both hash as they write
             source_paths = self.config.get('backup_paths', ['./src', './config', './docs'])
-            fs_backup_path = await self.fs_backup_manager.create_filesystem_backup(snapshot_id, source_paths)
+            db_backup_path, fs_backup_path = await asyncio.gather(
+                self.db_backup_manager.create_database_backup(snapshot_id),
+                self.fs_backup_manager.create_filesystem_backup(snapshot_id, source_paths)
+            )
             
             # Capture configuration state
             config_state = self._capture_configuration_state()
             
-            # Calculate checksum for integrity verification
-            checksum = self._calculate_snapshot_checksum(db_backup_path, fs_backup_path, config_state)
+            # Manifest tree and checksum for integrity verification
+            manifest_tree = await asyncio.get_running_loop().run_in_executor(
+                None, self._build_manifest_tree, db_backup_path, fs_backup_path, config_state
+            )
+            checksum = self._calculate_snapshot_checksum(manifest_tree)
             
             # Calculate backup size
-            size_bytes = Path(db_backup_path).stat().st_size + Path(fs_backup_path).stat().st_size
+            size_bytes = Path(db_backup_path).stat().st_size + self.fs_backup_manager.backup_size_bytes(fs_backup_path)
             
             creation_duration = (datetime.now() - start_time).total_seconds()
             
@@ -482,7 +1024,8 @@ class VantaRollbackManager:
                 version_info=await self._get_version_info(),
                 checksum=checksum,
                 size_bytes=size_bytes,
-                creation_duration=creation_duration
+                creation_duration=creation_duration,
+                manifest_tree=manifest_tree
             )
             
             # Store snapshot
@@ -707,21 +1250,30 @@ class VantaRollbackManager:
             "deployment_date": datetime.now().isoformat()
         }
     
-    def _calculate_snapshot_checksum(self, db_path: str, fs_path: str, config: Dict[str, Any]) -> str:
-        """Calculate checksum for snapshot integrity verification"""
-        hasher = hashlib.sha256()
-        
-        # Hash database backup
-        with open(db_path, 'rb') as f:
-            hasher.update(f.read())
-            
-        # Hash filesystem backup
-        with open(fs_path, 'rb') as f:
-            hasher.update(f.read())
-            
-        # Hash configuration
-        hasher.update(json.dumps(config, sort_keys=True).encode())
+    def _build_manifest_tree(self, db_path: str, fs_path: str, config: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Collect per-component digests for a snapshot. Digests computed while the
+        backups were written are reused; anything else is hashed in streaming
+        chunks, so memory stays bounded regardless of snapshot size.
+        """
+        database = self.db_backup_manager.backup_digests.pop(db_path, None)
+        if database is None:
+            database = stream_file_digest(db_path, self.db_backup_manager.chunk_size)
         
+        return {
+            'algorithm': 'sha256',
+            'database': database,
+            'filesystem': self.fs_backup_manager.describe_backup(fs_path),
+            'configuration': {
+                'sha256': hashlib.sha256(json.dumps(config, sort_keys=True).encode()).hexdigest()
+            }
+        }
+    
+    def _calculate_snapshot_checksum(self, manifest_tree: Dict[str, Any]) -> str:
+        """Calculate checksum for snapshot integrity verification from its manifest tree"""
+        hasher = hashlib.sha256()
+        for component in ('database', 'filesystem', 'configuration'):
+            hasher.update(manifest_tree[component]['sha256'].encode())
         return hasher.hexdigest()
     
     def _store_snapshot(self, snapshot: SystemSnapshot):
@@ -730,7 +1282,7 @@ class VantaRollbackManager:
         
         # Store in database
         self.conn.execute('''
-            INSERT INTO snapshots VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            INSERT INTO snapshots VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
         ''', (
             snapshot.snapshot_id,
             snapshot.timestamp.isoformat(),
@@ -742,7 +1294,8 @@ class VantaRollbackManager:
             json.dumps(snapshot.version_info),
             snapshot.checksum,
             snapshot.size_bytes,
-            snapshot.creation_duration
+            snapshot.creation_duration,
+            json.dumps(snapshot.manifest_tree)
         ))
         self.conn.commit()
     
@@ -770,7 +1323,8 @@ class VantaRollbackManager:
                 version_info=json.loads(row[7]),
                 checksum=row[8],
                 size_bytes=row[9],
-                creation_duration=row[10]
+                creation_duration=row[10],
+                manifest_tree=json.loads(row[11]) if row[11] else {}
             )
             self.snapshots[snapshot_id] = snapshot
             return snapshot
@@ -859,8 +1413,54 @@ class VantaRollbackManager:
         pass
     
     async def _verify_rollback_integrity(self, snapshot: SystemSnapshot) -> Dict[str, Any]:
-        """Verify rollback integrity"""
-        return {"success": True, "errors": []}
+        """Verify rollback integrity against the snapshot's manifest tree, off the event loop"""
+        if not snapshot.manifest_tree:
+            return {"success": True, "errors": [], "verified": []}
+        
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self._verify_manifest_tree, snapshot)
+    
+    def _verify_manifest_tree(self, snapshot: SystemSnapshot) -> Dict[str, Any]:
+        """
+        Compare what the rollback touched with the recorded digests. Chunk digests
+        captured while the database was copied back are compared directly, and
+        filesystem chunks were already verified as each restored file was
+        written, so only the manifest root is recomputed here.
+        """
+        tree = snapshot.manifest_tree
+        errors = []
+        verified = []
+        
+        # Database: digests from the restore copy, or a streaming re-hash of the backup
+        expected = tree['database']
+        actual = self.db_backup_manager.last_restore_digest
+        if actual is None or actual.get('chunk_size') != expected.get('chunk_size'):
+            actual = stream_file_digest(snapshot.database_state, expected.get('chunk_size', DEFAULT_CHUNK_SIZE))
+        if actual['sha256'] != expected['sha256']:
+            mismatched = [i for i, (a, b) in enumerate(zip(actual['chunks'], expected['chunks'])) if a != b]
+            errors.append(f"Database content does not match snapshot (chunks {mismatched[:10]}, "
+                          f"size {actual['size']} vs {expected['size']})")
+        else:
+            verified.append('database')
+        
+        # Filesystem: the manifest must still hash to the recorded root
+        try:
+            filesystem = self.fs_backup_manager.describe_backup(snapshot.file_system_state)
+            if filesystem['sha256'] != tree['filesystem']['sha256']:
+                errors.append("Filesystem backup does not match snapshot manifest root")
+            else:
+                verified.append('filesystem')
+        except (OSError, ValueError, zlib.error) as e:
+            errors.append(f"Filesystem backup unreadable: {e}")
+        
+        # Configuration
+        config_digest = hashlib.sha256(json.dumps(snapshot.configuration_state, sort_keys=True).encode()).hexdigest()
+        if config_digest != tree['configuration']['sha256']:
+            errors.append("Configuration state does not match snapshot")
+        else:
+            verified.append('configuration')
+        
+        return {"success": not errors, "errors": errors, "verified": verified}
     
     async def _restart_services_if_needed(self):
         """Restart services if necessary after rollback"""
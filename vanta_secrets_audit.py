@@ -2,18 +2,30 @@
 import re, os
 from pathlib import Path
 
+from agent_core.scan_cache import DEFAULT_CACHE_PATH, ScanCache
+from agent_core.secret_detection import DetectionRule, SecretDetector
+
+AUDIT_DETECTOR = SecretDetector([
+    DetectionRule("assignment", "secret", r"(api|secret|token|key)[_\-]?[a-z]*\s*=\s*['\"]\w+?['\"]", re.IGNORECASE)
+])
+
+def scan_content(content):
+    return [detection.value for detection in AUDIT_DETECTOR.scan(content)]
+
 def scan_file(file_path):
     content = Path(file_path).read_text(errors="ignore")
-    leaks = re.findall(r"(api|secret|token|key)[_\-]?[a-z]*\s*=\s*['\"]\w+?['\"]", content, re.IGNORECASE)
+    leaks = scan_content(content)
     return leaks
 
-def audit():
+def audit(cache_path=DEFAULT_CACHE_PATH):
     findings = {}
-    for f in Path(".").rglob("*.*"):
-        if f.suffix in [".py", ".env", ".md", ".txt"]:
-            results = scan_file(f)
-            if results:
-                findings[str(f)] = results
+    # Unchanged files since the last audit come from the scan cache
+    with ScanCache(cache_path, namespace="vanta_secrets_audit", ruleset_version=AUDIT_DETECTOR.ruleset_version) as cache:
+        for f in Path(".").rglob("*.*"):
+            if f.suffix in [".py", ".env", ".md", ".txt"]:
+                results = cache.scan_file(str(f), lambda data: scan_content(data.decode("utf-8", errors="ignore")))
+                if results:
+                    findings[str(f)] = results
 
     if findings:
         print("[!🔐] Potential leaks found:")
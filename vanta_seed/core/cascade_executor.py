@@ -1,131 +1,338 @@
+import asyncio
+import concurrent.futures
+import heapq
 import logging
-from typing import Any, Dict, Optional, List
-import yaml
-import os
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, Optional, List, Tuple, Union
 import re
 
 logger = logging.getLogger(__name__)
 
+# Matches {{ step_results.<source>.<key> }} references inside task_data strings
+_TEMPLATE_REF = re.compile(r'\{\{\s*step_results\.(\w+)\.(\w+)\s*\}\}')
+_POSITIONAL_OUTPUT = re.compile(r'^step_(\d+)_output$')
+
+
+class CascadeDefinitionError(ValueError):
+    """Raised when a cascade profile cannot be compiled (bad dependencies, cycles)."""
+
+
+@dataclass
+class CompiledTemplate:
+    """
+    A task_data string split once into literal text and step_results references.
+    Rendering is a single join over the parts instead of repeated str.replace.
+    """
+    source: str
+    parts: Tuple[Union[str, Tuple[str, str]], ...]
+
+    def render(self, step_results: Dict[str, Any], aliases: Dict[str, str]) -> str:
+        rendered = []
+        for part in self.parts:
+            if isinstance(part, str):
+                rendered.append(part)
+                continue
+            ref_source, ref_key = part
+            output = step_results.get(aliases.get(ref_source, ref_source))
+            if isinstance(output, dict) and ref_key in output:
+                rendered.append(str(output[ref_key]))
+            else:
+                # Unresolved references are left verbatim, as before
+                rendered.append('{{ step_results.%s.%s }}' % part)
+        return ''.join(rendered)
+
+
+@dataclass
+class CompiledStep:
+    """A cascade step with its templates compiled and its dependencies resolved."""
+    index: int
+    name: str
+    agent_id: Optional[str]
+    task_data: Dict[str, Any]
+    depends_on: Tuple[str, ...]
+    on_failure: str = ''
+    timeout_seconds: Optional[float] = None
+    retries: int = 0  # Failed attempts are retried; timed-out ones are not (see _run_step)
+    retry_delay_seconds: float = 0.5
+
+    def render(self, step_results: Dict[str, Any], aliases: Dict[str, str]) -> Dict[str, Any]:
+        return {
+            k: v.render(step_results, aliases) if isinstance(v, CompiledTemplate) else v
+            for k, v in self.task_data.items()
+        }
+
+
+@dataclass
+class CompiledCascade:
+    """A cascade profile compiled into a dependency graph of steps."""
+    profile_id: str
+    steps: List[CompiledStep]
+    dependents: Dict[str, List[str]] = field(default_factory=dict)
+    # step_N_output -> <name>_output, so positional references resolve to named steps
+    aliases: Dict[str, str] = field(default_factory=dict)
+    max_concurrency: Optional[int] = None
+
+
+def _compile_template(value: str) -> Union[str, CompiledTemplate]:
+    parts: List[Union[str, Tuple[str, str]]] = []
+    position = 0
+    for match in _TEMPLATE_REF.finditer(value):
+        if match.start() > position:
+            parts.append(value[position:match.start()])
+        parts.append((match.group(1), match.group(2)))
+        position = match.end()
+    if not parts:
+        return value
+    if position < len(value):
+        parts.append(value[position:])
+    return CompiledTemplate(source=value, parts=tuple(parts))
+
+
+def compile_cascade_profile(profile: Dict[str, Any]) -> CompiledCascade:
+    """
+    Compile a cascade profile into a CompiledCascade.
+
+    Steps may declare `depends_on` (a step name or list of names). If no step in the
+    profile declares dependencies, the profile is treated as linear and each step
+    depends on the one before it, preserving the original sequential semantics.
+    References to another step's output in task_data add an implicit dependency.
+    """
+    sequence = profile.get('agent_sequence', []) or []
+    names = [step.get('name', f'step_{idx+1}') for idx, step in enumerate(sequence)]
+    if len(set(names)) != len(names):
+        raise CascadeDefinitionError(f"Duplicate step names in cascade '{profile.get('profile_id')}'")
+
+    aliases = {f'step_{idx+1}_output': f'{name}_output' for idx, name in enumerate(names)}
+    output_to_name = {f'{name}_output': name for name in names}
+    is_dag = any('depends_on' in step for step in sequence)
+
+    steps = []
+    for idx, step in enumerate(sequence):
+        raw_task_data = step.get('task_data') or step.get('input_mapping') or {}
+        task_data = {k: _compile_template(v) if isinstance(v, str) else v for k, v in raw_task_data.items()}
+
+        if is_dag:
+            declared = step.get('depends_on') or []
+            depends_on = [declared] if isinstance(declared, str) else list(declared)
+        else:
+            depends_on = [names[idx - 1]] if idx > 0 else []
+
+        for template in task_data.values():
+            if isinstance(template, CompiledTemplate):
+                for part in template.parts:
+                    if isinstance(part, tuple):
+                        ref = output_to_name.get(aliases.get(part[0], part[0]))
+                        if ref and ref != names[idx] and ref not in depends_on:
+                            depends_on.append(ref)
+
+        unknown = [dep for dep in depends_on if dep not in output_to_name.values()]
+        if unknown:
+            raise CascadeDefinitionError(f"Step '{names[idx]}' depends on unknown steps: {unknown}")
+
+        steps.append(CompiledStep(
+            index=idx,
+            name=names[idx],
+            agent_id=step.get('agent') or step.get('agent_id'),
+            task_data=task_data,
+            depends_on=tuple(depends_on),
+            on_failure=str(step.get('on_failure', '')).upper(),
+            timeout_seconds=step.get('timeout_seconds', profile.get('step_timeout_seconds')),
+            retries=int(step.get('retries', 0)),
+            retry_delay_seconds=float(step.get('retry_delay_seconds', 0.5))
+        ))
+
+    dependents: Dict[str, List[str]] = {name: [] for name in names}
+    for step in steps:
+        for dep in step.depends_on:
+            dependents[dep].append(step.name)
+
+    # Kahn's algorithm to reject cycles up front
+    indegree = {step.name: len(step.depends_on) for step in steps}
+    queue = [name for name, degree in indegree.items() if degree == 0]
+    visited = 0
+    while queue:
+        name = queue.pop()
+        visited += 1
+        for child in dependents[name]:
+            indegree[child] -= 1
+            if indegree[child] == 0:
+                queue.append(child)
+    if visited != len(steps):
+        raise CascadeDefinitionError(f"Cascade '{profile.get('profile_id')}' has a dependency cycle")
+
+    return CompiledCascade(
+        profile_id=profile.get('profile_id', ''),
+        steps=steps,
+        dependents=dependents,
+        aliases=aliases,
+        max_concurrency=profile.get('max_concurrency')
+    )
+
+
 class CascadeExecutor:
     """
-    CascadeExecutor is responsible for loading cascade definitions, executing cascades step-by-step,
-    and logging all events according to the agentic protocol. It integrates with VantaMasterCore.
+    CascadeExecutor is responsible for loading cascade definitions, executing cascades as a
+    dependency graph of steps, and logging all events according to the agentic protocol.
+    Independent steps run concurrently on asyncio, bounded by max_concurrency.
+    It integrates with VantaMasterCore.
     """
-    def __init__(self, vmc: Any):
+    def __init__(self, vmc: Any, max_concurrency: int = 8, registry: Optional[Any] = None):
         """
         Args:
             vmc: Reference to the VantaMasterCore instance for agent/task execution and logging.
+            max_concurrency: Upper bound on steps running at once within one cascade.
+            registry: CascadeProfileRegistry to read profiles from. Defaults to the
+                process-wide registry for agent_cascade_definitions.mdc, so the file is
+                parsed once no matter how many executors are created.
         """
+        from .cascade_profile_registry import get_cascade_profile_registry
+
         self.vmc = vmc
-        self.cascades = {}  # type: Dict[str, Any]
-        self._load_cascade_definitions()
+        self.max_concurrency = max_concurrency
+        self.registry = registry if registry is not None else get_cascade_profile_registry()
 
-    def _load_cascade_definitions(self):
+    @property
+    def cascades(self) -> Dict[str, Any]:
+        """Raw cascade profiles keyed by profile_id."""
+        return self.registry.profiles
+
+    def get_compiled_cascade(self, cascade_id: str) -> Optional[CompiledCascade]:
         """
-        Loads cascade definitions from the agent_cascade_definitions.mdc file.
-        Finds the first 'profiles:' YAML list and parses it.
+        Returns the compiled form of a cascade profile, or None if it is unknown.
+        Raises CascadeDefinitionError if the profile was rejected at load time.
         """
-        mdc_path = os.path.join(os.path.dirname(__file__), '../../.cursor/rules/agent_cascade_definitions.mdc')
-        mdc_path = os.path.abspath(mdc_path)
-        try:
-            with open(mdc_path, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
-            
-            in_profiles_block = False
-            yaml_str_to_parse = ""
-            
-            for line in lines:
-                stripped_line = line.strip()
-                if stripped_line == "profiles:":
-                    in_profiles_block = True
-                    yaml_str_to_parse = "profiles:\n" # Start of the YAML doc
-                    continue
-                
-                if in_profiles_block:
-                    # If line is part of the profiles list (starts with space then dash, or just dash if it's the first line of a profile)
-                    if line.startswith('  -') or (yaml_str_to_parse.endswith('profiles:\n') and line.startswith('-')):
-                        yaml_str_to_parse += line
-                    # If it's an indented line (part of a multi-line value)
-                    elif line.startswith('    ') or line.startswith('  '): # Allow for different indent levels
-                        if not yaml_str_to_parse.endswith('\n'): # Ensure previous line ended with newline for correct YAML
-                             yaml_str_to_parse += '\n' 
-                        yaml_str_to_parse += line
-                    # If line is empty or a comment within the block, keep it if it helps structure
-                    elif not stripped_line or stripped_line.startswith('#'):
-                        yaml_str_to_parse += line 
-                    # If it is not part of the YAML list, the block ends
-                    else:
-                        in_profiles_block = False
-                        break # Stop processing lines for this block
-            
-            if not yaml_str_to_parse or yaml_str_to_parse == "profiles:\n":
-                logger.error("CascadeExecutor: No 'profiles:' YAML content found or block is empty.")
-                return
-
-            data = yaml.safe_load(yaml_str_to_parse)
-            if isinstance(data, dict) and 'profiles' in data:
-                for profile in data['profiles']:
-                    pid = profile.get('profile_id')
-                    if pid:
-                        self.cascades[pid] = profile
-                logger.info(f"CascadeExecutor: Loaded {len(self.cascades)} cascade profiles.")
-            else:
-                logger.error(f"CascadeExecutor: Parsed YAML from MDC does not contain a 'profiles' list or is not a dict. Parsed data: {data}")
-        except yaml.YAMLError as ye:
-            logger.error(f"CascadeExecutor: YAML parsing error in cascade definitions: {ye}\nContent attempted to parse:\n{yaml_str_to_parse}", exc_info=True)    
-        except Exception as e:
-            logger.error(f"CascadeExecutor: Failed to load cascade definitions: {e}", exc_info=True)
+        compiled = self.registry.get(cascade_id)
+        if compiled is None and cascade_id in self.registry.errors:
+            raise CascadeDefinitionError(self.registry.errors[cascade_id])
+        return compiled
 
     def trigger_cascade(self, cascade_id: str, initial_data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Triggers execution of a cascade by ID.
+        Synchronous wrapper around trigger_cascade_async; safe to call from inside a running loop.
         Args:
             cascade_id: The identifier of the cascade to execute.
             initial_data: Optional initial data/context for the cascade.
         Returns:
             Dict with execution result/status.
         """
+        coro = self.trigger_cascade_async(cascade_id, initial_data)
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(coro)
+        # Called from within an event loop: run the cascade on its own loop in a worker thread
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as pool:
+            return pool.submit(asyncio.run, coro).result()
+
+    async def trigger_cascade_async(self, cascade_id: str, initial_data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Executes a cascade and returns once every runnable step has finished.
+        Returns:
+            Dict with execution result/status; step_results holds each step's output.
+        """
         logger.info(f"CascadeExecutor: Triggering cascade '{cascade_id}' with initial_data: {initial_data}")
-        profile = self.cascades.get(cascade_id)
-        if not profile:
+        try:
+            compiled = self.get_compiled_cascade(cascade_id)
+        except CascadeDefinitionError as e:
+            logger.error(f"CascadeExecutor: Cascade profile '{cascade_id}' is invalid: {e}")
+            return {"status": "error", "message": str(e)}
+        if not compiled:
             logger.error(f"CascadeExecutor: Cascade profile '{cascade_id}' not found.")
             return {"status": "error", "message": f"Cascade profile '{cascade_id}' not found."}
-        agent_sequence = profile.get('agent_sequence', [])
+
         step_results = {"initial_data": initial_data or {}}
-        for idx, step in enumerate(agent_sequence):
-            step_name = step.get('name', f'step_{idx+1}')
-            agent_id = step.get('agent') or step.get('agent_id')
-            task_data = step.get('task_data') or step.get('input_mapping') or {}
-            # Render Jinja-style variables (very basic: only initial_data and previous step outputs)
-            # For demo, just replace {{ step_results.initial_data.* }} and {{ step_results.step_X_output.* }}
-            rendered_task_data = {}
-            for k, v in task_data.items():
-                if isinstance(v, str):
-                    val = v
-                    # Replace {{ step_results.initial_data.* }}
-                    if '{{ step_results.initial_data.' in val:
-                        for key in (initial_data or {}):
-                            val = val.replace(f'{{{{ step_results.initial_data.{key} }}}}', str((initial_data or {}).get(key, '')))
-                    # Replace {{ step_results.step_X_output.* }}
-                    for prev_idx in range(1, idx+1):
-                        prev_key = f'step_{prev_idx}_output'
-                        if prev_key in step_results:
-                            for outk, outv in step_results[prev_key].items():
-                                val = val.replace(f'{{{{ step_results.{prev_key}.{outk} }}}}', str(outv))
-                    rendered_task_data[k] = val
-                else:
-                    rendered_task_data[k] = v
-            # Call agent via VMC
-            if not agent_id:
-                logger.error(f"CascadeExecutor: Step {step_name} missing agent_id.")
-                step_results[f'{step_name}_output'] = {"status": "error", "message": "Missing agent_id"}
-                break
-            logger.info(f"CascadeExecutor: Executing step '{step_name}' with agent '{agent_id}' and data {rendered_task_data}")
-            result = self.vmc.execute_agent_task_sync(agent_id, "cascade_step", rendered_task_data)
-            step_results[f'{step_name}_output'] = result
-            if result.get('status') != 'success':
-                logger.error(f"CascadeExecutor: Step '{step_name}' failed: {result}")
-                if step.get('on_failure', '').upper() == 'LOG_AND_HALT':
-                    break
+        async for step_name, result in self._execute(compiled, step_results):
+            pass
         logger.info(f"CascadeExecutor: Cascade '{cascade_id}' completed. Step results: {step_results}")
-        return {"status": "success", "cascade_id": cascade_id, "step_results": step_results} 
\ No newline at end of file
+        return {"status": "success", "cascade_id": cascade_id, "step_results": step_results}
+
+    async def stream_cascade(self, cascade_id: str, initial_data: Optional[Dict[str, Any]] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Executes a cascade, yielding {"step": name, "output": result} as each step completes.
+        Raises KeyError for unknown profiles and CascadeDefinitionError for invalid ones.
+        """
+        compiled = self.get_compiled_cascade(cascade_id)
+        if not compiled:
+            raise KeyError(f"Cascade profile '{cascade_id}' not found.")
+        step_results = {"initial_data": initial_data or {}}
+        async for step_name, result in self._execute(compiled, step_results):
+            yield {"step": step_name, "output": result}
+
+    async def _execute(self, compiled: CompiledCascade, step_results: Dict[str, Any]) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Schedules steps as their dependencies complete. Ready steps start in declaration
+        order, at most `max_concurrency` at a time. A failing LOG_AND_HALT step (or a step
+        without an agent) stops new steps from starting; steps already running finish.
+        """
+        steps = {step.name: step for step in compiled.steps}
+        waiting_on = {step.name: len(step.depends_on) for step in compiled.steps}
+        ready = [(step.index, step.name) for step in compiled.steps if not step.depends_on]
+        heapq.heapify(ready)
+        running = {}  # type: Dict[asyncio.Task, str]
+        limit = max(1, compiled.max_concurrency or self.max_concurrency)
+        halted = False
+
+        try:
+            while ready or running:
+                while ready and not halted and len(running) < limit:
+                    _, name = heapq.heappop(ready)
+                    step = steps[name]
+                    if not step.agent_id:
+                        logger.error(f"CascadeExecutor: Step {name} missing agent_id.")
+                        step_results[f'{name}_output'] = {"status": "error", "message": "Missing agent_id"}
+                        halted = True
+                        yield name, step_results[f'{name}_output']
+                        break
+                    task_data = step.render(step_results, compiled.aliases)
+                    running[asyncio.create_task(self._run_step(step, task_data))] = name
+                if not running:
+                    break
+
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in sorted(done, key=lambda t: steps[running[t]].index):
+                    name = running.pop(task)
+                    step = steps[name]
+                    result = task.result()
+                    step_results[f'{name}_output'] = result
+                    if result.get('status') != 'success':
+                        logger.error(f"CascadeExecutor: Step '{name}' failed: {result}")
+                        if step.on_failure == 'LOG_AND_HALT':
+                            halted = True
+                    for child in compiled.dependents[name]:
+                        waiting_on[child] -= 1
+                        if waiting_on[child] == 0:
+                            heapq.heappush(ready, (steps[child].index, child))
+                    yield name, result
+        finally:
+            for task in running:
+                task.cancel()
+
+    async def _run_step(self, step: CompiledStep, task_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Runs one step with its timeout and retry policy; never raises.
+        A timeout cannot stop the worker thread, so a timed-out attempt may
+        still be running: it is not retried, which would run the step twice
+        concurrently.
+        """
+        logger.info(f"CascadeExecutor: Executing step '{step.name}' with agent '{step.agent_id}' and data {task_data}")
+        result: Dict[str, Any] = {}
+        for attempt in range(step.retries + 1):
+            if attempt:
+                await asyncio.sleep(step.retry_delay_seconds * (2 ** (attempt - 1)))
+                logger.info(f"CascadeExecutor: Retrying step '{step.name}' (attempt {attempt + 1}/{step.retries + 1})")
+            try:
+                result = await asyncio.wait_for(
+                    asyncio.to_thread(self.vmc.execute_agent_task_sync, step.agent_id, "cascade_step", task_data),
+                    timeout=step.timeout_seconds
+                )
+            except asyncio.TimeoutError:
+                result = {"status": "error", "message": f"Step '{step.name}' timed out after {step.timeout_seconds}s"}
+                if attempt < step.retries:
+                    logger.warning(f"CascadeExecutor: Not retrying step '{step.name}': the timed-out attempt may still be running")
+                break
+            except Exception as e:
+                result = {"status": "error", "message": str(e)}
+            if result.get('status') == 'success':
+                break
+        return result
@@ -0,0 +1,298 @@
+"""
+Cascade Profile Registry
+========================
+
+Process-wide cache of compiled cascade profiles loaded from
+agent_cascade_definitions.mdc. The file is parsed once per process; later
+refreshes re-read it only when its mtime/size change, and re-parse and
+recompile only the profiles whose text changed. Profiles are validated at load time so
+CascadeExecutor.trigger_cascade never parses anything.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+import yaml
+
+from .cascade_executor import CascadeDefinitionError, CompiledCascade, compile_cascade_profile
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CASCADE_DEFINITIONS_PATH = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), '../../.cursor/rules/agent_cascade_definitions.mdc')
+)
+
+
+def extract_profiles_yaml(lines: List[str]) -> str:
+    """
+    Finds the first 'profiles:' block in an MDC file and returns it as a YAML document.
+    Returns an empty string if no block is present.
+    """
+    in_profiles_block = False
+    yaml_str_to_parse = ""
+
+    for line in lines:
+        stripped_line = line.strip()
+        if stripped_line == "profiles:":
+            in_profiles_block = True
+            yaml_str_to_parse = "profiles:\n"  # Start of the YAML doc
+            continue
+
+        if in_profiles_block:
+            # If line is part of the profiles list (starts with space then dash, or just dash if it's the first line of a profile)
+            if line.startswith('  -') or (yaml_str_to_parse.endswith('profiles:\n') and line.startswith('-')):
+                yaml_str_to_parse += line
+            # If it's an indented line (part of a multi-line value)
+            elif line.startswith('    ') or line.startswith('  '):  # Allow for different indent levels
+                if not yaml_str_to_parse.endswith('\n'):  # Ensure previous line ended with newline for correct YAML
+                    yaml_str_to_parse += '\n'
+                yaml_str_to_parse += line
+            # If line is empty or a comment within the block, keep it if it helps structure
+            elif not stripped_line or stripped_line.startswith('#'):
+                yaml_str_to_parse += line
+            # If it is not part of the YAML list, the block ends
+            else:
+                break
+
+    if yaml_str_to_parse == "profiles:\n":
+        return ""
+    return yaml_str_to_parse
+
+
+_YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+
+def split_profile_chunks(yaml_str: str) -> List[str]:
+    """
+    Splits an extracted 'profiles:' document into one text chunk per list item,
+    so each profile can be hashed and parsed on its own.
+    """
+    chunks = []  # type: List[List[str]]
+    item_indent = None
+    for line in yaml_str.splitlines(keepends=True)[1:]:
+        stripped = line.lstrip(' ')
+        indent = len(line) - len(stripped)
+        if stripped.startswith('-') and (item_indent is None or indent == item_indent):
+            item_indent = indent
+            chunks.append([])
+        if chunks:
+            chunks[-1].append(line)
+    return [''.join(chunk) for chunk in chunks]
+
+
+def _profile_digest(profile: Dict[str, Any]) -> str:
+    canonical = json.dumps(profile, sort_keys=True, default=str)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+class CascadeProfileRegistry:
+    """
+    Holds raw and compiled cascade profiles for one definitions file.
+
+    Compiled profiles are cached by profile digest, so a reload that leaves a
+    profile untouched reuses its compiled form. Invalid profiles are logged and
+    recorded in `errors` rather than loaded.
+    """
+
+    def __init__(self, path: Optional[str] = None, poll_interval: float = 2.0):
+        self.path = os.path.abspath(path) if path else None
+        self.poll_interval = poll_interval
+        self.profiles = {}  # type: Dict[str, Dict[str, Any]]
+        self.compiled = {}  # type: Dict[str, CompiledCascade]
+        self.errors = {}  # type: Dict[str, str]
+        self.file_digest = None  # type: Optional[str]
+        self.reload_count = 0
+
+        self._profile_digests = {}  # type: Dict[str, str]
+        self._chunk_cache = {}  # type: Dict[str, Optional[Dict[str, Any]]]
+        self._file_signature = None  # type: Optional[tuple]  # (st_mtime_ns, st_size)
+        self._last_poll = 0.0
+        self._lock = threading.RLock()
+        self._observer = None
+
+        if self.path:
+            self.refresh(force=True)
+
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
+
+    def refresh(self, force: bool = False) -> bool:
+        """
+        Reloads the definitions file if it changed on disk.
+        Returns True if any profile was added, changed or removed.
+        """
+        if not self.path:
+            return False
+        with self._lock:
+            self._last_poll = time.monotonic()
+            try:
+                stat = os.stat(self.path)
+            except OSError as e:
+                logger.error(f"CascadeProfileRegistry: Cannot stat cascade definitions '{self.path}': {e}")
+                return False
+
+            signature = (stat.st_mtime_ns, stat.st_size)
+            if not force and signature == self._file_signature:
+                return False
+            self._file_signature = signature
+
+            try:
+                with open(self.path, 'rb') as f:
+                    raw = f.read()
+            except OSError as e:
+                logger.error(f"CascadeProfileRegistry: Failed to read cascade definitions: {e}")
+                return False
+
+            file_digest = hashlib.sha256(raw).hexdigest()
+            if file_digest == self.file_digest:
+                return False
+            self.file_digest = file_digest
+
+            yaml_str_to_parse = extract_profiles_yaml(raw.decode('utf-8').splitlines(keepends=True))
+            if not yaml_str_to_parse:
+                logger.error("CascadeProfileRegistry: No 'profiles:' YAML content found or block is empty.")
+                return self.load_profiles([])
+
+            # Parse each profile's text separately, reusing chunks seen before
+            profiles = []
+            chunk_cache = {}
+            for chunk in split_profile_chunks(yaml_str_to_parse):
+                chunk_digest = hashlib.sha256(chunk.encode('utf-8')).hexdigest()
+                if chunk_digest in self._chunk_cache:
+                    profile = self._chunk_cache[chunk_digest]
+                else:
+                    try:
+                        data = yaml.load("profiles:\n" + chunk, Loader=_YAML_LOADER)
+                        items = data.get('profiles') if isinstance(data, dict) else None
+                        profile = items[0] if isinstance(items, list) and items else None
+                    except yaml.YAMLError as ye:
+                        logger.error(f"CascadeProfileRegistry: YAML parsing error in cascade definitions: {ye}")
+                        profile = None
+                chunk_cache[chunk_digest] = profile
+                if isinstance(profile, dict):
+                    profiles.append(profile)
+            self._chunk_cache = chunk_cache
+
+            return self.load_profiles(profiles)
+
+    def load_profiles(self, profiles: List[Dict[str, Any]]) -> bool:
+        """
+        Replaces the registry contents with `profiles`, compiling only those whose
+        digest changed. Returns True if anything changed.
+        """
+        with self._lock:
+            new_profiles = {}
+            new_compiled = {}
+            new_digests = {}
+            new_errors = {}
+            recompiled = 0
+
+            for profile in profiles:
+                pid = profile.get('profile_id') if isinstance(profile, dict) else None
+                if not pid:
+                    continue
+                digest = _profile_digest(profile)
+                if self._profile_digests.get(pid) == digest and pid in self.compiled:
+                    new_compiled[pid] = self.compiled[pid]
+                else:
+                    try:
+                        new_compiled[pid] = compile_cascade_profile(profile)
+                        recompiled += 1
+                    except CascadeDefinitionError as e:
+                        logger.error(f"CascadeProfileRegistry: Rejecting invalid cascade profile '{pid}': {e}")
+                        new_errors[pid] = str(e)
+                        continue
+                new_profiles[pid] = profile
+                new_digests[pid] = digest
+
+            changed = (
+                recompiled > 0
+                or set(new_profiles) != set(self.profiles)
+                or set(new_errors) != set(self.errors)
+            )
+            self.profiles = new_profiles
+            self.compiled = new_compiled
+            self._profile_digests = new_digests
+            self.errors = new_errors
+            if changed:
+                self.reload_count += 1
+            logger.info(
+                f"CascadeProfileRegistry: Loaded {len(self.profiles)} cascade profiles "
+                f"({recompiled} compiled, {len(self.errors)} rejected)."
+            )
+            return changed
+
+    def maybe_refresh(self) -> bool:
+        """Polls the definitions file at most once per poll_interval."""
+        if self._observer is not None or not self.path:
+            return False
+        if time.monotonic() - self._last_poll < self.poll_interval:
+            return False
+        return self.refresh()
+
+    # ------------------------------------------------------------------
+    # Lookup
+    # ------------------------------------------------------------------
+
+    def get(self, profile_id: str) -> Optional[CompiledCascade]:
+        """Returns the compiled profile, refreshing from disk if the poll interval elapsed."""
+        self.maybe_refresh()
+        return self.compiled.get(profile_id)
+
+    def get_profile(self, profile_id: str) -> Optional[Dict[str, Any]]:
+        return self.profiles.get(profile_id)
+
+    # ------------------------------------------------------------------
+    # Watchdog hook
+    # ------------------------------------------------------------------
+
+    def start_watching(self) -> None:
+        """
+        Reloads on filesystem events instead of polling. Uses watchdog; while the
+        observer runs, maybe_refresh() becomes a no-op.
+        """
+        if not self.path or self._observer is not None:
+            return
+        from watchdog.events import FileSystemEventHandler
+        from watchdog.observers import Observer
+
+        registry = self
+
+        class _DefinitionsChanged(FileSystemEventHandler):
+            def on_any_event(self, event):
+                if os.path.abspath(getattr(event, 'dest_path', '') or event.src_path) == registry.path:
+                    registry.refresh()
+
+        observer = Observer()
+        observer.schedule(_DefinitionsChanged(), os.path.dirname(self.path), recursive=False)
+        observer.daemon = True
+        observer.start()
+        self._observer = observer
+        logger.info(f"CascadeProfileRegistry: Watching {self.path} for changes.")
+
+    def stop_watching(self) -> None:
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join(timeout=2)
+            self._observer = None
+
+
+_REGISTRIES = {}  # type: Dict[str, CascadeProfileRegistry]
+_REGISTRIES_LOCK = threading.Lock()
+
+
+def get_cascade_profile_registry(path: Optional[str] = None) -> CascadeProfileRegistry:
+    """Returns the process-wide registry for a definitions file, creating it on first use."""
+    resolved = os.path.abspath(path or DEFAULT_CASCADE_DEFINITIONS_PATH)
+    with _REGISTRIES_LOCK:
+        registry = _REGISTRIES.get(resolved)
+        if registry is None:
+            registry = CascadeProfileRegistry(resolved)
+            _REGISTRIES[resolved] = registry
+        return registry
@@ -64,6 +64,9 @@ class ComponentRegistry:
         self.tools_map: Dict[str, str] = {}  # tool_name -> agent_id
         self.protocol_agents: Dict[ProtocolType, Set[str]] = defaultdict(set)
         
+        # Bumped on every (un)registration so consumers can invalidate caches
+        self.version = 0
+        
         # Performance metrics
         self.registration_count = 0
         self.lookup_count = 0
@@ -145,6 +148,7 @@ class ComponentRegistry:
                     self.protocol_agents[protocol].add(agent_id)
                 
                 self.registration_count += 1
+                self.version += 1
                 
                 self.logger.info(
                     f"✅ Registered agent '{agent_id}' with {len(capabilities)} capabilities, "
@@ -187,6 +191,7 @@ class ComponentRegistry:
                 
                 # Remove registration
                 del self.agents[agent_id]
+                self.version += 1
                 
                 self.logger.info(f"✅ Unregistered agent '{agent_id}'")
                 return True
@@ -288,6 +293,12 @@ class ComponentRegistry:
                     healthy_agents.append(agent_id)
             return healthy_agents
     
+    async def is_agent_healthy(self, agent_id: str, heartbeat_timeout: float = 60.0) -> bool:
+        """O(1) health check for a single agent"""
+        with self._lock:
+            registration = self.agents.get(agent_id)
+            return registration is not None and registration.is_healthy(heartbeat_timeout)
+    
     async def get_agent_health(self, agent_id: str) -> Optional[AgentHealthStatus]:
         """Get health status for specific agent"""
         with self._lock:
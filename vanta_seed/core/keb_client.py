@@ -64,6 +64,39 @@ class KEBClient:
             logger.error(f"Failed to publish event to stream '{stream_name}': {e}")
             return None
 
+    def publish_many(self, stream_name: str, events: List[Dict[str, Any]]) -> List[Optional[str]]:
+        """
+        Publishes several events to a stream in a single Redis round trip.
+
+        Uses a non-transactional pipeline so a burst of events costs one network
+        exchange instead of one XADD round trip per event.
+
+        Args:
+            stream_name: The name of the Redis Stream.
+            events: Event payloads, published in order.
+
+        Returns:
+            The logical event IDs, in the same order as `events`. Entries are None
+            if the batch could not be published.
+        """
+        if not events:
+            return []
+        if not self.redis_client:
+            logger.error("Cannot publish events: Redis client not connected.")
+            return [None] * len(events)
+
+        try:
+            event_ids = [str(uuid.uuid4()) for _ in events]
+            pipe = self.redis_client.pipeline(transaction=False)
+            for event_id, event_data in zip(event_ids, events):
+                pipe.xadd(stream_name, {'_event_id': event_id, 'data': json.dumps(event_data)}, id='*')
+            pipe.execute()
+            logger.debug(f"Published {len(events)} events to stream '{stream_name}' in one pipeline")
+            return event_ids
+        except Exception as e:
+            logger.error(f"Failed to publish batch to stream '{stream_name}': {e}")
+            return [None] * len(events)
+
     def create_consumer_group(self, stream_name: str, group_name: str, start_id: str = '0') -> bool:
         """
         Creates a new consumer group for a given stream.
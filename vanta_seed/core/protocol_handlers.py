@@ -12,29 +12,152 @@ Compliance: COM-001, COM-002, COM-003
 import asyncio
 import logging
 import time
-from typing import Dict, List, Any, Optional, Union
-from dataclasses import asdict
+from typing import Dict, List, Any, Optional, Union, Callable, Set
+from dataclasses import asdict, dataclass
 
 from ..protocols.message_types import (
     ProtocolType, AgentMessage, MCPRequest, MCPResponse, A2AMessage,
-    CrossProtocolRequest, MessageType, UAPError, ProtocolError
+    CrossProtocolRequest, MessageType, UAPError, ProtocolError, MCPToolDefinition
 )
 from .component_registry import COMPONENT_REGISTRY
 
 
+_PARAMETER_TYPES = {
+    "string": str,
+    "number": (int, float),
+    "integer": int,
+    "boolean": bool,
+    "array": list,
+    "object": dict
+}
+
+
+def _compile_parameter_validator(tool_format: Dict[str, Any]) -> Callable[[Dict[str, Any]], List[str]]:
+    """
+    Compile a tool's parameter schema into a validator closure.
+    
+    The schema is walked once here; the returned function only checks the
+    parameters it is given against precomputed tuples.
+    """
+    tool_params = tool_format.get("parameters") or {}
+    required = tuple(tool_params.get("required", []))
+    typed = tuple(
+        (name, _PARAMETER_TYPES[spec["type"]])
+        for name, spec in (tool_params.get("properties") or {}).items()
+        if isinstance(spec, dict) and spec.get("type") in _PARAMETER_TYPES
+    )
+    
+    def validate(parameters: Dict[str, Any]) -> List[str]:
+        errors = [f"Missing required parameter: {param}" for param in required if param not in parameters]
+        for param_name, expected_type in typed:
+            if param_name in parameters and not isinstance(parameters[param_name], expected_type):
+                errors.append(f"Parameter '{param_name}' has incorrect type")
+        return errors
+    
+    return validate
+
+
+@dataclass
+class IndexedTool:
+    """Tool definition with its cached MCP format and compiled validator"""
+    definition: MCPToolDefinition
+    mcp_format: Dict[str, Any]
+    validate: Callable[[Dict[str, Any]], List[str]]
+
+
 class MCPHandler:
     """
     Model Control Protocol handler.
     
-    Handles MCP tool registration, discovery, and execution.
+    Handles MCP tool registration, discovery, and execution. When a transport
+    (UnifiedCommunicationLayer) is attached, tool calls are dispatched to the
+    providing agent over the KEB and matched to responses by correlation id;
+    sends issued in the same event-loop tick are pipelined into one batch.
+    
     Compliance: COM-002 - MCP Tool Integration
     """
     
-    def __init__(self):
+    def __init__(
+        self,
+        handler_id: str = "MCPHandler",
+        max_concurrency_per_tool: int = 8,
+        request_timeout: float = 30.0
+    ):
         self.logger = logging.getLogger("UAP.MCPHandler")
         self._tool_cache: Dict[str, str] = {}  # tool_name -> agent_id
-        self._last_cache_update = 0
-        self._cache_ttl = 60  # seconds
+        
+        # Tool index keyed by name, rebuilt when the registry version changes
+        self._tool_index: Dict[str, IndexedTool] = {}
+        self._index_version = -1
+        
+        # Transport dispatch state (see attach_transport)
+        self.transport: Optional[Any] = None
+        self.handler_id = handler_id
+        self.request_timeout = request_timeout
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._outbox: List[Any] = []
+        self._flush_scheduled = False
+        self._send_tasks: Set[asyncio.Task] = set()
+        
+        # Per-tool concurrency limits
+        self.max_concurrency_per_tool = max_concurrency_per_tool
+        self._tool_concurrency: Dict[str, int] = {}
+        self._tool_semaphores: Dict[str, asyncio.Semaphore] = {}
+    
+    async def attach_transport(self, transport: Any) -> None:
+        """
+        Attach a UnifiedCommunicationLayer used to dispatch tool calls.
+        
+        Registers the handler as a routable agent so responses can reach it.
+        """
+        self.transport = transport
+        await transport.register_agent(
+            agent_id=self.handler_id,
+            agent_type="MCPHandler",
+            capabilities=["mcp_dispatch"],
+            language="python"
+        )
+        transport.register_message_handler(self.handler_id, self._handle_transport_message)
+    
+    async def serve_agent(self, agent: Any) -> None:
+        """
+        Expose a UAP agent's MCP tools over the attached transport.
+        
+        Incoming requests are handed to `agent.handle_message` and the reply is
+        sent back to the caller under the request's correlation id.
+        """
+        if self.transport is None:
+            raise UAPError("No transport attached to MCPHandler")
+        
+        from agent_core.unified_communication import UnifiedMessage, MessageType as TransportMessageType
+        
+        transport = self.transport
+        
+        async def handle_request(message: Any) -> None:
+            if message.message_type != TransportMessageType.AGENT_REQUEST:
+                return
+            request = AgentMessage.from_dict(dict(message.payload))
+            reply = await agent.handle_message(request)
+            await transport.send_message(UnifiedMessage(
+                message_type=TransportMessageType.AGENT_RESPONSE,
+                source_agent=agent.agent_id,
+                target_agent=message.source_agent,
+                payload=reply.to_dict() if reply else {},
+                correlation_id=message.correlation_id
+            ))
+        
+        await transport.register_agent(
+            agent_id=agent.agent_id,
+            agent_type=type(agent).__name__,
+            capabilities=agent.get_capabilities(),
+            language="python"
+        )
+        transport.register_message_handler(agent.agent_id, handle_request)
+    
+    def set_tool_concurrency(self, tool_name: str, limit: int) -> None:
+        """Override the number of in-flight executions allowed for a tool"""
+        self._tool_concurrency[tool_name] = limit
+        self._tool_semaphores.pop(tool_name, None)
     
     async def register_tool(self, agent_id: str, tool_name: str) -> bool:
         """Register a tool with the MCP handler"""
@@ -57,21 +180,18 @@ class MCPHandler:
             List of tool definitions
         """
         try:
-            # Refresh tool cache if needed
-            await self._refresh_tool_cache()
-            
-            tools = await COMPONENT_REGISTRY.get_all_tools()
+            index = await self._get_tool_index()
             
             if capability_filter:
                 # Filter tools by capability
                 filtered_tools = []
-                for tool in tools:
-                    agent_registration = await COMPONENT_REGISTRY.get_agent_info(tool.agent_id)
+                for tool in index.values():
+                    agent_registration = await COMPONENT_REGISTRY.get_agent_info(tool.definition.agent_id)
                     if agent_registration and capability_filter in agent_registration.capabilities:
-                        filtered_tools.append(tool.to_mcp_format())
+                        filtered_tools.append(dict(tool.mcp_format))
                 return filtered_tools
             
-            return [tool.to_mcp_format() for tool in tools]
+            return [dict(tool.mcp_format) for tool in index.values()]
             
         except Exception as e:
             self.logger.error(f"❌ Error discovering tools: {e}")
@@ -97,58 +217,12 @@ class MCPHandler:
         start_time = time.time()
         
         try:
-            # Find agent that provides this tool
-            agent_id = await COMPONENT_REGISTRY.find_tool_agent(tool_name)
-            
-            if not agent_id:
-                return MCPResponse(
-                    success=False,
-                    errors=[f"Tool '{tool_name}' not found"],
-                    tool_name=tool_name,
-                    execution_time=time.time() - start_time
-                )
-            
-            # Validate agent is healthy
-            healthy_agents = await COMPONENT_REGISTRY.get_healthy_agents()
-            if agent_id not in healthy_agents:
-                return MCPResponse(
-                    success=False,
-                    errors=[f"Agent '{agent_id}' providing tool '{tool_name}' is not healthy"],
-                    tool_name=tool_name,
-                    execution_time=time.time() - start_time
-                )
-            
-            # Create MCP request message
-            message = AgentMessage(
-                agent_id=requesting_agent,
-                target_agent=agent_id,
-                action=tool_name,
-                parameters=parameters,
-                protocol=ProtocolType.MCP
-            )
+            prepared = await self._prepare_call(tool_name, parameters, requesting_agent, start_time)
+            if isinstance(prepared, MCPResponse):
+                return prepared
             
-            self.logger.info(f"🔧 Executing MCP tool '{tool_name}' on agent '{agent_id}'")
-            
-            # In a real implementation, this would route through a message bus
-            # For now, we'll simulate successful execution
-            execution_time = time.time() - start_time
-            
-            return MCPResponse(
-                success=True,
-                result={
-                    "tool": tool_name,
-                    "agent": agent_id,
-                    "status": "executed",
-                    "parameters": parameters
-                },
-                metadata={
-                    "requesting_agent": requesting_agent,
-                    "target_agent": agent_id
-                },
-                execution_time=execution_time,
-                agent_id=agent_id,
-                tool_name=tool_name
-            )
+            async with self._get_tool_semaphore(tool_name):
+                return await self._dispatch(prepared, start_time)
             
         except Exception as e:
             execution_time = time.time() - start_time
@@ -161,6 +235,27 @@ class MCPHandler:
                 execution_time=execution_time
             )
     
+    async def execute_tools(
+        self,
+        calls: List[Dict[str, Any]],
+        requesting_agent: str = "unknown"
+    ) -> List[MCPResponse]:
+        """
+        Execute a batch of MCP tools concurrently.
+        
+        Each call is a dict with `tool_name` and optional `parameters`. Requests
+        that clear their tool's concurrency limit together are published in a
+        single pipelined round trip. Responses are returned in call order.
+        """
+        return list(await asyncio.gather(*[
+            self.execute_tool(
+                call["tool_name"],
+                call.get("parameters", {}),
+                requesting_agent=call.get("requesting_agent", requesting_agent)
+            )
+            for call in calls
+        ]))
+    
     async def validate_tool_parameters(
         self,
         tool_name: str,
@@ -172,35 +267,18 @@ class MCPHandler:
         Compliance: TOOL-002 - Tool Parameter Validation
         """
         try:
-            tools = await self.discover_tools()
-            tool_def = next((t for t in tools if t["name"] == tool_name), None)
+            index = await self._get_tool_index()
+            tool = index.get(tool_name)
             
-            if not tool_def:
+            if not tool:
                 return {"valid": False, "errors": [f"Tool '{tool_name}' not found"]}
             
-            # Basic parameter validation
-            tool_params = tool_def.get("parameters", {})
-            required_params = tool_params.get("required", [])
-            
-            errors = []
-            
-            # Check required parameters
-            for param in required_params:
-                if param not in parameters:
-                    errors.append(f"Missing required parameter: {param}")
-            
-            # Check parameter types (basic validation)
-            param_properties = tool_params.get("properties", {})
-            for param_name, param_value in parameters.items():
-                if param_name in param_properties:
-                    expected_type = param_properties[param_name].get("type")
-                    if expected_type and not self._validate_parameter_type(param_value, expected_type):
-                        errors.append(f"Parameter '{param_name}' has incorrect type")
+            errors = tool.validate(parameters)
             
             return {
                 "valid": len(errors) == 0,
                 "errors": errors,
-                "tool_definition": tool_def
+                "tool_definition": tool.mcp_format
             }
             
         except Exception as e:
@@ -211,31 +289,220 @@ class MCPHandler:
     
     def _validate_parameter_type(self, value: Any, expected_type: str) -> bool:
         """Basic type validation helper"""
-        type_map = {
-            "string": str,
-            "number": (int, float),
-            "integer": int,
-            "boolean": bool,
-            "array": list,
-            "object": dict
-        }
-        
-        expected_python_type = type_map.get(expected_type)
+        expected_python_type = _PARAMETER_TYPES.get(expected_type)
         if expected_python_type:
             return isinstance(value, expected_python_type)
         
         return True  # Unknown type, pass validation
     
-    async def _refresh_tool_cache(self):
-        """Refresh the tool cache from registry"""
-        current_time = time.time()
-        if current_time - self._last_cache_update > self._cache_ttl:
-            try:
-                tools = await COMPONENT_REGISTRY.get_all_tools()
-                self._tool_cache = {tool.name: tool.agent_id for tool in tools}
-                self._last_cache_update = current_time
-            except Exception as e:
-                self.logger.error(f"❌ Error refreshing tool cache: {e}")
+    async def _get_tool_index(self) -> Dict[str, IndexedTool]:
+        """Return the name-keyed tool index, rebuilding it if the registry changed"""
+        registry_version = COMPONENT_REGISTRY.version
+        if registry_version != self._index_version:
+            tools = await COMPONENT_REGISTRY.get_all_tools()
+            index = {}
+            for tool in tools:
+                mcp_format = tool.to_mcp_format()
+                index[tool.name] = IndexedTool(
+                    definition=tool,
+                    mcp_format=mcp_format,
+                    validate=_compile_parameter_validator(mcp_format)
+                )
+            self._tool_index = index
+            self._tool_cache.update({tool.name: tool.agent_id for tool in tools})
+            self._index_version = registry_version
+        return self._tool_index
+    
+    def _get_tool_semaphore(self, tool_name: str) -> asyncio.Semaphore:
+        """Lazily create the semaphore bounding in-flight calls for a tool"""
+        semaphore = self._tool_semaphores.get(tool_name)
+        if semaphore is None:
+            limit = self._tool_concurrency.get(tool_name, self.max_concurrency_per_tool)
+            semaphore = asyncio.Semaphore(limit)
+            self._tool_semaphores[tool_name] = semaphore
+        return semaphore
+    
+    async def _prepare_call(
+        self,
+        tool_name: str,
+        parameters: Dict[str, Any],
+        requesting_agent: str,
+        start_time: float
+    ) -> Union[AgentMessage, MCPResponse]:
+        """Resolve, health-check and validate a call; returns an error response on failure"""
+        # Find agent that provides this tool
+        agent_id = await COMPONENT_REGISTRY.find_tool_agent(tool_name)
+        
+        if not agent_id:
+            return MCPResponse(
+                success=False,
+                errors=[f"Tool '{tool_name}' not found"],
+                tool_name=tool_name,
+                execution_time=time.time() - start_time
+            )
+        
+        # Validate agent is healthy
+        if not await COMPONENT_REGISTRY.is_agent_healthy(agent_id):
+            return MCPResponse(
+                success=False,
+                errors=[f"Agent '{agent_id}' providing tool '{tool_name}' is not healthy"],
+                tool_name=tool_name,
+                execution_time=time.time() - start_time
+            )
+        
+        index = await self._get_tool_index()
+        tool = index.get(tool_name)
+        if tool:
+            errors = tool.validate(parameters)
+            if errors:
+                return MCPResponse(
+                    success=False,
+                    errors=errors,
+                    tool_name=tool_name,
+                    agent_id=agent_id,
+                    execution_time=time.time() - start_time
+                )
+        
+        # Create MCP request message
+        return AgentMessage(
+            agent_id=requesting_agent,
+            target_agent=agent_id,
+            action=tool_name,
+            parameters=parameters,
+            protocol=ProtocolType.MCP
+        )
+    
+    async def _dispatch(self, message: AgentMessage, start_time: float) -> MCPResponse:
+        """Send a prepared request to its agent and wait for the correlated response"""
+        tool_name = message.action
+        agent_id = message.target_agent
+        
+        self.logger.info(f"🔧 Executing MCP tool '{tool_name}' on agent '{agent_id}'")
+        
+        if self.transport is None:
+            # Without a transport there is no bus to route over; acknowledge locally
+            return MCPResponse(
+                success=True,
+                result={
+                    "tool": tool_name,
+                    "agent": agent_id,
+                    "status": "executed",
+                    "parameters": message.parameters
+                },
+                metadata={
+                    "requesting_agent": message.agent_id,
+                    "target_agent": agent_id
+                },
+                execution_time=time.time() - start_time,
+                agent_id=agent_id,
+                tool_name=tool_name
+            )
+        
+        from agent_core.unified_communication import UnifiedMessage, MessageType as TransportMessageType
+        
+        future = asyncio.get_running_loop().create_future()
+        self._pending[message.correlation_id] = future
+        try:
+            self._enqueue(UnifiedMessage(
+                message_type=TransportMessageType.AGENT_REQUEST,
+                source_agent=self.handler_id,
+                target_agent=agent_id,
+                payload=message.to_dict(),
+                correlation_id=message.correlation_id
+            ))
+            payload = await asyncio.wait_for(future, timeout=self.request_timeout)
+        except asyncio.TimeoutError:
+            return MCPResponse(
+                success=False,
+                errors=[f"Tool '{tool_name}' timed out after {self.request_timeout} seconds"],
+                tool_name=tool_name,
+                agent_id=agent_id,
+                execution_time=time.time() - start_time
+            )
+        finally:
+            self._pending.pop(message.correlation_id, None)
+        
+        return self._response_from_payload(payload, message, time.time() - start_time)
+    
+    def _response_from_payload(
+        self,
+        payload: Dict[str, Any],
+        request: AgentMessage,
+        execution_time: float
+    ) -> MCPResponse:
+        """Convert an agent's reply message into an MCPResponse"""
+        params = payload.get("parameters", {})
+        metadata = {
+            **params.get("metadata", {}),
+            "requesting_agent": request.agent_id,
+            "target_agent": request.target_agent
+        }
+        
+        if payload.get("message_type") == MessageType.ERROR.value:
+            return MCPResponse(
+                success=False,
+                errors=[params.get("error", "Unknown agent error")],
+                metadata=metadata,
+                execution_time=execution_time,
+                agent_id=request.target_agent,
+                tool_name=request.action
+            )
+        
+        return MCPResponse(
+            success=bool(params.get("success", False)),
+            result=params.get("result"),
+            metadata=metadata,
+            errors=params.get("errors"),
+            warnings=params.get("warnings"),
+            execution_time=execution_time,
+            agent_id=request.target_agent,
+            tool_name=request.action
+        )
+    
+    def _enqueue(self, message: Any) -> None:
+        """Queue a transport message; everything queued in one loop tick is sent together"""
+        self._outbox.append(message)
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            asyncio.get_running_loop().call_soon(self._flush_outbox)
+    
+    def _flush_outbox(self) -> None:
+        """Hand the queued messages to the transport as one batch"""
+        self._flush_scheduled = False
+        batch, self._outbox = self._outbox, []
+        if batch:
+            task = asyncio.ensure_future(self._send_batch(batch))
+            self._send_tasks.add(task)
+            task.add_done_callback(self._send_tasks.discard)
+    
+    async def _send_batch(self, batch: List[Any]) -> None:
+        """Publish a batch and fail the futures of any message that was not sent"""
+        try:
+            if len(batch) > 1 and hasattr(self.transport, "send_messages"):
+                results = await self.transport.send_messages(batch)
+            else:
+                results = [await self.transport.send_message(message) for message in batch]
+        except Exception as e:
+            self.logger.error(f"❌ Error publishing MCP batch: {e}")
+            results = [False] * len(batch)
+        
+        for message, sent in zip(batch, results):
+            if sent:
+                continue
+            future = self._pending.get(message.correlation_id)
+            if future and not future.done():
+                future.set_exception(
+                    ProtocolError(ProtocolType.MCP, f"Failed to deliver request to '{message.target_agent}'")
+                )
+    
+    async def _handle_transport_message(self, message: Any) -> None:
+        """Resolve the pending future matching a response's correlation id"""
+        future = self._pending.get(message.correlation_id)
+        if future is None:
+            self.logger.debug(f"Ignoring message with unknown correlation ID: {message.correlation_id}")
+            return
+        if not future.done():
+            future.set_result(message.payload)
 
 
 class A2AHandler:
@@ -1,6 +1,7 @@
 import logging
 from typing import Dict, Any, Optional, List
 import asyncio # Added for type hinting and potential future use
+import concurrent.futures
 import json # Added for parsing event data
 import uuid # Added for example usage
 from datetime import datetime # Added for example usage
@@ -46,6 +47,22 @@ class VantaMasterCore:
         else:
             logger.info("VantaMasterCore initialized and KEBClient connected.")
 
+        # Async dispatch settings (see dispatch_task_async)
+        dispatch_config = self.config.get('dispatch', {})
+        self.dispatch_max_workers = dispatch_config.get('max_workers', 16)
+        self.dispatch_max_process_workers = dispatch_config.get('max_process_workers')
+        self.default_agent_concurrency = dispatch_config.get('agent_concurrency', 4)
+        self.max_agent_queue_depth = dispatch_config.get('max_queue_depth', 100)
+        self.completion_batch_size = dispatch_config.get('completion_batch_size', 50)
+        self.completion_flush_interval_s = dispatch_config.get('completion_flush_interval_s', 0.05)
+        self._thread_pool: Optional[concurrent.futures.ThreadPoolExecutor] = None
+        self._process_pool: Optional[concurrent.futures.ProcessPoolExecutor] = None
+        self._agent_semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._agent_queue_depth: Dict[str, int] = {}
+        self._dispatch_tasks: set = set()
+        self._completion_buffer: List[Dict[str, Any]] = []
+        self._completion_flush_task: Optional[asyncio.Task] = None
+
         # Initialize CascadeExecutor
         self.cascade_executor = CascadeExecutor(self)
 
@@ -149,6 +166,8 @@ class VantaMasterCore:
         
         logger.info("VMC: Agent shutdown sequence completed")
         
+        await self._drain_async_dispatch()
+        
         if self.keb_client: self.keb_client.disconnect()
         logger.info("VantaMasterCore shutdown complete.")
 
@@ -235,8 +254,7 @@ class VantaMasterCore:
         self.keb_client.publish(stream_name="task_events", event_data=event_payload)
         logger.info(f"VMC: Published TaskAssignedEvent (TaskID: {task_id}, EventID: {event_payload['event_id']}) for agent {agent_id_assigned_to}.")
 
-    def publish_task_completion_event(self, task_id: str, source_agent_id_completed_by: str, status: str, duration_ms: int, result: Optional[Dict[str, Any]] = None, error_details: Optional[Dict[str, Any]] = None):
-        if not self.keb_client.redis_client: return
+    def _build_task_completion_event(self, task_id: str, source_agent_id_completed_by: str, status: str, duration_ms: int, result: Optional[Dict[str, Any]] = None, error_details: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         base_payload = {
             "event_id": str(uuid.uuid4()),
             "timestamp_iso": datetime.utcnow().isoformat() + "Z",
@@ -252,10 +270,152 @@ class VantaMasterCore:
             base_payload["error_details"] = error_details
         elif status in ["failure", "error"]: # Ensure error_details is present even if minimal
              base_payload["error_details"] = {"error_code": "UNKNOWN_ERROR", "message": "No specific error details provided."}
+        return base_payload
 
+    def publish_task_completion_event(self, task_id: str, source_agent_id_completed_by: str, status: str, duration_ms: int, result: Optional[Dict[str, Any]] = None, error_details: Optional[Dict[str, Any]] = None):
+        if not self.keb_client.redis_client: return
+        base_payload = self._build_task_completion_event(task_id, source_agent_id_completed_by, status, duration_ms, result, error_details)
         self.keb_client.publish(stream_name="task_events", event_data=base_payload)
         logger.info(f"VMC: Published TaskCompletionEvent (TaskID: {task_id}, EventID: {base_payload['event_id']}) with status '{status}'.")
 
+    # ------------------------------------------------------------------
+    # Async dispatch
+    # ------------------------------------------------------------------
+
+    def _get_thread_pool(self) -> concurrent.futures.ThreadPoolExecutor:
+        if self._thread_pool is None:
+            self._thread_pool = concurrent.futures.ThreadPoolExecutor(
+                max_workers=self.dispatch_max_workers, thread_name_prefix="vmc-dispatch"
+            )
+        return self._thread_pool
+
+    def _get_process_pool(self) -> concurrent.futures.ProcessPoolExecutor:
+        if self._process_pool is None:
+            self._process_pool = concurrent.futures.ProcessPoolExecutor(max_workers=self.dispatch_max_process_workers)
+        return self._process_pool
+
+    def _get_agent_semaphore(self, agent_id: str, agent: Any) -> asyncio.Semaphore:
+        semaphore = self._agent_semaphores.get(agent_id)
+        if semaphore is None:
+            limit = getattr(agent, "max_concurrency", None) or self.default_agent_concurrency
+            semaphore = asyncio.Semaphore(limit)
+            self._agent_semaphores[agent_id] = semaphore
+        return semaphore
+
+    async def _run_process_task(self, agent: Any, task_type: str, task_parameters: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Runs agent.process_task without blocking the event loop. Coroutine agents are awaited
+        directly; agents flagged `cpu_bound = True` run in the process pool (they must be
+        picklable); all others run in the bounded thread pool.
+        """
+        if asyncio.iscoroutinefunction(agent.process_task):
+            return await agent.process_task(task_type, task_parameters)
+        loop = asyncio.get_running_loop()
+        pool = self._get_process_pool() if getattr(agent, "cpu_bound", False) else self._get_thread_pool()
+        return await loop.run_in_executor(pool, agent.process_task, task_type, task_parameters)
+
+    async def dispatch_task_async(self, agent_id: str, task_type: str, task_parameters: Dict[str, Any], original_task_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Non-blocking counterpart of dispatch_task_to_agent.
+
+        Each agent has a concurrency limit (`agent.max_concurrency` or the
+        `dispatch.agent_concurrency` config value). Tasks beyond
+        `dispatch.max_queue_depth` waiting or running for one agent are rejected
+        rather than queued. Completion events are buffered and published in
+        batches.
+        """
+        current_task_id = original_task_id or str(uuid.uuid4())
+        start_time = datetime.utcnow()
+
+        agent = self.agents.get(agent_id)
+        if not agent:
+            err_msg = f"Agent {agent_id} not found. Cannot dispatch task '{task_type}'."
+            logger.error(err_msg)
+            return {"status": "error", "message": err_msg, "task_id": current_task_id}
+        if not hasattr(agent, "process_task"):
+            err_msg = f"Agent {agent_id} does not have a process_task method."
+            logger.error(err_msg)
+            return {"status": "error", "message": err_msg, "task_id": current_task_id}
+
+        depth = self._agent_queue_depth.get(agent_id, 0)
+        if depth >= self.max_agent_queue_depth:
+            err_msg = f"Agent {agent_id} queue is full ({depth} tasks pending). Task '{task_type}' rejected."
+            logger.warning(err_msg)
+            self._queue_completion_event(self._build_task_completion_event(
+                current_task_id, agent_id, "error", 0,
+                error_details={"error_code": "AGENT_QUEUE_FULL", "message": err_msg}
+            ))
+            return {"status": "error", "message": err_msg, "task_id": current_task_id}
+
+        self._agent_queue_depth[agent_id] = depth + 1
+        try:
+            async with self._get_agent_semaphore(agent_id, agent):
+                logger.info(f"Dispatching task '{task_type}' (ID: {current_task_id}) to agent {agent_id} (async).")
+                try:
+                    result = await self._run_process_task(agent, task_type, task_parameters)
+                except Exception as e:
+                    duration_ms = int((datetime.utcnow() - start_time).total_seconds() * 1000)
+                    logger.error(f"Error processing task '{task_type}' (ID: {current_task_id}) by agent {agent_id}: {e}", exc_info=True)
+                    self._queue_completion_event(self._build_task_completion_event(
+                        current_task_id, agent_id, "error", duration_ms,
+                        error_details={"error_code": "UNHANDLED_EXCEPTION", "message": str(e)}
+                    ))
+                    return {"status": "error", "message": str(e), "task_id": current_task_id}
+        finally:
+            self._agent_queue_depth[agent_id] -= 1
+
+        duration_ms = int((datetime.utcnow() - start_time).total_seconds() * 1000)
+        task_status = result.get("status", "error")
+        if task_status == "success":
+            event = self._build_task_completion_event(current_task_id, agent_id, "success", duration_ms, result=result.get("result", result))
+        else:
+            error_payload = result.get("error_details", {"error_code": "AGENT_REPORTED_FAILURE", "message": result.get("message", "Agent processing failed.")})
+            event = self._build_task_completion_event(current_task_id, agent_id, task_status, duration_ms, error_details=error_payload)
+        self._queue_completion_event(event)
+        return {**result, "task_id": current_task_id}
+
+    def _queue_completion_event(self, event: Dict[str, Any]) -> None:
+        """Buffers a completion event; the buffer is flushed when full or after the flush interval."""
+        if not self.keb_client.redis_client: return
+        self._completion_buffer.append(event)
+        if len(self._completion_buffer) >= self.completion_batch_size:
+            self._schedule_completion_flush(delay=0)
+        elif self._completion_flush_task is None or self._completion_flush_task.done():
+            self._schedule_completion_flush(delay=self.completion_flush_interval_s)
+
+    def _schedule_completion_flush(self, delay: float) -> None:
+        async def flush_later():
+            if delay:
+                await asyncio.sleep(delay)
+            await self.flush_completion_events()
+        self._completion_flush_task = asyncio.create_task(flush_later())
+
+    async def flush_completion_events(self) -> int:
+        """Publishes all buffered completion events in one pipelined KEB write. Returns the count."""
+        batch, self._completion_buffer = self._completion_buffer, []
+        if not batch:
+            return 0
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._get_thread_pool(), self.keb_client.publish_many, "task_events", batch)
+        logger.info(f"VMC: Published {len(batch)} TaskCompletionEvents in one batch.")
+        return len(batch)
+
+    async def _drain_async_dispatch(self) -> None:
+        """Waits for in-flight async dispatches, flushes completions and stops the worker pools."""
+        if self._dispatch_tasks:
+            logger.info(f"VMC: Waiting for {len(self._dispatch_tasks)} in-flight dispatches...")
+            await asyncio.gather(*list(self._dispatch_tasks), return_exceptions=True)
+        try:
+            await self.flush_completion_events()
+        except Exception as e:
+            logger.error(f"VMC: Failed to flush completion events on shutdown: {e}", exc_info=True)
+        if self._thread_pool is not None:
+            self._thread_pool.shutdown(wait=False)
+            self._thread_pool = None
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=False)
+            self._process_pool = None
+
     async def subscribe_to_control_events(self):
         """
         Asynchronously subscribes to VMC control events on the KEB.
@@ -312,8 +472,16 @@ class VantaMasterCore:
                     )
                     
                     # Dispatch (which will then publish TaskCompletionEvent)
-                    # Pass new_task_id so completion event is tied to this assignment
-                    self.dispatch_task_to_agent(target_agent_id, task_type_to_dispatch, task_parameters, original_task_id=new_task_id)
+                    # Pass new_task_id so completion event is tied to this assignment.
+                    # On the KEB subscriber path, schedule it so a slow agent cannot stall event processing.
+                    try:
+                        asyncio.get_running_loop()
+                    except RuntimeError:
+                        self.dispatch_task_to_agent(target_agent_id, task_type_to_dispatch, task_parameters, original_task_id=new_task_id)
+                    else:
+                        task = asyncio.create_task(self.dispatch_task_async(target_agent_id, task_type_to_dispatch, task_parameters, original_task_id=new_task_id))
+                        self._dispatch_tasks.add(task)
+                        task.add_done_callback(self._dispatch_tasks.discard)
                 else:
                     logger.error(f"VMC: Invalid '{event_type}' (EvID: {logical_event_id}). Missing fields. Payload: {event_payload}")
             else:
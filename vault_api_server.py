@@ -258,6 +258,22 @@ async def health_check():
             "error": str(e)
         }
 
+# Metrics endpoint
+@app.get("/metrics", tags=["System"])
+async def metrics():
+    """Request and security event counters"""
+    from agent_core.security_event_buffer import export_security_event_metrics
+    
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "server": {
+            "total_requests": server_state.request_count,
+            "active_connections": server_state.active_connections,
+            "uptime_seconds": int((datetime.now() - server_state.start_time).total_seconds())
+        },
+        "security_events": export_security_event_metrics()
+    }
+
 # Dashboard endpoint
 @app.get("/dashboard", response_class=HTMLResponse, tags=["Dashboard"])
 async def dashboard(request: Request):
@@ -304,6 +320,7 @@ async def root():
         "timestamp": datetime.now().isoformat(),
         "endpoints": {
             "health": "/health",
+            "metrics": "/metrics",
             "dashboard": "/dashboard", 
             "docs": "/docs" if config.debug else "disabled",
             "vault_api": "/api/v1/vault/"
@@ -6,10 +6,18 @@ Auto-generated under Domino Mode
 from pathlib import Path
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
-import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Set
+import hashlib
+import threading
 import time
 import logging
 import os
+import yaml
+
+from agent_core.ignore_rules import IGNORE_FILE, IgnoreRules
+from env_scanner import SCANNED_SUFFIXES, iter_project_files, merge_results, scan_content
 
 # Configure logging
 LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO').upper()
@@ -17,50 +25,280 @@ logging.basicConfig(level=getattr(logging, LOG_LEVEL, logging.INFO),
                     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-class ProjectChangeHandler(FileSystemEventHandler):
-    def __init__(self, project_path):
-        self.project_path = Path(project_path).resolve()
-
-    def on_modified(self, event):
-        if any(event.src_path.endswith(ext) for ext in [".md", ".py", ".yaml", ".yml"]):
-            logger.info(f"Change detected in: {event.src_path}")
-            try:
-                logger.info(f"Running bootstrap for project: {self.project_path}")
-                result = subprocess.run(
-                    ["python3", "cli.py", "bootstrap", str(self.project_path)],
-                    capture_output=True, text=True, check=False # check=False to capture stderr
-                )
-                if result.returncode == 0:
-                    logger.info(f"Bootstrap successful for {self.project_path}. Output:\n{result.stdout}")
+@dataclass
+class PendingChange:
+    """Changes to one project coalesced while it waits out the debounce window"""
+    paths: Set[str] = field(default_factory=set)
+    secrets: bool = False
+    manifest: bool = False
+    rescan: bool = False    # An ignore file changed: rescan the whole project
+    first_at: float = 0.0
+    due_at: float = 0.0
+
+@dataclass
+class ProjectBinding:
+    """What a project's current bindings were computed from"""
+    root: Path
+    ignores: IgnoreRules
+    file_results: Dict[str, dict] = field(default_factory=dict)
+    bound: Optional[dict] = None
+    secret_digests: Dict[str, Optional[str]] = field(default_factory=dict)
+
+def _default_link(project_path: Path):
+    import cli  # Imported once and kept warm for every later rebinding
+    cli.cmd_link(project_path)
+
+def _default_sync(project_path: Path, manifest_path: Path):
+    import cli
+    cli.cmd_sync_shared_resources(project_path, manifest_path)
+
+class RebindingEngine:
+    """
+    Debounced, coalescing rebinding for watched projects.
+
+    File events are grouped per project and handled once no new event has
+    arrived for `debounce` seconds (or `max_delay` after the first one), with
+    at most one run in flight per project; events during a run are handled in
+    the next one. A run rescans only the changed files and re-links the
+    project only if its env keys or tools, or the values of secrets it uses,
+    changed. Shared manifest changes re-sync every project. Linking and
+    syncing run in-process, serialized, since they share the access mesh.
+    """
+
+    def __init__(self, secrets_path: Path = Path("secrets.yaml"),
+                 manifest_path: Path = Path("shared_resources.yaml"),
+                 debounce: float = 0.5, max_delay: float = 5.0, max_workers: int = 4,
+                 link: Optional[Callable[[Path], None]] = None,
+                 sync: Optional[Callable[[Path, Path], None]] = None):
+        self.secrets_path = Path(secrets_path).resolve()
+        self.manifest_path = Path(manifest_path).resolve()
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self.link = link or _default_link
+        self.sync = sync or _default_sync
+
+        self.projects: Dict[Path, ProjectBinding] = {}
+        self._pending: Dict[Path, PendingChange] = {}
+        self._in_flight: Set[Path] = set()
+        self._condition = threading.Condition()
+        self._binding_lock = threading.Lock()
+        self._secrets_cache = (None, {})
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="rebind")
+        self._scheduler: Optional[threading.Thread] = None
+        self._running = False
+        self.stats = {"events": 0, "runs": 0, "links": 0, "syncs": 0, "unchanged": 0, "errors": 0}
+
+    # === PROJECTS ===
+
+    def add_project(self, project_path: Path) -> ProjectBinding:
+        """Watch a project; its current files are the baseline of its bindings"""
+        root = Path(project_path).resolve()
+        ignores = IgnoreRules(root)
+        binding = ProjectBinding(root, ignores, dict(iter_project_files(root, ignore_rules=ignores)))
+        binding.bound = merge_results(binding.file_results.values())
+        binding.secret_digests = self._secret_digests(binding.bound["env_keys"])
+        self.projects[root] = binding
+        return binding
+
+    def _project_for(self, path: str) -> Optional[Path]:
+        best = None
+        for root in self.projects:
+            root_str = str(root)
+            if (path == root_str or path.startswith(root_str + os.sep)) and (best is None or len(root_str) > len(str(best))):
+                best = root
+        return best
+
+    # === EVENTS ===
+
+    def notify(self, path: str):
+        """Record a changed path (called from the observer thread)"""
+        path = os.path.abspath(path)
+        now = time.monotonic()
+        with self._condition:
+            self.stats["events"] += 1
+            if path == str(self.secrets_path) or path == str(self.manifest_path):
+                targets = list(self.projects)
+            else:
+                root = self._project_for(path)
+                if root is None:
+                    return
+                if os.path.basename(path) != IGNORE_FILE and (Path(path).suffix not in SCANNED_SUFFIXES
+                                                              or self.projects[root].ignores.is_ignored(path)):
+                    return
+                targets = [root]
+            for root in targets:
+                change = self._pending.get(root)
+                if change is None:
+                    change = self._pending[root] = PendingChange(first_at=now)
+                if path == str(self.secrets_path):
+                    change.secrets = True
+                elif path == str(self.manifest_path):
+                    change.manifest = True
+                elif os.path.basename(path) == IGNORE_FILE:
+                    change.rescan = True
                 else:
-                    logger.error(f"Bootstrap failed for {self.project_path}. Error:\n{result.stderr}")
-            except Exception as e:
-                logger.exception(f"Error running bootstrap for {self.project_path}: {e}")
+                    change.paths.add(path)
+                change.due_at = min(now + self.debounce, change.first_at + self.max_delay)
+            self._condition.notify()
 
-def watch_project(project_path: str):
-    project_path_resolved = Path(project_path).resolve()
-    logger.info(f"Initializing watcher for changes in: {project_path_resolved}")
-    event_handler = ProjectChangeHandler(project_path_resolved)
+    def _schedule(self):
+        with self._condition:
+            while self._running:
+                now = time.monotonic()
+                wait = None
+                for root, change in list(self._pending.items()):
+                    if root in self._in_flight:
+                        continue
+                    if change.due_at <= now:
+                        del self._pending[root]
+                        self._in_flight.add(root)
+                        self._executor.submit(self._run, root, change)
+                    else:
+                        wait = change.due_at - now if wait is None else min(wait, change.due_at - now)
+                self._condition.wait(wait)
+
+    def wait_idle(self, timeout: float = 10.0) -> bool:
+        """Block until nothing is pending or running"""
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            while self._pending or self._in_flight:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+        return True
+
+    # === REBINDING ===
+
+    def _secret_digests(self, keys: List[str]) -> Dict[str, Optional[str]]:
+        """Digests (not values) of the given secrets; the file is re-read only when it changes"""
+        try:
+            st = self.secrets_path.stat()
+            fingerprint = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            fingerprint = None
+        cached_fingerprint, digests = self._secrets_cache
+        if fingerprint != cached_fingerprint:
+            digests = {}
+            if fingerprint is not None:
+                try:
+                    secrets = yaml.safe_load(self.secrets_path.read_text()) or {}
+                    digests = {key: hashlib.sha256(str(value).encode()).hexdigest() for key, value in secrets.items()}
+                except (OSError, yaml.YAMLError, AttributeError) as e:
+                    logger.error(f"Could not read secrets from {self.secrets_path}: {e}")
+            self._secrets_cache = (fingerprint, digests)
+        return {key: digests.get(key) for key in keys}
+
+    def _run(self, root: Path, change: PendingChange):
+        binding = self.projects[root]
+        outcome = "unchanged"
+        try:
+            if change.rescan:
+                binding.ignores.invalidate()
+                binding.file_results = dict(iter_project_files(root, ignore_rules=binding.ignores))
+            for path in change.paths:
+                try:
+                    binding.file_results[path] = scan_content(Path(path).read_text())
+                except FileNotFoundError:
+                    binding.file_results.pop(path, None)
+                except (OSError, UnicodeDecodeError):
+                    continue
+            scan = merge_results(binding.file_results.values())
+            digests = self._secret_digests(scan["env_keys"])
+
+            relink = scan != binding.bound or digests != binding.secret_digests
+            if relink:
+                logger.info(f"Rebinding {root}: {len(change.paths)} changed files"
+                            + (", secrets changed" if change.secrets else ""))
+                with self._binding_lock:
+                    self.link(root)
+                binding.bound, binding.secret_digests = scan, digests
+                outcome = "links"
+            if change.manifest:
+                logger.info(f"Syncing shared resources for {root}")
+                with self._binding_lock:
+                    self.sync(root, self.manifest_path)
+            if not relink and not change.manifest:
+                logger.debug(f"{root}: {len(change.paths)} changed files, bindings unchanged")
+        except Exception as e:
+            outcome = "errors"
+            logger.exception(f"Rebinding failed for {root}: {e}")
+        finally:
+            with self._condition:
+                self.stats["runs"] += 1
+                if change.manifest and outcome != "errors":
+                    self.stats["syncs"] += 1
+                if outcome != "unchanged" or not change.manifest:
+                    self.stats[outcome] += 1
+                self._in_flight.discard(root)
+                self._condition.notify_all()
+
+    # === LIFECYCLE ===
+
+    def start(self):
+        self._running = True
+        self._scheduler = threading.Thread(target=self._schedule, name="rebind-scheduler", daemon=True)
+        self._scheduler.start()
+
+    def stop(self):
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+        if self._scheduler is not None:
+            self._scheduler.join()
+        self._executor.shutdown(wait=True)
+
+class ProjectChangeHandler(FileSystemEventHandler):
+    def __init__(self, engine: RebindingEngine):
+        self.engine = engine
+
+    def on_any_event(self, event):
+        if event.is_directory or event.event_type in ("opened", "closed_no_write"):
+            return
+        self.engine.notify(event.src_path)
+        dest_path = getattr(event, "dest_path", None)
+        if dest_path:
+            self.engine.notify(dest_path)
+
+def watch_projects(project_paths: List[str], secrets_path: Path = Path("secrets.yaml"),
+                   manifest_path: Path = Path("shared_resources.yaml"), **engine_options):
+    """One observer and rebinding engine for any number of projects and the shared inputs"""
+    engine = RebindingEngine(secrets_path, manifest_path, **engine_options)
+    handler = ProjectChangeHandler(engine)
     observer = Observer()
-    observer.schedule(event_handler, str(project_path_resolved), recursive=True)
+    for project_path in project_paths:
+        project_path_resolved = Path(project_path).resolve()
+        logger.info(f"Initializing watcher for changes in: {project_path_resolved}")
+        engine.add_project(project_path_resolved)
+        observer.schedule(handler, str(project_path_resolved), recursive=True)
+    for shared_dir in {engine.secrets_path.parent, engine.manifest_path.parent}:
+        if not any(shared_dir == root or root in shared_dir.parents for root in engine.projects):
+            observer.schedule(handler, str(shared_dir), recursive=False)
+    engine.start()
     observer.start()
-    logger.info(f"Watcher started for {project_path_resolved}. Press Ctrl+C to stop.")
+    logger.info(f"Watcher started for {len(engine.projects)} projects. Press Ctrl+C to stop.")
     try:
         while True:
             time.sleep(1)
     except KeyboardInterrupt:
         logger.info("KeyboardInterrupt received, stopping watcher.")
-        observer.stop()
     except Exception as e:
         logger.exception(f"Watcher loop encountered an error: {e}") # Log other exceptions too
-        observer.stop()
     finally:
+        observer.stop()
         observer.join()
-        logger.info(f"Watcher stopped for {project_path_resolved}.")
+        engine.stop()
+        logger.info(f"Watcher stopped ({engine.stats['runs']} runs, {engine.stats['links']} rebinds "
+                    f"for {engine.stats['events']} events).")
+
+def watch_project(project_path: str):
+    watch_projects([project_path])
 
 if __name__ == "__main__":
     import argparse
-    parser = argparse.ArgumentParser(description="Watch a project directory for changes and run bootstrap.")
-    parser.add_argument("project_path", type=str, help="The path to the project directory to watch.")
+    parser = argparse.ArgumentParser(description="Watch project directories for changes and rebind them.")
+    parser.add_argument("project_paths", type=str, nargs="+", help="The project directories to watch.")
+    parser.add_argument("--secrets_path", type=str, default="secrets.yaml")
+    parser.add_argument("--debounce", type=float, default=0.5, help="Seconds of quiet before rebinding")
     args = parser.parse_args()
-    watch_project(args.project_path)
\ No newline at end of file
+    watch_projects(args.project_paths, Path(args.secrets_path), debounce=args.debounce)